@@ -0,0 +1,193 @@
+import argparse
+import os
+import sys
+import time
+
+from loadtest.capacity import find_knee, recommend, upstream_profile
+from loadtest.prompt_ab import compare_layouts, prefix_cache_profile, run_prompt_ab
+from loadtest.report import compare_reports, format_comparison, load_report, metadata, write_report
+from loadtest.runner import ENDPOINTS, LoadProfile, run_benchmark, run_sweep
+from loadtest.stack import SERVICES
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--services", type=_csv, default=list(SERVICES), help="comma-separated services to start")
+    parser.add_argument("--endpoints", type=_csv, default=list(ENDPOINTS), help="comma-separated endpoints")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per endpoint")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers per service")
+    parser.add_argument("--text-size", type=int, default=0, help="pad request texts to this many characters")
+    parser.add_argument("--unique", action="store_true", help="make every request text distinct")
+    parser.add_argument("--mock-profile", default=None, help="mock-ollama profile JSON")
+    parser.add_argument("--ollama-url", default=None, help="use an already running Ollama stand-in")
+
+
+def _run(args: argparse.Namespace) -> int:
+    load = LoadProfile(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        text_size=args.text_size,
+        unique=args.unique,
+    )
+    config = {
+        "services": args.services,
+        "endpoints": args.endpoints,
+        "workers": args.workers,
+        "proxy": args.proxy,
+        "mock_profile": args.mock_profile,
+        "ollama_url": args.ollama_url,
+        "load": load.to_dict(),
+    }
+    meta = metadata(config)
+    results = run_benchmark(
+        args.services,
+        args.endpoints,
+        load,
+        workers=args.workers,
+        proxy=args.proxy,
+        mock_profile=args.mock_profile,
+        ollama_url=args.ollama_url,
+    )
+    output = args.output or f"results/loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_report(output, meta, results)
+    print(f"wrote {output}")
+    return 0
+
+
+def _sweep(args: argparse.Namespace) -> int:
+    load = LoadProfile(duration=args.duration, warmup=args.warmup, text_size=args.text_size, unique=args.unique)
+    upstream = None
+    if args.upstream_median_ms is not None:
+        upstream = upstream_profile(args.upstream_median_ms, args.upstream_sigma, args.upstream_max_concurrency)
+    config = {
+        "service": args.service,
+        "endpoint": args.endpoint,
+        "levels": args.levels,
+        "workers": args.workers,
+        "upstream": upstream,
+        "mock_profile": args.mock_profile,
+        "ollama_url": args.ollama_url,
+        "load": load.to_dict(),
+    }
+    meta = metadata(config)
+    results = run_sweep(
+        args.service,
+        args.endpoint,
+        args.levels,
+        load,
+        workers=args.workers,
+        upstream=upstream,
+        mock_profile=args.mock_profile,
+        ollama_url=args.ollama_url,
+    )
+    knee = find_knee(results, tolerance=args.tolerance, max_error_rate=args.max_error_rate)
+    recommendation = None
+    if knee is not None:
+        upstream_ms = args.upstream_median_ms if args.upstream_median_ms is not None else results[0]["latency_ms"]["p50"]
+        recommendation = recommend(knee, args.service, args.workers, upstream_ms, os.cpu_count() or 1)
+        print(f"\nknee at concurrency {knee['load']['concurrency']}: {knee['throughput_rps']} req/s, "
+              f"p99 {knee['latency_ms']['p99']} ms")
+        for key, value in recommendation["settings"].items():
+            print(f"  {key:<36}{value}")
+    else:
+        print("\nno successful requests; no knee found")
+    output = args.output or f"results/sweep-{args.service}-{args.endpoint}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_report(output, meta, results, knee=knee and knee["load"]["concurrency"], recommendation=recommendation)
+    print(f"wrote {output}")
+    return 0
+
+
+def _prompt_ab(args: argparse.Namespace) -> int:
+    # Distinct texts, otherwise the whole prompt is cached under either layout
+    load = LoadProfile(
+        concurrency=args.concurrency, duration=args.duration, warmup=args.warmup, text_size=args.text_size, unique=True
+    )
+    upstream = None if args.ollama_url else prefix_cache_profile(args.prompt_tokens_per_second, args.cache_slots)
+    config = {
+        "service": args.service,
+        "endpoints": args.endpoints,
+        "upstream": upstream,
+        "ollama_url": args.ollama_url,
+        "load": load.to_dict(),
+    }
+    meta = metadata(config)
+    results, summaries = run_prompt_ab(
+        args.service, args.endpoints, load, ollama_url=args.ollama_url, upstream=upstream
+    )
+    comparison = compare_layouts(summaries)
+    print(f"\nsystem_prefix vs inline: prompt eval time {comparison['prompt_eval_ms_change']:+.1%}, "
+          f"evaluated tokens {comparison['prompt_eval_tokens_change']:+.1%}")
+    output = args.output or f"results/prompt-ab-{args.service}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_report(output, meta, results, prompt_eval=summaries, comparison=comparison)
+    print(f"wrote {output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    rows, regressions = compare_reports(load_report(args.baseline), load_report(args.current), args.threshold)
+    print(format_comparison(rows))
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="End-to-end load tests against mock-ollama")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark each endpoint at one load level")
+    _add_load_arguments(run)
+    run.add_argument("--concurrency", type=int, default=8, help="closed-loop in-flight requests")
+    run.add_argument("--rate", type=float, default=None, help="open-loop Poisson arrival rate (req/s)")
+    run.add_argument("--proxy", action="store_true", help="also drive each service through the Flask proxy")
+    run.add_argument("--output", default=None, help="result JSON path")
+    run.set_defaults(func=_run)
+
+    sweep = commands.add_parser("sweep", help="find the capacity knee of one endpoint and recommend pool sizes")
+    _add_load_arguments(sweep)
+    sweep.add_argument("--service", choices=list(SERVICES), default="llm-multiroute")
+    sweep.add_argument("--endpoint", choices=list(ENDPOINTS), default="classify")
+    sweep.add_argument(
+        "--levels", type=lambda v: [int(x) for x in _csv(v)], default=[1, 2, 4, 8, 16, 32, 64, 128],
+        help="comma-separated closed-loop concurrency levels",
+    )
+    sweep.add_argument("--upstream-median-ms", type=float, default=None, help="target upstream median latency")
+    sweep.add_argument("--upstream-sigma", type=float, default=0.3, help="lognormal spread of upstream latency")
+    sweep.add_argument("--upstream-max-concurrency", type=int, default=0, help="upstream capacity (0 = unlimited)")
+    sweep.add_argument("--tolerance", type=float, default=0.05, help="allowed excess of p99 growth over throughput growth")
+    sweep.add_argument("--max-error-rate", type=float, default=0.01, help="error rate that counts as past the knee")
+    sweep.add_argument("--output", default=None, help="result JSON path")
+    sweep.set_defaults(func=_sweep)
+
+    prompt_ab = commands.add_parser("prompt-ab", help="compare prompt-eval time of the inline and system_prefix layouts")
+    prompt_ab.add_argument("--service", choices=list(SERVICES), default="llm-multiroute")
+    prompt_ab.add_argument("--endpoints", type=_csv, default=list(ENDPOINTS), help="comma-separated endpoints")
+    prompt_ab.add_argument("--concurrency", type=int, default=4, help="closed-loop in-flight requests")
+    prompt_ab.add_argument("--duration", type=float, default=10.0, help="measured seconds per endpoint and layout")
+    prompt_ab.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each run")
+    prompt_ab.add_argument("--text-size", type=int, default=0, help="pad request texts to this many characters")
+    prompt_ab.add_argument("--prompt-tokens-per-second", type=float, default=500.0, help="mock prompt-eval speed")
+    prompt_ab.add_argument("--cache-slots", type=int, default=8, help="prompts the mock keeps in its prefix cache")
+    prompt_ab.add_argument("--ollama-url", default=None, help="measure a real Ollama instead of mock-ollama")
+    prompt_ab.add_argument("--output", default=None, help="result JSON path")
+    prompt_ab.set_defaults(func=_prompt_ab)
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import math
+from typing import Optional
+
+# Defaults of the current AIService design, per uvicorn worker process
+ANYIO_DEFAULT_THREADS = 40
+HTTPX_DEFAULT_MAX_CONNECTIONS = 100
+HTTPX_DEFAULT_MAX_KEEPALIVE = 20
+
+
+def upstream_profile(median_ms: float, sigma: float = 0.3, max_concurrency: int = 0) -> dict:
+    """A mock-ollama profile that gives every model the same target upstream latency."""
+    return {
+        "seed": 0,
+        "default": {
+            "latency": {"kind": "lognormal", "median_ms": median_ms, "sigma": sigma},
+            "prompt_tokens_per_second": 0,
+            "eval_tokens_per_second": 0,
+            "max_concurrency": max_concurrency,
+        },
+        "models": {},
+    }
+
+
+def find_knee(points: list[dict], tolerance: float = 0.05, max_error_rate: float = 0.01) -> Optional[dict]:
+    """Returns the last sweep point before p99 latency starts growing faster than throughput.
+
+    Between consecutive concurrency levels the relative growth of p99 and of throughput
+    are compared; the knee is the point before the first step where latency growth
+    exceeds throughput growth by more than `tolerance`, or where the error rate
+    crosses `max_error_rate`. If no such step exists the last point is returned.
+    """
+    usable = [p for p in points if p["ok"] > 0]
+    if not usable:
+        return None
+    if usable[0]["error_rate"] > max_error_rate:
+        return usable[0]
+    for previous, current in zip(usable, usable[1:]):
+        if current["error_rate"] > max_error_rate:
+            return previous
+        previous_p99 = previous["latency_ms"]["p99"] or 1e-9
+        previous_throughput = previous["throughput_rps"] or 1e-9
+        latency_growth = current["latency_ms"]["p99"] / previous_p99 - 1.0
+        throughput_growth = current["throughput_rps"] / previous_throughput - 1.0
+        if latency_growth - throughput_growth > tolerance:
+            return previous
+    return usable[-1]
+
+
+def _cpu_seconds_per_request(point: dict, service: str) -> float:
+    processes = point.get("processes", {}).get(service, [])
+    cpu_seconds = sum(p["cpu_seconds"] for p in processes)
+    return cpu_seconds / point["ok"] if point["ok"] else 0.0
+
+
+def recommend(
+    knee: dict,
+    service: str,
+    workers: int,
+    upstream_latency_ms: float,
+    cpu_count: int,
+    target_cpu_utilization: float = 0.7,
+    headroom: float = 1.25,
+) -> dict:
+    """Turns the knee of a sweep into worker, concurrency and pool settings.
+
+    Each in-flight request holds one threadpool thread and one httpx connection for
+    the whole upstream call (sync endpoints, blocking `httpx.Client`), so per-worker
+    threads and connections follow from the knee concurrency; worker count follows
+    from the CPU cost per request, since one process saturates one core.
+    """
+    concurrency = knee["load"]["concurrency"]
+    throughput = knee["throughput_rps"]
+    cpu_per_request = _cpu_seconds_per_request(knee, service)
+
+    cpu_bound_workers = math.ceil(throughput * cpu_per_request / target_cpu_utilization) if cpu_per_request else 1
+    recommended_workers = max(1, min(max(cpu_bound_workers, 1), cpu_count or 1))
+    per_worker_inflight = math.ceil(concurrency * headroom / recommended_workers)
+    # Little's law: requests in flight upstream = arrival rate x upstream latency
+    littles_law_inflight = math.ceil(throughput * upstream_latency_ms / 1000.0)
+
+    return {
+        "measured_workers": workers,
+        "knee_concurrency": concurrency,
+        "knee_throughput_rps": throughput,
+        "knee_p99_ms": knee["latency_ms"]["p99"],
+        "cpu_seconds_per_request": round(cpu_per_request, 5),
+        "upstream_latency_ms": upstream_latency_ms,
+        "littles_law_upstream_inflight": littles_law_inflight,
+        "settings": {
+            "uvicorn_workers": recommended_workers,
+            "concurrency_limit_total": concurrency,
+            "concurrency_limit_per_worker": math.ceil(concurrency / recommended_workers),
+            "queue_size_per_worker": math.ceil(concurrency / recommended_workers),
+            "threadpool_size_per_worker": max(per_worker_inflight, 1),
+            "httpx_max_connections_per_worker": max(per_worker_inflight, 1),
+            "httpx_max_keepalive_per_worker": max(per_worker_inflight, 1),
+        },
+        "notes": [
+            f"Beyond {concurrency} concurrent requests p99 grows faster than throughput; "
+            "admit at most that many and queue or shed the rest.",
+            f"The anyio threadpool defaults to {ANYIO_DEFAULT_THREADS} threads per worker and httpx to "
+            f"{HTTPX_DEFAULT_MAX_CONNECTIONS} connections ({HTTPX_DEFAULT_MAX_KEEPALIVE} keep-alive); "
+            "size both to the per-worker in-flight figure so neither becomes the hidden queue.",
+            f"At {upstream_latency_ms:.0f} ms upstream latency the knee throughput needs about "
+            f"{littles_law_inflight} requests in flight upstream (Little's law).",
+        ],
+    }
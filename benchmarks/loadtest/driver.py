@@ -0,0 +1,99 @@
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+import httpx
+
+from loadtest.stats import RequestRecord
+
+PayloadFactory = Callable[[int], dict]
+
+
+async def _issue(client: httpx.AsyncClient, url: str, payload: dict, scheduled: float, headers: dict) -> RequestRecord:
+    try:
+        response = await client.post(url, json=payload, headers=headers)
+        return RequestRecord(scheduled, time.perf_counter() - scheduled, status=response.status_code)
+    except httpx.TimeoutException:
+        return RequestRecord(scheduled, time.perf_counter() - scheduled, error="timeout")
+    except httpx.HTTPError as e:
+        return RequestRecord(scheduled, time.perf_counter() - scheduled, error=type(e).__name__)
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    url: str,
+    payloads: PayloadFactory,
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    headers: Optional[dict] = None,
+) -> tuple[list[RequestRecord], float]:
+    """Keeps `concurrency` requests in flight for `duration` seconds after `warmup`."""
+    records: list[RequestRecord] = []
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    counter = 0
+
+    async def worker():
+        nonlocal counter
+        while time.perf_counter() < stop_at:
+            counter += 1
+            issued = time.perf_counter()
+            record = await _issue(client, url, payloads(counter), issued, headers or {})
+            if issued >= measure_from:
+                records.append(record)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return records, max(time.perf_counter() - measure_from, 1e-9)
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    url: str,
+    payloads: PayloadFactory,
+    rate: float,
+    duration: float,
+    warmup: float = 0.0,
+    max_outstanding: int = 1000,
+    headers: Optional[dict] = None,
+    rng: Optional[random.Random] = None,
+) -> tuple[list[RequestRecord], float]:
+    """Poisson arrivals at `rate` req/s.
+
+    Latency is measured from the scheduled arrival time rather than the send time, so
+    a saturated server cannot hide its queueing delay (no coordinated omission).
+    Arrivals beyond `max_outstanding` are recorded as 'dropped' instead of piling up.
+    """
+    rng = rng or random.Random(0)
+    records: list[RequestRecord] = []
+    tasks: set[asyncio.Task] = set()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    next_arrival = start
+    counter = 0
+
+    async def one(scheduled: float, payload: dict):
+        record = await _issue(client, url, payload, scheduled, headers or {})
+        if scheduled >= measure_from:
+            records.append(record)
+
+    while next_arrival < stop_at:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        counter += 1
+        if len(tasks) >= max_outstanding:
+            if next_arrival >= measure_from:
+                records.append(RequestRecord(next_arrival, 0.0, error="dropped"))
+        else:
+            task = asyncio.create_task(one(next_arrival, payloads(counter)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        next_arrival += rng.expovariate(rate)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return records, duration
@@ -0,0 +1,41 @@
+SAMPLE_TEXTS = {
+    "classify": [
+        "Artificial intelligence is transforming healthcare through faster and more accurate diagnostics.",
+        "The central bank raised interest rates by a quarter point to fight persistent inflation.",
+        "The home team won the championship after a dramatic overtime goal.",
+    ],
+    "sentiment": [
+        "I love this product! The quality is outstanding and delivery was fast.",
+        "This is terrible. The device broke after two days and support never answered.",
+        "The meeting is scheduled for 3 PM in the main conference room.",
+    ],
+    "summarize": [
+        "Artificial intelligence (AI) is intelligence demonstrated by machines. "
+        "AI research has been defined as the field of study of intelligent agents. "
+        "Machine learning is a subset of AI that enables systems to learn from data. "
+        "Deep learning, in turn, uses multi-layer neural networks to learn representations.",
+    ],
+    "intent": [
+        "Where is the nearest Italian restaurant that is open now?",
+        "Please send me the quarterly report by Friday.",
+        "Turn off the lights in the living room.",
+    ],
+}
+
+
+class PayloadFactory:
+    """Builds request bodies for one endpoint, optionally padded to a target size."""
+
+    def __init__(self, endpoint: str, text_size: int = 0, unique: bool = False):
+        self.texts = SAMPLE_TEXTS[endpoint]
+        self.text_size = text_size
+        self.unique = unique
+
+    def __call__(self, n: int) -> dict:
+        text = self.texts[n % len(self.texts)]
+        if self.text_size > len(text):
+            text = (text + " ") * (self.text_size // (len(text) + 1) + 1)
+            text = text[: self.text_size]
+        if self.unique:
+            text = f"{text} (#{n})"
+        return {"text": text}
@@ -0,0 +1,93 @@
+from typing import Optional
+
+import httpx
+
+from loadtest import stack
+from loadtest.runner import LoadProfile, measure_endpoint
+
+LAYOUTS = ("inline", "system_prefix")
+
+
+def prefix_cache_profile(prompt_tokens_per_second: float = 500.0, slots: int = 8) -> dict:
+    """A mock-ollama profile where prompt evaluation dominates and shared prefixes are cached."""
+    return {
+        "seed": 0,
+        "default": {
+            "latency": {"kind": "fixed", "median_ms": 20},
+            "prompt_tokens_per_second": prompt_tokens_per_second,
+            "eval_tokens_per_second": 0,
+            "prefix_cache_slots": slots,
+        },
+        "models": {},
+    }
+
+
+def summarize_prompt_eval(upstream_timings: dict) -> dict:
+    """Request-weighted mean prompt-eval time and evaluated tokens over all models."""
+    requests = sum(stats["prompt_eval_ms"]["count"] for stats in upstream_timings.values())
+    if not requests:
+        return {"requests": 0, "prompt_eval_ms_mean": 0.0, "prompt_eval_tokens_mean": 0.0}
+
+    def weighted(name: str) -> float:
+        total = sum(stats[name]["mean"] * stats[name]["count"] for stats in upstream_timings.values())
+        return round(total / requests, 2)
+
+    return {
+        "requests": requests,
+        "prompt_eval_ms_mean": weighted("prompt_eval_ms"),
+        "prompt_eval_tokens_mean": weighted("prompt_eval_tokens"),
+    }
+
+
+def compare_layouts(summaries: dict[str, dict]) -> dict:
+    """Relative change of system_prefix against inline; negative means less prompt work."""
+    base, head = summaries["inline"], summaries["system_prefix"]
+
+    def change(name: str) -> Optional[float]:
+        return round(head[name] / base[name] - 1.0, 4) if base[name] else None
+
+    return {
+        "prompt_eval_ms_change": change("prompt_eval_ms_mean"),
+        "prompt_eval_tokens_change": change("prompt_eval_tokens_mean"),
+    }
+
+
+def run_prompt_ab(
+    service_name: str,
+    endpoints: list[str],
+    load: LoadProfile,
+    ollama_url: Optional[str] = None,
+    upstream: Optional[dict] = None,
+    log=print,
+) -> tuple[list[dict], dict[str, dict]]:
+    """Drives the same endpoints once per PROMPT_LAYOUT and reads back the prompt-eval timings
+    the service collected from Ollama's responses (/api/ai/metrics -> upstream_timings)."""
+    mock = None if ollama_url else stack.mock_ollama().start()
+    upstream_url = ollama_url or mock.url
+    results, summaries = [], {}
+    try:
+        for layout in LAYOUTS:
+            if mock is not None:
+                # Re-applying the profile also empties the simulated prefix cache
+                httpx.put(
+                    f"{upstream_url}/mock/profile", json=upstream or prefix_cache_profile(), timeout=10.0
+                ).raise_for_status()
+            server = stack.service(service_name, upstream_url, env={"PROMPT_LAYOUT": layout}).start()
+            try:
+                for endpoint in endpoints:
+                    result = measure_endpoint(server.url, endpoint, load, {service_name: server})
+                    result.update({"service": f"{service_name}[{layout}]", "workers": 1})
+                    results.append(result)
+                timings = httpx.get(f"{server.url}/api/ai/metrics", timeout=10.0).json()["upstream_timings"]
+            finally:
+                server.stop()
+            summaries[layout] = summarize_prompt_eval(timings)
+            log(
+                f"[{service_name}] {layout}: prompt eval {summaries[layout]['prompt_eval_ms_mean']} ms, "
+                f"{summaries[layout]['prompt_eval_tokens_mean']} tokens per request "
+                f"({summaries[layout]['requests']} requests)"
+            )
+    finally:
+        if mock is not None:
+            mock.stop()
+    return results, summaries
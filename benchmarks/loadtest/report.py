@@ -0,0 +1,107 @@
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+from loadtest.stack import REPO_ROOT
+
+SCHEMA_VERSION = 1
+
+# metric path -> True when a larger value is better
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "error_rate": False,
+}
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def metadata(config: dict) -> dict:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+    }
+
+
+def write_report(path: str, meta: dict, results: list[dict], **sections) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results, **sections}, f, indent=2)
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _metric(result: dict, path: str) -> float:
+    value = result
+    for key in path.split("."):
+        value = value[key]
+    return float(value)
+
+
+def _key(result: dict) -> tuple:
+    load = result["load"]
+    return result["service"], result["endpoint"], load["mode"], load["rate"] or load["concurrency"]
+
+
+def compare_reports(base: dict, new: dict, threshold: float = 0.10) -> tuple[list[dict], list[dict]]:
+    """Pairs up results by (service, endpoint, load) and flags metrics that got worse by more than `threshold`.
+
+    Error rate is compared in absolute points, everything else relative to the baseline.
+    """
+    baseline = {_key(r): r for r in base["results"]}
+    rows, regressions = [], []
+    for result in new["results"]:
+        before = baseline.get(_key(result))
+        if before is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS.items():
+            old_value, new_value = _metric(before, path), _metric(result, path)
+            if path == "error_rate":
+                change = new_value - old_value
+            else:
+                change = (new_value - old_value) / old_value if old_value else 0.0
+            worse = change < -threshold if higher_is_better else change > threshold
+            row = {
+                "service": result["service"],
+                "endpoint": result["endpoint"],
+                "metric": path,
+                "baseline": old_value,
+                "current": new_value,
+                "change": round(change, 4),
+                "regression": worse,
+            }
+            rows.append(row)
+            if worse:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = [f"{'service':<26}{'endpoint':<11}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}"]
+    for row in rows:
+        flag = "  <-- regression" if row["regression"] else ""
+        change = f"{row['change']:+.3f}" if row["metric"] == "error_rate" else f"{row['change']:+.1%}"
+        lines.append(
+            f"{row['service']:<26}{row['endpoint']:<11}{row['metric']:<16}"
+            f"{row['baseline']:>12.2f}{row['current']:>12.2f}{change:>10}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import psutil
+
+
+class ResourceMonitor:
+    """Samples CPU time and RSS of a server process and its worker children.
+
+    With `uvicorn --workers N` the parent only supervises, so every live process
+    in the tree is reported separately, keyed by pid.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.25):
+        self.root = psutil.Process(pid)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._cpu_start: dict[int, float] = {}
+        self._rss: dict[int, list[int]] = {}
+        self._roles: dict[int, str] = {}
+        self._started_at = 0.0
+        self._elapsed = 0.0
+
+    def _processes(self) -> list[psutil.Process]:
+        try:
+            return [self.root] + self.root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    @staticmethod
+    def _cpu_seconds(process: psutil.Process) -> float:
+        times = process.cpu_times()
+        return times.user + times.system
+
+    def _sample(self) -> None:
+        for process in self._processes():
+            try:
+                rss = process.memory_info().rss
+                if process.pid not in self._cpu_start:
+                    self._cpu_start[process.pid] = self._cpu_seconds(process)
+                    self._roles[process.pid] = "main" if process.pid == self.root.pid else "worker"
+            except psutil.Error:
+                continue
+            self._rss.setdefault(process.pid, []).append(rss)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._sample()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> list[dict]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._elapsed = max(time.perf_counter() - self._started_at, 1e-9)
+        report = []
+        for process in self._processes():
+            pid = process.pid
+            if pid not in self._cpu_start:
+                continue
+            try:
+                cpu_seconds = self._cpu_seconds(process) - self._cpu_start[pid]
+            except psutil.Error:
+                continue
+            rss = self._rss.get(pid) or [0]
+            report.append(
+                {
+                    "pid": pid,
+                    "role": self._roles[pid],
+                    "cpu_seconds": round(cpu_seconds, 3),
+                    "cpu_percent": round(100.0 * cpu_seconds / self._elapsed, 1),
+                    "rss_mb_mean": round(sum(rss) / len(rss) / 2**20, 1),
+                    "rss_mb_max": round(max(rss) / 2**20, 1),
+                }
+            )
+        return report
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from loadtest import stack
+from loadtest.driver import run_closed_loop, run_open_loop
+from loadtest.payloads import PayloadFactory
+from loadtest.resources import ResourceMonitor
+from loadtest.stats import summarize_records
+
+ENDPOINTS = ("classify", "sentiment", "summarize", "intent")
+
+
+class LoadProfile:
+    """How hard to drive one endpoint: closed-loop concurrency or open-loop arrival rate."""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        rate: Optional[float] = None,
+        duration: float = 20.0,
+        warmup: float = 2.0,
+        text_size: int = 0,
+        unique: bool = False,
+        timeout: float = 130.0,
+        headers: Optional[dict] = None,
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.warmup = warmup
+        self.text_size = text_size
+        self.unique = unique
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    @property
+    def mode(self) -> str:
+        return "open" if self.rate else "closed"
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "duration_s": self.duration,
+            "warmup_s": self.warmup,
+            "text_size": self.text_size,
+            "unique": self.unique,
+        }
+
+
+async def _drive(url: str, endpoint: str, load: LoadProfile):
+    connections = max(load.concurrency, 1) if not load.rate else 1000
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(timeout=load.timeout, limits=limits) as client:
+        payloads = PayloadFactory(endpoint, load.text_size, load.unique)
+        if load.rate:
+            return await run_open_loop(client, url, payloads, load.rate, load.duration, load.warmup, headers=load.headers)
+        return await run_closed_loop(client, url, payloads, load.concurrency, load.duration, load.warmup, headers=load.headers)
+
+
+def measure_endpoint(
+    base_url: str,
+    endpoint: str,
+    load: LoadProfile,
+    monitored: Optional[dict[str, stack.ManagedProcess]] = None,
+) -> dict:
+    monitors = {name: ResourceMonitor(proc.pid) for name, proc in (monitored or {}).items()}
+    for monitor in monitors.values():
+        monitor.start()
+    started = time.time()
+    records, elapsed = asyncio.run(_drive(f"{base_url}/api/ai/{endpoint}", endpoint, load))
+    result = {
+        "endpoint": endpoint,
+        "started_at": started,
+        "load": load.to_dict(),
+        **summarize_records(records, elapsed),
+        "processes": {name: monitor.stop() for name, monitor in monitors.items()},
+    }
+    return result
+
+
+def run_benchmark(
+    services: list[str],
+    endpoints: list[str],
+    load: LoadProfile,
+    workers: int = 1,
+    proxy: bool = False,
+    mock_profile: Optional[str] = None,
+    ollama_url: Optional[str] = None,
+    log=print,
+) -> list[dict]:
+    mock = None if ollama_url else stack.mock_ollama(mock_profile).start()
+    upstream = ollama_url or mock.url
+    results = []
+    try:
+        for name in services:
+            server = stack.service(name, upstream, workers).start()
+            front = stack.frontend_proxy(server.url).start() if proxy else None
+            try:
+                targets = [(name, server.url, {name: server})]
+                if front is not None:
+                    targets.append((f"{name}+proxy", front.url, {name: server, "proxy": front}))
+                for label, url, monitored in targets:
+                    for endpoint in endpoints:
+                        log(f"[{label}] {endpoint}: {load.mode}-loop, {load.rate or load.concurrency} ...")
+                        result = measure_endpoint(url, endpoint, load, monitored)
+                        result.update({"service": label, "workers": workers})
+                        log(
+                            f"    {result['throughput_rps']} req/s, p50 {result['latency_ms']['p50']} ms, "
+                            f"p99 {result['latency_ms']['p99']} ms, errors {result['error_rate']:.1%}"
+                        )
+                        results.append(result)
+            finally:
+                if front is not None:
+                    front.stop()
+                server.stop()
+    finally:
+        if mock is not None:
+            mock.stop()
+    return results
+
+
+def run_sweep(
+    service_name: str,
+    endpoint: str,
+    levels: list[int],
+    load: LoadProfile,
+    workers: int = 1,
+    upstream: Optional[dict] = None,
+    mock_profile: Optional[str] = None,
+    ollama_url: Optional[str] = None,
+    stop_error_rate: float = 0.5,
+    log=print,
+) -> list[dict]:
+    """Runs one endpoint at each closed-loop concurrency level in turn against one stack."""
+    mock = None if ollama_url else stack.mock_ollama(mock_profile).start()
+    upstream_url = ollama_url or mock.url
+    results = []
+    try:
+        if upstream is not None:
+            httpx.put(f"{upstream_url}/mock/profile", json=upstream, timeout=10.0).raise_for_status()
+        server = stack.service(service_name, upstream_url, workers).start()
+        try:
+            for level in levels:
+                level_load = LoadProfile(
+                    concurrency=level,
+                    duration=load.duration,
+                    warmup=load.warmup,
+                    text_size=load.text_size,
+                    unique=load.unique,
+                    timeout=load.timeout,
+                    headers=load.headers,
+                )
+                result = measure_endpoint(server.url, endpoint, level_load, {service_name: server})
+                result.update({"service": service_name, "workers": workers})
+                log(
+                    f"[{service_name}] {endpoint} c={level}: {result['throughput_rps']} req/s, "
+                    f"p99 {result['latency_ms']['p99']} ms, errors {result['error_rate']:.1%}"
+                )
+                results.append(result)
+                if result["error_rate"] > stop_error_rate:
+                    log("    error rate too high, stopping the sweep")
+                    break
+        finally:
+            server.stop()
+    finally:
+        if mock is not None:
+            mock.stop()
+    return results
@@ -0,0 +1,135 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+SERVICES = {
+    "llm-python": REPO_ROOT / "llm-python",
+    "llm-multiroute": REPO_ROOT / "llm-multiroute",
+}
+MOCK_OLLAMA_DIR = REPO_ROOT / "mock-ollama"
+FRONTEND_DIR = REPO_ROOT / "llm-frontend-python"
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ManagedProcess:
+    """A server subprocess that is started, health-checked and torn down by the harness."""
+
+    def __init__(self, name: str, args: list[str], cwd: Path, port: int, health_path: str, env: Optional[dict] = None):
+        self.name = name
+        self.args = args
+        self.cwd = cwd
+        self.port = port
+        self.health_path = health_path
+        self.env = {**os.environ, **(env or {})}
+        self.process: Optional[subprocess.Popen] = None
+        self.log = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def start(self, timeout: float = 30.0) -> "ManagedProcess":
+        # stderr goes to a file rather than a pipe: nothing reads the pipe while the server
+        # runs, and a chatty child would block once the pipe buffer fills
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.args,
+            cwd=self.cwd,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=self.log,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited during startup:\n{self.log_tail()}")
+            try:
+                if httpx.get(self.url + self.health_path, timeout=1.0).status_code < 500:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        tail = self.log_tail()
+        self.stop()
+        raise RuntimeError(f"{self.name} did not become ready on port {self.port} within {timeout}s:\n{tail}")
+
+    def log_tail(self, max_bytes: int = 8192) -> str:
+        """The last `max_bytes` of the process's stderr."""
+        if self.log is None:
+            return ""
+        self.log.seek(0, os.SEEK_END)
+        self.log.seek(max(0, self.log.tell() - max_bytes))
+        return self.log.read().decode(errors="replace")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+def mock_ollama(profile_path: Optional[str] = None) -> ManagedProcess:
+    port = free_port()
+    env = {"MOCK_PROFILE_PATH": str(Path(profile_path).resolve())} if profile_path else {}
+    return ManagedProcess(
+        "mock-ollama",
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        MOCK_OLLAMA_DIR,
+        port,
+        "/api/tags",
+        env,
+    )
+
+
+def service(name: str, ollama_url: str, workers: int = 1, env: Optional[dict] = None) -> ManagedProcess:
+    port = free_port()
+    return ManagedProcess(
+        name,
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        SERVICES[name],
+        port,
+        "/api-docs",
+        {"OLLAMA_BASE_URL": ollama_url, "OLLAMA_API_KEY": "", **(env or {})},
+    )
+
+
+def frontend_proxy(backend_url: str) -> ManagedProcess:
+    port = free_port()
+    return ManagedProcess(
+        "llm-frontend-python",
+        [sys.executable, "app.py"],
+        FRONTEND_DIR,
+        port,
+        "/",
+        {"BACKEND_URL": backend_url, "FLASK_PORT": str(port), "FLASK_DEBUG": "false"},
+    )
@@ -0,0 +1,48 @@
+import math
+from collections import Counter
+
+
+class RequestRecord:
+    """Outcome of a single request issued by the load driver."""
+
+    __slots__ = ("start", "latency", "status", "error")
+
+    def __init__(self, start: float, latency: float, status: int = 0, error: str = ""):
+        self.start = start
+        self.latency = latency
+        self.status = status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300 and not self.error
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_records(records: list[RequestRecord], elapsed: float) -> dict:
+    latencies = sorted(r.latency * 1000.0 for r in records if r.ok)
+    errors = [r for r in records if not r.ok]
+    outcomes = Counter(str(r.status) if r.status else r.error for r in records)
+    total = len(records)
+    return {
+        "requests": total,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "outcomes": dict(outcomes),
+    }
@@ -0,0 +1,125 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+MICRO_DIR = Path(__file__).resolve().parent
+BENCHMARKS_DIR = MICRO_DIR.parent
+BASELINE_DIR = MICRO_DIR / "baseline"
+
+# Each service has its own top-level `app` package, so each runs in its own pytest process
+SUITES = {
+    "llm-python": MICRO_DIR / "llm_python",
+    "llm-multiroute": MICRO_DIR / "llm_multiroute",
+}
+
+SUMMARY_STATS = ("min", "max", "mean", "stddev", "median", "iqr", "ops", "rounds", "iterations")
+
+
+def run_suite(service: str, output: Path, extra: list[str]) -> int:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        sys.executable, "-m", "pytest",
+        "-c", str(MICRO_DIR / "pytest.ini"),
+        str(SUITES[service]),
+        f"--benchmark-json={output}",
+        "-q",
+        *extra,
+    ]
+    status = subprocess.call(command, cwd=BENCHMARKS_DIR)
+    if output.exists():
+        compact(output)
+    return status
+
+
+def compact(path: Path) -> None:
+    """Keeps only summary statistics so result files (and the committed baseline) stay small."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["benchmarks"] = [
+        {
+            "name": bench["name"],
+            "fullname": bench["fullname"],
+            "stats": {key: bench["stats"][key] for key in SUMMARY_STATS if key in bench["stats"]},
+        }
+        for bench in data["benchmarks"]
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_medians(path: Path) -> dict[str, float]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["name"]: bench["stats"]["median"] for bench in data["benchmarks"]}
+
+
+def compare_medians(baseline: dict[str, float], current: dict[str, float], threshold: float) -> tuple[list[tuple], list[tuple]]:
+    rows, regressions = [], []
+    for name, median in sorted(current.items()):
+        if name not in baseline:
+            continue
+        change = median / baseline[name] - 1.0 if baseline[name] else 0.0
+        row = (name, baseline[name], median, change)
+        rows.append(row)
+        if change > threshold:
+            regressions.append(row)
+    return rows, regressions
+
+
+def _run(args: argparse.Namespace) -> int:
+    status = 0
+    for service in args.services:
+        target = BASELINE_DIR if args.save_baseline else Path(args.output_dir)
+        status |= run_suite(service, target / f"{service}.json", args.pytest_args)
+    return status
+
+
+def _compare(args: argparse.Namespace) -> int:
+    failed = False
+    for service in args.services:
+        baseline_path = Path(args.baseline_dir) / f"{service}.json"
+        current_path = Path(args.current_dir) / f"{service}.json"
+        if not current_path.exists():
+            print(f"{service}: no results at {current_path}, run `python -m micro run` first")
+            failed = True
+            continue
+        rows, regressions = compare_medians(load_medians(baseline_path), load_medians(current_path), args.threshold)
+        print(f"\n{service}")
+        print(f"  {'benchmark':<58}{'baseline':>12}{'current':>12}{'change':>9}")
+        for name, before, after, change in rows:
+            flag = "  <-- regression" if change > args.threshold else ""
+            print(f"  {name:<58}{before * 1e6:>10.1f}us{after * 1e6:>10.1f}us{change:>+9.1%}{flag}")
+        if regressions:
+            print(f"  {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            failed = True
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m micro", description="Hot-path micro-benchmarks for both services")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the micro-benchmarks")
+    run.add_argument("--services", nargs="+", choices=list(SUITES), default=list(SUITES))
+    run.add_argument("--output-dir", default="results/micro")
+    run.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_DIR}")
+    run.add_argument("pytest_args", nargs=argparse.REMAINDER, help="extra pytest arguments after --")
+    run.set_defaults(func=_run)
+
+    compare = commands.add_parser("compare", help="compare results with the baseline (median per benchmark)")
+    compare.add_argument("--services", nargs="+", choices=list(SUITES), default=list(SUITES))
+    compare.add_argument("--baseline-dir", default=str(BASELINE_DIR))
+    compare.add_argument("--current-dir", default="results/micro")
+    compare.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "pytest_args", None) and args.pytest_args[0] == "--":
+        args.pytest_args = args.pytest_args[1:]
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
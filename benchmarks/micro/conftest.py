@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from micro.payloads import METHODS, PAYLOAD_SIZES, make_text
+
+
+@pytest.fixture(params=PAYLOAD_SIZES, ids=lambda size: f"{size}ch")
+def text(request) -> str:
+    return make_text(request.param)
+
+
+@pytest.fixture
+def request_body(text) -> bytes:
+    return json.dumps({"text": text}).encode("utf-8")
+
+
+@pytest.fixture(params=list(METHODS))
+def task(request) -> str:
+    return request.param
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parents[3] / "llm-multiroute"
+
+if str(SERVICE_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVICE_DIR))
@@ -0,0 +1,100 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from fastapi.testclient import TestClient
+
+from app.controller import ai_controller
+from app.dto.classification_response import ClassificationResponse
+from app.dto.intent_response import IntentResponse
+from app.dto.sentiment_response import SentimentResponse
+from app.dto.summary_response import SummaryResponse
+from app.dto.text_request import TextRequest
+from app.main import app
+from app.service.ai_service import AIService
+from micro.payloads import METHODS, RESPONSES
+
+DTOS = {
+    "classify": ClassificationResponse,
+    "sentiment": SentimentResponse,
+    "summarize": SummaryResponse,
+    "intent": IntentResponse,
+}
+
+
+def _run_sync(coro):
+    # serialize_response never suspends when is_coroutine=True; drive it without an event loop
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+@pytest.fixture
+def service() -> AIService:
+    return AIService(http_client=MagicMock())
+
+
+def test_text_request_validation(benchmark, request_body):
+    result = benchmark(TextRequest.model_validate_json, request_body)
+    assert result.text
+
+
+def test_prompt_build(benchmark, service, task, text):
+    captured = {}
+    service._chat = lambda messages, *args, **kwargs: captured.update(messages=messages) or ""
+    service._parse_json = lambda raw, model_class: None
+
+    benchmark(getattr(service, METHODS[task]), text)
+
+    assert text in captured["messages"][-1]["content"]
+
+
+def test_parse_json(benchmark, task):
+    result = benchmark(AIService._parse_json, RESPONSES[task], DTOS[task])
+    assert isinstance(result, DTOS[task])
+
+
+def test_parse_json_code_fence(benchmark, task):
+    raw = f"```json\n{RESPONSES[task]}\n```"
+    result = benchmark(AIService._parse_json, raw, DTOS[task])
+    assert isinstance(result, DTOS[task])
+
+
+def test_dto_construction(benchmark, task):
+    data = json.loads(RESPONSES[task])
+    result = benchmark(lambda: DTOS[task](**data))
+    assert isinstance(result, DTOS[task])
+
+
+def test_response_encoding(benchmark, task):
+    route = next(r for r in app.routes if isinstance(r, APIRoute) and r.path == f"/api/ai/{task}")
+    dto = DTOS[task](**json.loads(RESPONSES[task]))
+
+    def encode():
+        content = _run_sync(
+            serialize_response(
+                field=route.secure_cloned_response_field,
+                response_content=dto,
+                exclude_none=route.response_model_exclude_none,
+                is_coroutine=True,
+            )
+        )
+        return JSONResponse(content).body
+
+    assert benchmark(encode)
+
+
+def test_endpoint_roundtrip(benchmark, monkeypatch, task, request_body):
+    """Whole FastAPI request path with the upstream call stubbed out."""
+    monkeypatch.setattr(ai_controller.ai_service, "_chat", lambda *args, **kwargs: RESPONSES[task])
+    client = TestClient(app)
+    url = f"/api/ai/{task}"
+    headers = {"Content-Type": "application/json"}
+
+    response = benchmark(client.post, url, content=request_body, headers=headers)
+
+    assert response.status_code == 200
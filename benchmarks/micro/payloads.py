@@ -0,0 +1,24 @@
+# Request text sizes in characters, from a short review to a long document
+PAYLOAD_SIZES = [50, 1_000, 10_000, 200_000]
+
+SAMPLE = "I love this product! The quality is outstanding and delivery was fast. "
+
+RESPONSES = {
+    "classify": '{"labels": ["technology", "AI"], "primaryCategory": "technology", "confidence": 0.95}',
+    "sentiment": '{"overallSentiment": "positive", "sentimentScore": 0.85, "emotions": ["joy", "excitement"], "confidence": 0.92}',
+    "summarize": '{"summary": "AI transforms healthcare through improved diagnostics.", '
+    '"keyPoints": ["AI improves diagnosis", "Reduces costs", "Enhances care"], "wordCount": 6}',
+    "intent": '{"primaryIntent": "find_restaurant", "secondaryIntents": ["location_search"], '
+    '"intentCategory": "question", "confidence": 0.88}',
+}
+
+METHODS = {
+    "classify": "classify_text",
+    "sentiment": "analyze_sentiment",
+    "summarize": "summarize_text",
+    "intent": "detect_intent",
+}
+
+
+def make_text(size: int) -> str:
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
@@ -0,0 +1,71 @@
+from loadtest.capacity import find_knee, recommend, upstream_profile
+
+
+def _point(concurrency, throughput, p99, error_rate=0.0, ok=100, cpu_seconds=0.0) -> dict:
+    return {
+        "load": {"concurrency": concurrency},
+        "throughput_rps": throughput,
+        "latency_ms": {"p99": p99},
+        "error_rate": error_rate,
+        "ok": ok,
+        "processes": {"svc": [{"cpu_seconds": cpu_seconds}]},
+    }
+
+
+class TestFindKnee:
+    def test_knee_where_latency_outgrows_throughput(self):
+        points = [
+            _point(1, 5, 220),
+            _point(2, 10, 225),
+            _point(4, 20, 230),
+            _point(8, 26, 400),
+            _point(16, 27, 900),
+        ]
+
+        assert find_knee(points)["load"]["concurrency"] == 4
+
+    def test_linear_scaling_returns_last_point(self):
+        points = [_point(c, 5 * c, 200) for c in (1, 2, 4, 8)]
+
+        assert find_knee(points)["load"]["concurrency"] == 8
+
+    def test_errors_mark_the_knee(self):
+        points = [_point(1, 5, 200), _point(2, 10, 200), _point(4, 20, 200, error_rate=0.2)]
+
+        assert find_knee(points)["load"]["concurrency"] == 2
+
+    def test_no_successes(self):
+        assert find_knee([_point(1, 0, 0, ok=0)]) is None
+
+
+class TestRecommend:
+    def test_io_bound_service_needs_one_worker(self):
+        knee = _point(16, 50, 400, ok=500, cpu_seconds=1.0)
+
+        result = recommend(knee, "svc", workers=1, upstream_latency_ms=300, cpu_count=4)
+
+        assert result["settings"]["uvicorn_workers"] == 1
+        assert result["settings"]["concurrency_limit_total"] == 16
+        assert result["settings"]["threadpool_size_per_worker"] == 20
+        assert result["littles_law_upstream_inflight"] == 15
+
+    def test_cpu_heavy_service_spreads_over_workers(self):
+        knee = _point(32, 100, 400, ok=100, cpu_seconds=2.0)
+
+        result = recommend(knee, "svc", workers=1, upstream_latency_ms=300, cpu_count=8)
+
+        assert result["settings"]["uvicorn_workers"] == 3
+        assert result["settings"]["concurrency_limit_per_worker"] == 11
+
+    def test_workers_capped_by_cpu_count(self):
+        knee = _point(32, 100, 400, ok=100, cpu_seconds=100.0)
+
+        assert recommend(knee, "svc", 1, 300, cpu_count=2)["settings"]["uvicorn_workers"] == 2
+
+
+class TestUpstreamProfile:
+    def test_profile_shape(self):
+        profile = upstream_profile(250, sigma=0.5, max_concurrency=8)
+
+        assert profile["default"]["latency"]["median_ms"] == 250
+        assert profile["default"]["max_concurrency"] == 8
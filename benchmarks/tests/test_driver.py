@@ -0,0 +1,72 @@
+import asyncio
+import random
+
+import httpx
+
+from loadtest.driver import run_closed_loop, run_open_loop
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestClosedLoop:
+    def test_records_successes_and_failures(self):
+        calls = {"n": 0}
+
+        def handler(request):
+            calls["n"] += 1
+            return httpx.Response(200 if calls["n"] % 2 else 503, json={})
+
+        async def run():
+            async with _client(handler) as client:
+                return await run_closed_loop(client, "http://test/api/ai/classify", lambda n: {"text": "x"}, 4, 0.05)
+
+        records, elapsed = asyncio.run(run())
+
+        assert records
+        assert {r.status for r in records} == {200, 503}
+        assert elapsed >= 0.05
+
+    def test_transport_errors_are_recorded(self):
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        async def run():
+            async with _client(handler) as client:
+                return await run_closed_loop(client, "http://test/x", lambda n: {}, 1, 0.02)
+
+        records, _ = asyncio.run(run())
+
+        assert records[0].error == "ConnectError"
+        assert not records[0].ok
+
+
+class TestOpenLoop:
+    def test_arrival_rate(self):
+        async def run():
+            async with _client(lambda request: httpx.Response(200, json={})) as client:
+                return await run_open_loop(
+                    client, "http://test/x", lambda n: {}, rate=200, duration=0.5, rng=random.Random(1)
+                )
+
+        records, elapsed = asyncio.run(run())
+
+        assert elapsed == 0.5
+        assert 60 < len(records) < 140
+
+    def test_drops_beyond_max_outstanding(self):
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={})
+
+        async def run():
+            async with _client(handler) as client:
+                return await run_open_loop(
+                    client, "http://test/x", lambda n: {}, rate=500, duration=0.1, max_outstanding=5
+                )
+
+        records, _ = asyncio.run(run())
+
+        assert sum(1 for r in records if r.ok) <= 5
+        assert any(r.error == "dropped" for r in records)
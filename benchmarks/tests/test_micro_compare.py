@@ -0,0 +1,23 @@
+from micro.__main__ import compare_medians
+
+
+class TestCompareMedians:
+    def test_flags_slowdowns_over_threshold(self):
+        baseline = {"test_parse_json[classify]": 10e-6, "test_prompt_build[classify-50ch]": 2e-6}
+        current = {"test_parse_json[classify]": 14e-6, "test_prompt_build[classify-50ch]": 2.1e-6}
+
+        rows, regressions = compare_medians(baseline, current, threshold=0.25)
+
+        assert len(rows) == 2
+        assert [r[0] for r in regressions] == ["test_parse_json[classify]"]
+
+    def test_new_benchmarks_are_ignored(self):
+        rows, regressions = compare_medians({}, {"test_new": 1.0}, threshold=0.25)
+
+        assert rows == []
+        assert regressions == []
+
+    def test_speedups_are_not_regressions(self):
+        _, regressions = compare_medians({"a": 2.0}, {"a": 1.0}, threshold=0.0)
+
+        assert regressions == []
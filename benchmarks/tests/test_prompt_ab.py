@@ -0,0 +1,31 @@
+from loadtest.prompt_ab import compare_layouts, prefix_cache_profile, summarize_prompt_eval
+
+
+def _stats(count, mean) -> dict:
+    return {"count": count, "mean": mean, "p95": mean, "max": mean}
+
+
+class TestPromptEvalSummary:
+    def test_weighted_over_models(self):
+        timings = {
+            "gemma3:4b": {"prompt_eval_ms": _stats(3, 10.0), "prompt_eval_tokens": _stats(3, 40.0)},
+            "gemma3:12b": {"prompt_eval_ms": _stats(1, 30.0), "prompt_eval_tokens": _stats(1, 80.0)},
+        }
+
+        summary = summarize_prompt_eval(timings)
+
+        assert summary == {"requests": 4, "prompt_eval_ms_mean": 15.0, "prompt_eval_tokens_mean": 50.0}
+
+    def test_no_requests(self):
+        assert summarize_prompt_eval({})["requests"] == 0
+
+    def test_compare_layouts(self):
+        summaries = {
+            "inline": {"requests": 10, "prompt_eval_ms_mean": 100.0, "prompt_eval_tokens_mean": 50.0},
+            "system_prefix": {"requests": 10, "prompt_eval_ms_mean": 40.0, "prompt_eval_tokens_mean": 20.0},
+        }
+
+        assert compare_layouts(summaries) == {"prompt_eval_ms_change": -0.6, "prompt_eval_tokens_change": -0.6}
+
+    def test_profile_enables_prefix_cache(self):
+        assert prefix_cache_profile(slots=4)["default"]["prefix_cache_slots"] == 4
@@ -0,0 +1,68 @@
+import copy
+
+from loadtest.report import compare_reports, format_comparison, metadata
+
+
+def _report(throughput=10.0, p99=100.0, error_rate=0.0) -> dict:
+    return {
+        "results": [
+            {
+                "service": "llm-multiroute",
+                "endpoint": "classify",
+                "load": {"mode": "closed", "concurrency": 8, "rate": None},
+                "throughput_rps": throughput,
+                "latency_ms": {"p50": 50.0, "p95": 90.0, "p99": p99},
+                "error_rate": error_rate,
+            }
+        ]
+    }
+
+
+class TestCompareReports:
+    def test_identical_reports_have_no_regressions(self):
+        rows, regressions = compare_reports(_report(), copy.deepcopy(_report()))
+
+        assert len(rows) == 5
+        assert regressions == []
+
+    def test_latency_regression(self):
+        _, regressions = compare_reports(_report(p99=100.0), _report(p99=150.0), threshold=0.1)
+
+        assert [r["metric"] for r in regressions] == ["latency_ms.p99"]
+
+    def test_throughput_regression(self):
+        _, regressions = compare_reports(_report(throughput=10.0), _report(throughput=8.0), threshold=0.1)
+
+        assert [r["metric"] for r in regressions] == ["throughput_rps"]
+
+    def test_improvement_is_not_a_regression(self):
+        _, regressions = compare_reports(_report(throughput=10.0, p99=100.0), _report(throughput=20.0, p99=50.0))
+
+        assert regressions == []
+
+    def test_error_rate_uses_absolute_points(self):
+        _, regressions = compare_reports(_report(error_rate=0.0), _report(error_rate=0.2), threshold=0.1)
+
+        assert [r["metric"] for r in regressions] == ["error_rate"]
+
+    def test_unmatched_results_are_skipped(self):
+        other = _report()
+        other["results"][0]["endpoint"] = "intent"
+
+        rows, _ = compare_reports(_report(), other)
+
+        assert rows == []
+
+    def test_format_marks_regressions(self):
+        rows, _ = compare_reports(_report(p99=100.0), _report(p99=200.0))
+
+        assert "<-- regression" in format_comparison(rows)
+
+
+class TestMetadata:
+    def test_contains_config_and_commit_fields(self):
+        meta = metadata({"workers": 2})
+
+        assert meta["config"] == {"workers": 2}
+        assert "git_commit" in meta
+        assert meta["schema_version"] == 1
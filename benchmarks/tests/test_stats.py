@@ -0,0 +1,54 @@
+import pytest
+
+from loadtest.payloads import PayloadFactory
+from loadtest.stats import RequestRecord, percentile, summarize_records
+
+
+class TestPercentile:
+    def test_empty(self):
+        assert percentile([], 99) == 0.0
+
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+
+    def test_single_value(self):
+        assert percentile([7.0], 1) == 7.0
+
+
+class TestSummarizeRecords:
+    def test_counts_and_rates(self):
+        records = [RequestRecord(0.0, 0.1, status=200) for _ in range(8)]
+        records += [RequestRecord(0.0, 0.5, status=500), RequestRecord(0.0, 1.0, error="timeout")]
+
+        summary = summarize_records(records, elapsed=2.0)
+
+        assert summary["requests"] == 10
+        assert summary["ok"] == 8
+        assert summary["error_rate"] == 0.2
+        assert summary["throughput_rps"] == 4.0
+        assert summary["latency_ms"]["p99"] == pytest.approx(100.0)
+        assert summary["outcomes"] == {"200": 8, "500": 1, "timeout": 1}
+
+    def test_no_successes(self):
+        summary = summarize_records([RequestRecord(0.0, 0.1, error="ConnectError")], elapsed=1.0)
+
+        assert summary["ok"] == 0
+        assert summary["latency_ms"]["p50"] == 0.0
+
+
+class TestPayloadFactory:
+    def test_cycles_sample_texts(self):
+        factory = PayloadFactory("intent")
+        assert factory(0) != factory(1)
+        assert factory(0) == factory(3)
+
+    def test_pads_to_text_size(self):
+        assert len(PayloadFactory("classify", text_size=5000)(0)["text"]) == 5000
+
+    def test_unique_texts(self):
+        factory = PayloadFactory("classify", unique=True)
+        assert factory(0) != factory(3)
@@ -1,9 +1,21 @@
 from flask import Flask, render_template, request, jsonify
 import requests
-from config import BACKEND_URL, FLASK_PORT, DEBUG
+from config import BACKEND_URL, FLASK_PORT, DEBUG, BACKEND_TIMEOUT_SECONDS, DEADLINE_MARGIN_MS
 
 app = Flask(__name__)
 
+DEADLINE_HEADER = 'X-Request-Timeout-Ms'
+
+
+def request_budget_ms():
+    """The proxy timeout, lowered to the browser's own budget when it sends one."""
+    budget = BACKEND_TIMEOUT_SECONDS * 1000
+    try:
+        budget = min(budget, float(request.headers.get(DEADLINE_HEADER, budget)))
+    except ValueError:
+        pass
+    return max(budget, 0)
+
 
 @app.route('/')
 def index():
@@ -16,12 +28,19 @@ def proxy_analysis(analysis_type):
     if analysis_type not in allowed_types:
         return jsonify({'error': f'Invalid analysis type: {analysis_type}'}), 400
 
+    budget_ms = request_budget_ms()
+    if budget_ms <= DEADLINE_MARGIN_MS:
+        # Nothing left to forward: the backend would get a zero budget and give up at once
+        return jsonify({'error': 'Request deadline already exceeded'}), 504
     try:
         resp = requests.post(
             f'{BACKEND_URL}/api/ai/{analysis_type}',
             json=request.get_json(),
-            headers={'Content-Type': 'application/json'},
-            timeout=30
+            headers={
+                'Content-Type': 'application/json',
+                DEADLINE_HEADER: str(int(budget_ms - DEADLINE_MARGIN_MS)),
+            },
+            timeout=budget_ms / 1000
         )
         return jsonify(resp.json()), resp.status_code
     except requests.exceptions.ConnectionError:
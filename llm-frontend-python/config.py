@@ -3,3 +3,7 @@ import os
 BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:8080')
 FLASK_PORT = int(os.environ.get('FLASK_PORT', 5000))
 DEBUG = os.environ.get('FLASK_DEBUG', 'true').lower() == 'true'
+# Total time the proxy waits for the backend; the backend receives what is left of it
+# (minus the margin) in X-Request-Timeout-Ms so it gives up before the proxy does
+BACKEND_TIMEOUT_SECONDS = float(os.environ.get('BACKEND_TIMEOUT_SECONDS', 30))
+DEADLINE_MARGIN_MS = int(os.environ.get('DEADLINE_MARGIN_MS', 500))
@@ -14,6 +14,13 @@ document.addEventListener('DOMContentLoaded', () => {
     let selectedAnalysis = 'summarize';
     let isLoading = false;
 
+    // Time budget per analysis; sent along so the backend stops working once we stop waiting
+    const REQUEST_TIMEOUT_MS = 30000;
+    const requestHeaders = {
+        'Content-Type': 'application/json',
+        'X-Request-Timeout-Ms': String(REQUEST_TIMEOUT_MS)
+    };
+
     const analysisTypes = {
         summarize: { label: 'Summarize', icon: '\u{1F4DD}' },
         sentiment: { label: 'Sentiment', icon: '\u{1F60A}' },
@@ -241,8 +248,9 @@ document.addEventListener('DOMContentLoaded', () => {
         try {
             const response = await fetch(`/api/ai/${selectedAnalysis}`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text })
+                headers: requestHeaders,
+                body: JSON.stringify({ text }),
+                signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS)
             });
 
             if (!response.ok) {
@@ -274,8 +282,9 @@ document.addEventListener('DOMContentLoaded', () => {
         const promises = types.map(type =>
             fetch(`/api/ai/${type}`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text })
+                headers: requestHeaders,
+                body: JSON.stringify({ text }),
+                signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS)
             })
             .then(async response => {
                 if (!response.ok) {
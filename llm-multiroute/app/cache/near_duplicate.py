@@ -0,0 +1,244 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.config import settings
+from app.metrics import metrics
+from app.router.model_router import TaskType
+
+_WORD = re.compile(r"\w+")
+
+SIGNATURE_BITS = 128
+# 16 bands of 8 bits: any two signatures at Hamming distance <= 15 share a band, so
+# every cached text with similarity >= cos(15 * pi / 128) ~= 0.93 is a candidate
+BANDS = 16
+BAND_BITS = SIGNATURE_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercased words; whitespace, punctuation and case differences disappear."""
+    return _WORD.findall(text.lower())
+
+
+def simhash(words: list[str]) -> int:
+    """128-bit SimHash over words and word pairs.
+
+    A one-word edit changes three of the roughly 2n features (the word and two pairs),
+    so short texts with small edits stay close; trigrams change too much of them.
+    """
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])] or [""]
+    width = SIGNATURE_BITS // 8
+    digests = b"".join(hashlib.blake2b(f.encode(), digest_size=width).digest() for f in features)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, width), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def similarity(a: int, b: int) -> float:
+    """Cosine between the two feature sets, estimated from the signatures' Hamming distance."""
+    return math.cos(math.pi * (a ^ b).bit_count() / SIGNATURE_BITS)
+
+
+def _bands(signature: int) -> list[int]:
+    return [(signature >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+
+class _Entry:
+    __slots__ = ("signature", "short", "result", "expires_at", "fields", "scope")
+
+    def __init__(
+        self,
+        signature: int,
+        short: bool,
+        result: BaseModel,
+        expires_at: float,
+        fields: Optional[tuple[str, ...]] = None,
+        scope: str = "",
+    ):
+        self.signature = signature
+        self.short = short
+        self.result = result
+        self.fields = fields
+        self.scope = scope
+        self.expires_at = expires_at
+
+
+class ResultCacheStats:
+    """Hit rate, and the best candidate similarity seen by each lookup."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self._similarity: dict[str, int] = {}
+
+    def record(self, exact: bool, near: bool, best: Optional[float]) -> None:
+        # Only the top of the range is of interest when choosing a threshold
+        if best is None:
+            band = "none"
+        elif best < 0.9:
+            band = "<0.90"
+        else:
+            band = f"{math.floor(best * 100) / 100:.2f}"
+        with self._lock:
+            self.lookups += 1
+            self.exact_hits += exact
+            self.near_hits += near
+            self._similarity[band] = self._similarity.get(band, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            return {
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+                "best_similarity": dict(sorted(self._similarity.items())),
+            }
+
+
+def _covers(cached: Optional[tuple[str, ...]], wanted: Optional[tuple[str, ...]]) -> bool:
+    if cached is None:
+        return True
+    return wanted is not None and set(wanted) <= set(cached)
+
+
+class NearDuplicateCache:
+    """Reuses a route's answers for texts that are near-identical to earlier ones.
+
+    Texts are keyed by the SimHash of their normalized words and indexed by band
+    (LSH), so a lookup compares only against entries sharing a band rather than the
+    whole cache. Entries are evicted least recently used beyond `max_entries` and
+    expire after `ttl_seconds`. Texts shorter than `min_words` words carry too few
+    features for a meaningful estimate and only match identical texts.
+
+    A result generated for a field projection only answers requests for a subset of
+    its fields; `fields=None` means the full answer, which answers any request.
+    Results only answer requests of the same `scope`, such as the routing mode.
+    """
+
+    def __init__(
+        self,
+        min_similarity: float,
+        max_entries: int,
+        ttl_seconds: float,
+        min_words: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_similarity = min_similarity
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_words = min_words
+        self.clock = clock
+        self.stats = ResultCacheStats()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._buckets: list[dict[int, set[bytes]]] = [{} for _ in range(BANDS)]
+
+    def answer(
+        self,
+        text: str,
+        compute: Callable[[], BaseModel],
+        fields: Optional[tuple[str, ...]] = None,
+        scope: str = "",
+    ) -> BaseModel:
+        words = normalize(text)
+        variant = scope + ("" if fields is None else "\0" + ",".join(fields))
+        key = hashlib.blake2b((" ".join(words) + "\0" + variant).encode(), digest_size=16).digest()
+        signature = simhash(words)
+        short = len(words) < self.min_words
+        cached = self._lookup(key, signature, short, fields, scope)
+        if cached is not None:
+            return cached
+        result = compute()
+        expires_at = self.clock() + self.ttl_seconds
+        self._store(key, _Entry(signature, short, result.model_copy(), expires_at, fields, scope))
+        return result
+
+    def _lookup(
+        self, key: bytes, signature: int, short: bool, fields: Optional[tuple[str, ...]], scope: str
+    ) -> Optional[BaseModel]:
+        now = self.clock()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.record(exact=True, near=False, best=1.0)
+                return entry.result.model_copy()
+            best_key, best = None, None
+            if not short:
+                candidates = set().union(*(self._buckets[i].get(band, ()) for i, band in enumerate(_bands(signature))))
+                for candidate in candidates:
+                    entry = self._live(candidate, now)
+                    if entry is None or entry.short or entry.scope != scope or not _covers(entry.fields, fields):
+                        continue
+                    score = similarity(signature, entry.signature)
+                    if best is None or score > best:
+                        best_key, best = candidate, score
+            hit = best is not None and best >= self.min_similarity
+            self.stats.record(exact=False, near=hit, best=best)
+            if not hit:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key].result.model_copy()
+
+    def _live(self, key: bytes, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._remove(key)
+            return None
+        return entry
+
+    def _store(self, key: bytes, entry: _Entry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for i, band in enumerate(_bands(entry.signature)):
+                self._buckets[i].setdefault(band, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        for i, band in enumerate(_bands(entry.signature)):
+            bucket = self._buckets[i][band]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[i][band]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+        return {"entries": entries, "min_similarity": self.min_similarity, **self.stats.snapshot()}
+
+
+def build_result_caches() -> dict[TaskType, NearDuplicateCache]:
+    if not settings.RESULT_CACHE_ENABLED:
+        return {}
+    caches = {}
+    for task_type in TaskType:
+        min_similarity = getattr(settings, f"RESULT_CACHE_MIN_SIMILARITY_{task_type.name}")
+        if min_similarity is None:
+            continue
+        caches[task_type] = NearDuplicateCache(
+            min_similarity,
+            settings.RESULT_CACHE_MAX_ENTRIES,
+            settings.RESULT_CACHE_TTL_SECONDS,
+            settings.RESULT_CACHE_MIN_WORDS,
+        )
+    return caches
+
+
+route_result_caches = build_result_caches()
+metrics.register("result_cache", lambda: {task.value: c.snapshot() for task, c in route_result_caches.items()})
@@ -0,0 +1,158 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.concurrency.admission import AdmissionRejected
+from app.concurrency.priority import PriorityScheduler, configured_weights
+from app.config import settings
+from app.context import Priority
+from app.metrics import metrics
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one upstream model, driven by observed latency.
+
+    The baseline is a slow moving average of healthy latencies. While samples stay
+    within `tolerance` x baseline and the limit is actually in use, the limit grows
+    by about one per round trip (additive increase). An upstream error, timeout or a
+    latency above the tolerance cuts it by `backoff_ratio` (multiplicative decrease),
+    at most once per baseline interval so one slow burst is not punished repeatedly.
+    Requests waiting for a slot are released in priority order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        backoff_ratio: float = 0.9,
+        tolerance: float = 2.0,
+        max_wait_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.tolerance = tolerance
+        self.max_wait_seconds = max_wait_seconds
+        self.baseline: Optional[float] = None
+        self.last_latency = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.rejected = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.scheduler = PriorityScheduler(
+            lambda: max(1, math.floor(self.limit)),
+            configured_weights(),
+            settings.PRIORITY_STARVATION_SECONDS,
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self.scheduler.in_flight
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None) -> int:
+        """Blocks until a slot is free; returns the in-flight count including this request."""
+        max_wait = self.max_wait_seconds if timeout is None else max(0.0, min(timeout, self.max_wait_seconds))
+        if not self.scheduler.acquire(priority, max_wait):
+            with self._lock:
+                self.rejected += 1
+            raise AdmissionRejected(self.name, "adaptive limit reached", max(1, math.ceil(self.baseline or 1)))
+        return self.scheduler.in_flight
+
+    def release(self, latency: float, ok: Optional[bool], in_flight_at_start: int) -> None:
+        """`ok=None` frees the slot without feeding the latency into the limit."""
+        if ok is not None:
+            with self._lock:
+                self._on_sample(latency, ok, in_flight_at_start)
+        self.scheduler.release()
+
+    def _on_sample(self, latency: float, ok: bool, in_flight_at_start: int) -> None:
+        self.last_latency = latency
+        if ok and self.baseline is None:
+            self.baseline = latency
+            return
+        baseline = self.baseline or latency
+        congested = not ok or latency > self.tolerance * baseline
+        if ok:
+            # Congested samples still move the baseline, only much slower, so a genuinely
+            # slower upstream becomes the new normal instead of a permanent backoff
+            alpha = 0.002 if congested else 0.02
+            self.baseline = (1 - alpha) * baseline + alpha * latency
+
+        now = time.monotonic()
+        if congested:
+            if now - self._last_decrease >= baseline:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease = now
+                self.decreases += 1
+        elif in_flight_at_start >= self.limit / 2:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self.increases += 1
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None) -> Iterator["_Outcome"]:
+        in_flight = self.acquire(priority, timeout)
+        outcome = _Outcome()
+        started = time.monotonic()
+        try:
+            yield outcome
+        finally:
+            self.release(time.monotonic() - started, outcome.ok, in_flight)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "baseline_ms": round((self.baseline or 0.0) * 1000, 1),
+                "last_latency_ms": round(self.last_latency * 1000, 1),
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "rejected": self.rejected,
+                **self.scheduler.snapshot(),
+            }
+
+
+class _Outcome:
+    """Set `ok = False` inside the slot when the upstream call failed from overload,
+    or `ok = None` when the call was cut short by the caller and says nothing about it."""
+
+    def __init__(self):
+        self.ok: Optional[bool] = True
+
+
+class AdaptiveLimits:
+    """One adaptive limiter per upstream model, created on first use."""
+
+    def __init__(self):
+        self.enabled = settings.ADAPTIVE_LIMIT_ENABLED
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> AdaptiveLimiter:
+        with self._lock:
+            if model not in self._limiters:
+                self._limiters[model] = AdaptiveLimiter(
+                    model,
+                    initial_limit=settings.ADAPTIVE_INITIAL_LIMIT,
+                    min_limit=settings.ADAPTIVE_MIN_LIMIT,
+                    max_limit=settings.ADAPTIVE_MAX_LIMIT,
+                    backoff_ratio=settings.ADAPTIVE_BACKOFF_RATIO,
+                    tolerance=settings.ADAPTIVE_LATENCY_TOLERANCE,
+                    max_wait_seconds=settings.ADAPTIVE_MAX_WAIT_SECONDS,
+                )
+            return self._limiters[model]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {"enabled": self.enabled, "models": {name: lim.snapshot() for name, lim in limiters.items()}}
+
+
+adaptive_limits = AdaptiveLimits()
+metrics.register("adaptive_limits", adaptive_limits.snapshot)
@@ -0,0 +1,152 @@
+import asyncio
+import math
+import time
+from typing import Optional
+
+from app.concurrency.priority import WeightedPicker, configured_weights
+from app.config import settings
+from app.context import Priority
+from app.metrics import LatencyStats, metrics
+from app.router.model_router import TaskType
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, route: str, reason: str, retry_after: int):
+        super().__init__(f"Route '{route}' is overloaded ({reason}); retry after {retry_after}s")
+        self.route = route
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded wait queue and a maximum queue time.
+
+    Runs on the event loop, so requests wait here without holding a threadpool
+    thread. A released slot is handed directly to the next waiter, picked by
+    weighted priority and FIFO within a class.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, queue_size: int, max_queue_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.max_queue_seconds = max_queue_seconds
+        self.in_flight = 0
+        self._waiters: WeightedPicker[asyncio.Future] = WeightedPicker(
+            configured_weights(), settings.PRIORITY_STARVATION_SECONDS
+        )
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.wait_ms = LatencyStats()
+        self._service_seconds = 1.0  # EWMA of how long an admitted request holds its slot
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained through the slots."""
+        drain = self._service_seconds * (self.queued + 1) / max(self.max_concurrency, 1)
+        return int(min(max(math.ceil(drain), 1), 60))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        if reason == "queue full":
+            self.rejected_queue_full += 1
+        else:
+            self.rejected_timeout += 1
+        return AdmissionRejected(self.name, reason, self.retry_after())
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """Waits for a slot and returns the time spent queued, in seconds.
+
+        `timeout` (the caller's remaining budget) shortens the maximum queue time.
+        """
+        if self.in_flight < self.max_concurrency and not len(self._waiters):
+            self.in_flight += 1
+            self.admitted += 1
+            self.wait_ms.record(0.0)
+            return 0.0
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue full")
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.push(priority, waiter)
+        try:
+            max_wait = self.max_queue_seconds if timeout is None else max(0.0, min(timeout, self.max_queue_seconds))
+            await asyncio.wait({waiter}, timeout=max_wait)
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot we may have been handed
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(priority, waiter)
+            raise
+        if not waiter.done():
+            self._discard(priority, waiter)
+            raise self._reject("queue timeout")
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.wait_ms.record(waited * 1000.0)
+        return waited
+
+    def _discard(self, priority: Priority, waiter: asyncio.Future) -> None:
+        waiter.cancel()
+        self._waiters.remove(priority, waiter)
+
+    def release(self, held_seconds: Optional[float] = None) -> None:
+        if held_seconds is not None:
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * held_seconds
+        while (picked := self._waiters.pop()) is not None:
+            waiter = picked[1]
+            if not waiter.done():
+                # The slot moves to the waiter, in_flight stays the same
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_size": self.queue_size,
+            "max_queue_seconds": self.max_queue_seconds,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queued_by_priority": {p.value: self._waiters.depth(p) for p in Priority},
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
+
+class AdmissionController:
+    def __init__(self):
+        self.enabled = settings.ADMISSION_ENABLED
+        self._limiters: dict[TaskType, AdmissionLimiter] = {
+            task: AdmissionLimiter(
+                task.value,
+                getattr(settings, f"ADMISSION_MAX_CONCURRENCY_{task.name}"),
+                getattr(settings, f"ADMISSION_QUEUE_SIZE_{task.name}"),
+                getattr(settings, f"ADMISSION_MAX_QUEUE_SECONDS_{task.name}"),
+            )
+            for task in TaskType
+        }
+
+    def get(self, task_type: TaskType) -> AdmissionLimiter:
+        return self._limiters[task_type]
+
+    @property
+    def total_capacity(self) -> int:
+        return sum(limiter.max_concurrency for limiter in self._limiters.values())
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "routes": {task.value: limiter.snapshot() for task, limiter in self._limiters.items()},
+        }
+
+
+admission_controller = AdmissionController()
+metrics.register("admission", admission_controller.snapshot)
@@ -0,0 +1,69 @@
+from typing import Callable, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+import httpx
+
+from app.config import settings
+from app.metrics import metrics
+from app.router.model_router import TaskType
+
+T = TypeVar("T")
+
+
+class Bulkhead:
+    """Worker threads and an upstream connection pool that belong to a single route."""
+
+    def __init__(self, name: str, workers: int, pool_size: int):
+        self.name = name
+        self.workers = workers
+        self.pool_size = pool_size
+        self.client = httpx.Client(
+            timeout=120.0,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        # Created on first use because the limiter binds to the running event loop
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Runs the blocking call on one of this route's worker threads."""
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.workers)
+        return await anyio.to_thread.run_sync(func, *args, limiter=self._limiter)
+
+    def snapshot(self) -> dict:
+        busy = waiting = 0
+        if self._limiter is not None:
+            stats = self._limiter.statistics()
+            busy, waiting = stats.borrowed_tokens, stats.tasks_waiting
+        return {
+            "workers": self.workers,
+            "busy_workers": busy,
+            "waiting_for_worker": waiting,
+            "pool_size": self.pool_size,
+        }
+
+
+class Bulkheads:
+    def __init__(self):
+        self._bulkheads: dict[TaskType, Bulkhead] = {
+            task: Bulkhead(
+                task.value,
+                getattr(settings, f"ADMISSION_MAX_CONCURRENCY_{task.name}"),
+                getattr(settings, f"UPSTREAM_POOL_SIZE_{task.name}"),
+            )
+            for task in TaskType
+        }
+
+    def get(self, task_type: TaskType) -> Bulkhead:
+        return self._bulkheads[task_type]
+
+    async def run(self, task_type: TaskType, func: Callable[..., T], *args) -> T:
+        return await self._bulkheads[task_type].run(func, *args)
+
+    def snapshot(self) -> dict:
+        return {task.value: bulkhead.snapshot() for task, bulkhead in self._bulkheads.items()}
+
+
+route_bulkheads = Bulkheads()
+metrics.register("bulkheads", route_bulkheads.snapshot)
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Sequence, TypeVar
+
+from app.config import settings
+from app.context import CHUNK_FAILED, current_context
+from app.metrics import metrics
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ChunkFanout:
+    """Runs one request's chunk calls in parallel on a shared, bounded thread pool.
+
+    Each call runs with a copy of the caller's context variables, so every chunk
+    shares the request's priority, deadline and cancellation. The first failure
+    cancels the request's context, which aborts the chunks still streaming and
+    keeps queued ones from starting.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.requests = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="chunk")
+
+    def map(self, func: Callable[[T], R], items: Sequence[T]) -> list[R]:
+        with self._lock:
+            self.requests += 1
+            self.calls += len(items)
+        if len(items) == 1:
+            return [func(items[0])]
+        futures = [self._executor.submit(copy_context().run, func, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            current_context().cancel(CHUNK_FAILED)
+            raise
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "requests": self.requests, "calls": self.calls}
+
+
+chunk_fanout = ChunkFanout(settings.CHUNKED_WORKERS)
+metrics.register("chunk_fanout", chunk_fanout.snapshot)
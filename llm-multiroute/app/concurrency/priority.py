@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Generic, Optional, TypeVar
+
+from app.config import settings
+from app.context import Priority
+
+T = TypeVar("T")
+
+
+class WeightedPicker(Generic[T]):
+    """Per-priority FIFO queues drained by smooth weighted round-robin.
+
+    Each pick credits every non-empty class with its weight and takes the head of the
+    class with the most credit, so interactive work gets most turns while bulk and
+    batch still make progress. Starvation protection: a head that has waited longer
+    than `starvation_seconds` is taken first, oldest first.
+    """
+
+    def __init__(self, weights: dict[Priority, int], starvation_seconds: float):
+        self.weights = weights
+        self.starvation_seconds = starvation_seconds
+        self._queues: dict[Priority, deque[tuple[float, T]]] = {p: deque() for p in Priority}
+        self._credit: dict[Priority, int] = {p: 0 for p in Priority}
+        self.promoted = 0
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def depth(self, priority: Priority) -> int:
+        return len(self._queues[priority])
+
+    def push(self, priority: Priority, item: T) -> None:
+        self._queues[priority].append((time.monotonic(), item))
+
+    def remove(self, priority: Priority, item: T) -> bool:
+        queue = self._queues[priority]
+        for entry in queue:
+            if entry[1] is item:
+                queue.remove(entry)
+                return True
+        return False
+
+    def pop(self) -> Optional[tuple[Priority, T]]:
+        waiting = [p for p in Priority if self._queues[p]]
+        if not waiting:
+            return None
+        now = time.monotonic()
+        starved = [p for p in waiting if now - self._queues[p][0][0] >= self.starvation_seconds]
+        if starved:
+            chosen = min(starved, key=lambda p: self._queues[p][0][0])
+            if chosen != waiting[0]:
+                self.promoted += 1
+        else:
+            total = 0
+            for p in waiting:
+                self._credit[p] += self.weights[p]
+                total += self.weights[p]
+            chosen = max(waiting, key=lambda p: (self._credit[p], -p.rank))
+            self._credit[chosen] -= total
+        return chosen, self._queues[chosen].popleft()[1]
+
+
+class PriorityScheduler:
+    """Thread-side slot gate in front of upstream calls, ordered by priority class.
+
+    `capacity` is re-read on every decision so an adaptive limit can drive it.
+    """
+
+    def __init__(
+        self,
+        capacity: Callable[[], int],
+        weights: dict[Priority, int],
+        starvation_seconds: float,
+    ):
+        self.capacity = capacity
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._picker: WeightedPicker[threading.Event] = WeightedPicker(weights, starvation_seconds)
+        self.granted = {p: 0 for p in Priority}
+
+    def acquire(self, priority: Priority, timeout: float) -> bool:
+        with self._lock:
+            if self.in_flight < self.capacity() and not len(self._picker):
+                self.in_flight += 1
+                self.granted[priority] += 1
+                return True
+            ticket = threading.Event()
+            self._picker.push(priority, ticket)
+        if ticket.wait(timeout):
+            return True
+        with self._lock:
+            if self._picker.remove(priority, ticket):
+                return False
+        # Granted between the timeout and taking the lock
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.capacity():
+            picked = self._picker.pop()
+            if picked is None:
+                return
+            priority, ticket = picked
+            self.in_flight += 1
+            self.granted[priority] += 1
+            ticket.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queued": {p.value: self._picker.depth(p) for p in Priority},
+                "granted": {p.value: n for p, n in self.granted.items()},
+                "starvation_promotions": self._picker.promoted,
+            }
+
+
+def configured_weights() -> dict[Priority, int]:
+    return {p: max(1, getattr(settings, f"PRIORITY_WEIGHT_{p.name}")) for p in Priority}
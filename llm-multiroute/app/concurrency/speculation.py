@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, TypeVar
+
+from app.config import settings
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+
+class SpeculationBudget:
+    """Caps the extra upstream load that speculative cascade calls may add.
+
+    Every cascaded request deposits `ratio` into a balance capped at `burst`; starting a
+    speculative large-model call withdraws one. When the small answer turns out not to
+    be good enough the large call was needed anyway, so its withdrawal is refunded.
+    Over time wasted (cancelled) large calls therefore stay below `ratio` times the
+    cascaded traffic, and at most `max_in_flight` of them run at once.
+    """
+
+    def __init__(self, ratio: float, burst: float, max_in_flight: int):
+        self.ratio = ratio
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.balance = burst
+        self.in_flight = 0
+        self.granted = 0
+        self.denied = 0
+        self.wasted = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="speculative")
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.burst, self.balance + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.max_in_flight or self.balance < 1:
+                self.denied += 1
+                return False
+            self.balance -= 1
+            self.in_flight += 1
+            self.granted += 1
+            return True
+
+    def release(self, wasted: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if wasted:
+                self.wasted += 1
+            else:
+                self.balance = min(self.burst, self.balance + 1)
+
+    def submit(self, func: Callable[..., T], *args) -> Future:
+        """Runs `func` on a speculation thread with a copy of the caller's context variables."""
+        return self._executor.submit(copy_context().run, func, *args)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "balance": round(self.balance, 2),
+                "in_flight": self.in_flight,
+                "granted": self.granted,
+                "denied": self.denied,
+                "wasted": self.wasted,
+            }
+
+
+speculation_budget = SpeculationBudget(
+    settings.CASCADE_SPECULATIVE_BUDGET_RATIO,
+    settings.CASCADE_SPECULATIVE_BURST,
+    settings.CASCADE_SPECULATIVE_MAX_IN_FLIGHT,
+)
+metrics.register("speculation", speculation_budget.snapshot)
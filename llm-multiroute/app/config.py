@@ -1,4 +1,45 @@
 import os
+from typing import Optional
+
+
+def _route_option(option: str, task: str, default: str = "") -> str:
+    """OLLAMA_<OPTION>_<TASK>, falling back to OLLAMA_<OPTION>, then `default`."""
+    return os.getenv(f"OLLAMA_{option}_{task}", os.getenv(f"OLLAMA_{option}", default)).strip()
+
+
+def _route_int(option: str, task: str, default: str = "") -> Optional[int]:
+    value = _route_option(option, task, default)
+    return int(value) if value else None
+
+
+def _route_float(option: str, task: str, default: str = "") -> Optional[float]:
+    value = _route_option(option, task, default)
+    return float(value) if value else None
+
+
+def _optional_float(name: str, default: str = "") -> Optional[float]:
+    value = os.getenv(name, default).strip()
+    return float(value) if value else None
+
+
+def _mode_option(option: str, mode: str, task: str, default: str = "") -> str:
+    """MODE_<OPTION>_<MODE>_<TASK>, falling back to MODE_<OPTION>_<MODE>, then `default`."""
+    return os.getenv(f"MODE_{option}_{mode}_{task}", os.getenv(f"MODE_{option}_{mode}", default)).strip()
+
+
+def _mode_int(option: str, mode: str, task: str, default: str = "") -> Optional[int]:
+    value = _mode_option(option, mode, task, default)
+    return int(value) if value else None
+
+
+def _mode_float(option: str, mode: str, task: str, default: str = "") -> Optional[float]:
+    value = _mode_option(option, mode, task, default)
+    return float(value) if value else None
+
+
+def _route_stop(task: str) -> list[str]:
+    # '|'-separated, with \n for newlines
+    return [s.replace("\\n", "\n") for s in _route_option("STOP", task).split("|") if s]
 
 
 class Settings:
@@ -6,13 +47,299 @@ class Settings:
     APP_NAME: str = os.getenv("APP_NAME", "llm-multiroute")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "https://ollama.com")
     OLLAMA_TEMPERATURE: float = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
+    # system_prefix: static instructions in a system message, text last (prompt-cache friendly);
+    # inline: the original single user message, for A/B comparison
+    PROMPT_LAYOUT: str = os.getenv("PROMPT_LAYOUT", "system_prefix")
     OLLAMA_API_KEY: str = os.getenv("OLLAMA_API_KEY", "")
 
+    # Several Ollama nodes, separated by ';': "URL [models=a,b] [weight=N]"; empty uses
+    # OLLAMA_BASE_URL only. OLLAMA_API_KEY is sent to the OLLAMA_BASE_URL node only
+    OLLAMA_BACKENDS: str = os.getenv("OLLAMA_BACKENDS", "")
+    # least_outstanding, weighted or consistent_hash (cache affinity by model and text prefix)
+    OLLAMA_BALANCING: str = os.getenv("OLLAMA_BALANCING", "least_outstanding")
+    # consistent_hash: characters of normalized text that form the key, and how far above
+    # its fair share of in-flight requests a node may go before overflowing to the next
+    OLLAMA_HASH_PREFIX_CHARS: int = int(os.getenv("OLLAMA_HASH_PREFIX_CHARS", "512"))
+    OLLAMA_HASH_LOAD_FACTOR: float = float(os.getenv("OLLAMA_HASH_LOAD_FACTOR", "1.25"))
+    OLLAMA_EJECT_AFTER_FAILURES: int = int(os.getenv("OLLAMA_EJECT_AFTER_FAILURES", "3"))
+    OLLAMA_HEALTH_CHECK_SECONDS: float = float(os.getenv("OLLAMA_HEALTH_CHECK_SECONDS", "10"))
+    OLLAMA_HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+    # Longest a request may take end to end; callers can lower it with X-Request-Timeout-Ms
+    REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "120"))
+
     # Per-route model assignments (must be available on Ollama cloud)
     OLLAMA_MODEL_CLASSIFY: str = os.getenv("OLLAMA_MODEL_CLASSIFY", "gemma3:4b")
     OLLAMA_MODEL_SENTIMENT: str = os.getenv("OLLAMA_MODEL_SENTIMENT", "ministral-3:3b")
     OLLAMA_MODEL_SUMMARIZE: str = os.getenv("OLLAMA_MODEL_SUMMARIZE", "ministral-3:8b")
     OLLAMA_MODEL_INTENT: str = os.getenv("OLLAMA_MODEL_INTENT", "gemma3:12b")
 
+    # Per-route generation options, sent to Ollama under "options". Each reads
+    # OLLAMA_<OPTION>_<ROUTE>, then OLLAMA_<OPTION>; empty leaves the model's default.
+    # NUM_PREDICT caps output tokens, sized to each route's JSON schema, so a runaway
+    # answer is cut off instead of generating until the context is full.
+    # STOP is '|'-separated
+    OLLAMA_NUM_PREDICT_CLASSIFY: Optional[int] = _route_int("NUM_PREDICT", "CLASSIFY", "128")
+    OLLAMA_NUM_PREDICT_SENTIMENT: Optional[int] = _route_int("NUM_PREDICT", "SENTIMENT", "128")
+    OLLAMA_NUM_PREDICT_SUMMARIZE: Optional[int] = _route_int("NUM_PREDICT", "SUMMARIZE", "512")
+    OLLAMA_NUM_PREDICT_INTENT: Optional[int] = _route_int("NUM_PREDICT", "INTENT", "128")
+
+    OLLAMA_TEMPERATURE_CLASSIFY: float = _route_float("TEMPERATURE", "CLASSIFY", "0.7")
+    OLLAMA_TEMPERATURE_SENTIMENT: float = _route_float("TEMPERATURE", "SENTIMENT", "0.7")
+    OLLAMA_TEMPERATURE_SUMMARIZE: float = _route_float("TEMPERATURE", "SUMMARIZE", "0.7")
+    OLLAMA_TEMPERATURE_INTENT: float = _route_float("TEMPERATURE", "INTENT", "0.7")
+
+    OLLAMA_NUM_CTX_CLASSIFY: Optional[int] = _route_int("NUM_CTX", "CLASSIFY")
+    OLLAMA_NUM_CTX_SENTIMENT: Optional[int] = _route_int("NUM_CTX", "SENTIMENT")
+    OLLAMA_NUM_CTX_SUMMARIZE: Optional[int] = _route_int("NUM_CTX", "SUMMARIZE")
+    OLLAMA_NUM_CTX_INTENT: Optional[int] = _route_int("NUM_CTX", "INTENT")
+
+    OLLAMA_TOP_K_CLASSIFY: Optional[int] = _route_int("TOP_K", "CLASSIFY")
+    OLLAMA_TOP_K_SENTIMENT: Optional[int] = _route_int("TOP_K", "SENTIMENT")
+    OLLAMA_TOP_K_SUMMARIZE: Optional[int] = _route_int("TOP_K", "SUMMARIZE")
+    OLLAMA_TOP_K_INTENT: Optional[int] = _route_int("TOP_K", "INTENT")
+
+    OLLAMA_TOP_P_CLASSIFY: Optional[float] = _route_float("TOP_P", "CLASSIFY")
+    OLLAMA_TOP_P_SENTIMENT: Optional[float] = _route_float("TOP_P", "SENTIMENT")
+    OLLAMA_TOP_P_SUMMARIZE: Optional[float] = _route_float("TOP_P", "SUMMARIZE")
+    OLLAMA_TOP_P_INTENT: Optional[float] = _route_float("TOP_P", "INTENT")
+
+    OLLAMA_SEED_CLASSIFY: Optional[int] = _route_int("SEED", "CLASSIFY")
+    OLLAMA_SEED_SENTIMENT: Optional[int] = _route_int("SEED", "SENTIMENT")
+    OLLAMA_SEED_SUMMARIZE: Optional[int] = _route_int("SEED", "SUMMARIZE")
+    OLLAMA_SEED_INTENT: Optional[int] = _route_int("SEED", "INTENT")
+
+    OLLAMA_STOP_CLASSIFY: list[str] = _route_stop("CLASSIFY")
+    OLLAMA_STOP_SENTIMENT: list[str] = _route_stop("SENTIMENT")
+    OLLAMA_STOP_SUMMARIZE: list[str] = _route_stop("SUMMARIZE")
+    OLLAMA_STOP_INTENT: list[str] = _route_stop("INTENT")
+
+    # Per-request mode hint, from the X-Mode header or "mode" in the request body: fast,
+    # balanced or accurate. balanced is each route as configured above. The other modes
+    # use MODE_MODEL_<MODE>_<ROUTE> (empty keeps the route's model) and may override
+    # TEMPERATURE and NUM_PREDICT as MODE_<OPTION>_<MODE>_<ROUTE>, then
+    # MODE_<OPTION>_<MODE>; empty keeps the route's option. fast and accurate answer
+    # with their model directly, without the cascade; accurate also skips the fast path
+    MODE_DEFAULT: str = os.getenv("MODE_DEFAULT", "balanced")
+    MODE_MODEL_FAST_CLASSIFY: str = os.getenv("MODE_MODEL_FAST_CLASSIFY", "ministral-3:3b")
+    MODE_MODEL_FAST_SENTIMENT: str = os.getenv("MODE_MODEL_FAST_SENTIMENT", "ministral-3:3b")
+    MODE_MODEL_FAST_SUMMARIZE: str = os.getenv("MODE_MODEL_FAST_SUMMARIZE", "ministral-3:3b")
+    MODE_MODEL_FAST_INTENT: str = os.getenv("MODE_MODEL_FAST_INTENT", "ministral-3:3b")
+    MODE_MODEL_ACCURATE_CLASSIFY: str = os.getenv("MODE_MODEL_ACCURATE_CLASSIFY", "gemma3:12b")
+    MODE_MODEL_ACCURATE_SENTIMENT: str = os.getenv("MODE_MODEL_ACCURATE_SENTIMENT", "gemma3:12b")
+    MODE_MODEL_ACCURATE_SUMMARIZE: str = os.getenv("MODE_MODEL_ACCURATE_SUMMARIZE", "")
+    MODE_MODEL_ACCURATE_INTENT: str = os.getenv("MODE_MODEL_ACCURATE_INTENT", "")
+
+    MODE_NUM_PREDICT_FAST_CLASSIFY: Optional[int] = _mode_int("NUM_PREDICT", "FAST", "CLASSIFY")
+    MODE_NUM_PREDICT_FAST_SENTIMENT: Optional[int] = _mode_int("NUM_PREDICT", "FAST", "SENTIMENT")
+    MODE_NUM_PREDICT_FAST_SUMMARIZE: Optional[int] = _mode_int("NUM_PREDICT", "FAST", "SUMMARIZE", "256")
+    MODE_NUM_PREDICT_FAST_INTENT: Optional[int] = _mode_int("NUM_PREDICT", "FAST", "INTENT")
+    MODE_NUM_PREDICT_ACCURATE_CLASSIFY: Optional[int] = _mode_int("NUM_PREDICT", "ACCURATE", "CLASSIFY")
+    MODE_NUM_PREDICT_ACCURATE_SENTIMENT: Optional[int] = _mode_int("NUM_PREDICT", "ACCURATE", "SENTIMENT")
+    MODE_NUM_PREDICT_ACCURATE_SUMMARIZE: Optional[int] = _mode_int("NUM_PREDICT", "ACCURATE", "SUMMARIZE")
+    MODE_NUM_PREDICT_ACCURATE_INTENT: Optional[int] = _mode_int("NUM_PREDICT", "ACCURATE", "INTENT")
+
+    MODE_TEMPERATURE_FAST_CLASSIFY: Optional[float] = _mode_float("TEMPERATURE", "FAST", "CLASSIFY")
+    MODE_TEMPERATURE_FAST_SENTIMENT: Optional[float] = _mode_float("TEMPERATURE", "FAST", "SENTIMENT")
+    MODE_TEMPERATURE_FAST_SUMMARIZE: Optional[float] = _mode_float("TEMPERATURE", "FAST", "SUMMARIZE")
+    MODE_TEMPERATURE_FAST_INTENT: Optional[float] = _mode_float("TEMPERATURE", "FAST", "INTENT")
+    MODE_TEMPERATURE_ACCURATE_CLASSIFY: Optional[float] = _mode_float("TEMPERATURE", "ACCURATE", "CLASSIFY", "0.2")
+    MODE_TEMPERATURE_ACCURATE_SENTIMENT: Optional[float] = _mode_float("TEMPERATURE", "ACCURATE", "SENTIMENT", "0.2")
+    MODE_TEMPERATURE_ACCURATE_SUMMARIZE: Optional[float] = _mode_float("TEMPERATURE", "ACCURATE", "SUMMARIZE")
+    MODE_TEMPERATURE_ACCURATE_INTENT: Optional[float] = _mode_float("TEMPERATURE", "ACCURATE", "INTENT", "0.2")
+
+    # Model cascade: each route first asks CASCADE_MODEL and keeps the answer when its
+    # confidence reaches CASCADE_MIN_CONFIDENCE_<ROUTE>; otherwise, or when the answer
+    # does not parse, it asks the route's configured model. Empty disables the cascade
+    # for that route (summaries carry no confidence, so only a parse failure escalates)
+    CASCADE_ENABLED: bool = os.getenv("CASCADE_ENABLED", "false").lower() == "true"
+    CASCADE_MODEL: str = os.getenv("CASCADE_MODEL", "ministral-3:3b")
+    CASCADE_MIN_CONFIDENCE_CLASSIFY: Optional[float] = _optional_float("CASCADE_MIN_CONFIDENCE_CLASSIFY", "0.8")
+    CASCADE_MIN_CONFIDENCE_SENTIMENT: Optional[float] = _optional_float("CASCADE_MIN_CONFIDENCE_SENTIMENT", "0.8")
+    CASCADE_MIN_CONFIDENCE_SUMMARIZE: Optional[float] = _optional_float("CASCADE_MIN_CONFIDENCE_SUMMARIZE")
+    CASCADE_MIN_CONFIDENCE_INTENT: Optional[float] = _optional_float("CASCADE_MIN_CONFIDENCE_INTENT", "0.8")
+    # Speculative cascade for callers that send X-Speculative: true: the small and the
+    # large model start together and the large call is cancelled if the small answer is
+    # kept. Cancelled large calls are limited to BUDGET_RATIO of cascaded requests
+    # (BURST saved up at most) and MAX_IN_FLIGHT at a time; over budget runs sequentially
+    CASCADE_SPECULATIVE_ENABLED: bool = os.getenv("CASCADE_SPECULATIVE_ENABLED", "false").lower() == "true"
+    CASCADE_SPECULATIVE_BUDGET_RATIO: float = float(os.getenv("CASCADE_SPECULATIVE_BUDGET_RATIO", "0.2"))
+    CASCADE_SPECULATIVE_BURST: float = float(os.getenv("CASCADE_SPECULATIVE_BURST", "10"))
+    CASCADE_SPECULATIVE_MAX_IN_FLIGHT: int = int(os.getenv("CASCADE_SPECULATIVE_MAX_IN_FLIGHT", "8"))
+
+    # In-process fast path for classify, sentiment and intent: off, shadow (always ask
+    # the model, compare with the local answer) or on (serve local answers at or above
+    # the confidence threshold). ENGINE is a built-in name ("lexicon", "rules",
+    # "centroid") or "package.module:ClassName"
+    FAST_PATH_CLASSIFY: str = os.getenv("FAST_PATH_CLASSIFY", "off")
+    FAST_PATH_SENTIMENT: str = os.getenv("FAST_PATH_SENTIMENT", "off")
+    FAST_PATH_INTENT: str = os.getenv("FAST_PATH_INTENT", "off")
+    FAST_PATH_ENGINE_CLASSIFY: str = os.getenv("FAST_PATH_ENGINE_CLASSIFY", "centroid")
+    FAST_PATH_ENGINE_SENTIMENT: str = os.getenv("FAST_PATH_ENGINE_SENTIMENT", "lexicon")
+    FAST_PATH_ENGINE_INTENT: str = os.getenv("FAST_PATH_ENGINE_INTENT", "rules")
+    FAST_PATH_MIN_CONFIDENCE_CLASSIFY: float = float(os.getenv("FAST_PATH_MIN_CONFIDENCE_CLASSIFY", "0.8"))
+    FAST_PATH_MIN_CONFIDENCE_SENTIMENT: float = float(os.getenv("FAST_PATH_MIN_CONFIDENCE_SENTIMENT", "0.8"))
+    FAST_PATH_MIN_CONFIDENCE_INTENT: float = float(os.getenv("FAST_PATH_MIN_CONFIDENCE_INTENT", "0.85"))
+    # The centroid engine embeds the text and scores it against label centroids built
+    # from seeds/<route>.jsonl into INDEX_DIR/<route> (python -m app.fastpath.centroids).
+    # Concurrent texts are sent to /api/embed together, up to BATCH_SIZE per call after
+    # waiting at most BATCH_WAIT_MS. Lower TEMPERATURE makes confidence grow faster
+    # with the margin between the best and the runner-up label
+    FAST_PATH_EMBED_MODEL: str = os.getenv("FAST_PATH_EMBED_MODEL", "nomic-embed-text")
+    FAST_PATH_EMBED_BATCH_SIZE: int = int(os.getenv("FAST_PATH_EMBED_BATCH_SIZE", "32"))
+    FAST_PATH_EMBED_BATCH_WAIT_MS: float = float(os.getenv("FAST_PATH_EMBED_BATCH_WAIT_MS", "5"))
+    FAST_PATH_EMBED_TIMEOUT_SECONDS: float = float(os.getenv("FAST_PATH_EMBED_TIMEOUT_SECONDS", "5"))
+    FAST_PATH_INDEX_DIR: str = os.getenv("FAST_PATH_INDEX_DIR", "indexes")
+    FAST_PATH_CENTROID_TEMPERATURE: float = float(os.getenv("FAST_PATH_CENTROID_TEMPERATURE", "0.05"))
+    # Longer texts always go to the model
+    FAST_PATH_MAX_CHARS: int = int(os.getenv("FAST_PATH_MAX_CHARS", "280"))
+
+    # Near-duplicate result cache: a text whose normalized SimHash is within the route's
+    # MIN_SIMILARITY (estimated cosine between word and word-pair sets; values below 0.93
+    # may miss matches) of a cached text reuses that answer. Empty disables a route.
+    # MAX_ENTRIES is per route; texts under MIN_WORDS words only match identical texts
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "false").lower() == "true"
+    RESULT_CACHE_MIN_SIMILARITY_CLASSIFY: Optional[float] = _optional_float(
+        "RESULT_CACHE_MIN_SIMILARITY_CLASSIFY", "0.94"
+    )
+    RESULT_CACHE_MIN_SIMILARITY_SENTIMENT: Optional[float] = _optional_float(
+        "RESULT_CACHE_MIN_SIMILARITY_SENTIMENT", "0.96"
+    )
+    RESULT_CACHE_MIN_SIMILARITY_SUMMARIZE: Optional[float] = _optional_float("RESULT_CACHE_MIN_SIMILARITY_SUMMARIZE")
+    RESULT_CACHE_MIN_SIMILARITY_INTENT: Optional[float] = _optional_float("RESULT_CACHE_MIN_SIMILARITY_INTENT", "0.96")
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+    RESULT_CACHE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+    RESULT_CACHE_MIN_WORDS: int = int(os.getenv("RESULT_CACHE_MIN_WORDS", "8"))
+
+    # Incremental summarize: texts longer than CHUNK_MAX_CHARS are split at
+    # content-defined paragraph boundaries into chunks of about MIN..MAX chars. Each
+    # chunk's summary is cached by content hash and the section summaries are merged,
+    # so an edited document only re-summarizes the changed chunks. CACHE_MAX_ENTRIES
+    # bounds the cached section and merge summaries together
+    SUMMARIZE_INCREMENTAL_ENABLED: bool = os.getenv("SUMMARIZE_INCREMENTAL_ENABLED", "false").lower() == "true"
+    SUMMARIZE_CHUNK_MIN_CHARS: int = int(os.getenv("SUMMARIZE_CHUNK_MIN_CHARS", "2000"))
+    SUMMARIZE_CHUNK_MAX_CHARS: int = int(os.getenv("SUMMARIZE_CHUNK_MAX_CHARS", "6000"))
+    SUMMARIZE_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARIZE_CACHE_MAX_ENTRIES", "20000"))
+
+    # Extractive pre-compression: summarize inputs estimated above TOKEN_BUDGET tokens
+    # keep only their most central sentences (TextRank over TF-IDF) up to the budget,
+    # in original order. Texts that take the incremental path are not compressed.
+    # Sentences are ranked in blocks of at most MAX_SENTENCES, which bounds the cost
+    SUMMARIZE_EXTRACTIVE_ENABLED: bool = os.getenv("SUMMARIZE_EXTRACTIVE_ENABLED", "false").lower() == "true"
+    SUMMARIZE_EXTRACTIVE_TOKEN_BUDGET: int = int(os.getenv("SUMMARIZE_EXTRACTIVE_TOKEN_BUDGET", "2000"))
+    SUMMARIZE_EXTRACTIVE_MAX_SENTENCES: int = int(os.getenv("SUMMARIZE_EXTRACTIVE_MAX_SENTENCES", "500"))
+
+    # Long-document mode for classify, sentiment and intent: texts longer than
+    # CHUNK_CHARS are split at paragraph boundaries into chunks of about half to one
+    # CHUNK_CHARS (more when they would exceed MAX_CHUNKS), scored in parallel on a
+    # pool of WORKERS threads shared by all requests, and aggregated into one answer
+    CHUNKED_MODE_ENABLED: bool = os.getenv("CHUNKED_MODE_ENABLED", "false").lower() == "true"
+    CHUNKED_CHUNK_CHARS: int = int(os.getenv("CHUNKED_CHUNK_CHARS", "4000"))
+    CHUNKED_MAX_CHUNKS: int = int(os.getenv("CHUNKED_MAX_CHUNKS", "64"))
+    CHUNKED_WORKERS: int = int(os.getenv("CHUNKED_WORKERS", "16"))
+
+    # Durable bulk jobs (POST /api/ai/jobs): texts are queued in a SQLite database (WAL)
+    # at DB_PATH and answered by WORKERS background threads at PRIORITY, apart from the
+    # interactive bulkheads and admission queues, so WORKERS caps job throughput. A
+    # claimed item is leased for LEASE_SECONDS and renewed while it runs; items of a
+    # stopped or crashed process are requeued once their lease runs out, so several
+    # processes may share DB_PATH. A failing item, or one whose lease keeps running
+    # out, is retried up to MAX_ATTEMPTS times.
+    # Webhooks get WEBHOOK_ATTEMPTS tries with exponential backoff. Webhook URLs must be
+    # http(s) to a public address; WEBHOOK_ALLOWED_HOSTS (comma-separated) lifts that
+    # for trusted internal hosts. Uploaded files larger than MAX_UPLOAD_BYTES get a 413
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "false").lower() == "true"
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", "data/jobs.db")
+    JOBS_WORKERS: int = int(os.getenv("JOBS_WORKERS", "4"))
+    JOBS_PRIORITY: str = os.getenv("JOBS_PRIORITY", "batch")
+    JOBS_MAX_TEXTS: int = int(os.getenv("JOBS_MAX_TEXTS", "10000"))
+    JOBS_MAX_UPLOAD_BYTES: int = int(os.getenv("JOBS_MAX_UPLOAD_BYTES", "16777216"))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+    JOBS_POLL_SECONDS: float = float(os.getenv("JOBS_POLL_SECONDS", "1"))
+    JOBS_LEASE_SECONDS: float = float(os.getenv("JOBS_LEASE_SECONDS", "30"))
+    JOBS_PAGE_SIZE: int = int(os.getenv("JOBS_PAGE_SIZE", "100"))
+    JOBS_WEBHOOK_TIMEOUT_SECONDS: float = float(os.getenv("JOBS_WEBHOOK_TIMEOUT_SECONDS", "10"))
+    JOBS_WEBHOOK_ATTEMPTS: int = int(os.getenv("JOBS_WEBHOOK_ATTEMPTS", "3"))
+    JOBS_WEBHOOK_ALLOWED_HOSTS: str = os.getenv("JOBS_WEBHOOK_ALLOWED_HOSTS", "")
+
+    # Input normalization, run once per request before the fast path, the result cache
+    # and prompt construction. Comma-separated stages per route, applied in this order:
+    # html (tags, scripts, entities), quoted (email reply history), signature,
+    # urls (scheme, query and fragment dropped), whitespace. Empty turns normalization off.
+    # The defaults only drop markup and redundant whitespace; quoted, signature and urls
+    # change what the text says and are opt-in per route
+    NORMALIZE_STAGES_CLASSIFY: str = os.getenv("NORMALIZE_STAGES_CLASSIFY", "html,whitespace")
+    NORMALIZE_STAGES_SENTIMENT: str = os.getenv("NORMALIZE_STAGES_SENTIMENT", "html,whitespace")
+    NORMALIZE_STAGES_SUMMARIZE: str = os.getenv("NORMALIZE_STAGES_SUMMARIZE", "html,whitespace")
+    NORMALIZE_STAGES_INTENT: str = os.getenv("NORMALIZE_STAGES_INTENT", "html,whitespace")
+
+    # Per-route upstream connection pools. Each route also runs on its own worker
+    # threads, ADMISSION_MAX_CONCURRENCY_<ROUTE> of them, so a slow route cannot
+    # take connections or threads from the others
+    UPSTREAM_POOL_SIZE_CLASSIFY: int = int(os.getenv("UPSTREAM_POOL_SIZE_CLASSIFY", "16"))
+    UPSTREAM_POOL_SIZE_SENTIMENT: int = int(os.getenv("UPSTREAM_POOL_SIZE_SENTIMENT", "16"))
+    UPSTREAM_POOL_SIZE_SUMMARIZE: int = int(os.getenv("UPSTREAM_POOL_SIZE_SUMMARIZE", "8"))
+    UPSTREAM_POOL_SIZE_INTENT: int = int(os.getenv("UPSTREAM_POOL_SIZE_INTENT", "16"))
+
+    # Admission control: concurrent requests per route, bounded wait queue and maximum
+    # queue time; requests that cannot be admitted in time get 429 with Retry-After
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+    ADMISSION_MAX_QUEUE_SECONDS: float = float(os.getenv("ADMISSION_MAX_QUEUE_SECONDS", "10"))
+
+    ADMISSION_MAX_CONCURRENCY_CLASSIFY: int = int(
+        os.getenv("ADMISSION_MAX_CONCURRENCY_CLASSIFY", str(ADMISSION_MAX_CONCURRENCY))
+    )
+    ADMISSION_MAX_CONCURRENCY_SENTIMENT: int = int(
+        os.getenv("ADMISSION_MAX_CONCURRENCY_SENTIMENT", str(ADMISSION_MAX_CONCURRENCY))
+    )
+    ADMISSION_MAX_CONCURRENCY_SUMMARIZE: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY_SUMMARIZE", "8"))
+    ADMISSION_MAX_CONCURRENCY_INTENT: int = int(
+        os.getenv("ADMISSION_MAX_CONCURRENCY_INTENT", str(ADMISSION_MAX_CONCURRENCY))
+    )
+
+    ADMISSION_QUEUE_SIZE_CLASSIFY: int = int(
+        os.getenv("ADMISSION_QUEUE_SIZE_CLASSIFY", str(ADMISSION_QUEUE_SIZE))
+    )
+    ADMISSION_QUEUE_SIZE_SENTIMENT: int = int(
+        os.getenv("ADMISSION_QUEUE_SIZE_SENTIMENT", str(ADMISSION_QUEUE_SIZE))
+    )
+    ADMISSION_QUEUE_SIZE_SUMMARIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE_SUMMARIZE", "16"))
+    ADMISSION_QUEUE_SIZE_INTENT: int = int(
+        os.getenv("ADMISSION_QUEUE_SIZE_INTENT", str(ADMISSION_QUEUE_SIZE))
+    )
+
+    ADMISSION_MAX_QUEUE_SECONDS_CLASSIFY: float = float(
+        os.getenv("ADMISSION_MAX_QUEUE_SECONDS_CLASSIFY", str(ADMISSION_MAX_QUEUE_SECONDS))
+    )
+    ADMISSION_MAX_QUEUE_SECONDS_SENTIMENT: float = float(
+        os.getenv("ADMISSION_MAX_QUEUE_SECONDS_SENTIMENT", str(ADMISSION_MAX_QUEUE_SECONDS))
+    )
+    ADMISSION_MAX_QUEUE_SECONDS_SUMMARIZE: float = float(
+        os.getenv("ADMISSION_MAX_QUEUE_SECONDS_SUMMARIZE", "30")
+    )
+    ADMISSION_MAX_QUEUE_SECONDS_INTENT: float = float(
+        os.getenv("ADMISSION_MAX_QUEUE_SECONDS_INTENT", str(ADMISSION_MAX_QUEUE_SECONDS))
+    )
+
+    # Adaptive (AIMD) concurrency limit per upstream model, in front of every Ollama call
+    ADAPTIVE_LIMIT_ENABLED: bool = os.getenv("ADAPTIVE_LIMIT_ENABLED", "true").lower() == "true"
+    ADAPTIVE_INITIAL_LIMIT: int = int(os.getenv("ADAPTIVE_INITIAL_LIMIT", "8"))
+    ADAPTIVE_MIN_LIMIT: int = int(os.getenv("ADAPTIVE_MIN_LIMIT", "1"))
+    ADAPTIVE_MAX_LIMIT: int = int(os.getenv("ADAPTIVE_MAX_LIMIT", "64"))
+    ADAPTIVE_BACKOFF_RATIO: float = float(os.getenv("ADAPTIVE_BACKOFF_RATIO", "0.9"))
+    ADAPTIVE_LATENCY_TOLERANCE: float = float(os.getenv("ADAPTIVE_LATENCY_TOLERANCE", "2.0"))
+    ADAPTIVE_MAX_WAIT_SECONDS: float = float(os.getenv("ADAPTIVE_MAX_WAIT_SECONDS", "30"))
+
+    # Priority classes (interactive, bulk, batch) from the X-Priority header or the API key
+    PRIORITY_DEFAULT: str = os.getenv("PRIORITY_DEFAULT", "interactive")
+    # Comma-separated key=class pairs, e.g. "nightly-key=batch,crm-key=bulk"
+    PRIORITY_API_KEYS: str = os.getenv("PRIORITY_API_KEYS", "")
+    PRIORITY_WEIGHT_INTERACTIVE: int = int(os.getenv("PRIORITY_WEIGHT_INTERACTIVE", "8"))
+    PRIORITY_WEIGHT_BULK: int = int(os.getenv("PRIORITY_WEIGHT_BULK", "3"))
+    PRIORITY_WEIGHT_BATCH: int = int(os.getenv("PRIORITY_WEIGHT_BATCH", "1"))
+    # A queued request older than this is served next regardless of class
+    PRIORITY_STARVATION_SECONDS: float = float(os.getenv("PRIORITY_STARVATION_SECONDS", "5"))
+
 
 settings = Settings()
@@ -1,56 +1,153 @@
-from fastapi import APIRouter
+import asyncio
+import time
+from typing import Optional
 
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.concurrency.admission import admission_controller
+from app.concurrency.bulkhead import route_bulkheads
+from app.context import (
+    CLIENT_DISCONNECTED,
+    RequestContext,
+    current_context,
+    deadline_from_header,
+    resolve_mode,
+    resolve_priority,
+    set_context,
+)
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
 from app.dto.summary_response import SummaryResponse
 from app.dto.text_request import TextRequest
-from app.router.model_router import model_router
+from app.metrics import metrics
+from app.router.model_router import TaskType, model_router
 from app.service.ai_service import AIService
 
-router = APIRouter(prefix="/api/ai", tags=["AI Text Analysis"])
+
+async def request_context(
+    request: Request,
+    x_priority: Optional[str] = Header(None, description="interactive, bulk or batch"),
+    x_api_key: Optional[str] = Header(None),
+    x_request_timeout_ms: Optional[str] = Header(None, description="Remaining time budget of the caller"),
+    x_speculative: Optional[str] = Header(None, description="'true' runs the small and large cascade models in parallel"),
+    x_mode: Optional[str] = Header(None, description="fast, balanced or accurate"),
+):
+    """Classifies the request before admission; the context follows it into the worker thread.
+
+    While the request runs, a watcher cancels the context when the client disconnects
+    so the upstream call is aborted instead of generating an answer nobody reads.
+    """
+    context = RequestContext(
+        resolve_priority(x_priority, x_api_key),
+        deadline_from_header(x_request_timeout_ms),
+        speculative=(x_speculative or "").strip().lower() == "true",
+        mode=resolve_mode(x_mode),
+    )
+    set_context(context)
+    watcher = asyncio.create_task(_watch_disconnect(request, context))
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+async def _watch_disconnect(request: Request, context: RequestContext) -> None:
+    # The body has already been read, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+    context.cancel(CLIENT_DISCONNECTED)
+
+
+router = APIRouter(prefix="/api/ai", tags=["AI Text Analysis"], dependencies=[Depends(request_context)])
 
 ai_service = AIService()
 
 
+def use_mode(request: TextRequest) -> None:
+    """A mode in the body wins over the X-Mode header."""
+    if request.mode is not None:
+        current_context().mode = request.mode
+
+
+def respond(result: BaseModel, fields: Optional[list[str]]):
+    """Projected answers leave the fields nobody asked for out rather than returning them as null."""
+    if fields is None:
+        return result
+    return JSONResponse(result.model_dump(exclude_none=True))
+
+
+def admit(task_type: TaskType):
+    """Dependency that holds a route admission slot for the duration of the request."""
+
+    async def dependency():
+        if not admission_controller.enabled:
+            yield
+            return
+        limiter = admission_controller.get(task_type)
+        context = current_context()
+        await limiter.acquire(context.priority, context.remaining())
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    return dependency
+
+
 @router.post(
     "/classify",
+    dependencies=[Depends(admit(TaskType.CLASSIFY))],
     response_model=ClassificationResponse,
     summary="Classify Text",
     description="Analyzes text and returns classification labels, tags, and primary category",
 )
-def classify_text(request: TextRequest) -> ClassificationResponse:
-    return ai_service.classify_text(request.text)
+async def classify_text(request: TextRequest) -> ClassificationResponse:
+    use_mode(request)
+    result = await route_bulkheads.run(TaskType.CLASSIFY, ai_service.classify_text, request.text, request.fields)
+    return respond(result, request.fields)
 
 
 @router.post(
     "/sentiment",
+    dependencies=[Depends(admit(TaskType.SENTIMENT))],
     response_model=SentimentResponse,
     summary="Analyze Sentiment",
     description="Analyzes text sentiment (positive, negative, neutral) and detects specific emotions",
 )
-def analyze_sentiment(request: TextRequest) -> SentimentResponse:
-    return ai_service.analyze_sentiment(request.text)
+async def analyze_sentiment(request: TextRequest) -> SentimentResponse:
+    use_mode(request)
+    result = await route_bulkheads.run(TaskType.SENTIMENT, ai_service.analyze_sentiment, request.text, request.fields)
+    return respond(result, request.fields)
 
 
 @router.post(
     "/summarize",
+    dependencies=[Depends(admit(TaskType.SUMMARIZE))],
     response_model=SummaryResponse,
     summary="Summarize Text",
     description="Generates a concise summary with key points from the provided text",
 )
-def summarize_text(request: TextRequest) -> SummaryResponse:
-    return ai_service.summarize_text(request.text)
+async def summarize_text(request: TextRequest) -> SummaryResponse:
+    use_mode(request)
+    result = await route_bulkheads.run(TaskType.SUMMARIZE, ai_service.summarize_text, request.text, request.fields)
+    return respond(result, request.fields)
 
 
 @router.post(
     "/intent",
+    dependencies=[Depends(admit(TaskType.INTENT))],
     response_model=IntentResponse,
     summary="Detect Intent",
     description="Identifies the intent and purpose behind the text (question, request, statement, command)",
 )
-def detect_intent(request: TextRequest) -> IntentResponse:
-    return ai_service.detect_intent(request.text)
+async def detect_intent(request: TextRequest) -> IntentResponse:
+    use_mode(request)
+    result = await route_bulkheads.run(TaskType.INTENT, ai_service.detect_intent, request.text, request.fields)
+    return respond(result, request.fields)
 
 
 @router.get(
@@ -60,3 +157,12 @@ def detect_intent(request: TextRequest) -> IntentResponse:
 )
 def get_routes() -> dict[str, str]:
     return model_router.get_routes()
+
+
+@router.get(
+    "/metrics",
+    summary="Get Runtime Metrics",
+    description="Returns admission, adaptive limit, bulkhead, backend node and cancellation state",
+)
+def get_metrics() -> dict:
+    return metrics.snapshot()
@@ -0,0 +1,149 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.dto.job_request import JobRequest
+from app.dto.job_response import JobResponse
+from app.jobs.runner import UnsafeWebhook, check_webhook_url, job_runner, job_summary
+from app.jobs.store import JobStore
+from app.router.model_router import Mode, TaskType
+from app.service.prompts import prompts
+
+router = APIRouter(prefix="/api/ai/jobs", tags=["Bulk Jobs"])
+
+
+def _store() -> JobStore:
+    if job_runner.store is None:
+        raise HTTPException(status_code=503, detail="Bulk jobs are disabled")
+    return job_runner.store
+
+
+def _queue(
+    task: TaskType,
+    texts: list[str],
+    fields: Optional[list[str]],
+    mode: Optional[Mode],
+    webhook_url: Optional[str],
+) -> JobResponse:
+    store = _store()
+    if not texts:
+        raise HTTPException(status_code=422, detail="A job needs at least one text")
+    if len(texts) > settings.JOBS_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"A job takes at most {settings.JOBS_MAX_TEXTS} texts")
+    if fields is not None:
+        # Rejects unknown fields now rather than failing every item later
+        prompts[task].project(fields)
+    if webhook_url is not None:
+        try:
+            check_webhook_url(webhook_url)
+        except UnsafeWebhook as e:
+            raise HTTPException(status_code=422, detail=str(e)) from None
+    job_id = store.create(task.value, texts, fields, mode.value if mode else None, webhook_url)
+    job_runner.notify()
+    return JobResponse(**job_summary(store.get(job_id)))
+
+
+def parse_upload(body: str, content_type: str) -> list[str]:
+    """Texts from an uploaded file: JSON lines (strings or objects with "text") or one text per line."""
+    lines = [line for line in body.splitlines() if line.strip()]
+    if "json" not in content_type:
+        return [line.strip() for line in lines]
+    texts = []
+    for number, line in enumerate(lines, start=1):
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=422, detail=f"Line {number} is not valid JSON") from None
+        text = value.get("text") if isinstance(value, dict) else value
+        if not isinstance(text, str):
+            raise HTTPException(status_code=422, detail=f'Line {number} is neither a string nor has a "text" string')
+        texts.append(text)
+    return texts
+
+
+@router.post(
+    "",
+    status_code=202,
+    response_model=JobResponse,
+    summary="Queue Bulk Job",
+    description="Queues many texts for one task and returns the job id at once; poll the job or use a webhook",
+)
+def create_job(request: JobRequest) -> JobResponse:
+    return _queue(request.task, request.texts, request.fields, request.mode, request.webhookUrl)
+
+
+@router.post(
+    "/upload",
+    status_code=202,
+    response_model=JobResponse,
+    summary="Queue Bulk Job From File",
+    description=(
+        "Queues the texts of an uploaded file sent as the request body: JSON lines "
+        "(application/x-ndjson, each a string or an object with \"text\") or plain text, one text per line"
+    ),
+)
+async def upload_job(
+    request: Request,
+    task: TaskType = Query(..., description="classify, sentiment, summarize or intent"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields; all when omitted"),
+    mode: Optional[Mode] = Query(None, description="fast, balanced or accurate"),
+    webhook_url: Optional[str] = Query(None, alias="webhookUrl", description="Receives the job's status when done"),
+) -> JobResponse:
+    _store()
+    body = await _read_upload(request)
+    field_list = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    # Parsing, the webhook's DNS lookup and the SQLite writes all block, so they stay off the event loop
+    return await run_in_threadpool(
+        _queue_upload, body, request.headers.get("content-type", ""), task, field_list, mode, webhook_url
+    )
+
+
+async def _read_upload(request: Request) -> bytes:
+    """The request body, refused with 413 once it passes JOBS_MAX_UPLOAD_BYTES."""
+    limit = settings.JOBS_MAX_UPLOAD_BYTES
+    too_large = HTTPException(status_code=413, detail=f"An upload takes at most {limit} bytes")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+def _queue_upload(
+    body: bytes,
+    content_type: str,
+    task: TaskType,
+    fields: Optional[list[str]],
+    mode: Optional[Mode],
+    webhook_url: Optional[str],
+) -> JobResponse:
+    texts = parse_upload(body.decode("utf-8", errors="replace"), content_type)
+    return _queue(task, texts, fields, mode, webhook_url)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Get Bulk Job",
+    description="Returns a job's progress and a page of its results in input order",
+)
+def get_job(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first result to return"),
+    limit: int = Query(settings.JOBS_PAGE_SIZE, ge=0, description="Results to return, at most JOBS_PAGE_SIZE"),
+) -> JobResponse:
+    store = _store()
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    limit = min(limit, settings.JOBS_PAGE_SIZE)
+    results = store.results(job_id, offset, limit) if limit else []
+    next_offset = offset + limit if limit and offset + limit < job["total"] else None
+    return JobResponse(**job_summary(job), results=results, nextOffset=next_offset)
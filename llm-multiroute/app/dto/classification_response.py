@@ -1,21 +1,31 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class ClassificationResponse(BaseModel):
-    """Text classification result with labels and confidence."""
+    """Text classification result with labels and confidence.
+
+    Fields left out of a request's `fields` projection are None and omitted from the response.
+    """
 
-    labels: list[str] = Field(
-        ...,
+    labels: Optional[list[str]] = Field(
+        None,
         description="List of classification labels/tags",
         json_schema_extra={"example": ["technology", "news", "AI"]},
     )
-    primaryCategory: str = Field(
-        ...,
+    primaryCategory: Optional[str] = Field(
+        None,
         description="Primary category of the text",
         json_schema_extra={"example": "technology"},
     )
-    confidence: float = Field(
-        ...,
+    confidence: Optional[float] = Field(
+        None,
         description="Confidence score (0.0 to 1.0)",
         json_schema_extra={"example": 0.95},
     )
+    modelTier: Optional[str] = Field(
+        None,
+        description="Tier that answered when the cascade or fast path is enabled: 'local', 'small' or 'large'",
+        json_schema_extra={"example": "small"},
+    )
@@ -1,26 +1,36 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class IntentResponse(BaseModel):
-    """Intent detection result with primary and secondary intents."""
+    """Intent detection result with primary and secondary intents.
+
+    Fields left out of a request's `fields` projection are None and omitted from the response.
+    """
 
-    primaryIntent: str = Field(
-        ...,
+    primaryIntent: Optional[str] = Field(
+        None,
         description="Primary intent detected",
         json_schema_extra={"example": "find_restaurant"},
     )
-    secondaryIntents: list[str] = Field(
-        ...,
+    secondaryIntents: Optional[list[str]] = Field(
+        None,
         description="Secondary intents detected",
         json_schema_extra={"example": ["location_search", "recommendation_request"]},
     )
-    intentCategory: str = Field(
-        ...,
+    intentCategory: Optional[str] = Field(
+        None,
         description="Category of the intent",
         json_schema_extra={"example": "question"},
     )
-    confidence: float = Field(
-        ...,
+    confidence: Optional[float] = Field(
+        None,
         description="Confidence score (0.0 to 1.0)",
         json_schema_extra={"example": 0.88},
     )
+    modelTier: Optional[str] = Field(
+        None,
+        description="Tier that answered when the cascade or fast path is enabled: 'local', 'small' or 'large'",
+        json_schema_extra={"example": "small"},
+    )
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.router.model_router import Mode, TaskType
+
+
+class JobRequest(BaseModel):
+    """Request body queuing many texts for one task."""
+
+    task: TaskType = Field(
+        ...,
+        description="Task to run on every text: classify, sentiment, summarize or intent",
+        json_schema_extra={"example": "sentiment"},
+    )
+    texts: list[str] = Field(
+        ...,
+        min_length=1,
+        description="Texts to analyze; results keep this order",
+        json_schema_extra={"example": ["Great service, thank you!", "The package never arrived."]},
+    )
+    fields: Optional[list[str]] = Field(
+        None,
+        description="Response fields to generate for each text; all fields when omitted",
+        json_schema_extra={"example": ["overallSentiment", "sentimentScore"]},
+    )
+    mode: Optional[Mode] = Field(
+        None,
+        description="Latency/quality hint picking the routing tier: fast, balanced or accurate",
+        json_schema_extra={"example": "fast"},
+    )
+    webhookUrl: Optional[str] = Field(
+        None,
+        description="http(s) URL on a public host that receives a POST with the job's status when it finishes",
+        json_schema_extra={"example": "https://example.com/hooks/ai-jobs"},
+    )
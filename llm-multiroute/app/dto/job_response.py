@@ -0,0 +1,82 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobItemResult(BaseModel):
+    """Outcome of one text of a job."""
+
+    index: int = Field(
+        ...,
+        description="Position of the text in the job",
+        json_schema_extra={"example": 0},
+    )
+    status: str = Field(
+        ...,
+        description="pending, running, done or failed",
+        json_schema_extra={"example": "done"},
+    )
+    result: Optional[dict[str, Any]] = Field(
+        None,
+        description="The task's response for this text, once done",
+        json_schema_extra={"example": {"overallSentiment": "positive", "sentimentScore": 0.9}},
+    )
+    error: Optional[str] = Field(
+        None,
+        description="Last error for this text, when an attempt failed",
+        json_schema_extra={"example": None},
+    )
+
+
+class JobResponse(BaseModel):
+    """Progress of a bulk job, with a page of its results when requested."""
+
+    id: str = Field(
+        ...,
+        description="Job id",
+        json_schema_extra={"example": "3f7c0d9a5b2e4d0f8a1c6e9b2d4f7a10"},
+    )
+    task: str = Field(
+        ...,
+        description="Task run on every text",
+        json_schema_extra={"example": "sentiment"},
+    )
+    status: str = Field(
+        ...,
+        description="queued, running or completed",
+        json_schema_extra={"example": "running"},
+    )
+    total: int = Field(
+        ...,
+        description="Number of texts in the job",
+        json_schema_extra={"example": 2},
+    )
+    completed: int = Field(
+        ...,
+        description="Texts answered so far",
+        json_schema_extra={"example": 1},
+    )
+    failed: int = Field(
+        ...,
+        description="Texts that failed after every attempt",
+        json_schema_extra={"example": 0},
+    )
+    createdAt: float = Field(
+        ...,
+        description="Unix time the job was queued",
+        json_schema_extra={"example": 1792400000.0},
+    )
+    finishedAt: Optional[float] = Field(
+        None,
+        description="Unix time the last text finished",
+        json_schema_extra={"example": None},
+    )
+    results: Optional[list[JobItemResult]] = Field(
+        None,
+        description="Requested page of per-text results, in input order",
+    )
+    nextOffset: Optional[int] = Field(
+        None,
+        description="Offset of the next page of results, when there is one",
+        json_schema_extra={"example": None},
+    )
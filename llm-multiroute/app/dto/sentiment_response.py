@@ -1,26 +1,36 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class SentimentResponse(BaseModel):
-    """Sentiment analysis result with emotions and confidence."""
+    """Sentiment analysis result with emotions and confidence.
+
+    Fields left out of a request's `fields` projection are None and omitted from the response.
+    """
 
-    overallSentiment: str = Field(
-        ...,
+    overallSentiment: Optional[str] = Field(
+        None,
         description="Overall sentiment classification",
         json_schema_extra={"example": "positive"},
     )
-    sentimentScore: float = Field(
-        ...,
+    sentimentScore: Optional[float] = Field(
+        None,
         description="Sentiment score from -1 (negative) to 1 (positive)",
         json_schema_extra={"example": 0.85},
     )
-    emotions: list[str] = Field(
-        ...,
+    emotions: Optional[list[str]] = Field(
+        None,
         description="Detected emotions in the text",
         json_schema_extra={"example": ["joy", "excitement"]},
     )
-    confidence: float = Field(
-        ...,
+    confidence: Optional[float] = Field(
+        None,
         description="Confidence score (0.0 to 1.0)",
         json_schema_extra={"example": 0.92},
     )
+    modelTier: Optional[str] = Field(
+        None,
+        description="Tier that answered when the cascade or fast path is enabled: 'local', 'small' or 'large'",
+        json_schema_extra={"example": "small"},
+    )
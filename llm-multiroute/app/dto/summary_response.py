@@ -1,21 +1,41 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class SummaryResponse(BaseModel):
-    """Text summarization result with key points."""
+    """Text summarization result with key points.
+
+    Fields left out of a request's `fields` projection are None and omitted from the response.
+    """
 
-    summary: str = Field(
-        ...,
+    summary: Optional[str] = Field(
+        None,
         description="Concise summary of the text",
         json_schema_extra={"example": "This article discusses the impact of AI on healthcare..."},
     )
-    keyPoints: list[str] = Field(
-        ...,
+    keyPoints: Optional[list[str]] = Field(
+        None,
         description="Key points extracted from the text",
         json_schema_extra={"example": ["AI improves diagnosis", "Reduces costs", "Enhances patient care"]},
     )
-    wordCount: int = Field(
-        ...,
+    wordCount: Optional[int] = Field(
+        None,
         description="Word count of the summary",
         json_schema_extra={"example": 50},
     )
+    modelTier: Optional[str] = Field(
+        None,
+        description="Tier that answered when the cascade or fast path is enabled: 'local', 'small' or 'large'",
+        json_schema_extra={"example": "small"},
+    )
+    compressionRatio: Optional[float] = Field(
+        None,
+        description="Share of the estimated input tokens kept by extractive pre-compression, when it ran",
+        json_schema_extra={"example": 0.35},
+    )
+    promptEvalMsSaved: Optional[float] = Field(
+        None,
+        description="Estimated prompt evaluation time saved by pre-compression, from the model's measured rate",
+        json_schema_extra={"example": 840.0},
+    )
@@ -1,5 +1,9 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
+from app.router.model_router import Mode
+
 
 class TextRequest(BaseModel):
     """Request body containing text to analyze."""
@@ -9,3 +13,13 @@ class TextRequest(BaseModel):
         description="Text to be analyzed",
         json_schema_extra={"example": "I love this product! The quality is outstanding."},
     )
+    fields: Optional[list[str]] = Field(
+        None,
+        description="Response fields to generate; the model is only asked for these. All fields when omitted",
+        json_schema_extra={"example": ["overallSentiment", "sentimentScore"]},
+    )
+    mode: Optional[Mode] = Field(
+        None,
+        description="Latency/quality hint picking the routing tier: fast, balanced or accurate. Overrides X-Mode",
+        json_schema_extra={"example": "fast"},
+    )
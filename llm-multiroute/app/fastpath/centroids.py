@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+from typing import Optional, Protocol, Union
+
+import numpy as np
+
+from app.config import settings
+from app.dto.classification_response import ClassificationResponse
+from app.dto.intent_response import IntentResponse
+from app.fastpath.embeddings import EmbeddingClient
+from app.metrics import metrics
+from app.router.model_router import TaskType
+
+CENTROIDS_FILE = "centroids.npy"
+LABELS_FILE = "labels.json"
+
+# Runner-up labels at or above this probability are reported as secondary
+SECONDARY_MIN_PROBABILITY = 0.1
+
+
+class Embedder(Protocol):
+    def embed(self, text: str) -> np.ndarray: ...
+
+    def embed_many(self, texts: list[str]) -> np.ndarray: ...
+
+
+class CentroidIndex:
+    """One L2-normalized mean embedding per label, stored as a float32 .npy matrix.
+
+    `load` memory-maps the matrix, so startup cost does not grow with the label set
+    and several workers share the same pages.
+    """
+
+    def __init__(self, labels: list[str], centroids: np.ndarray, model: str, categories: Optional[dict] = None):
+        if len(labels) != centroids.shape[0]:
+            raise ValueError(f"{len(labels)} labels for {centroids.shape[0]} centroids")
+        self.labels = labels
+        self.centroids = centroids
+        self.model = model
+        self.categories = categories or {}
+
+    @classmethod
+    def build(cls, seeds: list[dict], embedder: Embedder, model: str) -> "CentroidIndex":
+        """`seeds` are {"text", "label"} rows, optionally with the label's intent "category"."""
+        labels = sorted({seed["label"] for seed in seeds})
+        vectors = embedder.embed_many([seed["text"] for seed in seeds])
+        rows = np.array([labels.index(seed["label"]) for seed in seeds])
+        centroids = np.vstack([vectors[rows == i].mean(axis=0) for i in range(len(labels))]).astype(np.float32)
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+        categories = {seed["label"]: seed["category"] for seed in seeds if seed.get("category")}
+        return cls(labels, centroids, model, categories)
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, CENTROIDS_FILE), self.centroids)
+        with open(os.path.join(directory, LABELS_FILE), "w") as f:
+            json.dump({"model": self.model, "labels": self.labels, "categories": self.categories}, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str) -> "CentroidIndex":
+        with open(os.path.join(directory, LABELS_FILE)) as f:
+            meta = json.load(f)
+        centroids = np.load(os.path.join(directory, CENTROIDS_FILE), mmap_mode="r")
+        return cls(meta["labels"], centroids, meta["model"], meta.get("categories"))
+
+    def probabilities(self, vector: np.ndarray, temperature: float) -> np.ndarray:
+        """Softmax over cosine similarities; the top value grows with the margin to the runner-up."""
+        logits = (self.centroids @ vector) / temperature
+        weights = np.exp(logits - logits.max())
+        return weights / weights.sum()
+
+
+class CentroidClassifier:
+    """Nearest-centroid label for classify and intent.
+
+    Confidence is the winning label's softmax probability, so the fast path threshold
+    only lets through texts that are clearly closer to one label than to every other.
+    """
+
+    name = "centroid"
+
+    def __init__(self, task_type: TaskType, index: CentroidIndex, embedder: Embedder, temperature: float):
+        if task_type not in (TaskType.CLASSIFY, TaskType.INTENT):
+            raise ValueError(f"The centroid engine does not support the {task_type.value} route")
+        self.task_type = task_type
+        self.index = index
+        self.embedder = embedder
+        self.temperature = temperature
+
+    @classmethod
+    def for_route(cls, task_type: TaskType) -> "CentroidClassifier":
+        index = CentroidIndex.load(os.path.join(settings.FAST_PATH_INDEX_DIR, task_type.value))
+        if index.model != settings.FAST_PATH_EMBED_MODEL:
+            raise ValueError(
+                f"Index for {task_type.value} was built with '{index.model}', "
+                f"FAST_PATH_EMBED_MODEL is '{settings.FAST_PATH_EMBED_MODEL}'"
+            )
+        return cls(task_type, index, shared_embedding_client(), settings.FAST_PATH_CENTROID_TEMPERATURE)
+
+    def predict(self, text: str) -> Optional[Union[ClassificationResponse, IntentResponse]]:
+        if not text.strip():
+            return None
+        probabilities = self.index.probabilities(self.embedder.embed(text), self.temperature)
+        order = np.argsort(probabilities)[::-1]
+        label = self.index.labels[order[0]]
+        confidence = round(float(probabilities[order[0]]), 2)
+        secondary = [self.index.labels[i] for i in order[1:3] if probabilities[i] >= SECONDARY_MIN_PROBABILITY]
+        if self.task_type == TaskType.CLASSIFY:
+            return ClassificationResponse(labels=[label, *secondary], primaryCategory=label, confidence=confidence)
+        return IntentResponse(
+            primaryIntent=label,
+            secondaryIntents=secondary,
+            intentCategory=self.index.categories.get(label, "statement"),
+            confidence=confidence,
+        )
+
+
+_embedding_client: Optional[EmbeddingClient] = None
+
+
+def shared_embedding_client() -> EmbeddingClient:
+    """One batching client for every centroid route, so their texts share /api/embed calls."""
+    global _embedding_client
+    if _embedding_client is None:
+        _embedding_client = EmbeddingClient(
+            settings.FAST_PATH_EMBED_MODEL,
+            settings.FAST_PATH_EMBED_BATCH_SIZE,
+            settings.FAST_PATH_EMBED_BATCH_WAIT_MS / 1000,
+        )
+        metrics.register("embeddings", _embedding_client.snapshot)
+    return _embedding_client
+
+
+def read_seeds(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.fastpath.centroids")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="embed a labeled seed set and write the route's centroid index")
+    build.add_argument("--task", required=True, choices=[TaskType.CLASSIFY.value, TaskType.INTENT.value])
+    build.add_argument("--seeds", help="JSONL of {text, label[, category]}; default seeds/<task>.jsonl")
+    build.add_argument("--out", help=f"default {settings.FAST_PATH_INDEX_DIR}/<task>")
+    args = parser.parse_args(argv)
+
+    seeds = read_seeds(args.seeds or os.path.join("seeds", f"{args.task}.jsonl"))
+    out = args.out or os.path.join(settings.FAST_PATH_INDEX_DIR, args.task)
+    index = CentroidIndex.build(seeds, shared_embedding_client(), settings.FAST_PATH_EMBED_MODEL)
+    index.save(out)
+    print(f"{len(seeds)} seeds, {len(index.labels)} labels, dim {index.centroids.shape[1]} -> {out}")
+
+
+if __name__ == "__main__":
+    main()
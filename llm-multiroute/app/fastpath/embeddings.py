@@ -0,0 +1,104 @@
+import threading
+from typing import Optional
+
+import httpx
+import numpy as np
+
+from app.config import settings
+from app.router.backend_pool import BackendPool, backend_pool
+
+
+class _Pending:
+    def __init__(self, text: str):
+        self.text = text
+        self.vector: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class EmbeddingClient:
+    """Ollama /api/embed with L2-normalized float32 results.
+
+    `embed` coalesces concurrent single-text calls: the first caller waits up to
+    `max_wait_seconds` (or until `max_batch` texts are queued) and sends them all in
+    one request, so a burst of requests costs one round trip instead of one each.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_batch: int = 32,
+        max_wait_seconds: float = 0.005,
+        http_client: Optional[httpx.Client] = None,
+        backends: Optional[BackendPool] = None,
+    ):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self.http_client = http_client or httpx.Client(timeout=settings.FAST_PATH_EMBED_TIMEOUT_SECONDS)
+        self.backends = backends or backend_pool
+        self.api_key = settings.OLLAMA_API_KEY
+        self.requests = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+        self._queue: list[_Pending] = []
+        self._collecting = False
+        self._full = threading.Event()
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        """Embeds `texts` in batches of `max_batch`; one row per text."""
+        rows = [self._post(texts[i : i + self.max_batch]) for i in range(0, len(texts), self.max_batch)]
+        return np.vstack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+
+    def embed(self, text: str) -> np.ndarray:
+        pending = _Pending(text)
+        with self._lock:
+            self._queue.append(pending)
+            leader = not self._collecting
+            if leader:
+                self._collecting = True
+            elif len(self._queue) >= self.max_batch:
+                self._full.set()
+        if leader:
+            self._full.wait(self.max_wait_seconds)
+            with self._lock:
+                batch, self._queue = self._queue, []
+                self._collecting = False
+                self._full.clear()
+            try:
+                for p, vector in zip(batch, self.embed_many([p.text for p in batch])):
+                    p.vector = vector
+            except BaseException as e:
+                for p in batch:
+                    p.error = e
+            finally:
+                for p in batch:
+                    p.done.set()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.vector
+
+    def _post(self, texts: list[str]) -> np.ndarray:
+        with self.backends.lease(self.model) as backend:
+            headers = {}
+            if self.api_key and backend.authenticated:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            response = self.http_client.post(
+                f"{backend.url}/api/embed", headers=headers, json={"model": self.model, "input": texts}
+            )
+            response.raise_for_status()
+        with self._lock:
+            self.requests += 1
+            self.texts += len(texts)
+        vectors = np.asarray(response.json()["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "mean_batch": round(self.texts / self.requests, 2) if self.requests else 0.0,
+            }
@@ -0,0 +1,160 @@
+import importlib
+import logging
+import threading
+from typing import Callable, Optional, Protocol
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.context import RequestCancelled
+from app.fastpath.centroids import CentroidClassifier
+from app.fastpath.intent import RuleIntent
+from app.fastpath.sentiment import LexiconSentiment
+from app.metrics import metrics
+from app.router.model_router import TaskType
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "shadow", "on")
+
+# Built-in engine factories, called with the route they serve
+ENGINES: dict[str, Callable[[TaskType], "Preclassifier"]] = {
+    "lexicon": lambda task_type: LexiconSentiment(),
+    "rules": lambda task_type: RuleIntent(),
+    "centroid": CentroidClassifier.for_route,
+}
+
+# Field whose value must match for a local answer to count as agreeing with the model
+AGREEMENT_FIELDS = {
+    TaskType.CLASSIFY: "primaryCategory",
+    TaskType.SENTIMENT: "overallSentiment",
+    TaskType.INTENT: "intentCategory",
+}
+
+
+class Preclassifier(Protocol):
+    name: str
+
+    def predict(self, text: str) -> Optional[BaseModel]:
+        """The route's response with a `confidence`, or None when the text is out of reach."""
+
+
+def load_engine(spec: str, task_type: TaskType) -> Preclassifier:
+    """A built-in engine name, or "package.module:ClassName" for a custom one (built without arguments)."""
+    if spec in ENGINES:
+        return ENGINES[spec](task_type)
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+class FastPathStats:
+    """Hit rate, and agreement with the model per confidence band."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.confident = 0
+        self.served = 0
+        self.compared = 0
+        self.agreed = 0
+        self.errors = 0
+        self._bands: dict[str, list[int]] = {}
+
+    def record(self, confident: bool, served: bool, failed: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.confident += confident
+            self.served += served
+            self.errors += failed
+
+    def record_comparison(self, confidence: float, confident: bool, agreed: bool) -> None:
+        band = f"{min(int(confidence * 10), 9) / 10:.1f}"
+        with self._lock:
+            counts = self._bands.setdefault(band, [0, 0])
+            counts[0] += 1
+            counts[1] += agreed
+            if confident:
+                self.compared += 1
+                self.agreed += agreed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "confident": self.confident,
+                "served": self.served,
+                "errors": self.errors,
+                "hit_rate": round(self.confident / self.requests, 4) if self.requests else 0.0,
+                "compared": self.compared,
+                "agreement": round(self.agreed / self.compared, 4) if self.compared else None,
+                "agreement_by_confidence": {
+                    band: {"compared": n, "agreement": round(a / n, 4)} for band, (n, a) in sorted(self._bands.items())
+                },
+            }
+
+
+class FastPath:
+    """Answers a route in-process when the local engine is confident enough.
+
+    `on` serves confident local answers and asks the model otherwise. `shadow` always
+    asks the model and returns its answer. Whenever both answers exist they are
+    compared, so agreement per confidence band shows where the threshold is safe.
+    """
+
+    def __init__(self, task_type: TaskType, engine: Preclassifier, mode: str, min_confidence: float, max_chars: int):
+        if mode not in MODES:
+            raise ValueError(f"Unknown fast path mode '{mode}', expected one of {MODES}")
+        self.task_type = task_type
+        self.engine = engine
+        self.mode = mode
+        self.min_confidence = min_confidence
+        self.max_chars = max_chars
+        self.stats = FastPathStats()
+
+    def answer(self, text: str, ask_model: Callable[[], BaseModel]) -> BaseModel:
+        local, failed = None, False
+        if len(text) <= self.max_chars:
+            try:
+                local = self.engine.predict(text)
+            except RequestCancelled:
+                raise
+            except Exception:
+                # An engine outage (e.g. the embedding service) is a miss, never a failed request
+                logger.warning(
+                    "Fast path engine %s failed for %s", self.engine.name, self.task_type.value, exc_info=True
+                )
+                failed = True
+        confident = local is not None and local.confidence >= self.min_confidence
+        if confident and self.mode == "on":
+            self.stats.record(confident=True, served=True)
+            local.modelTier = "local"
+            return local
+        self.stats.record(confident=confident, served=False, failed=failed)
+        result = ask_model()
+        # In `on` mode only unconfident predictions reach here, which still fills the lower bands
+        if local is not None:
+            field = AGREEMENT_FIELDS[self.task_type]
+            agreed = str(getattr(local, field)).lower() == str(getattr(result, field)).lower()
+            self.stats.record_comparison(local.confidence, confident, agreed)
+        return result
+
+
+def build_fast_paths() -> dict[TaskType, FastPath]:
+    fast_paths = {}
+    for task_type in AGREEMENT_FIELDS:
+        name = task_type.name
+        mode = getattr(settings, f"FAST_PATH_{name}")
+        if mode == "off":
+            continue
+        fast_paths[task_type] = FastPath(
+            task_type,
+            load_engine(getattr(settings, f"FAST_PATH_ENGINE_{name}"), task_type),
+            mode,
+            getattr(settings, f"FAST_PATH_MIN_CONFIDENCE_{name}"),
+            settings.FAST_PATH_MAX_CHARS,
+        )
+    return fast_paths
+
+
+route_fast_paths = build_fast_paths()
+metrics.register("fast_path", lambda: {task.value: fp.stats.snapshot() for task, fp in route_fast_paths.items()})
@@ -0,0 +1,82 @@
+import re
+from typing import Optional
+
+from app.dto.intent_response import IntentResponse
+
+_WORD = re.compile(r"[a-z']+")
+_SENTENCE_BREAK = re.compile(r"[.!?]\s+\S")
+
+COMMAND_VERBS = {
+    "turn", "switch", "set", "play", "pause", "stop", "open", "close", "start", "call", "send", "book", "order",
+    "cancel", "show", "remind", "add", "delete", "remove", "schedule", "lock", "unlock", "find", "check",
+}
+REQUEST_OPENERS = ("can you", "could you", "would you", "will you", "please", "i need", "i want", "i'd like")
+QUESTION_INTENTS = {
+    "where": "find_location",
+    "when": "ask_time",
+    "why": "ask_reason",
+    "who": "ask_person",
+    "what": "ask_information",
+    "which": "ask_information",
+    "how": "ask_method",
+}
+YES_NO_OPENERS = {"is", "are", "do", "does", "did", "was", "were", "has", "have", "will", "should", "am"}
+GREETINGS = {"hi": "greeting", "hello": "greeting", "hey": "greeting", "thanks": "thanks", "thank": "thanks",
+             "bye": "farewell", "goodbye": "farewell"}
+FILLER = {"the", "a", "an", "my", "me", "please", "to", "for", "of", "in", "on", "all", "some", "this", "that", "it"}
+
+
+def _intent_name(words: list[str], limit: int = 3) -> str:
+    return "_".join([w.replace("'", "") for w in words if w not in FILLER][:limit]) or "unknown"
+
+
+class RuleIntent:
+    """Surface rules for short, unambiguous texts: imperatives, polite requests, questions, greetings.
+
+    Anything with more than one sentence or no matching rule returns None and goes to the model.
+    """
+
+    name = "rules"
+
+    def predict(self, text: str) -> Optional[IntentResponse]:
+        stripped = text.strip()
+        lowered = stripped.lower()
+        words = _WORD.findall(lowered)
+        if not words or _SENTENCE_BREAK.search(stripped):
+            return None
+        first = words[0]
+        if len(words) <= 3 and first in GREETINGS:
+            return IntentResponse(
+                primaryIntent=GREETINGS[first], secondaryIntents=[], intentCategory="statement", confidence=0.9
+            )
+        if lowered.startswith(REQUEST_OPENERS):
+            opener = next(o for o in REQUEST_OPENERS if lowered.startswith(o))
+            rest = words[len(opener.split()) :]
+            return IntentResponse(
+                primaryIntent=_intent_name(rest),
+                secondaryIntents=[],
+                intentCategory="request",
+                confidence=0.88 if rest and rest[0] in COMMAND_VERBS else 0.8,
+            )
+        if first in COMMAND_VERBS and not stripped.endswith("?"):
+            return IntentResponse(
+                primaryIntent=_intent_name(words),
+                secondaryIntents=[],
+                intentCategory="command",
+                confidence=0.9,
+            )
+        if first in QUESTION_INTENTS or first in YES_NO_OPENERS:
+            intent = QUESTION_INTENTS.get(first, "ask_confirmation")
+            if first == "how" and len(words) > 1 and words[1] in ("much", "many"):
+                intent = "ask_quantity"
+            return IntentResponse(
+                primaryIntent=intent,
+                secondaryIntents=[],
+                intentCategory="question",
+                confidence=0.9 if stripped.endswith("?") else 0.8,
+            )
+        if stripped.endswith("?"):
+            return IntentResponse(
+                primaryIntent="ask_information", secondaryIntents=[], intentCategory="question", confidence=0.75
+            )
+        return None
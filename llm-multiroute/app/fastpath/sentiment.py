@@ -0,0 +1,72 @@
+import re
+from typing import Optional
+
+from app.dto.sentiment_response import SentimentResponse
+
+_WORD = re.compile(r"[a-z']+")
+
+# word -> (polarity, weight); strong words decide a short text on their own
+POLAR_WORDS: dict[str, tuple[int, float]] = {
+    **{w: (1, 2.0) for w in ("love", "loved", "amazing", "excellent", "outstanding", "fantastic", "perfect",
+                             "wonderful", "awesome", "best", "brilliant", "superb", "delighted")},
+    **{w: (1, 1.0) for w in ("great", "good", "nice", "like", "liked", "enjoy", "enjoyed", "happy", "glad",
+                             "pleased", "satisfied", "recommend", "fast", "helpful", "thanks", "thank", "works")},
+    **{w: (-1, 2.0) for w in ("hate", "hated", "terrible", "awful", "horrible", "worst", "useless", "furious",
+                              "disgusting", "scam", "pathetic")},
+    **{w: (-1, 1.0) for w in ("bad", "poor", "broken", "broke", "disappointed", "disappointing", "angry", "sad",
+                              "annoying", "annoyed", "frustrated", "frustrating", "slow", "waste", "rude",
+                              "failed", "fails", "refund", "never", "problem", "wrong")},
+}
+EMOTIONS = {
+    "love": "love", "loved": "love", "delighted": "joy", "happy": "joy", "glad": "joy", "amazing": "excitement",
+    "awesome": "excitement", "fantastic": "excitement", "pleased": "satisfaction", "satisfied": "satisfaction",
+    "thanks": "gratitude", "thank": "gratitude", "angry": "anger", "furious": "anger", "hate": "anger",
+    "sad": "sadness", "disappointed": "disappointment", "disappointing": "disappointment",
+    "frustrated": "frustration", "frustrating": "frustration", "annoying": "frustration", "annoyed": "frustration",
+}
+NEGATORS = {"not", "no", "never", "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "can't", "won't"}
+CONTRAST = {"but", "however", "although", "though", "yet", "except"}
+
+
+class LexiconSentiment:
+    """Weighted polarity lexicon with negation flipping.
+
+    Only texts whose polar words all agree get a confident answer; mixed, contrasted
+    or lexicon-free texts come back with low or no confidence and go to the model.
+    """
+
+    name = "lexicon"
+
+    def predict(self, text: str) -> Optional[SentimentResponse]:
+        words = _WORD.findall(text.lower())
+        weight = {1: 0.0, -1: 0.0}
+        emotions: list[str] = []
+        negated = False
+        for i, word in enumerate(words):
+            if word not in POLAR_WORDS:
+                continue
+            polarity, w = POLAR_WORDS[word]
+            if any(prev in NEGATORS for prev in words[max(0, i - 3) : i]) and word not in NEGATORS:
+                polarity, negated = -polarity, True
+            weight[polarity] += w
+            if word in EMOTIONS and not negated and EMOTIONS[word] not in emotions:
+                emotions.append(EMOTIONS[word])
+        total = weight[1] + weight[-1]
+        if total == 0:
+            return None
+        polarity = 1 if weight[1] >= weight[-1] else -1
+        dominant = weight[polarity]
+        confidence = 0.6 + 0.1 * min(dominant, 3.5) if dominant == total else 0.5
+        if "!" in text:
+            confidence += 0.03
+        if negated:
+            confidence -= 0.1
+        if CONTRAST.intersection(words):
+            confidence -= 0.2
+        score = polarity * min(1.0, 0.4 + 0.15 * dominant) * (dominant / total)
+        return SentimentResponse(
+            overallSentiment="positive" if polarity > 0 else "negative",
+            sentimentScore=round(score, 2),
+            emotions=emotions,
+            confidence=round(max(0.0, min(confidence, 0.99)), 2),
+        )
@@ -0,0 +1,271 @@
+import ipaddress
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.context import SHUTDOWN, Priority, RequestCancelled, RequestContext, deadline_from_header, set_context
+from app.jobs.store import FAILED, JobItem, JobStore
+from app.metrics import metrics
+from app.router.model_router import Mode, TaskType
+
+DELIVERED = "delivered"
+
+
+class UnsafeWebhook(ValueError):
+    pass
+
+
+def check_webhook_url(url: str) -> None:
+    """Raises UnsafeWebhook unless `url` is http(s) and its host is public or allowlisted.
+
+    The server itself POSTs to the URL, so without this check a client could make it
+    call internal services or cloud metadata endpoints. Hosts in
+    JOBS_WEBHOOK_ALLOWED_HOSTS skip the address check.
+    """
+    try:
+        parsed = urlsplit(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    except ValueError:
+        raise UnsafeWebhook(f"Invalid webhook URL {url!r}") from None
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise UnsafeWebhook("Webhook URL must be an http or https URL with a host")
+    host = parsed.hostname.lower()
+    allowed = {name.strip().lower() for name in settings.JOBS_WEBHOOK_ALLOWED_HOSTS.split(",") if name.strip()}
+    if host in allowed:
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    except (socket.gaierror, UnicodeError):
+        raise UnsafeWebhook(f"Webhook host {host} does not resolve") from None
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if not ip.is_global or ip.is_multicast:
+            raise UnsafeWebhook(f"Webhook host {host} resolves to a non-public address")
+
+
+class JobRunner:
+    """Background workers that drain the job queue, separately from interactive traffic.
+
+    `workers` threads each answer one item at a time, so they bound the job load on the
+    upstream whatever the size of the queue. Items run at `priority`, so with adaptive
+    limits enabled they also wait behind interactive requests for upstream slots. When
+    a job's last item finishes, its webhook (if any) is sent the job's status.
+
+    Each start takes a new owner id for its item leases. A heartbeat thread renews them
+    every third of `lease_seconds` and requeues items whose lease expired elsewhere, so
+    several processes can drain one database and a crashed one loses nothing.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        priority: Priority,
+        max_attempts: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        webhook_timeout_seconds: float,
+        webhook_attempts: int,
+    ):
+        self.workers = workers
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.webhook_timeout_seconds = webhook_timeout_seconds
+        self.webhook_attempts = webhook_attempts
+        self.store: Optional[JobStore] = None
+        self.owner: Optional[str] = None
+        self.recovered = 0
+        self.answered = 0
+        self.errors = 0
+        self.webhooks_sent = 0
+        self.webhooks_failed = 0
+        self._handlers: dict[TaskType, Callable] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._in_flight: set[RequestContext] = set()
+
+    def start(self, store: JobStore, service) -> None:
+        """Requeues expired leases, resends owed webhooks and starts the workers."""
+        self.store = store
+        self.owner = uuid.uuid4().hex
+        self._handlers = {
+            TaskType.CLASSIFY: service.classify_text,
+            TaskType.SENTIMENT: service.analyze_sentiment,
+            TaskType.SUMMARIZE: service.summarize_text,
+            TaskType.INTENT: service.detect_intent,
+        }
+        self.recovered += store.recover(self.max_attempts)[0]
+        self._stop.clear()
+        owed = store.pending_webhooks()
+        if owed:
+            self._spawn("job-webhooks", self._send_webhooks, owed)
+        self._spawn("job-leases", self._heartbeat)
+        for i in range(self.workers):
+            self._spawn(f"job-worker-{i}", self._work)
+
+    def _spawn(self, name: str, target: Callable, *args) -> None:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stops the workers, aborting the items in flight and handing them back to the queue."""
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            in_flight = list(self._in_flight)
+        for context in in_flight:
+            context.cancel(SHUTDOWN)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.store is not None:
+            self.store.release(self.owner)
+            self.store.close()
+            self.store = None
+
+    def notify(self) -> None:
+        """Wakes idle workers after new items were queued."""
+        self._wake.set()
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.store.renew(self.owner, self.lease_seconds)
+                recovered, finished = self.store.recover(self.max_attempts)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                self.recovered += recovered
+            if finished:
+                self._spawn("job-webhooks", self._send_webhooks, finished)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self.store.claim(self.owner, self.lease_seconds)
+                if item is None:
+                    self._wake.wait(self.poll_seconds)
+                    self._wake.clear()
+                    continue
+                self.run_item(item)
+            except Exception:
+                # One bad item or a locked database must not cost the process a worker
+                with self._lock:
+                    self.errors += 1
+                self._stop.wait(self.poll_seconds)
+
+    def run_item(self, item: JobItem) -> None:
+        mode = Mode(item.mode) if item.mode else None
+        context = RequestContext(self.priority, deadline_from_header(None), mode=mode)
+        with self._lock:
+            self._in_flight.add(context)
+        set_context(context)
+        try:
+            result = self._handlers[TaskType(item.task)](item.text, item.fields)
+            answer = result.model_dump_json(exclude_none=item.fields is not None)
+        except Exception as e:
+            if isinstance(e, RequestCancelled) and context.cancel_reason == SHUTDOWN:
+                return
+            # Anything else, an exceeded deadline included, is a failed attempt
+            finished = self.store.fail(item, str(e) or type(e).__name__, self.max_attempts)
+            with self._lock:
+                self.errors += 1
+        else:
+            finished = self.store.complete(item, answer)
+            with self._lock:
+                self.answered += 1
+        finally:
+            set_context(None)
+            with self._lock:
+                self._in_flight.discard(context)
+        if finished:
+            self._send_webhook(item.job_id)
+
+    def _send_webhooks(self, job_ids: list[str]) -> None:
+        for job_id in job_ids:
+            if self._stop.is_set():
+                return
+            self._send_webhook(job_id)
+
+    def _send_webhook(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or not job["webhook_url"]:
+            return
+        try:
+            # Checked again at send time: the host may resolve elsewhere than when the job was queued
+            check_webhook_url(job["webhook_url"])
+        except UnsafeWebhook:
+            delivered = False
+        else:
+            delivered = self._post_webhook(job)
+        self.store.set_webhook_status(job_id, DELIVERED if delivered else FAILED)
+        with self._lock:
+            if delivered:
+                self.webhooks_sent += 1
+            else:
+                self.webhooks_failed += 1
+
+    def _post_webhook(self, job: dict) -> bool:
+        with httpx.Client(timeout=self.webhook_timeout_seconds) as client:
+            for attempt in range(self.webhook_attempts):
+                if attempt:
+                    time.sleep(2 ** (attempt - 1))
+                try:
+                    client.post(job["webhook_url"], json=job_summary(job)).raise_for_status()
+                except httpx.HTTPError:
+                    continue
+                return True
+        return False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = {
+                "workers": self.workers,
+                "priority": self.priority.value,
+                "recovered": self.recovered,
+                "answered": self.answered,
+                "errors": self.errors,
+                "webhooks_sent": self.webhooks_sent,
+                "webhooks_failed": self.webhooks_failed,
+            }
+        if self.store is not None:
+            stats.update(self.store.snapshot())
+        return stats
+
+
+def job_summary(job: dict) -> dict:
+    """A job's progress, as returned by the status endpoint and posted to its webhook."""
+    return {
+        "id": job["id"],
+        "task": job["task"],
+        "status": job["status"],
+        "total": job["total"],
+        "completed": job["completed"],
+        "failed": job["failed"],
+        "createdAt": job["created_at"],
+        "finishedAt": job["finished_at"],
+    }
+
+
+job_runner = JobRunner(
+    settings.JOBS_WORKERS,
+    Priority(settings.JOBS_PRIORITY),
+    settings.JOBS_MAX_ATTEMPTS,
+    settings.JOBS_POLL_SECONDS,
+    settings.JOBS_LEASE_SECONDS,
+    settings.JOBS_WEBHOOK_TIMEOUT_SECONDS,
+    settings.JOBS_WEBHOOK_ATTEMPTS,
+)
+metrics.register("jobs", job_runner.snapshot)
@@ -0,0 +1,290 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    fields TEXT,
+    mode TEXT,
+    webhook_url TEXT,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    webhook_status TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    lease_until REAL,
+    PRIMARY KEY (job_id, idx)
+);
+-- Entries are ordered by (status, rowid), so the oldest pending item is one seek away
+CREATE INDEX IF NOT EXISTS items_status ON items (status);
+"""
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+
+# Item states
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# Error of an item whose worker never reported back
+LEASE_EXPIRED = "Lease expired before the item finished"
+
+
+class JobItem:
+    """One text of a job, claimed by a worker."""
+
+    def __init__(
+        self,
+        job_id: str,
+        index: int,
+        task: str,
+        text: str,
+        fields: Optional[list[str]] = None,
+        mode: Optional[str] = None,
+        owner: Optional[str] = None,
+    ):
+        self.job_id = job_id
+        self.index = index
+        self.task = task
+        self.text = text
+        self.fields = fields
+        self.mode = mode
+        self.owner = owner
+
+
+class JobStore:
+    """Durable job queue in a local SQLite database.
+
+    WAL mode lets status reads proceed while a worker commits, and every state change
+    is its own write-locked (BEGIN IMMEDIATE) transaction, so several processes can
+    share the file. A claimed item is leased to its owner until `lease_until`; owners
+    `renew` their leases while they work, and `recover` requeues items whose lease ran
+    out, i.e. whose owner stopped or crashed. Answers from an owner that lost its lease
+    are ignored.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def create(
+        self,
+        task: str,
+        texts: list[str],
+        fields: Optional[list[str]] = None,
+        mode: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute(
+                "INSERT INTO jobs (id, task, fields, mode, webhook_url, status, total, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, task, _dump(fields), mode, webhook_url, QUEUED, len(texts), time.time()),
+            )
+            self._db.executemany(
+                "INSERT INTO items (job_id, idx, text, status) VALUES (?, ?, ?, ?)",
+                ((job_id, i, text, PENDING) for i, text in enumerate(texts)),
+            )
+        return job_id
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[JobItem]:
+        """The earliest queued pending item, leased to `owner`; None when the queue is empty.
+
+        Items are inserted job by job in input order, so rowid order drains jobs first in,
+        first out.
+        """
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            item = self._db.execute(
+                "SELECT rowid, job_id, idx, text FROM items WHERE status = ? ORDER BY rowid LIMIT 1", (PENDING,)
+            ).fetchone()
+            if item is None:
+                return None
+            job = self._db.execute("SELECT task, fields, mode FROM jobs WHERE id = ?", (item["job_id"],)).fetchone()
+            self._db.execute(
+                "UPDATE items SET status = ?, attempts = attempts + 1, owner = ?, lease_until = ? WHERE rowid = ?",
+                (RUNNING, owner, time.time() + lease_seconds, item["rowid"]),
+            )
+            self._db.execute(
+                "UPDATE jobs SET status = ? WHERE id = ? AND status = ?", (RUNNING, item["job_id"], QUEUED)
+            )
+        return JobItem(
+            item["job_id"], item["idx"], job["task"], item["text"], _load(job["fields"]), job["mode"], owner
+        )
+
+    def complete(self, item: JobItem, result: str) -> bool:
+        """Stores an item's answer; True when it was the job's last open item."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            if not self._holds(item):
+                return False
+            self._db.execute(
+                "UPDATE items SET status = ?, result = ?, error = NULL, owner = NULL WHERE job_id = ? AND idx = ?",
+                (DONE, result, item.job_id, item.index),
+            )
+            self._db.execute("UPDATE jobs SET completed = completed + 1 WHERE id = ?", (item.job_id,))
+            return self._finish_if_done(item.job_id)
+
+    def fail(self, item: JobItem, error: str, max_attempts: int) -> bool:
+        """Requeues the item, or marks it failed after `max_attempts`; True when that finished the job."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            if not self._holds(item):
+                return False
+            attempts = self._db.execute(
+                "SELECT attempts FROM items WHERE job_id = ? AND idx = ?", (item.job_id, item.index)
+            ).fetchone()["attempts"]
+            status = PENDING if attempts < max_attempts else FAILED
+            self._db.execute(
+                "UPDATE items SET status = ?, error = ?, owner = NULL WHERE job_id = ? AND idx = ?",
+                (status, error, item.job_id, item.index),
+            )
+            if status == PENDING:
+                return False
+            self._db.execute("UPDATE jobs SET failed = failed + 1 WHERE id = ?", (item.job_id,))
+            return self._finish_if_done(item.job_id)
+
+    def _holds(self, item: JobItem) -> bool:
+        """Whether `item` is still leased to the owner that claimed it."""
+        row = self._db.execute(
+            "SELECT 1 FROM items WHERE job_id = ? AND idx = ? AND status = ? AND owner = ?",
+            (item.job_id, item.index, RUNNING, item.owner),
+        ).fetchone()
+        return row is not None
+
+    def _finish_if_done(self, job_id: str) -> bool:
+        job = self._db.execute(
+            "SELECT total, completed, failed, webhook_url FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if job["completed"] + job["failed"] < job["total"]:
+            return False
+        self._db.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, webhook_status = ? WHERE id = ?",
+            (COMPLETED, time.time(), PENDING if job["webhook_url"] else None, job_id),
+        )
+        return True
+
+    def renew(self, owner: str, lease_seconds: float) -> None:
+        """Extends the leases of every item `owner` is working on."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE items SET lease_until = ? WHERE status = ? AND owner = ?",
+                (time.time() + lease_seconds, RUNNING, owner),
+            )
+
+    def release(self, owner: str) -> int:
+        """Requeues `owner`'s unfinished items without counting the attempt; returns how many."""
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            cursor = self._db.execute(
+                "UPDATE items SET status = ?, owner = NULL, attempts = attempts - 1 WHERE status = ? AND owner = ?",
+                (PENDING, RUNNING, owner),
+            )
+            return cursor.rowcount
+
+    def recover(self, max_attempts: int) -> tuple[int, list[str]]:
+        """Takes back running items whose lease expired, as their owner is gone.
+
+        Items with attempts left are requeued; the rest fail like `fail` would, so an
+        item that keeps killing or outliving its worker cannot hold its job open.
+        Returns how many items were taken back and the jobs that finished.
+        """
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            expired = self._db.execute(
+                "SELECT job_id, idx, attempts FROM items WHERE status = ? AND lease_until < ?",
+                (RUNNING, time.time()),
+            ).fetchall()
+            failed_jobs = set()
+            for row in expired:
+                key = (row["job_id"], row["idx"])
+                if row["attempts"] < max_attempts:
+                    self._db.execute(
+                        "UPDATE items SET status = ?, owner = NULL WHERE job_id = ? AND idx = ?", (PENDING, *key)
+                    )
+                    continue
+                self._db.execute(
+                    "UPDATE items SET status = ?, error = ?, owner = NULL WHERE job_id = ? AND idx = ?",
+                    (FAILED, LEASE_EXPIRED, *key),
+                )
+                self._db.execute("UPDATE jobs SET failed = failed + 1 WHERE id = ?", (row["job_id"],))
+                failed_jobs.add(row["job_id"])
+            finished = [job_id for job_id in sorted(failed_jobs) if self._finish_if_done(job_id)]
+            return len(expired), finished
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["fields"] = _load(job["fields"])
+        return job
+
+    def results(self, job_id: str, offset: int, limit: int) -> list[dict]:
+        """Items `offset` .. `offset + limit` in input order, with their answer or last error."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, status, result, error FROM items WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+                (job_id, offset, limit),
+            ).fetchall()
+        return [
+            {"index": row["idx"], "status": row["status"], "result": _load(row["result"]), "error": row["error"]}
+            for row in rows
+        ]
+
+    def pending_webhooks(self) -> list[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT id FROM jobs WHERE webhook_status = ?", (PENDING,)).fetchall()
+        return [row["id"] for row in rows]
+
+    def set_webhook_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET webhook_status = ? WHERE id = ?", (status, job_id))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = dict(self._db.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+            jobs = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"jobs": jobs, "items": items}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _dump(value) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+def _load(value: Optional[str]):
+    return None if value is None else json.loads(value)
@@ -1,8 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.concurrency.admission import AdmissionRejected
 from app.config import settings
+from app.context import DeadlineExceeded, RequestCancelled
+from app.controller.ai_controller import ai_service
 from app.controller.ai_controller import router as ai_router
+from app.controller.job_controller import router as job_router
+from app.jobs.runner import job_runner
+from app.jobs.store import JobStore
+from app.router.backend_pool import NoBackendAvailable, backend_pool
+from app.service.prompts import UnknownFields
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    backend_pool.start_health_checks(settings.OLLAMA_HEALTH_CHECK_SECONDS, settings.OLLAMA_HEALTH_CHECK_TIMEOUT_SECONDS)
+    if settings.JOBS_ENABLED:
+        job_runner.start(JobStore(settings.JOBS_DB_PATH), ai_service)
+    yield
+    job_runner.stop()
+    backend_pool.stop_health_checks()
+
 
 app = FastAPI(
     title="Multi-Route LLM API",
@@ -21,6 +43,7 @@ app = FastAPI(
     servers=[
         {"url": f"http://localhost:{settings.SERVER_PORT}", "description": "Local Development Server"}
     ],
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,7 +54,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(RequestCancelled)
+async def request_cancelled_handler(request: Request, exc: RequestCancelled) -> JSONResponse:
+    # Nobody is listening any more; 499 is what the access log shows for client-closed requests
+    return JSONResponse(status_code=499, content={"detail": str(exc)})
+
+
+@app.exception_handler(NoBackendAvailable)
+async def no_backend_handler(request: Request, exc: NoBackendAvailable) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@app.exception_handler(UnknownFields)
+async def unknown_fields_handler(request: Request, exc: UnknownFields) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
 app.include_router(ai_router)
+app.include_router(job_router)
 
 if __name__ == "__main__":
     import uvicorn
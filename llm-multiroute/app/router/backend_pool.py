@@ -0,0 +1,263 @@
+import itertools
+import math
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import httpx
+
+from app.config import settings
+from app.context import RequestCancelled, UpstreamTimeout
+from app.metrics import metrics
+from app.router.hash_ring import HashRing
+
+
+class NoBackendAvailable(Exception):
+    def __init__(self, model: str):
+        super().__init__(f"No Ollama backend is configured to serve model '{model}'")
+        self.model = model
+
+
+class Backend:
+    """One Ollama node. `models` is None when the node serves every model."""
+
+    def __init__(
+        self,
+        url: str,
+        models: Optional[frozenset[str]] = None,
+        weight: int = 1,
+        authenticated: bool = False,
+    ):
+        self.url = url.rstrip("/")
+        self.models = models
+        self.weight = max(1, weight)
+        # Only the configured OLLAMA_BASE_URL receives OLLAMA_API_KEY
+        self.authenticated = authenticated
+        self.healthy = True
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.credit = 0
+
+    def serves(self, model: str) -> bool:
+        return self.models is None or model in self.models
+
+    def snapshot(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "models": sorted(self.models) if self.models is not None else "*",
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class BackendPool:
+    """Picks the Ollama node for a model chosen by ModelRouter.
+
+    Policies: `least_outstanding` sends the request to the node with the fewest
+    in-flight requests per unit of weight; `weighted` is smooth weighted round-robin;
+    `consistent_hash` sends the same affinity key (model and text prefix) to the same
+    node so its prompt cache stays warm, overflowing along the ring to the next node
+    once a node carries more than `load_factor` x its fair share of in-flight requests.
+    A node is ejected after `eject_after` consecutive failures (connection errors or
+    5xx) or a failed /api/tags health check, and reinstated by the next passing check.
+    When every node for a model is ejected the pool fails open and tries them anyway.
+    """
+
+    POLICIES = ("least_outstanding", "weighted", "consistent_hash")
+
+    def __init__(
+        self,
+        backends: list[Backend],
+        policy: str = "least_outstanding",
+        eject_after: int = 3,
+        load_factor: float = 1.25,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown balancing policy '{policy}', expected one of {self.POLICIES}")
+        self.backends = backends
+        self.policy = policy
+        self.eject_after = eject_after
+        self.load_factor = load_factor
+        self.ring = HashRing(backends, name=lambda b: b.url, weight=lambda b: b.weight)
+        self.fail_open = 0
+        self.affinity_hits = 0
+        self.affinity_overflows = 0
+        self._lock = threading.Lock()
+        self._tiebreak = itertools.count()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def candidates(self, model: str) -> list[Backend]:
+        serving = [b for b in self.backends if b.serves(model)]
+        if not serving:
+            raise NoBackendAvailable(model)
+        healthy = [b for b in serving if b.healthy]
+        if healthy:
+            return healthy
+        self.fail_open += 1
+        return serving
+
+    def select(self, model: str, key: Optional[str] = None) -> Backend:
+        with self._lock:
+            return self._select(model, key)
+
+    def _select(self, model: str, key: Optional[str]) -> Backend:
+        candidates = self.candidates(model)
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.policy == "consistent_hash" and key is not None:
+            return self._select_by_hash(candidates, key)
+        if self.policy == "weighted":
+            total = sum(b.weight for b in candidates)
+            for b in candidates:
+                b.credit += b.weight
+            chosen = max(candidates, key=lambda b: b.credit)
+            chosen.credit -= total
+            return chosen
+        # Rotate the starting point so equally loaded nodes share the traffic
+        offset = next(self._tiebreak) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda b: b.outstanding / b.weight)
+
+    def _select_by_hash(self, candidates: list[Backend], key: str) -> Backend:
+        # Bounded load: a node may hold up to load_factor x its weighted share of the
+        # in-flight requests, counting the one being placed
+        total_weight = sum(b.weight for b in candidates)
+        in_flight = sum(b.outstanding for b in candidates) + 1
+        preferred = None
+        for backend in self.ring.walk(key):
+            if backend not in candidates:
+                continue
+            if preferred is None:
+                preferred = backend
+            if backend.outstanding < math.ceil(self.load_factor * in_flight * backend.weight / total_weight):
+                if backend is preferred:
+                    self.affinity_hits += 1
+                else:
+                    self.affinity_overflows += 1
+                return backend
+        self.affinity_overflows += 1
+        return preferred or candidates[0]
+
+    @contextmanager
+    def lease(self, model: str, key: Optional[str] = None) -> Iterator[Backend]:
+        """Selects a node and tracks the request on it; failures count towards ejection."""
+        with self._lock:
+            backend = self._select(model, key)
+            backend.outstanding += 1
+            backend.requests += 1
+        ok: Optional[bool] = True
+        try:
+            yield backend
+        except httpx.HTTPStatusError as e:
+            ok = e.response.status_code < 500
+            raise
+        except (httpx.TransportError, UpstreamTimeout):
+            ok = False
+            raise
+        except RequestCancelled:
+            # Cut short by the caller, which says nothing about the node
+            ok = None
+            raise
+        finally:
+            self._finish(backend, ok)
+
+    def _finish(self, backend: Backend, ok: Optional[bool]) -> None:
+        with self._lock:
+            backend.outstanding -= 1
+            if ok is None:
+                return
+            if ok:
+                backend.consecutive_failures = 0
+                return
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if backend.healthy and backend.consecutive_failures >= self.eject_after:
+                self._eject(backend)
+
+    def _eject(self, backend: Backend) -> None:
+        backend.healthy = False
+        backend.ejections += 1
+
+    def check_health(self, client: httpx.Client, api_key: str = "") -> None:
+        for backend in self.backends:
+            headers = {"Authorization": f"Bearer {api_key}"} if api_key and backend.authenticated else {}
+            try:
+                client.get(f"{backend.url}/api/tags", headers=headers).raise_for_status()
+                passed = True
+            except httpx.HTTPError:
+                passed = False
+            with self._lock:
+                if passed:
+                    backend.healthy = True
+                    backend.consecutive_failures = 0
+                elif backend.healthy:
+                    self._eject(backend)
+
+    def start_health_checks(self, interval_seconds: float, timeout_seconds: float) -> None:
+        if self._health_thread is not None or len(self.backends) < 2:
+            return
+        self._stop.clear()
+
+        def loop():
+            with httpx.Client(timeout=timeout_seconds) as client:
+                while not self._stop.wait(interval_seconds):
+                    self.check_health(client, settings.OLLAMA_API_KEY)
+
+        self._health_thread = threading.Thread(target=loop, name="ollama-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "fail_open": self.fail_open,
+                "affinity_hits": self.affinity_hits,
+                "affinity_overflows": self.affinity_overflows,
+                "nodes": {b.url: b.snapshot() for b in self.backends},
+            }
+
+
+def parse_backends(raw: str, base_url: str) -> list[Backend]:
+    """Parses OLLAMA_BACKENDS: entries separated by ';', each a URL followed by optional
+    `models=a,b` and `weight=N`, e.g. "http://gpu1:11434 models=gemma3:4b weight=2".
+    Empty means a single node at OLLAMA_BASE_URL serving every model."""
+    if not raw.strip():
+        return [Backend(base_url, authenticated=True)]
+    backends = []
+    for entry in raw.split(";"):
+        fields = entry.split()
+        if not fields:
+            continue
+        url, options = fields[0], dict(f.partition("=")[::2] for f in fields[1:])
+        models = frozenset(m for m in options.get("models", "").split(",") if m) or None
+        backends.append(
+            Backend(
+                url,
+                models=models,
+                weight=int(options.get("weight", "1")),
+                authenticated=url.rstrip("/") == base_url.rstrip("/"),
+            )
+        )
+    return backends
+
+
+backend_pool = BackendPool(
+    parse_backends(settings.OLLAMA_BACKENDS, settings.OLLAMA_BASE_URL),
+    policy=settings.OLLAMA_BALANCING,
+    eject_after=settings.OLLAMA_EJECT_AFTER_FAILURES,
+    load_factor=settings.OLLAMA_HASH_LOAD_FACTOR,
+)
+metrics.register("backends", backend_pool.snapshot)
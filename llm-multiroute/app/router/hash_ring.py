@@ -0,0 +1,53 @@
+import bisect
+import hashlib
+import re
+from typing import Callable, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def affinity_key(model: str, text: str, prefix_chars: int) -> str:
+    """Case and whitespace differences do not change the node a text lands on."""
+    # Only the prefix matters, so skip normalizing the rest of a long text
+    normalized = _WHITESPACE.sub(" ", text.lstrip()[: 4 * prefix_chars]).strip().lower()
+    return f"{model}\0{normalized[:prefix_chars]}"
+
+
+class HashRing(Generic[T]):
+    """Consistent hash ring with `replicas` virtual points per unit of node weight.
+
+    Adding or removing a node only moves the keys on the arcs that node owns, about
+    1/n of them, so the other nodes keep their warm caches.
+    """
+
+    def __init__(self, nodes: list[T], name: Callable[[T], str], weight: Callable[[T], int], replicas: int = 64):
+        self._points: list[int] = []
+        self._owners: list[T] = []
+        entries = sorted(
+            ((_hash(f"{name(node)}#{i}"), node) for node in nodes for i in range(replicas * weight(node))),
+            key=lambda entry: entry[0],
+        )
+        for point, node in entries:
+            self._points.append(point)
+            self._owners.append(node)
+        self._size = len(nodes)
+
+    def walk(self, key: str) -> Iterator[T]:
+        """Distinct nodes in ring order, starting at the owner of `key`."""
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        seen: list[T] = []
+        for i in range(len(self._points)):
+            node = self._owners[(start + i) % len(self._points)]
+            if node not in seen:
+                seen.append(node)
+                yield node
+                if len(seen) == self._size:
+                    return
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 from app.config import settings
 
@@ -10,6 +11,90 @@ class TaskType(str, Enum):
     INTENT = "intent"
 
 
+class Mode(str, Enum):
+    """A caller's latency/quality hint; each mode has its own model and options per route."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+
+
+class GenerationOptions:
+    """Ollama sampling options for one route; None leaves the model's default."""
+
+    def __init__(
+        self,
+        temperature: Optional[float] = None,
+        num_predict: Optional[int] = None,
+        num_ctx: Optional[int] = None,
+        stop: Optional[list[str]] = None,
+        top_k: Optional[int] = None,
+        top_p: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.temperature = temperature
+        self.num_predict = num_predict
+        self.num_ctx = num_ctx
+        self.stop = stop or []
+        self.top_k = top_k
+        self.top_p = top_p
+        self.seed = seed
+        self._payload = self._build_payload()
+
+    @classmethod
+    def for_route(cls, task_type: "TaskType") -> "GenerationOptions":
+        name = task_type.name
+        return cls(
+            temperature=getattr(settings, f"OLLAMA_TEMPERATURE_{name}"),
+            num_predict=getattr(settings, f"OLLAMA_NUM_PREDICT_{name}"),
+            num_ctx=getattr(settings, f"OLLAMA_NUM_CTX_{name}"),
+            stop=getattr(settings, f"OLLAMA_STOP_{name}"),
+            top_k=getattr(settings, f"OLLAMA_TOP_K_{name}"),
+            top_p=getattr(settings, f"OLLAMA_TOP_P_{name}"),
+            seed=getattr(settings, f"OLLAMA_SEED_{name}"),
+        )
+
+    def with_overrides(self, **overrides) -> "GenerationOptions":
+        """A copy with the given options replaced; None keeps this route's value."""
+        values = {
+            "temperature": self.temperature,
+            "num_predict": self.num_predict,
+            "num_ctx": self.num_ctx,
+            "stop": self.stop,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "seed": self.seed,
+        }
+        values.update({name: value for name, value in overrides.items() if value is not None})
+        return GenerationOptions(**values)
+
+    def _build_payload(self) -> dict:
+        options = {
+            "temperature": self.temperature,
+            "num_predict": self.num_predict,
+            "num_ctx": self.num_ctx,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "seed": self.seed,
+        }
+        payload = {name: value for name, value in options.items() if value is not None}
+        if self.stop:
+            payload["stop"] = list(self.stop)
+        return payload
+
+    def to_payload(self) -> dict:
+        """The `options` object of an /api/chat request."""
+        return self._payload
+
+
+class CascadeRoute:
+    """The cheap model a route tries first, and the confidence it must reach to be kept."""
+
+    def __init__(self, model: str, min_confidence: float):
+        self.model = model
+        self.min_confidence = min_confidence
+
+
 class ModelRouter:
     def __init__(self):
         self._route_map: dict[TaskType, str] = {
@@ -18,9 +103,41 @@ class ModelRouter:
             TaskType.SUMMARIZE: settings.OLLAMA_MODEL_SUMMARIZE,
             TaskType.INTENT: settings.OLLAMA_MODEL_INTENT,
         }
+        self._options: dict[TaskType, GenerationOptions] = {
+            task: GenerationOptions.for_route(task) for task in TaskType
+        }
+        # Models and options of the fast and accurate tiers; balanced is the route itself
+        self._tiers: dict[Mode, dict[TaskType, str]] = {Mode.BALANCED: self._route_map}
+        self._tier_options: dict[Mode, dict[TaskType, GenerationOptions]] = {Mode.BALANCED: self._options}
+        for mode in (Mode.FAST, Mode.ACCURATE):
+            self._tiers[mode] = {}
+            self._tier_options[mode] = {}
+            for task in TaskType:
+                tier = f"{mode.name}_{task.name}"
+                self._tiers[mode][task] = getattr(settings, f"MODE_MODEL_{tier}") or self._route_map[task]
+                self._tier_options[mode][task] = self._options[task].with_overrides(
+                    temperature=getattr(settings, f"MODE_TEMPERATURE_{tier}"),
+                    num_predict=getattr(settings, f"MODE_NUM_PREDICT_{tier}"),
+                )
+        self._cascades: dict[TaskType, CascadeRoute] = {}
+        if settings.CASCADE_ENABLED:
+            for task, model in self._route_map.items():
+                min_confidence = getattr(settings, f"CASCADE_MIN_CONFIDENCE_{task.name}")
+                # A route already on the cheap model has nothing to escalate to
+                if min_confidence is not None and model != settings.CASCADE_MODEL:
+                    self._cascades[task] = CascadeRoute(settings.CASCADE_MODEL, min_confidence)
+
+    def get_model(self, task_type: TaskType, mode: Mode = Mode.BALANCED) -> str:
+        return self._tiers[mode][task_type]
+
+    def get_options(self, task_type: TaskType, mode: Mode = Mode.BALANCED) -> GenerationOptions:
+        return self._tier_options[mode][task_type]
 
-    def get_model(self, task_type: TaskType) -> str:
-        return self._route_map[task_type]
+    def get_cascade(self, task_type: TaskType, mode: Mode = Mode.BALANCED) -> Optional[CascadeRoute]:
+        """Only balanced requests cascade; the fast and accurate tiers are answered by their own model."""
+        if mode != Mode.BALANCED:
+            return None
+        return self._cascades.get(task_type)
 
     def get_routes(self) -> dict[str, str]:
         return {task.value: model for task, model in self._route_map.items()}
@@ -0,0 +1,94 @@
+from typing import Callable
+
+import numpy as np
+
+from app.dto.classification_response import ClassificationResponse
+from app.dto.intent_response import IntentResponse
+from app.dto.sentiment_response import SentimentResponse
+from app.router.model_router import TaskType
+
+MAX_LABELS = 5
+MAX_EMOTIONS = 5
+MAX_SECONDARY_INTENTS = 3
+
+
+def _index(values: list[str]) -> tuple[list[str], np.ndarray]:
+    """Distinct values in first-seen order, and each value's position in that list."""
+    distinct = list(dict.fromkeys(values))
+    positions = {value: i for i, value in enumerate(distinct)}
+    return distinct, np.array([positions[v] for v in values], dtype=np.intp)
+
+
+def _vote(values: list[str], weights: np.ndarray) -> tuple[str, np.ndarray, list[str], np.ndarray]:
+    """Weighted vote: the winner, whether each item voted for it, and all totals by value."""
+    distinct, index = _index(values)
+    totals = np.bincount(index, weights=weights, minlength=len(distinct))
+    winner = int(np.argmax(totals))
+    return distinct[winner], index == winner, distinct, totals
+
+
+def _ranked(values: list[str], weights: np.ndarray, exclude: str, limit: int) -> list[str]:
+    if not values:
+        return []
+    distinct, index = _index(values)
+    totals = np.bincount(index, weights=weights, minlength=len(distinct))
+    order = np.argsort(-totals, kind="stable")
+    return [distinct[i] for i in order if distinct[i] != exclude][:limit]
+
+
+def _agreeing_confidence(weights: np.ndarray, confidences: np.ndarray, agrees: np.ndarray) -> float:
+    """Length-weighted confidence, counting chunks that disagree with the winner as zero."""
+    return round(float(np.sum(weights * confidences * agrees) / np.sum(weights)), 4)
+
+
+def aggregate_sentiment(results: list[SentimentResponse], weights: np.ndarray) -> SentimentResponse:
+    """Length-weighted score; the label with the most length-times-confidence behind it."""
+    scores = np.array([r.sentimentScore for r in results], dtype=np.float64)
+    confidences = np.array([r.confidence for r in results], dtype=np.float64)
+    label, agrees, _, _ = _vote([r.overallSentiment.lower() for r in results], weights * confidences)
+    emotions = [e.lower() for r in results for e in dict.fromkeys(r.emotions)]
+    return SentimentResponse(
+        overallSentiment=label,
+        sentimentScore=round(float(np.average(scores, weights=weights)), 4),
+        emotions=_ranked(emotions, np.ones(len(emotions)), exclude="", limit=MAX_EMOTIONS),
+        confidence=_agreeing_confidence(weights, confidences, agrees),
+    )
+
+
+def aggregate_classification(results: list[ClassificationResponse], weights: np.ndarray) -> ClassificationResponse:
+    """Primary category by weighted vote; labels ranked by how many chunks carry them."""
+    confidences = np.array([r.confidence for r in results], dtype=np.float64)
+    category, agrees, _, _ = _vote([r.primaryCategory for r in results], weights * confidences)
+    labels = [label for r in results for label in dict.fromkeys(r.labels)]
+    label_weights = np.repeat(weights, [len(dict.fromkeys(r.labels)) for r in results])
+    return ClassificationResponse(
+        labels=[category, *_ranked(labels, label_weights, exclude=category, limit=MAX_LABELS - 1)],
+        primaryCategory=category,
+        confidence=_agreeing_confidence(weights, confidences, agrees),
+    )
+
+
+def aggregate_intent(results: list[IntentResponse], weights: np.ndarray) -> IntentResponse:
+    """The intent with the most length-times-confidence behind it, with its chunks' category."""
+    confidences = np.array([r.confidence for r in results], dtype=np.float64)
+    intent, agrees, distinct, totals = _vote([r.primaryIntent for r in results], weights * confidences)
+    category, _, _, _ = _vote([r.intentCategory for r in results], np.where(agrees, weights * confidences, 0.0))
+    # Other chunks' primary intents outrank intents that were only ever secondary
+    secondary = [(name, float(total)) for name, total in zip(distinct, totals)]
+    secondary += [(name, 0.0) for r in results for name in r.secondaryIntents]
+    best: dict[str, float] = {}
+    for name, total in secondary:
+        best[name] = max(best.get(name, 0.0), total)
+    return IntentResponse(
+        primaryIntent=intent,
+        secondaryIntents=[n for n in sorted(best, key=lambda n: -best[n]) if n != intent][:MAX_SECONDARY_INTENTS],
+        intentCategory=category,
+        confidence=_agreeing_confidence(weights, confidences, agrees),
+    )
+
+
+AGGREGATORS: dict[TaskType, Callable] = {
+    TaskType.CLASSIFY: aggregate_classification,
+    TaskType.SENTIMENT: aggregate_sentiment,
+    TaskType.INTENT: aggregate_intent,
+}
@@ -1,15 +1,44 @@
 import json
+import math
 import re
+import socket
 from typing import Optional
 
 import httpx
+import numpy as np
 
+from app.cache.near_duplicate import NearDuplicateCache, route_result_caches
+from app.concurrency.adaptive import AdaptiveLimits, adaptive_limits
+from app.concurrency.bulkhead import Bulkheads, route_bulkheads
+from app.concurrency.fanout import ChunkFanout, chunk_fanout
+from app.concurrency.speculation import SpeculationBudget, speculation_budget
 from app.config import settings
+from app.context import (
+    DEADLINE_EXCEEDED,
+    SPECULATION_LOST,
+    RequestCancelled,
+    RequestContext,
+    UpstreamTimeout,
+    cancellation_stats,
+    current_context,
+    deadline_from_header,
+    set_context,
+)
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
 from app.dto.summary_response import SummaryResponse
-from app.router.model_router import ModelRouter, TaskType, model_router
+from app.fastpath.gate import AGREEMENT_FIELDS, FastPath, route_fast_paths
+from app.metrics import cascade_stats, upstream_timings
+from app.router.backend_pool import BackendPool, backend_pool
+from app.router.hash_ring import affinity_key
+from app.router.model_router import CascadeRoute, Mode, ModelRouter, TaskType, model_router
+from app.service.aggregate import AGGREGATORS
+from app.service.chunking import content_hash, split_chunks
+from app.service.extractive import compress, extractive_stats
+from app.service.incremental_summary import IncrementalSummarizer, incremental_summarizer
+from app.service.normalize import TextNormalizer, text_normalizer
+from app.service.prompts import PromptTemplate, prompts, summary_stages
 
 
 class AIService:
@@ -17,82 +46,334 @@ class AIService:
         self,
         http_client: Optional[httpx.Client] = None,
         router: Optional[ModelRouter] = None,
+        limits: Optional[AdaptiveLimits] = None,
+        bulkheads: Optional[Bulkheads] = None,
+        backends: Optional[BackendPool] = None,
+        speculation: Optional[SpeculationBudget] = None,
+        fast_paths: Optional[dict[TaskType, FastPath]] = None,
+        result_caches: Optional[dict[TaskType, NearDuplicateCache]] = None,
+        incremental: Optional[IncrementalSummarizer] = None,
+        normalizer: Optional[TextNormalizer] = None,
+        fanout: Optional[ChunkFanout] = None,
     ):
-        self.http_client = http_client or httpx.Client(timeout=120.0)
-        self.base_url = settings.OLLAMA_BASE_URL
-        self.temperature = settings.OLLAMA_TEMPERATURE
+        # A client passed in serves every route; otherwise each route uses its bulkhead's pool
+        self.http_client = http_client
         self.api_key = settings.OLLAMA_API_KEY
         self.router = router or model_router
+        self.limits = limits or adaptive_limits
+        self.bulkheads = bulkheads or route_bulkheads
+        self.backends = backends or backend_pool
+        self.speculation = speculation or speculation_budget
+        self.fast_paths = route_fast_paths if fast_paths is None else fast_paths
+        self.result_caches = route_result_caches if result_caches is None else result_caches
+        self.incremental = incremental or incremental_summarizer
+        self.normalizer = normalizer or text_normalizer
+        self.fanout = fanout or chunk_fanout
+        self.prompts = prompts
+        self.summary_stages = summary_stages
 
-    def _chat(self, prompt: str, model: str) -> str:
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        response = self.http_client.post(
-            f"{self.base_url}/api/chat",
-            headers=headers,
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "stream": False,
-                "temperature": self.temperature,
-            },
-        )
-        response.raise_for_status()
-        return response.json()["message"]["content"]
-
-    def classify_text(self, text: str) -> ClassificationResponse:
-        model = self.router.get_model(TaskType.CLASSIFY)
-        prompt = (
-            "Analyze the following text and classify it with appropriate labels and tags. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"labels": ["label1", "label2"], "primaryCategory": "category", "confidence": 0.9}'
-        )
-        response = self._chat(prompt, model)
-        return self._parse_json(response, ClassificationResponse)
-
-    def analyze_sentiment(self, text: str) -> SentimentResponse:
-        model = self.router.get_model(TaskType.SENTIMENT)
-        prompt = (
-            "Analyze the sentiment of the following text. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"overallSentiment": "positive", "sentimentScore": 0.8, '
-            '"emotions": ["joy", "excitement"], "confidence": 0.9}'
+    def _chat(self, messages: list[dict], task_type: TaskType, text: str, model: Optional[str] = None) -> str:
+        context = current_context()
+        model = model or self.router.get_model(task_type, context.mode)
+        options = self.router.get_options(task_type, context.mode).to_payload()
+        client = self.http_client or self.bulkheads.get(task_type).client
+        key = None
+        if self.backends.policy == "consistent_hash":
+            key = affinity_key(model, text, settings.OLLAMA_HASH_PREFIX_CHARS)
+        if not self.limits.enabled:
+            return self._post_chat(client, messages, model, options, key)
+        with self.limits.get(model).slot(context.priority, context.remaining()) as outcome:
+            try:
+                return self._post_chat(client, messages, model, options, key)
+            except httpx.HTTPStatusError as e:
+                # Only overload signals should shrink the limit, not bad requests
+                outcome.ok = e.response.status_code < 500 and e.response.status_code != 429
+                raise
+            except (httpx.TransportError, UpstreamTimeout):
+                outcome.ok = False
+                raise
+            except RequestCancelled:
+                outcome.ok = None
+                raise
+
+    def _post_chat(
+        self,
+        client: httpx.Client,
+        messages: list[dict],
+        model: str,
+        options: dict,
+        key: Optional[str] = None,
+    ) -> str:
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "options": options,
+        }
+        context = current_context()
+        with self.backends.lease(model, key) as backend:
+            url = f"{backend.url}/api/chat"
+            headers = {}
+            if self.api_key and backend.authenticated:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            if context.deadline is not None:
+                return self._stream_chat(client, url, headers, payload, context)
+            response = client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
+            body = response.json()
+            upstream_timings.record(model, body)
+            return body["message"]["content"]
+
+    def _stream_chat(
+        self, client: httpx.Client, url: str, headers: dict, payload: dict, context: RequestContext
+    ) -> str:
+        """Streams the answer so a cancelled request can stop the upstream mid-generation.
+
+        Reads time out at the remaining budget; a client disconnect shuts the socket down
+        from the event loop, which also tells Ollama to stop generating. A timeout raises
+        UpstreamTimeout so the limiter and backend pool count it against the upstream.
+        """
+        context.check()
+        parts = []
+        try:
+            with client.stream(
+                "POST",
+                url,
+                headers=headers,
+                json={**payload, "stream": True},
+                timeout=context.remaining(),
+            ) as response:
+                unregister = context.on_cancel(lambda: _abort(response))
+                try:
+                    if response.is_error:
+                        response.read()
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        context.check()
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if "error" in chunk:
+                            raise RuntimeError(f"Upstream error: {chunk['error']}")
+                        parts.append(chunk.get("message", {}).get("content", ""))
+                        if chunk.get("done"):
+                            upstream_timings.record(payload["model"], chunk)
+                finally:
+                    unregister()
+        except httpx.TimeoutException as e:
+            context.cancel(DEADLINE_EXCEEDED)
+            cancellation_stats.record("upstream_aborted")
+            if context.cancel_reason == DEADLINE_EXCEEDED:
+                raise UpstreamTimeout() from e
+            context.check()
+        except (httpx.TransportError, RequestCancelled):
+            if not context.cancelled:
+                raise
+            cancellation_stats.record("upstream_aborted")
+            context.check()
+        return "".join(parts)
+
+    def classify_text(self, text: str, fields: Optional[list[str]] = None) -> ClassificationResponse:
+        self._check_fields(TaskType.CLASSIFY, fields)
+        text = self.normalizer.apply(TaskType.CLASSIFY, text)
+        return self._answer_long(TaskType.CLASSIFY, text, ClassificationResponse, fields)
+
+    def analyze_sentiment(self, text: str, fields: Optional[list[str]] = None) -> SentimentResponse:
+        self._check_fields(TaskType.SENTIMENT, fields)
+        text = self.normalizer.apply(TaskType.SENTIMENT, text)
+        return self._answer_long(TaskType.SENTIMENT, text, SentimentResponse, fields)
+
+    def summarize_text(self, text: str, fields: Optional[list[str]] = None) -> SummaryResponse:
+        self._check_fields(TaskType.SUMMARIZE, fields)
+        text = self.normalizer.apply(TaskType.SUMMARIZE, text)
+        if self.incremental is not None and self.incremental.applies_to(text):
+            return self._project(TaskType.SUMMARIZE, self._summarize_incrementally(text), fields)
+        if settings.SUMMARIZE_EXTRACTIVE_ENABLED:
+            return self._summarize_compressed(text, fields)
+        return self._answer(TaskType.SUMMARIZE, text, SummaryResponse, fields)
+
+    def _summarize_compressed(self, text: str, fields: Optional[list[str]] = None) -> SummaryResponse:
+        compression = compress(
+            text, settings.SUMMARIZE_EXTRACTIVE_TOKEN_BUDGET, settings.SUMMARIZE_EXTRACTIVE_MAX_SENTENCES
         )
-        response = self._chat(prompt, model)
-        return self._parse_json(response, SentimentResponse)
-
-    def summarize_text(self, text: str) -> SummaryResponse:
-        model = self.router.get_model(TaskType.SUMMARIZE)
-        prompt = (
-            "Summarize the following text concisely. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"summary": "your summary here", "keyPoints": ["point1", "point2", "point3"], "wordCount": 25}'
+        extractive_stats.record(compression)
+        if compression is None:
+            return self._answer(TaskType.SUMMARIZE, text, SummaryResponse, fields)
+        result = self._answer(TaskType.SUMMARIZE, compression.text, SummaryResponse, fields)
+        result.compressionRatio = round(compression.ratio, 4)
+        ms_per_token = upstream_timings.ms_per_token(self.router.get_model(TaskType.SUMMARIZE, current_context().mode))
+        if ms_per_token is not None:
+            result.promptEvalMsSaved = round(ms_per_token * compression.removed_tokens, 1)
+        return result
+
+    def _summarize_incrementally(self, text: str) -> SummaryResponse:
+        section, merge = self.summary_stages["section"], self.summary_stages["merge"]
+        # A new model or new stage prompts must not reuse old section summaries
+        prompt_version = content_hash(section.system_prompt + merge.system_prompt)
+        scope = f"{self.router.get_model(TaskType.SUMMARIZE, current_context().mode)}:{prompt_version}"
+        return self.incremental.summarize(
+            text,
+            scope,
+            lambda chunk: self._ask_model(TaskType.SUMMARIZE, chunk, SummaryResponse, section),
+            lambda sections: self._ask_model(TaskType.SUMMARIZE, sections, SummaryResponse, merge),
         )
-        response = self._chat(prompt, model)
-        return self._parse_json(response, SummaryResponse)
-
-    def detect_intent(self, text: str) -> IntentResponse:
-        model = self.router.get_model(TaskType.INTENT)
-        prompt = (
-            "Detect the intent behind the following text. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"primaryIntent": "main_intent", "secondaryIntents": ["intent1", "intent2"], '
-            '"intentCategory": "question", "confidence": 0.9}'
+
+    def detect_intent(self, text: str, fields: Optional[list[str]] = None) -> IntentResponse:
+        self._check_fields(TaskType.INTENT, fields)
+        text = self.normalizer.apply(TaskType.INTENT, text)
+        return self._answer_long(TaskType.INTENT, text, IntentResponse, fields)
+
+    def _answer_long(self, task_type: TaskType, text: str, model_class: type, fields: Optional[list[str]] = None):
+        """Scores a long text chunk by chunk in parallel and aggregates the chunk answers.
+
+        Each chunk goes through the fast path, result cache and cascade like a short
+        request, so latency follows the slowest chunk rather than the text's length.
+        Chunk answers are weighted by chunk length. Aggregation reads every field, so
+        chunks are asked for the full answer and the projection applies to the result.
+        """
+        if not settings.CHUNKED_MODE_ENABLED or len(text) <= settings.CHUNKED_CHUNK_CHARS:
+            return self._answer(task_type, text, model_class, fields)
+        chunk_chars = max(settings.CHUNKED_CHUNK_CHARS, math.ceil(2 * len(text) / settings.CHUNKED_MAX_CHUNKS))
+        chunks = split_chunks(text, chunk_chars // 2, chunk_chars)
+        if len(chunks) == 1:
+            return self._answer(task_type, text, model_class, fields)
+        results = self.fanout.map(lambda chunk: self._answer(task_type, chunk, model_class), chunks)
+        weights = np.array([len(chunk) for chunk in chunks], dtype=np.float64)
+        return self._project(task_type, AGGREGATORS[task_type](results, weights), fields)
+
+    def _answer(self, task_type: TaskType, text: str, model_class: type, fields: Optional[list[str]] = None):
+        prompt = self._prompt(task_type, fields)
+        cache = self.result_caches.get(task_type)
+        if cache is not None:
+            variant = None if fields is None else prompt.fields
+            result = cache.answer(
+                text,
+                lambda: self._answer_uncached(task_type, text, model_class, prompt),
+                variant,
+                scope=current_context().mode.value,
+            )
+        else:
+            result = self._answer_uncached(task_type, text, model_class, prompt)
+        return self._project(task_type, result, fields)
+
+    def _answer_uncached(self, task_type: TaskType, text: str, model_class: type, prompt: PromptTemplate):
+        fast_path = self.fast_paths.get(task_type)
+        if fast_path is not None and current_context().mode != Mode.ACCURATE:
+            return fast_path.answer(text, lambda: self._ask_model(task_type, text, model_class, prompt))
+        return self._ask_model(task_type, text, model_class, prompt)
+
+    def _prompt(self, task_type: TaskType, fields: Optional[list[str]]) -> PromptTemplate:
+        """The route's prompt, narrowed to the requested fields plus those the pipeline reads.
+
+        The cascade needs `confidence` to decide on escalation and the fast path compares
+        its agreement field, so those stay in the schema even when not requested.
+        """
+        prompt = self.prompts[task_type]
+        if fields is None:
+            return prompt
+        needed = set(prompt.project(fields).fields)
+        if self.router.get_cascade(task_type, current_context().mode) is not None and "confidence" in prompt.fields:
+            needed.add("confidence")
+        if task_type in self.fast_paths:
+            needed.add(AGREEMENT_FIELDS[task_type])
+        return prompt.project(needed)
+
+    def _check_fields(self, task_type: TaskType, fields: Optional[list[str]]) -> None:
+        """Raises UnknownFields up front; the chunked and incremental paths never build a projected prompt."""
+        if fields is not None:
+            self.prompts[task_type].project(fields)
+
+    def _project(self, task_type: TaskType, result, fields: Optional[list[str]]):
+        if fields is None:
+            return result
+        omitted = [name for name in self.prompts[task_type].fields if name not in fields]
+        return result.model_copy(update=dict.fromkeys(omitted))
+
+    def _ask_model(self, task_type: TaskType, text: str, model_class: type, prompt: Optional[PromptTemplate] = None):
+        """Asks the route's model, or with a cascade the small model first.
+
+        The small model's answer is kept when it parses and its confidence reaches the
+        route's threshold (answers without a confidence field only need to parse);
+        otherwise the same prompt goes to the route's configured model.
+        """
+        prompt = prompt or self.prompts[task_type]
+        messages = prompt.messages(text)
+        context = current_context()
+        cascade = self.router.get_cascade(task_type, context.mode)
+        if cascade is None:
+            return self._parse_json(self._chat(messages, task_type, text), model_class, prompt.fields)
+        self.speculation.deposit()
+        if settings.CASCADE_SPECULATIVE_ENABLED and context.speculative and self.speculation.try_acquire():
+            return self._answer_speculatively(messages, task_type, text, model_class, cascade, context, prompt.fields)
+        raw = self._chat(messages, task_type, text, cascade.model)
+        result, outcome = self._small_answer(raw, model_class, cascade, prompt.fields)
+        cascade_stats.record(task_type.value, outcome)
+        if result is None:
+            result = self._parse_json(self._chat(messages, task_type, text), model_class, prompt.fields)
+            result.modelTier = "large"
+        return result
+
+    def _answer_speculatively(
+        self,
+        messages: list[dict],
+        task_type: TaskType,
+        text: str,
+        model_class: type,
+        cascade: CascadeRoute,
+        context: RequestContext,
+        fields: tuple[str, ...],
+    ):
+        """Runs the large model alongside the small one and cancels it only when the small answer is kept."""
+        # Its own context lets the large call be cancelled alone; the deadline makes it
+        # stream, which is what allows aborting it mid-generation
+        large_context = RequestContext(
+            context.priority, context.deadline or deadline_from_header(None), mode=context.mode
         )
-        response = self._chat(prompt, model)
-        return self._parse_json(response, IntentResponse)
+        unlink = context.on_cancel(lambda: large_context.cancel(context.cancel_reason))
+        large = self.speculation.submit(self._chat_in_context, large_context, messages, task_type, text)
+        wasted = True
+        try:
+            try:
+                raw = self._chat(messages, task_type, text, cascade.model)
+            except RequestCancelled:
+                raise
+            except Exception:
+                # A failed small call must not cost the answer the large call is already making
+                result, outcome = None, "escalated_error"
+            else:
+                result, outcome = self._small_answer(raw, model_class, cascade, fields)
+            cascade_stats.record(task_type.value, outcome)
+            if result is not None:
+                return result
+            wasted = False
+            result = self._parse_json(large.result(), model_class, fields)
+            result.modelTier = "large"
+            return result
+        finally:
+            unlink()
+            if wasted:
+                large_context.cancel(SPECULATION_LOST)
+            large.add_done_callback(lambda _: self.speculation.release(wasted))
+
+    def _chat_in_context(self, context: RequestContext, messages: list[dict], task_type: TaskType, text: str) -> str:
+        set_context(context)
+        return self._chat(messages, task_type, text)
+
+    def _small_answer(self, raw: str, model_class: type, cascade: CascadeRoute, fields: tuple[str, ...]):
+        """The small model's answer if it may be kept (else None), and the cascade outcome."""
+        try:
+            result = self._parse_json(raw, model_class, fields)
+        except RuntimeError:
+            return None, "escalated_invalid"
+        confidence = getattr(result, "confidence", None)
+        if confidence is None or confidence >= cascade.min_confidence:
+            result.modelTier = "small"
+            return result, "answered_small"
+        return None, "escalated_low_confidence"
 
     @staticmethod
-    def _parse_json(raw: str, model_class: type):
+    def _parse_json(raw: str, model_class: type, fields: tuple[str, ...]):
+        """Parses the model's answer, which must carry every field the prompt asked for."""
         cleaned = raw.strip()
         # Strip markdown code blocks if present
         cleaned = re.sub(r"^```json\s*", "", cleaned)
@@ -101,6 +382,21 @@ class AIService:
         cleaned = cleaned.strip()
         try:
             data = json.loads(cleaned)
-            return model_class(**data)
+            result = model_class(**data)
         except Exception as e:
             raise RuntimeError(f"Failed to parse AI response as JSON: {raw}") from e
+        missing = [name for name in fields if getattr(result, name) is None]
+        if missing:
+            raise RuntimeError(f"AI response is missing fields {missing}: {raw}")
+        return result
+
+
+def _abort(response: httpx.Response) -> None:
+    """Shuts the upstream socket down so the worker blocked reading it returns at once."""
+    stream = response.extensions.get("network_stream")
+    sock = stream.get_extra_info("socket") if stream is not None else None
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
@@ -0,0 +1,52 @@
+import hashlib
+import re
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# A paragraph whose hash is divisible by this ends a chunk once it has MIN chars, so
+# chunks average a few paragraphs beyond the minimum
+BOUNDARY_DIVISOR = 4
+
+
+def content_hash(text: str) -> str:
+    """Digest of the text with whitespace collapsed, so reflowing does not change it."""
+    return hashlib.blake2b(" ".join(text.split()).encode(), digest_size=16).hexdigest()
+
+
+def _units(text: str, max_chars: int) -> list[str]:
+    """Paragraphs; longer ones split into sentences, longer sentences into max_chars slices."""
+    units = []
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        paragraph = paragraph.strip()
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            units.extend(sentence[i : i + max_chars] for i in range(0, len(sentence), max_chars))
+    return [u for u in units if u]
+
+
+def split_chunks(text: str, min_chars: int, max_chars: int) -> list[str]:
+    """Splits text into chunks of roughly min_chars..max_chars at content-defined boundaries.
+
+    Whether a paragraph ends a chunk depends only on its own content, not on its
+    offset, so an edit moves at most the boundaries next to it: the chunks before
+    and after the change keep the same text and hash.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for unit in _units(text, max_chars):
+        # Chunk sizes count the paragraph breaks that join the units
+        if current and size + 2 + len(unit) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        size += len(unit) + (2 if current else 0)
+        current.append(unit)
+        if size >= min_chars and int(content_hash(unit), 16) % BOUNDARY_DIVISOR == 0:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
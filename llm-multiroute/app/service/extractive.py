@@ -0,0 +1,135 @@
+import math
+import re
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from app.metrics import metrics
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WORD = re.compile(r"\w+")
+
+# Rough Ollama tokenizer average for English text
+CHARS_PER_TOKEN = 4
+# Words are hashed into this many TF-IDF columns, which bounds memory for any vocabulary
+HASH_DIMENSIONS = 2048
+DAMPING = 0.85
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_BREAK.split(text) if s and s.strip()]
+
+
+def textrank(sentences: list[str], iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """TextRank centrality of each sentence over TF-IDF cosine similarity."""
+    n = len(sentences)
+    rows, columns = [], []
+    for i, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            rows.append(i)
+            columns.append(zlib.crc32(word.encode()) % HASH_DIMENSIONS)
+    tf = np.zeros((n, HASH_DIMENSIONS), dtype=np.float32)
+    np.add.at(tf, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+    df = np.count_nonzero(tf, axis=0)
+    tfidf = tf * (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf /= np.where(norms == 0, 1.0, norms)
+    similarity = tfidf @ tfidf.T
+    np.fill_diagonal(similarity, 0.0)
+    # Row-normalized similarity is the random-walk transition matrix; isolated sentences jump uniformly
+    out = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(out > 0, similarity / np.where(out == 0, 1.0, out), 1.0 / n)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def rank_sentences(sentences: list[str], max_sentences: int) -> np.ndarray:
+    """TextRank scores, computed within even blocks of at most `max_sentences` consecutive sentences.
+
+    A single graph costs quadratic memory and time in the sentence count; blocks keep it
+    linear for long documents. Each block's scores sum to one, so they are scaled by the
+    block size to stay comparable across blocks.
+    """
+    n = len(sentences)
+    if n <= max_sentences:
+        return textrank(sentences)
+    blocks = np.array_split(np.arange(n), math.ceil(n / max_sentences))
+    return np.concatenate([textrank([sentences[i] for i in block]) * len(block) / n for block in blocks])
+
+
+class Compression:
+    def __init__(self, text: str, original_tokens: int, kept_tokens: int):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.kept_tokens = kept_tokens
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of the estimated input tokens that was kept."""
+        return self.kept_tokens / self.original_tokens
+
+    @property
+    def removed_tokens(self) -> int:
+        return self.original_tokens - self.kept_tokens
+
+
+class ExtractiveStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.compressed = 0
+        self.original_tokens = 0
+        self.kept_tokens = 0
+
+    def record(self, compression: Optional[Compression]) -> None:
+        with self._lock:
+            self.requests += 1
+            if compression is not None:
+                self.compressed += 1
+                self.original_tokens += compression.original_tokens
+                self.kept_tokens += compression.kept_tokens
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "compressed": self.compressed,
+                "estimated_tokens_removed": self.original_tokens - self.kept_tokens,
+                "ratio": round(self.kept_tokens / self.original_tokens, 4) if self.original_tokens else None,
+            }
+
+
+def compress(text: str, token_budget: int, max_sentences: int = 500) -> Optional[Compression]:
+    """The most central sentences that fit `token_budget`, in their original order.
+
+    Returns None when the text already fits or cannot be split into sentences.
+    """
+    original_tokens = estimate_tokens(text)
+    sentences = split_sentences(text)
+    if original_tokens <= token_budget or len(sentences) < 2:
+        return None
+    keep, used = [], 0
+    for i in np.argsort(-rank_sentences(sentences, max_sentences), kind="stable"):
+        tokens = estimate_tokens(sentences[i])
+        if used + tokens <= token_budget:
+            keep.append(i)
+            used += tokens
+    if not keep:
+        return None
+    kept = " ".join(sentences[i] for i in sorted(keep))
+    return Compression(kept, original_tokens, estimate_tokens(kept))
+
+
+extractive_stats = ExtractiveStats()
+metrics.register("extractive", extractive_stats.snapshot)
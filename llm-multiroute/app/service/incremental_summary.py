@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.config import settings
+from app.dto.summary_response import SummaryResponse
+from app.metrics import metrics
+from app.service.chunking import content_hash, split_chunks
+
+
+class IncrementalSummaryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.chunks = 0
+        self.chunks_reused = 0
+        self.merges_reused = 0
+
+    def record(self, chunks: int, reused: int, merge_reused: bool) -> None:
+        with self._lock:
+            self.documents += 1
+            self.chunks += chunks
+            self.chunks_reused += reused
+            self.merges_reused += merge_reused
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "chunks": self.chunks,
+                "chunks_reused": self.chunks_reused,
+                "chunk_reuse_rate": round(self.chunks_reused / self.chunks, 4) if self.chunks else 0.0,
+                "merges_reused": self.merges_reused,
+            }
+
+
+class IncrementalSummarizer:
+    """Map-reduce summarization that only re-summarizes the chunks an edit touched.
+
+    The document is split at content-defined boundaries and each chunk's summary is
+    cached under the hash of its text. A new version of the document therefore costs
+    one section call per changed chunk plus the merge; an unchanged one costs nothing,
+    because the merge is cached under the hash of the section summaries it combined.
+    The least recently used entries are dropped beyond `max_entries`.
+    """
+
+    def __init__(self, min_chars: int, max_chars: int, max_entries: int):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.max_entries = max_entries
+        self.stats = IncrementalSummaryStats()
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, SummaryResponse] = OrderedDict()
+
+    def applies_to(self, text: str) -> bool:
+        return len(text) > self.max_chars
+
+    def summarize(
+        self,
+        text: str,
+        scope: str,
+        summarize_section: Callable[[str], SummaryResponse],
+        merge: Callable[[str], SummaryResponse],
+    ) -> SummaryResponse:
+        """`scope` (model and prompt version) is part of every key, so changing either starts afresh."""
+        chunks = split_chunks(text, self.min_chars, self.max_chars)
+        sections = []
+        reused = 0
+        for chunk in chunks:
+            key = f"{scope}:section:{content_hash(chunk)}"
+            section = self._get(key)
+            if section is None:
+                section = summarize_section(chunk)
+                self._put(key, section)
+            else:
+                reused += 1
+            sections.append(section)
+        combined = "\n\n".join(_render_section(i, s) for i, s in enumerate(sections, 1))
+        key = f"{scope}:merge:{content_hash(combined)}"
+        result = self._get(key)
+        self.stats.record(len(chunks), reused, merge_reused=result is not None)
+        if result is None:
+            result = merge(combined)
+            self._put(key, result)
+        return result.model_copy()
+
+    def _get(self, key: str) -> Optional[SummaryResponse]:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _put(self, key: str, value: SummaryResponse) -> None:
+        with self._lock:
+            self._cache[key] = value.model_copy()
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries = len(self._cache)
+        return {"entries": entries, **self.stats.snapshot()}
+
+
+def _render_section(number: int, section: SummaryResponse) -> str:
+    points = "".join(f"\n- {p}" for p in section.keyPoints)
+    return f"Section {number}: {section.summary}{points}"
+
+
+incremental_summarizer = (
+    IncrementalSummarizer(
+        settings.SUMMARIZE_CHUNK_MIN_CHARS,
+        settings.SUMMARIZE_CHUNK_MAX_CHARS,
+        settings.SUMMARIZE_CACHE_MAX_ENTRIES,
+    )
+    if settings.SUMMARIZE_INCREMENTAL_ENABLED
+    else None
+)
+if incremental_summarizer is not None:
+    metrics.register("incremental_summarize", incremental_summarizer.snapshot)
@@ -0,0 +1,130 @@
+import json
+import threading
+from typing import Iterable
+
+from app.config import settings
+from app.router.model_router import TaskType
+
+JSON_ONLY = "Respond with ONLY valid JSON, no additional text or explanation."
+
+PROMPT_LAYOUTS = ("system_prefix", "inline")
+
+SUMMARY_SCHEMA = {"summary": "your summary here", "keyPoints": ["point1", "point2", "point3"], "wordCount": 25}
+
+
+class UnknownFields(ValueError):
+    """A field projection names fields the task does not produce."""
+
+
+class PromptTemplate:
+    """Chat messages for one task.
+
+    With the `system_prefix` layout the instructions and JSON format live in a system
+    message that is identical on every request and the text comes last, so Ollama
+    reuses the cached prefix and only evaluates the new tokens. `inline` is the
+    original single user message with the text in the middle, kept for A/B runs.
+
+    `schema` maps each answer field to an example value, in the order the model
+    should write them; `project` narrows it to the fields a caller asked for.
+    """
+
+    def __init__(self, instruction: str, schema: dict, layout: str = "system_prefix"):
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{layout}', expected one of {PROMPT_LAYOUTS}")
+        self.instruction = instruction
+        self.fields = tuple(schema)
+        self.schema = json.dumps(schema)
+        self.layout = layout
+        self.system_prompt = f"{instruction} {JSON_ONLY}\n\nReturn JSON in this exact format:\n{self.schema}"
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        self._examples = schema
+        self._projections: dict[tuple[str, ...], PromptTemplate] = {}
+        self._lock = threading.Lock()
+
+    def project(self, fields: Iterable[str]) -> "PromptTemplate":
+        """This template asking only for `fields`.
+
+        Projections are built once and reused, so each field set keeps a fixed system
+        prefix that Ollama can cache like the full one.
+        """
+        wanted = set(fields)
+        unknown = wanted - set(self.fields)
+        if unknown or not wanted:
+            raise UnknownFields(f"Unknown fields {sorted(unknown)}, expected some of {list(self.fields)}")
+        key = tuple(name for name in self.fields if name in wanted)
+        if key == self.fields:
+            return self
+        with self._lock:
+            projection = self._projections.get(key)
+            if projection is None:
+                schema = {name: self._examples[name] for name in key}
+                projection = PromptTemplate(self.instruction, schema, self.layout)
+                self._projections[key] = projection
+            return projection
+
+    def messages(self, text: str) -> list[dict]:
+        if self.layout == "inline":
+            content = (
+                f"{self.instruction} {JSON_ONLY}\n\n"
+                f"Text: {text}\n\n"
+                f"Return JSON in this exact format:\n{self.schema}"
+            )
+            return [{"role": "user", "content": content}]
+        return [self._system_message, {"role": "user", "content": f"Text: {text}"}]
+
+
+def build_prompts(layout: str) -> dict[TaskType, PromptTemplate]:
+    return {
+        TaskType.CLASSIFY: PromptTemplate(
+            "Analyze the following text and classify it with appropriate labels and tags.",
+            {"labels": ["label1", "label2"], "primaryCategory": "category", "confidence": 0.9},
+            layout,
+        ),
+        TaskType.SENTIMENT: PromptTemplate(
+            "Analyze the sentiment of the following text.",
+            {
+                "overallSentiment": "positive",
+                "sentimentScore": 0.8,
+                "emotions": ["joy", "excitement"],
+                "confidence": 0.9,
+            },
+            layout,
+        ),
+        TaskType.SUMMARIZE: PromptTemplate(
+            "Summarize the following text concisely.",
+            SUMMARY_SCHEMA,
+            layout,
+        ),
+        TaskType.INTENT: PromptTemplate(
+            "Detect the intent behind the following text.",
+            {
+                "primaryIntent": "main_intent",
+                "secondaryIntents": ["intent1", "intent2"],
+                "intentCategory": "question",
+                "confidence": 0.9,
+            },
+            layout,
+        ),
+    }
+
+
+def build_summary_stages(layout: str) -> dict[str, PromptTemplate]:
+    """Map and reduce prompts for summarizing a long document in chunks."""
+    return {
+        "section": PromptTemplate(
+            "Summarize the following section of a longer document concisely. "
+            "Keep names, figures and decisions.",
+            SUMMARY_SCHEMA,
+            layout,
+        ),
+        "merge": PromptTemplate(
+            "The following are summaries of consecutive sections of one document, in order. "
+            "Combine them into one concise summary of the whole document.",
+            SUMMARY_SCHEMA,
+            layout,
+        ),
+    }
+
+
+prompts = build_prompts(settings.PROMPT_LAYOUT)
+summary_stages = build_summary_stages(settings.PROMPT_LAYOUT)
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.concurrency.adaptive import AdaptiveLimiter, AdaptiveLimits
+from app.concurrency.admission import AdmissionRejected
+from app.router.model_router import ModelRouter
+from app.service.ai_service import AIService
+
+
+def _limiter(**overrides) -> AdaptiveLimiter:
+    params = dict(initial_limit=4, min_limit=1, max_limit=16, backoff_ratio=0.5, tolerance=2.0, max_wait_seconds=0.05)
+    params.update(overrides)
+    return AdaptiveLimiter("gemma3:4b", **params)
+
+
+class TestAdaptiveLimiter:
+    def test_additive_increase_when_healthy_and_utilized(self):
+        limiter = _limiter()
+        limiter.scheduler.in_flight = 1
+        limiter.release(0.1, ok=True, in_flight_at_start=4)
+
+        for _ in range(20):
+            limiter.scheduler.in_flight = 1
+            limiter.release(0.1, ok=True, in_flight_at_start=4)
+
+        assert limiter.limit > 4
+        assert limiter.increases == 20
+        assert limiter.baseline == pytest.approx(0.1)
+
+    def test_no_increase_when_limit_unused(self):
+        limiter = _limiter()
+        for _ in range(10):
+            limiter.scheduler.in_flight = 1
+            limiter.release(0.1, ok=True, in_flight_at_start=1)
+
+        assert limiter.limit == 4
+
+    def test_latency_spike_cuts_limit(self):
+        limiter = _limiter()
+        limiter.scheduler.in_flight = 2
+        limiter.release(0.1, ok=True, in_flight_at_start=4)
+        limiter.release(1.0, ok=True, in_flight_at_start=4)
+
+        assert limiter.limit == 2
+        assert limiter.decreases == 1
+
+    def test_error_cuts_limit_once_per_baseline_interval(self):
+        limiter = _limiter()
+        limiter.scheduler.in_flight = 3
+        limiter.release(10.0, ok=True, in_flight_at_start=1)
+        limiter.release(0.1, ok=False, in_flight_at_start=4)
+        limiter.release(0.1, ok=False, in_flight_at_start=4)
+
+        assert limiter.limit == 2
+        assert limiter.decreases == 1
+
+    def test_limit_never_below_minimum(self):
+        limiter = _limiter(min_limit=2)
+        limiter.baseline = 0.0
+        for _ in range(5):
+            limiter.scheduler.in_flight = 1
+            limiter._last_decrease = 0.0
+            limiter.release(0.1, ok=False, in_flight_at_start=4)
+
+        assert limiter.limit == 2
+
+    def test_acquire_rejects_after_max_wait(self):
+        limiter = _limiter(initial_limit=1)
+        limiter.acquire()
+
+        with pytest.raises(AdmissionRejected):
+            limiter.acquire()
+        assert limiter.rejected == 1
+
+    def test_waiter_proceeds_when_slot_frees(self):
+        limiter = _limiter(initial_limit=1, max_wait_seconds=2)
+        limiter.acquire()
+        acquired = []
+
+        thread = threading.Thread(target=lambda: acquired.append(limiter.acquire()))
+        thread.start()
+        time.sleep(0.02)
+        limiter.release(0.01, ok=True, in_flight_at_start=1)
+        thread.join(timeout=2)
+
+        assert acquired == [1]
+
+    def test_snapshot(self):
+        snapshot = _limiter().snapshot()
+
+        assert snapshot["limit"] == 4
+        assert snapshot["in_flight"] == 0
+
+
+class TestAdaptiveLimitsInService:
+    def _service(self, http_client) -> AIService:
+        return AIService(http_client=http_client, router=ModelRouter(), limits=AdaptiveLimits())
+
+    def test_successful_call_feeds_limiter(self):
+        http_client = MagicMock()
+        http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'}
+        }
+        service = self._service(http_client)
+
+        service.classify_text("text")
+
+        snapshot = service.limits.snapshot()["models"]["gemma3:4b"]
+        assert snapshot["in_flight"] == 0
+        assert snapshot["last_latency_ms"] >= 0
+
+    def test_upstream_503_counts_as_overload(self):
+        http_client = MagicMock()
+        error = httpx.HTTPStatusError("busy", request=MagicMock(), response=MagicMock(status_code=503))
+        http_client.post.return_value.raise_for_status.side_effect = error
+        service = self._service(http_client)
+        limiter = service.limits.get("gemma3:4b")
+        limiter.baseline = 0.0
+
+        with pytest.raises(httpx.HTTPStatusError):
+            service.classify_text("text")
+
+        assert limiter.decreases == 1
+        assert limiter.in_flight == 0
+
+    def test_disabled_limits_bypass(self):
+        http_client = MagicMock()
+        http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'}
+        }
+        service = self._service(http_client)
+        service.limits.enabled = False
+
+        service.classify_text("text")
+
+        assert service.limits.snapshot()["models"] == {}
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.concurrency.admission import AdmissionController, AdmissionLimiter, AdmissionRejected
+from app.router.model_router import TaskType
+
+
+class TestAdmissionLimiter:
+    def test_admits_up_to_limit_without_waiting(self):
+        limiter = AdmissionLimiter("classify", max_concurrency=2, queue_size=0, max_queue_seconds=1)
+
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+            with pytest.raises(AdmissionRejected) as exc_info:
+                await limiter.acquire()
+            return exc_info.value
+
+        rejected = asyncio.run(run())
+
+        assert limiter.in_flight == 2
+        assert rejected.reason == "queue full"
+        assert rejected.retry_after >= 1
+        assert limiter.rejected_queue_full == 1
+
+    def test_queued_request_gets_released_slot(self):
+        limiter = AdmissionLimiter("classify", max_concurrency=1, queue_size=1, max_queue_seconds=1)
+
+        async def run():
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0.01)
+            assert limiter.queued == 1
+            limiter.release()
+            return await waiter
+
+        waited = asyncio.run(run())
+
+        assert waited > 0
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+        assert limiter.admitted == 2
+
+    def test_queue_timeout_rejects(self):
+        limiter = AdmissionLimiter("summarize", max_concurrency=1, queue_size=1, max_queue_seconds=0.02)
+
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            asyncio.run(run())
+
+        assert exc_info.value.reason == "queue timeout"
+        assert limiter.queued == 0
+        assert limiter.rejected_timeout == 1
+
+    def test_cancelled_waiter_leaves_queue(self):
+        limiter = AdmissionLimiter("intent", max_concurrency=1, queue_size=1, max_queue_seconds=5)
+
+        async def run():
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            limiter.release()
+
+        asyncio.run(run())
+
+        assert limiter.queued == 0
+        assert limiter.in_flight == 0
+
+    def test_retry_after_grows_with_queue(self):
+        limiter = AdmissionLimiter("classify", max_concurrency=1, queue_size=10, max_queue_seconds=1)
+        limiter.release(held_seconds=6.0)
+        limiter.in_flight = 1
+
+        assert limiter.retry_after() >= 2
+
+    def test_snapshot_exposes_queue_and_wait(self):
+        limiter = AdmissionLimiter("classify", max_concurrency=4, queue_size=8, max_queue_seconds=2)
+
+        asyncio.run(limiter.acquire())
+        snapshot = limiter.snapshot()
+
+        assert snapshot["in_flight"] == 1
+        assert snapshot["queued"] == 0
+        assert snapshot["wait_ms"]["count"] == 1
+
+
+class TestAdmissionController:
+    def test_limits_come_from_settings(self):
+        controller = AdmissionController()
+
+        assert controller.get(TaskType.SUMMARIZE).max_concurrency == 8
+        assert controller.get(TaskType.CLASSIFY).max_concurrency == 16
+        assert controller.total_capacity == 56
+
+    def test_snapshot_covers_all_routes(self):
+        snapshot = AdmissionController().snapshot()
+
+        assert set(snapshot["routes"]) == {"classify", "sentiment", "summarize", "intent"}
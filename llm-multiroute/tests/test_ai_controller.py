@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.concurrency.admission import AdmissionLimiter
+from app.context import Priority, current_context
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
@@ -36,7 +38,9 @@ class TestClassifyEndpoint:
         assert data["labels"] == ["technology", "healthcare", "AI"]
         assert data["primaryCategory"] == "technology"
         assert data["confidence"] == 0.95
-        mock_ai_service.classify_text.assert_called_once_with("Artificial intelligence is transforming healthcare.")
+        mock_ai_service.classify_text.assert_called_once_with(
+            "Artificial intelligence is transforming healthcare.", None
+        )
 
     def test_empty_labels(self, client, mock_ai_service):
         mock_ai_service.classify_text.return_value = ClassificationResponse(
@@ -78,7 +82,7 @@ class TestSentimentEndpoint:
         assert data["sentimentScore"] == 0.85
         assert data["emotions"] == ["joy", "excitement"]
         assert data["confidence"] == 0.92
-        mock_ai_service.analyze_sentiment.assert_called_once_with("I love this product! It's amazing!")
+        mock_ai_service.analyze_sentiment.assert_called_once_with("I love this product! It's amazing!", None)
 
     def test_negative_sentiment(self, client, mock_ai_service):
         mock_ai_service.analyze_sentiment.return_value = SentimentResponse(
@@ -144,7 +148,7 @@ class TestSummarizeEndpoint:
         assert data["summary"] != ""
         assert len(data["keyPoints"]) == 3
         assert data["wordCount"] == 15
-        mock_ai_service.summarize_text.assert_called_once_with(input_text)
+        mock_ai_service.summarize_text.assert_called_once_with(input_text, None)
 
     def test_short_text_minimal_summary(self, client, mock_ai_service):
         mock_ai_service.summarize_text.return_value = SummaryResponse(
@@ -186,7 +190,7 @@ class TestIntentEndpoint:
         assert data["secondaryIntents"] == ["location_search", "recommendation_request"]
         assert data["intentCategory"] == "question"
         assert data["confidence"] == 0.88
-        mock_ai_service.detect_intent.assert_called_once_with("Where is the nearest restaurant?")
+        mock_ai_service.detect_intent.assert_called_once_with("Where is the nearest restaurant?", None)
 
     def test_command_intent(self, client, mock_ai_service):
         mock_ai_service.detect_intent.return_value = IntentResponse(
@@ -313,3 +317,82 @@ class TestRequestValidation:
         )
 
         assert response.status_code == 422
+
+
+class TestAdmissionControl:
+    def test_overloaded_route_returns_429_with_retry_after(self, client, mock_ai_service):
+        limiter = AdmissionLimiter("classify", max_concurrency=0, queue_size=0, max_queue_seconds=1)
+
+        with patch("app.controller.ai_controller.admission_controller") as controller:
+            controller.enabled = True
+            controller.get.return_value = limiter
+            response = client.post("/api/ai/classify", json={"text": "test"})
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        mock_ai_service.classify_text.assert_not_called()
+
+    def test_slot_released_after_request(self, client, mock_ai_service):
+        mock_ai_service.classify_text.return_value = ClassificationResponse(
+            labels=["t"], primaryCategory="t", confidence=0.9
+        )
+        limiter = AdmissionLimiter("classify", max_concurrency=1, queue_size=0, max_queue_seconds=1)
+
+        with patch("app.controller.ai_controller.admission_controller") as controller:
+            controller.enabled = True
+            controller.get.return_value = limiter
+            first = client.post("/api/ai/classify", json={"text": "one"})
+            second = client.post("/api/ai/classify", json={"text": "two"})
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert limiter.in_flight == 0
+        assert limiter.admitted == 2
+
+    def test_metrics_expose_admission_state(self, client, mock_ai_service):
+        response = client.get("/api/ai/metrics")
+
+        assert response.status_code == 200
+        routes = response.json()["admission"]["routes"]
+        assert set(routes) == {"classify", "sentiment", "summarize", "intent"}
+        assert "queued" in routes["classify"]
+        assert "wait_ms" in routes["classify"]
+
+
+class TestPriorityClassification:
+    def _capture_priority(self, mock_ai_service) -> list:
+        seen = []
+
+        def classify(text, fields):
+            seen.append(current_context().priority)
+            return ClassificationResponse(labels=["t"], primaryCategory="t", confidence=0.9)
+
+        mock_ai_service.classify_text.side_effect = classify
+        return seen
+
+    def test_priority_header_reaches_service(self, client, mock_ai_service):
+        seen = self._capture_priority(mock_ai_service)
+
+        response = client.post("/api/ai/classify", json={"text": "test"}, headers={"X-Priority": "batch"})
+
+        assert response.status_code == 200
+        assert seen == [Priority.BATCH]
+
+    def test_default_priority_is_interactive(self, client, mock_ai_service):
+        seen = self._capture_priority(mock_ai_service)
+
+        client.post("/api/ai/classify", json={"text": "test"})
+
+        assert seen == [Priority.INTERACTIVE]
+
+    def test_api_key_class_overrides_higher_header(self, client, mock_ai_service):
+        seen = self._capture_priority(mock_ai_service)
+
+        with patch.dict("app.context.API_KEY_PRIORITIES", {"nightly": Priority.BATCH}):
+            client.post(
+                "/api/ai/classify",
+                json={"text": "test"},
+                headers={"X-Priority": "interactive", "X-API-Key": "nightly"},
+            )
+
+        assert seen == [Priority.BATCH]
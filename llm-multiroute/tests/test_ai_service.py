@@ -19,12 +19,14 @@ def mock_http_client():
 @pytest.fixture
 def mock_router():
     router = MagicMock(spec=ModelRouter)
-    router.get_model.side_effect = lambda t: {
+    router.get_model.side_effect = lambda t, mode=None: {
         TaskType.CLASSIFY: "gemma3:4b",
         TaskType.SENTIMENT: "ministral-3:3b",
         TaskType.SUMMARIZE: "ministral-3:8b",
         TaskType.INTENT: "gemma3:12b",
     }[t]
+    router.get_options.side_effect = ModelRouter().get_options
+    router.get_cascade.return_value = None
     return router
 
 
@@ -305,6 +307,15 @@ class TestModelRoutingIntegration:
             body = call_args.kwargs.get("json") or call_args[1].get("json")
             assert body["model"] == expected_model, f"Expected model {expected_model}, got {body['model']}"
 
+    def test_route_options_nested_under_options(self, ai_service, mock_http_client):
+        _setup_chat_response(mock_http_client, '{"summary": "s", "keyPoints": ["p"], "wordCount": 1}')
+
+        ai_service.summarize_text("text")
+
+        body = mock_http_client.post.call_args.kwargs["json"]
+        assert "temperature" not in body
+        assert body["options"] == {"temperature": 0.7, "num_predict": 512}
+
 
 class TestJsonParsingEdgeCases:
     def test_extra_whitespace(self, ai_service, mock_http_client):
@@ -339,9 +350,10 @@ class TestJsonParsingEdgeCases:
 
         call_args = mock_http_client.post.call_args
         body = call_args.kwargs.get("json") or call_args[1].get("json")
-        prompt = body["messages"][0]["content"]
-        assert "Test input text" in prompt
-        assert "Respond with ONLY valid JSON" in prompt
-        assert "labels" in prompt
-        assert "primaryCategory" in prompt
-        assert "confidence" in prompt
+        system, user = body["messages"]
+        assert system["role"] == "system"
+        assert "Respond with ONLY valid JSON" in system["content"]
+        assert "labels" in system["content"]
+        assert "primaryCategory" in system["content"]
+        assert "confidence" in system["content"]
+        assert user == {"role": "user", "content": "Text: Test input text"}
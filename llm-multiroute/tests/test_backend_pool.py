@@ -0,0 +1,232 @@
+import time
+from collections import Counter
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.context import CLIENT_DISCONNECTED, RequestCancelled, RequestContext, UpstreamTimeout, set_context
+from app.router.backend_pool import Backend, BackendPool, NoBackendAvailable, parse_backends
+from app.router.hash_ring import affinity_key
+from app.router.model_router import ModelRouter
+from app.service.ai_service import AIService
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://node/api/chat")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+class TestParseBackends:
+    def test_empty_uses_base_url_for_every_model(self):
+        backends = parse_backends("", "https://ollama.com")
+
+        assert len(backends) == 1
+        assert backends[0].url == "https://ollama.com"
+        assert backends[0].serves("anything")
+        assert backends[0].authenticated
+
+    def test_entries_with_models_and_weight(self):
+        backends = parse_backends(
+            "http://gpu1:11434 models=gemma3:4b,gemma3:12b weight=3; https://ollama.com/",
+            "https://ollama.com",
+        )
+
+        assert [b.url for b in backends] == ["http://gpu1:11434", "https://ollama.com"]
+        assert backends[0].models == {"gemma3:4b", "gemma3:12b"}
+        assert backends[0].weight == 3
+        assert not backends[0].authenticated
+        assert backends[1].models is None
+        assert backends[1].authenticated
+
+
+class TestBalancing:
+    def test_only_nodes_serving_the_model_are_candidates(self):
+        pool = BackendPool([Backend("http://a", frozenset({"gemma3:4b"})), Backend("http://b")])
+
+        assert {pool.select("ministral-3:8b").url for _ in range(5)} == {"http://b"}
+        with pytest.raises(NoBackendAvailable):
+            BackendPool([Backend("http://a", frozenset({"gemma3:4b"}))]).select("other")
+
+    def test_least_outstanding_prefers_idle_node(self):
+        busy, idle = Backend("http://busy"), Backend("http://idle")
+        busy.outstanding = 3
+        pool = BackendPool([busy, idle])
+
+        with pool.lease("m") as first:
+            with pool.lease("m") as second:
+                assert first is idle
+                assert second is idle
+        assert idle.outstanding == 0
+
+    def test_least_outstanding_spreads_ties(self):
+        pool = BackendPool([Backend("http://a"), Backend("http://b")])
+
+        picked = Counter(pool.select("m").url for _ in range(10))
+
+        assert picked == {"http://a": 5, "http://b": 5}
+
+    def test_weighted_round_robin(self):
+        pool = BackendPool([Backend("http://a", weight=3), Backend("http://b", weight=1)], policy="weighted")
+
+        picked = Counter(pool.select("m").url for _ in range(8))
+
+        assert picked == {"http://a": 6, "http://b": 2}
+
+
+class TestHealth:
+    def test_consecutive_failures_eject_until_health_check_passes(self):
+        flaky, good = Backend("http://flaky"), Backend("http://good")
+        pool = BackendPool([flaky, good], eject_after=2)
+        good.outstanding = 10
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                with pool.lease("m"):
+                    raise _status_error(503)
+
+        assert not flaky.healthy
+        assert pool.select("m") is good
+
+        client = MagicMock()
+        pool.check_health(client)
+
+        assert flaky.healthy
+        client.get.assert_any_call("http://flaky/api/tags", headers={})
+
+    def test_client_errors_do_not_eject(self):
+        node = Backend("http://node")
+        pool = BackendPool([node], eject_after=1)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            with pool.lease("m"):
+                raise _status_error(400)
+
+        assert node.healthy
+
+    def test_upstream_timeouts_eject_but_client_disconnects_do_not(self):
+        node = Backend("http://node", frozenset({"gemma3:4b"}))
+        pool = BackendPool([node], eject_after=2)
+        http_client = MagicMock()
+        http_client.stream.side_effect = httpx.ConnectTimeout("no answer")
+        service = AIService(http_client=http_client, router=ModelRouter(), backends=pool)
+
+        for _ in range(2):
+            context = RequestContext(deadline=time.monotonic() + 5)
+            set_context(context)
+            with pytest.raises(UpstreamTimeout):
+                service.classify_text("text")
+        set_context(None)
+
+        assert not node.healthy
+        assert node.failures == 2
+
+        pool.check_health(MagicMock())
+        for _ in range(2):
+            with pytest.raises(RequestCancelled):
+                with pool.lease("gemma3:4b"):
+                    raise RequestCancelled(CLIENT_DISCONNECTED)
+
+        assert node.healthy
+
+    def test_failed_health_check_ejects_and_all_down_fails_open(self):
+        a, b = Backend("http://a"), Backend("http://b")
+        pool = BackendPool([a, b])
+        client = MagicMock()
+        client.get.side_effect = httpx.ConnectError("refused")
+
+        pool.check_health(client)
+
+        assert not a.healthy and not b.healthy
+        assert pool.select("m") in (a, b)
+        assert pool.snapshot()["fail_open"] == 1
+
+
+class TestServiceUsesPool:
+    def test_request_goes_to_selected_node_with_auth_only_for_base_url(self):
+        http_client = MagicMock()
+        http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'}
+        }
+        pool = BackendPool([Backend("http://gpu1:11434", frozenset({"gemma3:4b"}))])
+        service = AIService(http_client=http_client, router=ModelRouter(), backends=pool)
+        service.api_key = "secret"
+
+        service.classify_text("text")
+
+        call = http_client.post.call_args
+        assert call.args[0] == "http://gpu1:11434/api/chat"
+        assert "Authorization" not in call.kwargs["headers"]
+        assert pool.backends[0].requests == 1
+
+
+class TestConsistentHash:
+    def _pool(self, count: int = 4, **kwargs) -> BackendPool:
+        return BackendPool([Backend(f"http://node{i}") for i in range(count)], policy="consistent_hash", **kwargs)
+
+    def test_same_text_lands_on_same_node(self):
+        pool = self._pool()
+        key = affinity_key("gemma3:4b", "The  quick brown fox", 512)
+
+        nodes = {pool.select("gemma3:4b", key).url for _ in range(10)}
+
+        assert len(nodes) == 1
+        assert affinity_key("gemma3:4b", "  the quick\nbrown FOX ", 512) == key
+        assert affinity_key("gemma3:12b", "the quick brown fox", 512) != key
+
+    def test_keys_spread_over_nodes(self):
+        pool = self._pool()
+
+        owners = Counter(pool.select("m", f"text {i}").url for i in range(1000))
+
+        assert len(owners) == 4
+        assert min(owners.values()) > 150
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        keys = [f"text {i}" for i in range(1000)]
+        before = {k: self._pool(4).select("m", k).url for k in keys}
+        three = BackendPool([Backend(f"http://node{i}") for i in range(3)], policy="consistent_hash")
+        after = {k: three.select("m", k).url for k in keys}
+
+        moved = [k for k in keys if before[k] != after[k]]
+
+        assert all(before[k] == "http://node3" for k in moved)
+        assert len(moved) < 400
+
+    def test_ejected_node_keys_move_to_next_node_only(self):
+        pool = self._pool()
+        keys = [f"text {i}" for i in range(200)]
+        before = {k: pool.select("m", k) for k in keys}
+        pool.backends[0].healthy = False
+
+        after = {k: pool.select("m", k) for k in keys}
+
+        assert all(after[k] is before[k] for k in keys if before[k] is not pool.backends[0])
+        assert all(after[k] is not pool.backends[0] for k in keys)
+
+    def test_overloaded_node_overflows_to_next(self):
+        pool = self._pool(load_factor=1.25)
+        key = "hot text"
+        owner = pool.select("m", key)
+        owner.outstanding = 5
+
+        chosen = pool.select("m", key)
+
+        assert chosen is not owner
+        assert pool.snapshot()["affinity_overflows"] == 1
+
+    def test_service_sends_affinity_key(self):
+        http_client = MagicMock()
+        http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'}
+        }
+        pool = self._pool()
+        service = AIService(http_client=http_client, router=ModelRouter(), backends=pool)
+
+        for _ in range(3):
+            service.classify_text("Same text")
+        service.classify_text("  same   TEXT")
+
+        urls = {call.args[0] for call in http_client.post.call_args_list}
+        assert len(urls) == 1
+        assert pool.snapshot()["affinity_hits"] == 4
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.concurrency.bulkhead import Bulkhead, Bulkheads
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+
+
+class TestBulkhead:
+    def test_each_route_has_its_own_pool(self):
+        bulkheads = Bulkheads()
+
+        clients = {id(bulkheads.get(task).client) for task in TaskType}
+
+        assert len(clients) == len(TaskType)
+        assert bulkheads.get(TaskType.SUMMARIZE).pool_size == 8
+        assert bulkheads.get(TaskType.CLASSIFY).pool_size == 16
+
+    def test_saturated_route_does_not_block_other_route(self):
+        bulkheads = Bulkheads()
+        bulkheads._bulkheads[TaskType.SUMMARIZE] = Bulkhead("summarize", workers=2, pool_size=2)
+        release = threading.Event()
+
+        async def run():
+            slow = [asyncio.create_task(bulkheads.run(TaskType.SUMMARIZE, release.wait, 5)) for _ in range(4)]
+            await asyncio.sleep(0.05)
+            snapshot = bulkheads.snapshot()["summarize"]
+            started = time.monotonic()
+            fast = await bulkheads.run(TaskType.CLASSIFY, lambda: "classified")
+            fast_seconds = time.monotonic() - started
+            release.set()
+            await asyncio.gather(*slow)
+            return snapshot, fast, fast_seconds
+
+        snapshot, fast, fast_seconds = asyncio.run(run())
+
+        assert snapshot["busy_workers"] == 2
+        assert snapshot["waiting_for_worker"] == 2
+        assert fast == "classified"
+        assert fast_seconds < 1
+
+    def test_service_uses_route_client(self):
+        bulkheads = Bulkheads()
+        for task in TaskType:
+            bulkheads.get(task).client = MagicMock()
+        summarize_client = bulkheads.get(TaskType.SUMMARIZE).client
+        summarize_client.post.return_value.json.return_value = {
+            "message": {"content": '{"summary": "s", "keyPoints": [], "wordCount": 1}'}
+        }
+        service = AIService(router=ModelRouter(), bulkheads=bulkheads)
+
+        service.summarize_text("text")
+
+        summarize_client.post.assert_called_once()
+        bulkheads.get(TaskType.CLASSIFY).client.post.assert_not_called()
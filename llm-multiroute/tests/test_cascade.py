@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.metrics import cascade_stats
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+
+
+@pytest.fixture
+def cascade_router():
+    with patch.multiple("app.config.settings", CASCADE_ENABLED=True, CASCADE_MODEL="ministral-3:3b"):
+        yield ModelRouter()
+
+
+def _answers(mock_http_client, *contents):
+    responses = []
+    for content in contents:
+        response = MagicMock()
+        response.json.return_value = {"message": {"content": content}}
+        responses.append(response)
+    mock_http_client.post.side_effect = responses
+
+
+def _models(mock_http_client) -> list[str]:
+    return [c.kwargs["json"]["model"] for c in mock_http_client.post.call_args_list]
+
+
+class TestCascadeRouting:
+    def test_disabled_by_default(self):
+        assert ModelRouter().get_cascade(TaskType.CLASSIFY) is None
+
+    def test_routes_with_threshold_get_cascade(self, cascade_router):
+        cascade = cascade_router.get_cascade(TaskType.INTENT)
+
+        assert cascade.model == "ministral-3:3b"
+        assert cascade.min_confidence == 0.8
+        # No threshold configured for summaries
+        assert cascade_router.get_cascade(TaskType.SUMMARIZE) is None
+        # Already routed to the cheap model
+        assert cascade_router.get_cascade(TaskType.SENTIMENT) is None
+
+
+class TestCascadeService:
+    def test_confident_small_answer_is_kept(self, cascade_router):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.93}')
+        service = AIService(http_client=mock_http_client, router=cascade_router)
+        before = cascade_stats.snapshot().get("classify", {}).get("answered_small", 0)
+
+        result = service.classify_text("text")
+
+        assert result.modelTier == "small"
+        assert _models(mock_http_client) == ["ministral-3:3b"]
+        assert cascade_stats.snapshot()["classify"]["answered_small"] == before + 1
+
+    def test_low_confidence_escalates(self, cascade_router):
+        mock_http_client = MagicMock()
+        _answers(
+            mock_http_client,
+            '{"labels": ["t"], "primaryCategory": "small", "confidence": 0.4}',
+            '{"labels": ["t"], "primaryCategory": "large", "confidence": 0.9}',
+        )
+        service = AIService(http_client=mock_http_client, router=cascade_router)
+
+        result = service.classify_text("text")
+
+        assert result.primaryCategory == "large"
+        assert result.modelTier == "large"
+        assert _models(mock_http_client) == ["ministral-3:3b", "gemma3:4b"]
+
+    def test_invalid_small_answer_escalates(self, cascade_router):
+        mock_http_client = MagicMock()
+        _answers(
+            mock_http_client,
+            "I think this is about travel.",
+            '{"primaryIntent": "i", "secondaryIntents": [], "intentCategory": "question", "confidence": 0.6}',
+        )
+        service = AIService(http_client=mock_http_client, router=cascade_router)
+        before = cascade_stats.snapshot().get("intent", {}).get("escalated_invalid", 0)
+
+        result = service.detect_intent("text")
+
+        assert result.modelTier == "large"
+        assert _models(mock_http_client) == ["ministral-3:3b", "gemma3:12b"]
+        assert cascade_stats.snapshot()["intent"]["escalated_invalid"] == before + 1
+
+    def test_route_without_cascade_reports_no_tier(self, cascade_router):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, '{"summary": "s", "keyPoints": [], "wordCount": 1}')
+        service = AIService(http_client=mock_http_client, router=cascade_router)
+
+        assert service.summarize_text("text").modelTier is None
+        assert _models(mock_http_client) == ["ministral-3:8b"]
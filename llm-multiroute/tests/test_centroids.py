@@ -0,0 +1,138 @@
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.fastpath.centroids import CentroidClassifier, CentroidIndex
+from app.fastpath.embeddings import EmbeddingClient
+from app.router.backend_pool import Backend, BackendPool
+from app.router.model_router import TaskType
+
+# Each seed text is embedded as its label's axis plus some noise along the others
+AXES = {"greeting": 0, "request_refund": 1, "check_order_status": 2}
+SEEDS = [
+    {"text": "hello", "label": "greeting", "category": "statement"},
+    {"text": "hi there", "label": "greeting", "category": "statement"},
+    {"text": "refund me", "label": "request_refund", "category": "request"},
+    {"text": "money back", "label": "request_refund", "category": "request"},
+    {"text": "where is my order", "label": "check_order_status", "category": "question"},
+]
+LABELS_BY_TEXT = {seed["text"]: seed["label"] for seed in SEEDS}
+
+
+class FakeEmbedder:
+    def __init__(self, vectors=None):
+        self.vectors = vectors or {}
+
+    def _vector(self, text):
+        if text in self.vectors:
+            return np.asarray(self.vectors[text], dtype=np.float32)
+        vector = np.full(3, 0.1, dtype=np.float32)
+        vector[AXES[LABELS_BY_TEXT[text]]] = 1.0
+        return vector / np.linalg.norm(vector)
+
+    def embed(self, text):
+        return self._vector(text)
+
+    def embed_many(self, texts):
+        return np.vstack([self._vector(t) for t in texts])
+
+
+def _embed_response(texts):
+    response = MagicMock()
+    response.json.return_value = {"embeddings": [[float(len(t)), 0.0] for t in texts]}
+    return response
+
+
+def _client(http_client, **kwargs) -> EmbeddingClient:
+    pool = BackendPool([Backend("http://a")])
+    return EmbeddingClient("nomic-embed-text", http_client=http_client, backends=pool, **kwargs)
+
+
+class TestCentroidIndex:
+    def test_build_averages_and_normalizes(self):
+        index = CentroidIndex.build(SEEDS, FakeEmbedder(), "nomic-embed-text")
+
+        assert index.labels == ["check_order_status", "greeting", "request_refund"]
+        assert index.centroids.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(index.centroids, axis=1), 1.0, rtol=1e-6)
+        assert index.categories["request_refund"] == "request"
+
+    def test_save_and_load_memory_maps(self, tmp_path):
+        CentroidIndex.build(SEEDS, FakeEmbedder(), "nomic-embed-text").save(str(tmp_path))
+
+        index = CentroidIndex.load(str(tmp_path))
+
+        assert isinstance(index.centroids, np.memmap)
+        assert index.model == "nomic-embed-text"
+        assert index.labels == ["check_order_status", "greeting", "request_refund"]
+
+
+class TestCentroidClassifier:
+    def _classifier(self, task_type, vectors):
+        index = CentroidIndex.build(SEEDS, FakeEmbedder(), "nomic-embed-text")
+        return CentroidClassifier(task_type, index, FakeEmbedder(vectors), temperature=0.05)
+
+    def test_clear_intent_is_confident(self):
+        classifier = self._classifier(TaskType.INTENT, {"I want my money back": [0.05, 1.0, 0.05]})
+
+        result = classifier.predict("I want my money back")
+
+        assert result.primaryIntent == "request_refund"
+        assert result.intentCategory == "request"
+        assert result.confidence >= 0.9
+
+    def test_ambiguous_text_has_low_confidence(self):
+        classifier = self._classifier(TaskType.CLASSIFY, {"refund where": [0.0, 0.7, 0.7]})
+
+        result = classifier.predict("refund where")
+
+        assert result.confidence < 0.6
+        assert set(result.labels) == {"request_refund", "check_order_status"}
+        assert result.primaryCategory == result.labels[0]
+
+    def test_unsupported_route_rejected(self):
+        with pytest.raises(ValueError):
+            self._classifier(TaskType.SENTIMENT, {})
+
+
+class TestEmbeddingClient:
+    def test_embed_many_batches_and_normalizes(self):
+        http_client = MagicMock()
+        http_client.post.side_effect = lambda url, headers, json: _embed_response(json["input"])
+        client = _client(http_client, max_batch=2)
+
+        vectors = client.embed_many(["a", "bb", "ccc"])
+
+        assert http_client.post.call_count == 2
+        assert http_client.post.call_args_list[0].kwargs["json"] == {"model": "nomic-embed-text", "input": ["a", "bb"]}
+        np.testing.assert_allclose(vectors, [[1.0, 0.0]] * 3)
+
+    def test_concurrent_embeds_share_one_call(self):
+        http_client = MagicMock()
+        http_client.post.side_effect = lambda url, headers, json: _embed_response(json["input"])
+        client = _client(http_client, max_batch=4, max_wait_seconds=1.0)
+        results = {}
+
+        def embed(text):
+            results[text] = client.embed(text)
+
+        threads = [threading.Thread(target=embed, args=(t,)) for t in ("a", "bb", "ccc", "dddd")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert http_client.post.call_count == 1
+        assert sorted(http_client.post.call_args.kwargs["json"]["input"]) == ["a", "bb", "ccc", "dddd"]
+        assert len(results) == 4
+        assert client.snapshot()["mean_batch"] == 4.0
+
+    def test_errors_reach_every_waiter(self):
+        http_client = MagicMock()
+        http_client.post.side_effect = RuntimeError("down")
+        client = _client(http_client, max_wait_seconds=0)
+
+        with pytest.raises(RuntimeError):
+            client.embed("a")
@@ -0,0 +1,162 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.concurrency.fanout import ChunkFanout
+from app.context import CHUNK_FAILED, RequestContext, current_context, set_context
+from app.dto.classification_response import ClassificationResponse
+from app.dto.intent_response import IntentResponse
+from app.dto.sentiment_response import SentimentResponse
+from app.router.model_router import ModelRouter
+from app.service.aggregate import aggregate_classification, aggregate_intent, aggregate_sentiment
+from app.service.ai_service import AIService
+from app.service.normalize import TextNormalizer
+
+
+@pytest.fixture
+def context():
+    context = RequestContext()
+    set_context(context)
+    yield context
+    set_context(None)
+
+
+def _sentiment(label, score, confidence, emotions=()):
+    return SentimentResponse(
+        overallSentiment=label, sentimentScore=score, emotions=list(emotions), confidence=confidence
+    )
+
+
+class TestAggregate:
+    def test_sentiment_score_is_length_weighted(self):
+        results = [_sentiment("positive", 0.8, 0.9, ["joy"]), _sentiment("negative", -0.4, 0.9, ["anger", "joy"])]
+
+        aggregated = aggregate_sentiment(results, np.array([1000.0, 3000.0]))
+
+        assert aggregated.sentimentScore == pytest.approx(-0.1)
+        assert aggregated.overallSentiment == "negative"
+        assert aggregated.emotions == ["joy", "anger"]
+        assert aggregated.confidence == pytest.approx(0.675)
+
+    def test_confident_chunk_outvotes_longer_unsure_one(self):
+        results = [_sentiment("positive", 0.6, 0.95), _sentiment("neutral", 0.0, 0.3)]
+
+        aggregated = aggregate_sentiment(results, np.array([1000.0, 1500.0]))
+
+        assert aggregated.overallSentiment == "positive"
+
+    def test_classification_votes_and_label_counts(self):
+        results = [
+            ClassificationResponse(labels=["billing", "refund"], primaryCategory="billing", confidence=0.9),
+            ClassificationResponse(labels=["refund", "shipping"], primaryCategory="shipping", confidence=0.6),
+            ClassificationResponse(labels=["billing", "refund"], primaryCategory="billing", confidence=0.8),
+        ]
+
+        aggregated = aggregate_classification(results, np.array([1.0, 1.0, 1.0]))
+
+        assert aggregated.primaryCategory == "billing"
+        assert aggregated.labels == ["billing", "refund", "shipping"]
+        assert aggregated.confidence == pytest.approx((0.9 + 0.8) / 3, abs=1e-4)
+
+    def test_intent_selection_with_its_category(self):
+        results = [
+            IntentResponse(
+                primaryIntent="cancel_order", secondaryIntents=["refund"], intentCategory="order", confidence=0.9
+            ),
+            IntentResponse(
+                primaryIntent="track_order", secondaryIntents=["complain"], intentCategory="shipping", confidence=0.5
+            ),
+            IntentResponse(primaryIntent="cancel_order", secondaryIntents=[], intentCategory="account", confidence=0.2),
+        ]
+
+        aggregated = aggregate_intent(results, np.array([2.0, 2.0, 1.0]))
+
+        assert aggregated.primaryIntent == "cancel_order"
+        assert aggregated.intentCategory == "order"
+        assert aggregated.secondaryIntents[0] == "track_order"
+        assert set(aggregated.secondaryIntents) == {"track_order", "refund", "complain"}
+
+
+class TestChunkFanout:
+    def test_results_in_input_order_and_context_shared(self, context):
+        fanout = ChunkFanout(workers=4)
+
+        results = fanout.map(lambda n: (n * 2, current_context() is context), [3, 1, 2])
+
+        assert results == [(6, True), (2, True), (4, True)]
+        assert fanout.snapshot()["calls"] == 3
+
+    def test_failure_cancels_the_request(self, context):
+        fanout = ChunkFanout(workers=2)
+        started = threading.Event()
+
+        def work(n):
+            if n == 0:
+                started.wait(1)
+                raise RuntimeError("chunk failed")
+            started.set()
+            return n
+
+        with pytest.raises(RuntimeError):
+            fanout.map(work, [0, 1])
+
+        assert context.cancel_reason == CHUNK_FAILED
+
+
+class TestServiceChunked:
+    def _service(self, mock_http_client):
+        return AIService(
+            http_client=mock_http_client,
+            router=ModelRouter(),
+            fast_paths={},
+            result_caches={},
+            normalizer=TextNormalizer({}),
+            fanout=ChunkFanout(workers=4),
+        )
+
+    def test_long_text_scored_per_chunk_and_aggregated(self):
+        mock_http_client = MagicMock()
+
+        def respond(url, **kwargs):
+            text = kwargs["json"]["messages"][-1]["content"]
+            positive = "great" in text
+            content = {
+                "overallSentiment": "positive" if positive else "negative",
+                "sentimentScore": 0.8 if positive else -0.6,
+                "emotions": ["joy"] if positive else ["anger"],
+                "confidence": 0.9,
+            }
+            response = MagicMock()
+            response.json.return_value = {"message": {"content": json.dumps(content)}}
+            return response
+
+        mock_http_client.post.side_effect = respond
+        paragraphs = [("great service " if i < 6 else "awful delay ") * 20 for i in range(8)]
+        text = "\n\n".join(paragraphs)
+        service = self._service(mock_http_client)
+
+        with patch.multiple("app.config.settings", CHUNKED_MODE_ENABLED=True, CHUNKED_CHUNK_CHARS=600):
+            result = service.analyze_sentiment(text)
+
+        assert mock_http_client.post.call_count > 1
+        assert all(len(c.kwargs["json"]["messages"][-1]["content"]) < 700 for c in mock_http_client.post.call_args_list)
+        assert result.overallSentiment == "positive"
+        assert -0.6 < result.sentimentScore < 0.8
+        assert set(result.emotions) == {"joy", "anger"}
+
+    def test_short_text_sent_whole(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        content = {"labels": ["billing"], "primaryCategory": "billing", "confidence": 0.9}
+        mock_response.json.return_value = {"message": {"content": json.dumps(content)}}
+        mock_http_client.post.return_value = mock_response
+        service = self._service(mock_http_client)
+
+        with patch.multiple("app.config.settings", CHUNKED_MODE_ENABLED=True, CHUNKED_CHUNK_CHARS=600):
+            result = service.classify_text("Please refund my last invoice.")
+
+        assert mock_http_client.post.call_count == 1
+        assert result.primaryCategory == "billing"
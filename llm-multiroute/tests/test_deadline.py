@@ -0,0 +1,176 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.concurrency.adaptive import AdaptiveLimits
+from app.context import (
+    CLIENT_DISCONNECTED,
+    DeadlineExceeded,
+    RequestCancelled,
+    RequestContext,
+    UpstreamTimeout,
+    cancellation_stats,
+    deadline_from_header,
+    set_context,
+)
+from app.main import app
+from app.router.model_router import ModelRouter
+from app.service.ai_service import AIService
+
+CLASSIFY_JSON = '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'
+
+
+@pytest.fixture
+def context():
+    context = RequestContext(deadline=time.monotonic() + 5)
+    set_context(context)
+    yield context
+    set_context(None)
+
+
+def _stream_response(mock_http_client, lines):
+    response = MagicMock()
+    response.is_error = False
+    response.extensions = {}
+    response.iter_lines.return_value = lines
+    mock_http_client.stream.return_value.__enter__.return_value = response
+    return response
+
+
+def _chunks(text: str) -> list[str]:
+    return [json.dumps({"message": {"content": text[i : i + 8]}, "done": False}) for i in range(0, len(text), 8)] + [
+        json.dumps({"message": {"content": ""}, "done": True})
+    ]
+
+
+class TestRequestContext:
+    def test_header_budget_capped_by_setting(self):
+        now = time.monotonic()
+        assert deadline_from_header("2000") == pytest.approx(now + 2, abs=0.1)
+        assert deadline_from_header("99999999") == pytest.approx(now + 120, abs=0.1)
+        assert deadline_from_header("soon") == pytest.approx(now + 120, abs=0.1)
+
+    def test_check_raises_after_deadline(self):
+        context = RequestContext(deadline=time.monotonic() - 0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            context.check()
+        assert context.cancelled
+
+    def test_cancel_runs_callbacks_once_and_counts(self):
+        before = cancellation_stats.snapshot()[CLIENT_DISCONNECTED]
+        context = RequestContext()
+        calls = []
+        context.on_cancel(lambda: calls.append("first"))
+        unregister = context.on_cancel(lambda: calls.append("removed"))
+        unregister()
+
+        context.cancel(CLIENT_DISCONNECTED)
+        context.cancel(CLIENT_DISCONNECTED)
+        context.on_cancel(lambda: calls.append("late"))
+
+        assert calls == ["first", "late"]
+        assert cancellation_stats.snapshot()[CLIENT_DISCONNECTED] == before + 1
+        with pytest.raises(RequestCancelled) as exc_info:
+            context.check()
+        assert exc_info.value.reason == CLIENT_DISCONNECTED
+
+
+class TestUpstreamStreaming:
+    def test_deadline_uses_streaming_call_with_remaining_budget(self, context):
+        mock_http_client = MagicMock()
+        _stream_response(mock_http_client, _chunks(CLASSIFY_JSON))
+        service = AIService(http_client=mock_http_client, router=ModelRouter())
+
+        result = service.classify_text("text")
+
+        assert result.primaryCategory == "t"
+        mock_http_client.post.assert_not_called()
+        kwargs = mock_http_client.stream.call_args.kwargs
+        assert kwargs["json"]["stream"] is True
+        assert 4 < kwargs["timeout"] <= 5
+
+    def test_cancel_mid_stream_stops_reading(self, context):
+        mock_http_client = MagicMock()
+        lines = _chunks(CLASSIFY_JSON)
+
+        def iter_lines():
+            yield lines[0]
+            context.cancel(CLIENT_DISCONNECTED)
+            yield from lines[1:]
+
+        response = _stream_response(mock_http_client, None)
+        response.iter_lines.side_effect = iter_lines
+        service = AIService(http_client=mock_http_client, router=ModelRouter())
+        before = cancellation_stats.snapshot()["upstream_aborted"]
+
+        with pytest.raises(RequestCancelled):
+            service.classify_text("text")
+        assert cancellation_stats.snapshot()["upstream_aborted"] == before + 1
+
+    def test_upstream_timeout_becomes_deadline_exceeded(self, context):
+        mock_http_client = MagicMock()
+        mock_http_client.stream.side_effect = httpx.ReadTimeout("timed out")
+        service = AIService(http_client=mock_http_client, router=ModelRouter())
+
+        with pytest.raises(DeadlineExceeded):
+            service.classify_text("text")
+
+    def test_upstream_timeout_cuts_adaptive_limit(self, context):
+        mock_http_client = MagicMock()
+        mock_http_client.stream.side_effect = httpx.ReadTimeout("timed out")
+        limits = AdaptiveLimits()
+        limits.enabled = True
+        service = AIService(http_client=mock_http_client, router=ModelRouter(), limits=limits)
+        limiter = limits.get("gemma3:4b")
+        initial = limiter.limit
+
+        with pytest.raises(UpstreamTimeout):
+            service.classify_text("text")
+
+        assert limiter.decreases == 1
+        assert limiter.limit < initial
+        assert limiter.in_flight == 0
+
+    def test_client_disconnect_does_not_move_adaptive_limit(self, context):
+        mock_http_client = MagicMock()
+
+        def disconnect(*args, **kwargs):
+            context.cancel(CLIENT_DISCONNECTED)
+            raise httpx.ReadError("socket shut down")
+
+        mock_http_client.stream.side_effect = disconnect
+        limits = AdaptiveLimits()
+        limits.enabled = True
+        service = AIService(http_client=mock_http_client, router=ModelRouter(), limits=limits)
+
+        with pytest.raises(RequestCancelled) as raised:
+            service.classify_text("text")
+
+        assert not isinstance(raised.value, DeadlineExceeded)
+        limiter = limits.get("gemma3:4b")
+        assert limiter.decreases == 0
+        assert limiter.baseline is None
+        assert limiter.in_flight == 0
+
+    def test_no_deadline_keeps_plain_post(self):
+        mock_http_client = MagicMock()
+        mock_http_client.post.return_value.json.return_value = {"message": {"content": CLASSIFY_JSON}}
+        service = AIService(http_client=mock_http_client, router=ModelRouter())
+
+        service.classify_text("text")
+
+        mock_http_client.stream.assert_not_called()
+
+
+class TestDeadlineEndpoint:
+    def test_deadline_exceeded_returns_504(self):
+        with patch("app.controller.ai_controller.ai_service") as mock_service:
+            mock_service.classify_text.side_effect = DeadlineExceeded()
+            response = TestClient(app).post("/api/ai/classify", json={"text": "t"})
+
+        assert response.status_code == 504
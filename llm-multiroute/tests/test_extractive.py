@@ -0,0 +1,105 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from app.router.model_router import ModelRouter
+from app.service.ai_service import AIService
+from app.service.extractive import compress, estimate_tokens, rank_sentences, split_sentences, textrank
+
+ARTICLE = (
+    "The city council approved the new transit budget on Monday. "
+    "The transit budget adds three bus lines and extends service hours. "
+    "Council members said the budget for transit was the largest in a decade. "
+    "My cat enjoys sleeping in the sun. "
+    "Riders will see the new bus lines and longer transit hours in spring. "
+    "The weather was mild."
+)
+
+
+class TestTextRank:
+    def test_central_sentences_outrank_outliers(self):
+        sentences = split_sentences(ARTICLE)
+
+        scores = textrank(sentences)
+
+        assert scores.shape == (len(sentences),)
+        assert np.isclose(scores.sum(), 1.0, atol=1e-3)
+        assert scores[1] > scores[3]
+        assert scores[0] > scores[5]
+
+    def test_long_documents_ranked_in_bounded_blocks(self):
+        sentences = split_sentences(ARTICLE) * 3
+
+        with patch("app.service.extractive.textrank", wraps=textrank) as ranked:
+            scores = rank_sentences(sentences, max_sentences=8)
+
+        assert [len(call.args[0]) for call in ranked.call_args_list] == [6, 6, 6]
+        assert scores.shape == (18,)
+        assert np.isclose(scores.sum(), 1.0, atol=1e-3)
+        assert np.allclose(scores[:6], scores[6:12], atol=1e-4)
+
+    def test_split_sentences_on_punctuation_and_paragraphs(self):
+        assert split_sentences("One. Two?\n\nThree without a stop\n\nFour!") == [
+            "One.",
+            "Two?",
+            "Three without a stop",
+            "Four!",
+        ]
+
+
+class TestCompress:
+    def test_keeps_top_sentences_within_budget_in_order(self):
+        budget = estimate_tokens(ARTICLE) // 2
+
+        compression = compress(ARTICLE, budget)
+
+        assert compression.kept_tokens <= budget
+        assert "cat" not in compression.text
+        kept = split_sentences(compression.text)
+        original = split_sentences(ARTICLE)
+        assert [original.index(s) for s in kept] == sorted(original.index(s) for s in kept)
+        assert 0 < compression.ratio < 1
+
+    def test_text_within_budget_is_left_alone(self):
+        assert compress(ARTICLE, estimate_tokens(ARTICLE)) is None
+
+
+class TestServiceCompression:
+    def test_compressed_text_sent_and_savings_reported(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        content = {"summary": "Transit budget approved.", "keyPoints": [], "wordCount": 3}
+        mock_response.json.return_value = {
+            "message": {"content": json.dumps(content)},
+            "prompt_eval_duration": 50_000_000,
+            "prompt_eval_count": 100,
+        }
+        mock_http_client.post.return_value = mock_response
+        service = AIService(http_client=mock_http_client, router=ModelRouter(), fast_paths={}, result_caches={})
+        budget = estimate_tokens(ARTICLE) // 2
+
+        with patch.multiple(
+            "app.config.settings", SUMMARIZE_EXTRACTIVE_ENABLED=True, SUMMARIZE_EXTRACTIVE_TOKEN_BUDGET=budget
+        ):
+            result = service.summarize_text(ARTICLE)
+
+        sent = mock_http_client.post.call_args.kwargs["json"]["messages"][-1]["content"]
+        assert "cat" not in sent
+        assert 0 < result.compressionRatio < 1
+        assert result.promptEvalMsSaved > 0
+
+    def test_short_text_not_compressed(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "message": {"content": json.dumps({"summary": "Short.", "keyPoints": [], "wordCount": 1})}
+        }
+        mock_http_client.post.return_value = mock_response
+        service = AIService(http_client=mock_http_client, router=ModelRouter(), fast_paths={}, result_caches={})
+
+        with patch.multiple("app.config.settings", SUMMARIZE_EXTRACTIVE_ENABLED=True):
+            result = service.summarize_text("A short note.")
+
+        assert result.compressionRatio is None
+        assert result.promptEvalMsSaved is None
@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.dto.intent_response import IntentResponse
+from app.dto.sentiment_response import SentimentResponse
+from app.fastpath.gate import FastPath, load_engine
+from app.fastpath.intent import RuleIntent
+from app.fastpath.sentiment import LexiconSentiment
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+
+
+def _sentiment(label: str, confidence: float) -> SentimentResponse:
+    return SentimentResponse(overallSentiment=label, sentimentScore=0.5, emotions=[], confidence=confidence)
+
+
+class FixedEngine:
+    name = "fixed"
+
+    def __init__(self, prediction=None):
+        self.prediction = prediction
+
+    def predict(self, text):
+        return self.prediction.model_copy() if self.prediction is not None else None
+
+
+class TestLexiconSentiment:
+    @pytest.mark.parametrize(
+        "text,label",
+        [
+            ("I love this product! The quality is outstanding.", "positive"),
+            ("This is terrible. The device broke after two days.", "negative"),
+        ],
+    )
+    def test_clear_texts_are_confident(self, text, label):
+        result = LexiconSentiment().predict(text)
+
+        assert result.overallSentiment == label
+        assert result.confidence >= 0.8
+
+    def test_negation_flips_polarity(self):
+        result = LexiconSentiment().predict("The support was not helpful")
+
+        assert result.overallSentiment == "negative"
+        assert result.confidence < 0.8
+
+    def test_mixed_or_neutral_texts_fall_through(self):
+        assert LexiconSentiment().predict("Great phone but the battery is awful").confidence < 0.8
+        assert LexiconSentiment().predict("The meeting is at 3 PM in room 4.") is None
+
+
+class TestRuleIntent:
+    @pytest.mark.parametrize(
+        "text,category,intent",
+        [
+            ("Turn off the lights in the living room.", "command", "turn_off_lights"),
+            ("Please send me the quarterly report by Friday.", "request", "send_quarterly_report"),
+            ("Where is the nearest Italian restaurant?", "question", "find_location"),
+            ("hello", "statement", "greeting"),
+        ],
+    )
+    def test_rules(self, text, category, intent):
+        result = RuleIntent().predict(text)
+
+        assert result.intentCategory == category
+        assert result.primaryIntent == intent
+        assert result.confidence >= 0.85
+
+    def test_multi_sentence_and_plain_statements_fall_through(self):
+        assert RuleIntent().predict("I think it will rain. Bring an umbrella.") is None
+        assert RuleIntent().predict("The sky is blue") is None
+
+
+class TestFastPath:
+    def test_on_serves_confident_local_answer(self):
+        fast_path = FastPath(TaskType.SENTIMENT, FixedEngine(_sentiment("positive", 0.9)), "on", 0.8, 280)
+        ask_model = MagicMock()
+
+        result = fast_path.answer("text", ask_model)
+
+        assert result.modelTier == "local"
+        ask_model.assert_not_called()
+        assert fast_path.stats.snapshot()["hit_rate"] == 1.0
+
+    def test_on_asks_model_below_threshold_and_compares(self):
+        fast_path = FastPath(TaskType.SENTIMENT, FixedEngine(_sentiment("positive", 0.6)), "on", 0.8, 280)
+
+        result = fast_path.answer("text", lambda: _sentiment("negative", 0.9))
+
+        assert result.overallSentiment == "negative"
+        stats = fast_path.stats.snapshot()
+        assert stats["served"] == 0
+        assert stats["agreement_by_confidence"] == {"0.6": {"compared": 1, "agreement": 0.0}}
+
+    def test_shadow_returns_model_answer_and_records_agreement(self):
+        fast_path = FastPath(TaskType.SENTIMENT, FixedEngine(_sentiment("Positive", 0.95)), "shadow", 0.8, 280)
+
+        result = fast_path.answer("text", lambda: _sentiment("positive", 0.7))
+
+        assert result.modelTier is None
+        stats = fast_path.stats.snapshot()
+        assert stats["confident"] == 1
+        assert stats["served"] == 0
+        assert stats["agreement"] == 1.0
+
+    def test_long_text_skips_engine(self):
+        engine = FixedEngine(_sentiment("positive", 0.99))
+        fast_path = FastPath(TaskType.SENTIMENT, engine, "on", 0.8, max_chars=10)
+
+        result = fast_path.answer("x" * 11, lambda: _sentiment("negative", 0.9))
+
+        assert result.overallSentiment == "negative"
+
+    def test_engine_failure_falls_through_to_model(self):
+        engine = MagicMock()
+        engine.predict.side_effect = httpx.ConnectTimeout("embedding service down")
+        fast_path = FastPath(TaskType.SENTIMENT, engine, "on", 0.8, 280)
+
+        result = fast_path.answer("text", lambda: _sentiment("negative", 0.9))
+
+        assert result.overallSentiment == "negative"
+        stats = fast_path.stats.snapshot()
+        assert stats["errors"] == 1
+        assert stats["hit_rate"] == 0.0
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            FastPath(TaskType.INTENT, RuleIntent(), "always", 0.8, 280)
+
+    def test_load_engine(self):
+        assert isinstance(load_engine("rules", TaskType.INTENT), RuleIntent)
+        assert isinstance(load_engine("app.fastpath.sentiment:LexiconSentiment", TaskType.SENTIMENT), LexiconSentiment)
+
+
+class TestServiceFastPath:
+    def test_confident_intent_skips_upstream(self):
+        mock_http_client = MagicMock()
+        fast_path = FastPath(TaskType.INTENT, RuleIntent(), "on", 0.85, 280)
+        service = AIService(
+            http_client=mock_http_client, router=ModelRouter(), fast_paths={TaskType.INTENT: fast_path}
+        )
+
+        result = service.detect_intent("Turn off the lights")
+
+        assert isinstance(result, IntentResponse)
+        assert result.modelTier == "local"
+        mock_http_client.post.assert_not_called()
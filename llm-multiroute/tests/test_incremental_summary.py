@@ -0,0 +1,137 @@
+import json
+from unittest.mock import MagicMock
+
+from app.dto.summary_response import SummaryResponse
+from app.router.model_router import ModelRouter
+from app.service.ai_service import AIService
+from app.service.chunking import split_chunks
+from app.service.incremental_summary import IncrementalSummarizer
+
+STEPS = "Step {i}.{j} restarts worker {j} and checks its queue."
+PARAGRAPHS = [f"Paragraph {i} of the runbook. " + " ".join(STEPS.format(i=i, j=j) for j in range(8)) for i in range(40)]
+DOCUMENT = "\n\n".join(PARAGRAPHS)
+
+
+def _edit(index: int, text: str = "This paragraph was rewritten after the incident review.") -> str:
+    return "\n\n".join(text if i == index else p for i, p in enumerate(PARAGRAPHS))
+
+
+def _summary(text: str) -> SummaryResponse:
+    return SummaryResponse(summary=f"summary of {len(text)} chars", keyPoints=[text[:20]], wordCount=4)
+
+
+def _summarizer() -> IncrementalSummarizer:
+    return IncrementalSummarizer(min_chars=1500, max_chars=4000, max_entries=1000)
+
+
+class TestSplitChunks:
+    def test_chunks_cover_text_within_bounds(self):
+        chunks = split_chunks(DOCUMENT, 1500, 4000)
+
+        assert len(chunks) > 3
+        assert all(len(c) <= 4000 for c in chunks)
+        assert "\n\n".join(chunks) == DOCUMENT
+
+    def test_edit_only_changes_nearby_chunks(self):
+        before = split_chunks(DOCUMENT, 1500, 4000)
+
+        after = split_chunks(_edit(20), 1500, 4000)
+
+        assert len(set(after) - set(before)) <= 2
+
+    def test_oversized_paragraph_is_split(self):
+        chunks = split_chunks("Sentence number one goes here. " * 400, 1500, 4000)
+
+        assert len(chunks) >= 3
+        assert all(len(c) <= 4000 for c in chunks)
+
+
+class TestIncrementalSummarizer:
+    def test_edit_resummarizes_only_changed_chunks(self):
+        summarizer = _summarizer()
+        section = MagicMock(side_effect=_summary)
+        merge = MagicMock(side_effect=_summary)
+        summarizer.summarize(DOCUMENT, "model", section, merge)
+        first_pass = section.call_count
+
+        summarizer.summarize(_edit(20), "model", section, merge)
+
+        assert first_pass == len(split_chunks(DOCUMENT, 1500, 4000))
+        assert 1 <= section.call_count - first_pass <= 2
+        assert merge.call_count == 2
+
+    def test_unchanged_document_makes_no_calls(self):
+        summarizer = _summarizer()
+        section = MagicMock(side_effect=_summary)
+        merge = MagicMock(side_effect=_summary)
+        first = summarizer.summarize(DOCUMENT, "model", section, merge)
+        calls = section.call_count
+
+        again = summarizer.summarize(DOCUMENT.replace("\n\n", "\n \n"), "model", section, merge)
+
+        assert section.call_count == calls
+        assert merge.call_count == 1
+        assert again == first
+        assert summarizer.snapshot()["merges_reused"] == 1
+
+    def test_scope_change_starts_afresh(self):
+        summarizer = _summarizer()
+        section = MagicMock(side_effect=_summary)
+        merge = MagicMock(side_effect=_summary)
+        summarizer.summarize(DOCUMENT, "model-a", section, merge)
+        calls = section.call_count
+
+        summarizer.summarize(DOCUMENT, "model-b", section, merge)
+
+        assert section.call_count == 2 * calls
+
+    def test_merge_receives_sections_in_order(self):
+        summarizer = _summarizer()
+        merge = MagicMock(side_effect=_summary)
+
+        summarizer.summarize(DOCUMENT, "model", _summary, merge)
+
+        combined = merge.call_args.args[0]
+        assert combined.startswith("Section 1: ")
+        assert combined.index("Paragraph 0 of") < combined.index("Section 2: ")
+
+
+class TestServiceIncrementalSummary:
+    def _service(self, mock_http_client):
+        return AIService(
+            http_client=mock_http_client,
+            router=ModelRouter(),
+            fast_paths={},
+            result_caches={},
+            incremental=_summarizer(),
+        )
+
+    def _respond(self, mock_http_client):
+        def post(url, **kwargs):
+            response = MagicMock()
+            content = {"summary": "s", "keyPoints": [], "wordCount": 1}
+            response.json.return_value = {"message": {"content": json.dumps(content)}}
+            return response
+
+        mock_http_client.post.side_effect = post
+
+    def test_long_document_uses_section_and_merge_prompts(self):
+        mock_http_client = MagicMock()
+        self._respond(mock_http_client)
+        service = self._service(mock_http_client)
+
+        service.summarize_text(DOCUMENT)
+
+        systems = [c.kwargs["json"]["messages"][0]["content"] for c in mock_http_client.post.call_args_list]
+        assert systems[0].startswith("Summarize the following section")
+        assert systems[-1].startswith("The following are summaries")
+        assert len(systems) == len(split_chunks(DOCUMENT, 1500, 4000)) + 1
+
+    def test_short_text_uses_single_call(self):
+        mock_http_client = MagicMock()
+        self._respond(mock_http_client)
+        service = self._service(mock_http_client)
+
+        service.summarize_text("A short note about the deploy.")
+
+        assert mock_http_client.post.call_count == 1
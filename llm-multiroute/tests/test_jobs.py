@@ -0,0 +1,392 @@
+import json
+import sqlite3
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.context import DeadlineExceeded, Priority, current_context
+from app.dto.sentiment_response import SentimentResponse
+from app.jobs.runner import JobRunner, job_runner
+from app.jobs.store import COMPLETED, DONE, FAILED, LEASE_EXPIRED, PENDING, RUNNING, JobStore
+from app.main import app
+from app.router.model_router import Mode
+
+POSITIVE = SentimentResponse(overallSentiment="positive", sentimentScore=0.8, emotions=["joy"], confidence=0.9)
+OWNER = "worker-a"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def _claim(store: JobStore, lease_seconds: float = 60):
+    return store.claim(OWNER, lease_seconds)
+
+
+def _runner(**kwargs) -> JobRunner:
+    options = {
+        "workers": 2,
+        "priority": Priority.BATCH,
+        "max_attempts": 2,
+        "poll_seconds": 0.05,
+        "lease_seconds": 60,
+        "webhook_timeout_seconds": 1,
+        "webhook_attempts": 1,
+    }
+    return JobRunner(**{**options, **kwargs})
+
+
+def _service(side_effect=None) -> MagicMock:
+    service = MagicMock()
+    service.analyze_sentiment.side_effect = side_effect or (lambda text, fields: POSITIVE)
+    return service
+
+
+class TestJobStore:
+    def test_items_claimed_in_job_then_input_order(self, store):
+        first = store.create("sentiment", ["a", "b"])
+        second = store.create("intent", ["c"])
+
+        claimed = [_claim(store) for _ in range(4)]
+
+        assert [(i.job_id, i.index, i.task, i.text) for i in claimed[:3]] == [
+            (first, 0, "sentiment", "a"),
+            (first, 1, "sentiment", "b"),
+            (second, 0, "intent", "c"),
+        ]
+        assert claimed[3] is None
+        assert store.get(first)["status"] == RUNNING
+
+    def test_progress_and_completion(self, store):
+        job_id = store.create("sentiment", ["a", "b"], fields=["overallSentiment"], webhook_url="http://hook")
+
+        assert store.complete(_claim(store), '{"overallSentiment": "positive"}') is False
+        assert store.get(job_id)["completed"] == 1
+        assert store.complete(_claim(store), '{"overallSentiment": "negative"}') is True
+
+        job = store.get(job_id)
+        assert job["status"] == "completed"
+        assert job["fields"] == ["overallSentiment"]
+        assert store.pending_webhooks() == [job_id]
+
+    def test_failed_item_retried_then_marked_failed(self, store):
+        job_id = store.create("sentiment", ["a"])
+
+        assert store.fail(_claim(store), "upstream 503", max_attempts=2) is False
+        retry = _claim(store)
+        assert retry is not None
+        assert store.fail(retry, "upstream 503", max_attempts=2) is True
+
+        assert store.get(job_id)["failed"] == 1
+        assert store.results(job_id, 0, 10) == [{"index": 0, "status": FAILED, "result": None, "error": "upstream 503"}]
+
+    def test_expired_leases_requeued_after_restart(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        store = JobStore(path)
+        job_id = store.create("sentiment", ["a", "b", "c"])
+        store.complete(_claim(store), '{"overallSentiment": "positive"}')
+        _claim(store, lease_seconds=0)
+        _claim(store, lease_seconds=60)
+        store.close()
+
+        reopened = JobStore(path)
+        try:
+            assert reopened.recover(max_attempts=3) == (1, [])
+            item = reopened.claim("worker-b", 60)
+            assert (item.job_id, item.index) == (job_id, 1)
+            assert [r["status"] for r in reopened.results(job_id, 0, 10)] == [DONE, RUNNING, RUNNING]
+        finally:
+            reopened.close()
+
+    def test_answer_after_lost_lease_is_ignored(self, store):
+        job_id = store.create("sentiment", ["a"])
+        stale = _claim(store, lease_seconds=0)
+        store.recover(max_attempts=3)
+        current = store.claim("worker-b", 60)
+
+        assert store.complete(stale, '{"overallSentiment": "positive"}') is False
+        assert store.fail(stale, "timeout", max_attempts=1) is False
+        assert store.complete(current, '{"overallSentiment": "negative"}') is True
+        assert store.get(job_id)["completed"] == 1
+        assert store.results(job_id, 0, 1)[0]["result"] == {"overallSentiment": "negative"}
+
+    def test_renewed_lease_survives_recover(self, store):
+        store.create("sentiment", ["a"])
+        _claim(store, lease_seconds=0)
+
+        store.renew(OWNER, 60)
+
+        assert store.recover(max_attempts=3) == (0, [])
+
+    def test_item_that_keeps_losing_its_lease_fails_after_max_attempts(self, store):
+        job_id = store.create("sentiment", ["fine", "kills its worker"], webhook_url="http://hooks.example/done")
+        store.complete(_claim(store), '{"overallSentiment": "positive"}')
+
+        _claim(store, lease_seconds=0)
+        assert store.recover(max_attempts=2) == (1, [])
+        _claim(store, lease_seconds=0)
+        assert store.recover(max_attempts=2) == (1, [job_id])
+
+        job = store.get(job_id)
+        assert (job["status"], job["completed"], job["failed"]) == (COMPLETED, 1, 1)
+        assert store.results(job_id, 1, 1)[0] == {"index": 1, "status": FAILED, "result": None, "error": LEASE_EXPIRED}
+        assert store.pending_webhooks() == [job_id]
+
+    def test_release_requeues_without_counting_the_attempt(self, store):
+        job_id = store.create("sentiment", ["a"])
+        _claim(store)
+
+        assert store.release(OWNER) == 1
+        assert store.fail(_claim(store), "upstream 503", max_attempts=2) is False
+        assert store.results(job_id, 0, 1)[0]["status"] == PENDING
+
+    def test_results_are_paged_in_order(self, store):
+        job_id = store.create("sentiment", [f"text {i}" for i in range(5)])
+
+        page = store.results(job_id, 2, 2)
+
+        assert [r["index"] for r in page] == [2, 3]
+        assert all(r["status"] == PENDING for r in page)
+
+
+class TestJobRunner:
+    def test_item_runs_at_job_priority_and_mode(self, store):
+        seen = []
+
+        def analyze(text, fields):
+            seen.append((current_context().priority, current_context().mode, fields))
+            return POSITIVE
+
+        runner = _runner()
+        runner.start(store, _service(analyze))
+        try:
+            job_id = store.create("sentiment", ["good"], fields=["overallSentiment"], mode="fast")
+            runner.notify()
+            _wait_for(lambda: store.get(job_id)["status"] == "completed")
+        finally:
+            runner.stop()
+
+        assert seen == [(Priority.BATCH, Mode.FAST, ["overallSentiment"])]
+
+    def test_projected_result_stored_without_omitted_fields(self, store):
+        runner = _runner()
+        runner.start(store, _service(lambda text, fields: SentimentResponse(overallSentiment="positive")))
+        try:
+            job_id = store.create("sentiment", ["good"], fields=["overallSentiment"])
+            runner.notify()
+            _wait_for(lambda: store.get(job_id)["status"] == "completed")
+            assert store.results(job_id, 0, 1)[0]["result"] == {"overallSentiment": "positive"}
+        finally:
+            runner.stop()
+
+    def test_webhook_posted_when_job_finishes(self, store):
+        runner = _runner(workers=0)
+        runner.start(store, _service())
+        job_id = store.create("sentiment", ["good"], webhook_url="http://hooks.example.com/jobs")
+
+        with patch("app.jobs.runner.httpx.Client") as client_class, patch.multiple(
+            "app.config.settings", JOBS_WEBHOOK_ALLOWED_HOSTS="hooks.example.com"
+        ):
+            runner.run_item(_claim(store))
+
+        client = client_class.return_value.__enter__.return_value
+        url, payload = client.post.call_args.args[0], client.post.call_args.kwargs["json"]
+        assert url == "http://hooks.example.com/jobs"
+        assert payload["id"] == job_id
+        assert payload["completed"] == 1
+        assert store.get(job_id)["webhook_status"] == "delivered"
+        assert store.pending_webhooks() == []
+
+    def test_webhook_to_private_address_is_not_sent(self, store):
+        runner = _runner(workers=0)
+        runner.start(store, _service())
+        job_id = store.create("sentiment", ["good"], webhook_url="http://10.0.0.5/jobs")
+
+        with patch("app.jobs.runner.httpx.Client") as client_class:
+            runner.run_item(_claim(store))
+
+        client_class.return_value.__enter__.return_value.post.assert_not_called()
+        assert store.get(job_id)["webhook_status"] == FAILED
+
+    def test_exceeded_deadline_is_a_failed_attempt(self, store):
+        runner = _runner(workers=0, max_attempts=1)
+        runner.start(store, _service(MagicMock(side_effect=DeadlineExceeded())))
+        job_id = store.create("sentiment", ["slow"])
+
+        runner.run_item(_claim(store))
+
+        job = store.get(job_id)
+        assert (job["status"], job["failed"]) == ("completed", 1)
+        assert "deadline exceeded" in store.results(job_id, 0, 1)[0]["error"]
+
+    def test_worker_survives_unexpected_errors(self, store):
+        runner = _runner(workers=1)
+        job_id = store.create("sentiment", ["good"])
+        claim, failures = store.claim, [sqlite3.OperationalError("database is locked")]
+
+        def flaky_claim(*args):
+            if failures:
+                raise failures.pop()
+            return claim(*args)
+
+        with patch.object(store, "claim", side_effect=flaky_claim):
+            runner.start(store, _service())
+            try:
+                _wait_for(lambda: store.get(job_id)["status"] == "completed")
+            finally:
+                with patch.object(store, "close"):
+                    runner.stop()
+
+        assert runner.snapshot()["errors"] == 1
+
+    def test_shutdown_hands_in_flight_item_back_to_the_queue(self, store):
+        started = threading.Event()
+
+        def analyze(text, fields):
+            context = current_context()
+            started.set()
+            while not context.cancelled:
+                time.sleep(0.01)
+            context.check()
+
+        runner = _runner(workers=1)
+        job_id = store.create("sentiment", ["slow"])
+        runner.start(store, _service(analyze))
+        assert started.wait(2)
+
+        with patch.object(store, "close"):
+            runner.stop()
+
+        assert store.results(job_id, 0, 1)[0]["status"] == PENDING
+        assert store.get(job_id)["failed"] == 0
+
+
+class TestJobEndpoints:
+    @pytest.fixture
+    def client(self, store):
+        with patch.object(job_runner, "store", store), patch.object(job_runner, "notify"):
+            yield TestClient(app)
+
+    def test_queue_and_read_job(self, client, store):
+        response = client.post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a", "b", "c"], "mode": "fast"})
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+        assert job["total"] == 3
+        store.complete(_claim(store), json.dumps({"overallSentiment": "positive"}))
+
+        page = client.get(f"/api/ai/jobs/{job['id']}", params={"offset": 0, "limit": 2}).json()
+
+        assert page["completed"] == 1
+        assert page["results"][0] == {
+            "index": 0,
+            "status": "done",
+            "result": {"overallSentiment": "positive"},
+            "error": None,
+        }
+        assert [r["status"] for r in page["results"]] == ["done", "pending"]
+        assert page["nextOffset"] == 2
+
+    def test_upload_json_lines(self, client, store):
+        body = '"first text"\n{"text": "second text"}\n\n'
+
+        response = client.post(
+            "/api/ai/jobs/upload",
+            params={"task": "intent", "fields": "primaryIntent"},
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 202
+        job = store.get(response.json()["id"])
+        assert job["fields"] == ["primaryIntent"]
+        assert [_claim(store).text for _ in range(2)] == ["first text", "second text"]
+
+    def test_upload_plain_text_lines(self, client, store):
+        response = client.post(
+            "/api/ai/jobs/upload",
+            params={"task": "classify"},
+            content="one\ntwo\n",
+            headers={"Content-Type": "text/plain"},
+        )
+
+        assert response.json()["total"] == 2
+
+    def test_oversized_upload_rejected(self, client, store):
+        with patch.multiple("app.config.settings", JOBS_MAX_UPLOAD_BYTES=8):
+            response = client.post(
+                "/api/ai/jobs/upload",
+                params={"task": "classify"},
+                content="one\ntwo\nthree\n",
+                headers={"Content-Type": "text/plain"},
+            )
+
+        assert response.status_code == 413
+        assert store.snapshot()["jobs"] == {}
+
+    def test_upload_while_disabled_is_503(self):
+        with patch.object(job_runner, "store", None):
+            response = TestClient(app).post("/api/ai/jobs/upload", params={"task": "classify"}, content="one\n")
+
+        assert response.status_code == 503
+
+    def test_unknown_job_is_404(self, client):
+        assert client.get("/api/ai/jobs/missing").status_code == 404
+
+    def test_unknown_field_rejected_before_queueing(self, client, store):
+        response = client.post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a"], "fields": ["mood"]})
+        client.post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a"]})
+
+        assert response.status_code == 422
+        assert store.snapshot()["jobs"] == {"queued": 1}
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "ftp://93.184.216.34/hook",
+            "http://127.0.0.1:8082/api/ai/metrics",
+            "http://169.254.169.254/latest/meta-data",
+            "http://[::1]/hook",
+            "https://10.1.2.3/hook",
+            "not a url",
+        ],
+    )
+    def test_unsafe_webhook_rejected(self, client, store, url):
+        response = client.post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a"], "webhookUrl": url})
+
+        assert response.status_code == 422
+        assert store.snapshot()["jobs"] == {}
+
+    def test_public_or_allowlisted_webhook_accepted(self, client):
+        job = {"task": "sentiment", "texts": ["a"]}
+        public = client.post("/api/ai/jobs", json={**job, "webhookUrl": "https://93.184.216.34/hook"})
+        with patch.multiple("app.config.settings", JOBS_WEBHOOK_ALLOWED_HOSTS="hooks.internal"):
+            internal = client.post("/api/ai/jobs", json={**job, "webhookUrl": "http://hooks.internal:9000/jobs"})
+
+        assert (public.status_code, internal.status_code) == (202, 202)
+
+    def test_too_many_texts_is_413(self, client):
+        with patch.multiple("app.config.settings", JOBS_MAX_TEXTS=2):
+            response = client.post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a", "b", "c"]})
+
+        assert response.status_code == 413
+
+
+def test_disabled_jobs_return_503():
+    response = TestClient(app).post("/api/ai/jobs", json={"task": "sentiment", "texts": ["a"]})
+
+    assert response.status_code == 503
+
+
+def _wait_for(condition, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
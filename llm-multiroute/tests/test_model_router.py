@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from app.router.model_router import ModelRouter, TaskType
+from app.router.model_router import GenerationOptions, ModelRouter, TaskType
 
 
 class TestModelRouter:
@@ -83,6 +83,42 @@ class TestModelRouterCustomConfig:
         }
 
 
+class TestGenerationOptions:
+    def test_default_routes_cap_output(self):
+        router = ModelRouter()
+
+        assert router.get_options(TaskType.CLASSIFY).to_payload() == {"temperature": 0.7, "num_predict": 128}
+        assert router.get_options(TaskType.SUMMARIZE).num_predict == 512
+
+    def test_unset_options_are_omitted(self):
+        options = GenerationOptions(temperature=0.2, num_ctx=4096, stop=["\n\n"], top_k=20, top_p=0.9, seed=7)
+
+        assert options.to_payload() == {
+            "temperature": 0.2,
+            "num_ctx": 4096,
+            "top_k": 20,
+            "top_p": 0.9,
+            "seed": 7,
+            "stop": ["\n\n"],
+        }
+        assert GenerationOptions().to_payload() == {}
+
+    def test_route_options_from_settings(self):
+        with patch.multiple(
+            "app.config.settings",
+            OLLAMA_NUM_PREDICT_INTENT=64,
+            OLLAMA_TOP_K_INTENT=10,
+            OLLAMA_SEED_INTENT=42,
+            OLLAMA_STOP_INTENT=["}"],
+        ):
+            options = ModelRouter().get_options(TaskType.INTENT).to_payload()
+
+        assert options["num_predict"] == 64
+        assert options["top_k"] == 10
+        assert options["seed"] == 42
+        assert options["stop"] == ["}"]
+
+
 class TestTaskType:
     def test_task_type_values(self):
         assert TaskType.CLASSIFY.value == "classify"
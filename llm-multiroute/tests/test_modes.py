@@ -0,0 +1,151 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache.near_duplicate import NearDuplicateCache
+from app.context import RequestContext, current_context, resolve_mode, set_context
+from app.dto.classification_response import ClassificationResponse
+from app.fastpath.gate import FastPath
+from app.main import app
+from app.router.model_router import Mode, ModelRouter, TaskType
+from app.service.ai_service import AIService
+from app.service.normalize import TextNormalizer
+
+TEXT = "My invoice shows a charge twice and I would like one of them refunded please."
+ANSWER = {"labels": ["billing"], "primaryCategory": "billing", "confidence": 0.9}
+
+
+@pytest.fixture
+def mode_context():
+    def use(mode: Mode) -> RequestContext:
+        context = RequestContext(mode=mode)
+        set_context(context)
+        return context
+
+    yield use
+    set_context(None)
+
+
+def _service(mock_http_client, **kwargs):
+    mock_http_client.post.return_value.json.return_value = {"message": {"content": json.dumps(ANSWER)}}
+    options = {"router": ModelRouter(), "fast_paths": {}, "result_caches": {}, "normalizer": TextNormalizer({})}
+    return AIService(http_client=mock_http_client, **{**options, **kwargs})
+
+
+def _sent(mock_http_client) -> list[tuple[str, dict]]:
+    return [(c.kwargs["json"]["model"], c.kwargs["json"]["options"]) for c in mock_http_client.post.call_args_list]
+
+
+class TestModeTiers:
+    def test_balanced_is_the_configured_route(self):
+        router = ModelRouter()
+
+        for task in TaskType:
+            assert router.get_model(task, Mode.BALANCED) == router.get_model(task)
+            assert router.get_options(task, Mode.BALANCED) is router.get_options(task)
+
+    def test_tier_models_and_option_overrides(self):
+        with patch.multiple(
+            "app.config.settings",
+            MODE_MODEL_FAST_INTENT="ministral-3:3b",
+            MODE_MODEL_ACCURATE_INTENT="",
+            MODE_NUM_PREDICT_FAST_INTENT=48,
+            MODE_TEMPERATURE_ACCURATE_INTENT=0.1,
+        ):
+            router = ModelRouter()
+
+        assert router.get_model(TaskType.INTENT, Mode.FAST) == "ministral-3:3b"
+        # Empty keeps the route's model
+        assert router.get_model(TaskType.INTENT, Mode.ACCURATE) == router.get_model(TaskType.INTENT)
+        fast = router.get_options(TaskType.INTENT, Mode.FAST).to_payload()
+        assert fast["num_predict"] == 48
+        assert fast["temperature"] == router.get_options(TaskType.INTENT).temperature
+        assert router.get_options(TaskType.INTENT, Mode.ACCURATE).to_payload()["temperature"] == 0.1
+
+    def test_only_balanced_cascades(self):
+        with patch.multiple("app.config.settings", CASCADE_ENABLED=True, CASCADE_MODEL="ministral-3:3b"):
+            router = ModelRouter()
+
+        assert router.get_cascade(TaskType.CLASSIFY) is not None
+        assert router.get_cascade(TaskType.CLASSIFY, Mode.FAST) is None
+        assert router.get_cascade(TaskType.CLASSIFY, Mode.ACCURATE) is None
+
+    @pytest.mark.parametrize("header, expected", [("Fast", Mode.FAST), ("quick", None), (None, None)])
+    def test_resolve_mode_header(self, header, expected):
+        assert resolve_mode(header) == expected
+
+
+class TestServiceModes:
+    def test_request_mode_picks_model_and_options(self, mode_context):
+        mock_http_client = MagicMock()
+        with patch.multiple(
+            "app.config.settings", MODE_MODEL_FAST_CLASSIFY="tiny:1b", MODE_NUM_PREDICT_FAST_CLASSIFY=32
+        ):
+            service = _service(mock_http_client, router=ModelRouter())
+        mode_context(Mode.FAST)
+
+        service.classify_text(TEXT)
+
+        model, options = _sent(mock_http_client)[0]
+        assert model == "tiny:1b"
+        assert options["num_predict"] == 32
+
+    def test_accurate_skips_the_fast_path(self, mode_context):
+        mock_http_client = MagicMock()
+        engine = MagicMock()
+        engine.predict.return_value = ClassificationResponse(labels=["x"], primaryCategory="x", confidence=0.99)
+        fast_path = FastPath(TaskType.CLASSIFY, engine, "on", 0.8, 10_000)
+        service = _service(mock_http_client, fast_paths={TaskType.CLASSIFY: fast_path})
+
+        mode_context(Mode.BALANCED)
+        assert service.classify_text(TEXT).modelTier == "local"
+        mode_context(Mode.ACCURATE)
+        assert service.classify_text(TEXT).primaryCategory == "billing"
+        assert mock_http_client.post.call_count == 1
+
+    def test_cached_answers_are_kept_per_mode(self, mode_context):
+        mock_http_client = MagicMock()
+        cache = NearDuplicateCache(min_similarity=0.9, max_entries=10, ttl_seconds=60, min_words=3)
+        service = _service(mock_http_client, result_caches={TaskType.CLASSIFY: cache})
+
+        for mode in (Mode.FAST, Mode.ACCURATE, Mode.FAST):
+            mode_context(mode)
+            service.classify_text(TEXT)
+
+        assert mock_http_client.post.call_count == 2
+
+
+class TestModeEndpoint:
+    @pytest.fixture
+    def seen(self):
+        seen = []
+
+        def classify(text, fields):
+            seen.append(current_context().mode)
+            return ClassificationResponse(**ANSWER)
+
+        with patch("app.controller.ai_controller.ai_service") as mock_service:
+            mock_service.classify_text.side_effect = classify
+            yield seen
+
+    def test_header_sets_mode(self, seen):
+        TestClient(app).post("/api/ai/classify", json={"text": TEXT}, headers={"X-Mode": "fast"})
+
+        assert seen == [Mode.FAST]
+
+    def test_body_overrides_header(self, seen):
+        TestClient(app).post("/api/ai/classify", json={"text": TEXT, "mode": "accurate"}, headers={"X-Mode": "fast"})
+
+        assert seen == [Mode.ACCURATE]
+
+    def test_default_mode(self, seen):
+        TestClient(app).post("/api/ai/classify", json={"text": TEXT})
+
+        assert seen == [Mode.BALANCED]
+
+    def test_unknown_body_mode_returns_422(self, seen):
+        response = TestClient(app).post("/api/ai/classify", json={"text": TEXT, "mode": "turbo"})
+
+        assert response.status_code == 422
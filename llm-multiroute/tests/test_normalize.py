@@ -0,0 +1,155 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.cache.near_duplicate import NearDuplicateCache
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+from app.service.normalize import (
+    TextNormalizer,
+    collapse_whitespace,
+    parse_stages,
+    shorten_urls,
+    strip_html,
+    strip_quoted,
+    strip_signature,
+)
+
+ALL_STAGES = parse_stages("html,quoted,signature,urls,whitespace")
+
+EMAIL = """<html><head><style>p { color: red; }</style></head><body>
+<p>Hi team,</p>
+<p>The   export is <b>broken</b> again &amp; I need it fixed:
+https://tracker.example.com/issues/4411?utm_source=mail&amp;utm_medium=email</p>
+<p>Thanks</p>
+<p>Jane Doe<br>Senior Analyst<br>ACME Corp</p>
+<div>On Mon, Oct 12, 2026 at 9:14 AM Bob &lt;bob@example.com&gt; wrote:</div>
+<blockquote>&gt; Is the export working now?</blockquote>
+</body></html>"""
+CLEAN_EMAIL = "Hi team,\n\nThe export is broken again & I need it fixed:\ntracker.example.com/issues/4411"
+
+
+class TestStages:
+    def test_strip_html_drops_markup_and_unescapes(self):
+        result = strip_html("<style>x{}</style><p>Fish &amp; chips</p><br>done")
+
+        assert "<" not in result
+        assert "x{}" not in result
+        assert "Fish & chips" in result
+
+    @pytest.mark.parametrize("text", ["5 < 6 and 7 > 3", "if a<b and c>d then x"])
+    def test_plain_text_untouched_by_html_stage(self, text):
+        assert strip_html(text) == text
+
+    def test_comparisons_kept_next_to_real_markup(self):
+        assert strip_html("x < y &amp; <b>bold</b>") == "x < y &  bold"
+
+    def test_strip_quoted_reply_history(self):
+        text = "Works for me.\n\nOn Tue, Oct 13, 2026 at 10:00 AM Ann <ann@example.com> wrote:\n> Does it work?"
+
+        assert strip_quoted(text).strip() == "Works for me."
+
+    def test_strip_outlook_header_block(self):
+        text = "Short reply.\n\nFrom: Bob Smith\nSent: Monday\nTo: me\nSubject: x\n\nold text"
+
+        assert strip_quoted(text).strip() == "Short reply."
+
+    def test_from_line_alone_is_kept(self):
+        text = "From: the desk of the CEO, hello all.\nWe are growing."
+
+        assert strip_quoted(text) == text
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "The order arrived late.\n-- \nJane Doe\nACME",
+            "The order arrived late.\nSent from my iPhone",
+            "The order arrived late.\n\nBest regards,\nJane Doe\nSupport lead",
+        ],
+    )
+    def test_strip_signature(self, text):
+        assert strip_signature(text).strip() == "The order arrived late."
+
+    def test_sign_off_followed_by_content_is_kept(self):
+        text = "Thanks\n" + "\n".join(f"Line {i} of the actual message body continues here." for i in range(10))
+
+        assert strip_signature(text) == text
+
+    def test_sign_off_followed_by_prose_is_kept(self):
+        text = "Thanks\nAlso, the invoice from March is wrong and I need it fixed."
+
+        assert strip_signature(text) == text
+
+    def test_urls_lose_scheme_query_and_fragment(self):
+        assert shorten_urls("see https://github.com/org/repo/issues/123?utm_source=x#top now") == (
+            "see github.com/org/repo/issues/123 now"
+        )
+
+    def test_collapse_whitespace_keeps_indentation(self):
+        assert collapse_whitespace("\nif x:\n    a \t b  c \n\n\n\n    d  \n") == "if x:\n    a b c\n\n    d"
+
+    def test_unknown_stage_rejected(self):
+        with pytest.raises(ValueError):
+            parse_stages("html,emoji")
+
+
+class TestTextNormalizer:
+    def test_email_pipeline(self):
+        normalizer = TextNormalizer({TaskType.SENTIMENT: ALL_STAGES})
+
+        result = normalizer.apply(TaskType.SENTIMENT, EMAIL)
+
+        assert result == CLEAN_EMAIL
+        stats = normalizer.stats.snapshot()["sentiment"]
+        assert stats["bytes_out"] < stats["bytes_in"]
+        assert stats["estimated_tokens_saved"] > 0
+
+    def test_route_without_stages_is_untouched(self):
+        normalizer = TextNormalizer({TaskType.SENTIMENT: ALL_STAGES, TaskType.SUMMARIZE: ()})
+
+        assert normalizer.apply(TaskType.SUMMARIZE, EMAIL) == EMAIL
+        assert "summarize" not in normalizer.stats.snapshot()
+
+    def test_text_that_normalizes_to_nothing_is_kept(self):
+        normalizer = TextNormalizer({TaskType.INTENT: ALL_STAGES})
+
+        assert normalizer.apply(TaskType.INTENT, "<br>") == "<br>"
+
+
+class TestServiceNormalization:
+    def _service(self, mock_http_client, **kwargs):
+        mock_response = MagicMock()
+        content = {"overallSentiment": "negative", "sentimentScore": -0.5, "emotions": [], "confidence": 0.9}
+        mock_response.json.return_value = {"message": {"content": json.dumps(content)}}
+        mock_http_client.post.return_value = mock_response
+        return AIService(
+            http_client=mock_http_client,
+            router=ModelRouter(),
+            fast_paths={},
+            normalizer=TextNormalizer({TaskType.SENTIMENT: ALL_STAGES}),
+            **kwargs,
+        )
+
+    def test_model_sees_normalized_text(self):
+        mock_http_client = MagicMock()
+        service = self._service(mock_http_client, result_caches={})
+
+        service.analyze_sentiment(EMAIL)
+
+        sent = mock_http_client.post.call_args.kwargs["json"]["messages"][-1]["content"]
+        assert sent == "Text: " + CLEAN_EMAIL
+
+    def test_normalized_text_is_the_cache_key(self):
+        mock_http_client = MagicMock()
+        cache = NearDuplicateCache(min_similarity=1.0, max_entries=10, ttl_seconds=60, min_words=100)
+        service = self._service(mock_http_client, result_caches={TaskType.SENTIMENT: cache})
+        plain = (
+            "Hi team,\nThe export is broken again & I need it fixed:\nhttps://tracker.example.com/issues/4411\nThanks"
+        )
+
+        service.analyze_sentiment(EMAIL)
+        service.analyze_sentiment(plain)
+
+        assert mock_http_client.post.call_count == 1
+        assert cache.snapshot()["exact_hits"] == 1
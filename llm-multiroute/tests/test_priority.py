@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from app.concurrency.admission import AdmissionLimiter
+from app.concurrency.priority import PriorityScheduler, WeightedPicker
+from app.context import Priority, resolve_priority
+
+WEIGHTS = {Priority.INTERACTIVE: 8, Priority.BULK: 3, Priority.BATCH: 1}
+
+
+class TestResolvePriority:
+    def test_header_selects_class(self):
+        assert resolve_priority("batch", None) == Priority.BATCH
+        assert resolve_priority(" Bulk ", None) == Priority.BULK
+
+    def test_missing_or_unknown_header_uses_default(self):
+        assert resolve_priority(None, None) == Priority.INTERACTIVE
+        assert resolve_priority("urgent", None) == Priority.INTERACTIVE
+
+    def test_api_key_caps_header(self):
+        with patch.dict("app.context.API_KEY_PRIORITIES", {"nightly": Priority.BATCH, "crm": Priority.BULK}):
+            assert resolve_priority(None, "nightly") == Priority.BATCH
+            assert resolve_priority("interactive", "nightly") == Priority.BATCH
+            assert resolve_priority("batch", "crm") == Priority.BATCH
+            assert resolve_priority("unknown", "crm") == Priority.BULK
+
+
+class TestWeightedPicker:
+    def test_weighted_share_when_all_classes_backlogged(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=60)
+        for i in range(12):
+            for p in Priority:
+                picker.push(p, i)
+
+        picked = [picker.pop()[0] for _ in range(12)]
+
+        assert picked.count(Priority.INTERACTIVE) == 8
+        assert picked.count(Priority.BULK) == 3
+        assert picked.count(Priority.BATCH) == 1
+        assert picked[0] == Priority.INTERACTIVE
+
+    def test_fifo_within_class(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=60)
+        picker.push(Priority.BULK, "first")
+        picker.push(Priority.BULK, "second")
+
+        assert picker.pop() == (Priority.BULK, "first")
+        assert picker.pop() == (Priority.BULK, "second")
+        assert picker.pop() is None
+
+    def test_starved_request_is_promoted(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=0.01)
+        picker.push(Priority.BATCH, "old")
+        time.sleep(0.02)
+        picker.push(Priority.INTERACTIVE, "new")
+
+        assert picker.pop() == (Priority.BATCH, "old")
+        assert picker.promoted == 1
+
+    def test_remove(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=60)
+        item = object()
+        picker.push(Priority.BULK, item)
+
+        assert picker.remove(Priority.BULK, item)
+        assert not picker.remove(Priority.BULK, item)
+        assert len(picker) == 0
+
+
+class TestPriorityScheduler:
+    def test_interactive_waiter_served_before_batch(self):
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        assert scheduler.acquire(Priority.BATCH, 0)
+        order = []
+
+        def wait(priority):
+            if scheduler.acquire(priority, 2):
+                order.append(priority)
+                scheduler.release()
+
+        batch = threading.Thread(target=wait, args=(Priority.BATCH,))
+        batch.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=wait, args=(Priority.INTERACTIVE,))
+        interactive.start()
+        time.sleep(0.02)
+        scheduler.release()
+        batch.join()
+        interactive.join()
+
+        assert order == [Priority.INTERACTIVE, Priority.BATCH]
+        assert scheduler.in_flight == 0
+
+    def test_timeout_leaves_queue(self):
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        scheduler.acquire(Priority.INTERACTIVE, 0)
+
+        assert not scheduler.acquire(Priority.BULK, 0.01)
+        assert scheduler.snapshot()["queued"]["bulk"] == 0
+
+
+class TestAdmissionPriority:
+    def test_released_slot_goes_to_interactive_waiter(self):
+        limiter = AdmissionLimiter("summarize", max_concurrency=1, queue_size=4, max_queue_seconds=1)
+        order = []
+
+        async def waiter(priority):
+            await limiter.acquire(priority)
+            order.append(priority)
+            limiter.release()
+
+        async def run():
+            await limiter.acquire(Priority.BULK)
+            batch = asyncio.create_task(waiter(Priority.BATCH))
+            await asyncio.sleep(0.01)
+            interactive = asyncio.create_task(waiter(Priority.INTERACTIVE))
+            await asyncio.sleep(0.01)
+            assert limiter.snapshot()["queued_by_priority"] == {"interactive": 1, "bulk": 0, "batch": 1}
+            limiter.release()
+            await asyncio.gather(batch, interactive)
+
+        asyncio.run(run())
+
+        assert order == [Priority.INTERACTIVE, Priority.BATCH]
+        assert limiter.in_flight == 0
+
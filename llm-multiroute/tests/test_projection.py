@@ -0,0 +1,144 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache.near_duplicate import NearDuplicateCache
+from app.dto.sentiment_response import SentimentResponse
+from app.main import app
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+from app.service.normalize import TextNormalizer
+from app.service.prompts import UnknownFields, build_prompts
+
+REVIEW = "The checkout flow kept failing and support never answered my emails about the refund."
+SENTIMENT = {"overallSentiment": "negative", "sentimentScore": -0.7, "emotions": ["anger"], "confidence": 0.9}
+
+
+def _answers(mock_http_client, *contents):
+    responses = []
+    for content in contents:
+        response = MagicMock()
+        response.json.return_value = {"message": {"content": json.dumps(content)}}
+        responses.append(response)
+    mock_http_client.post.side_effect = responses
+
+
+def _service(mock_http_client, **kwargs):
+    options = {"router": ModelRouter(), "fast_paths": {}, "result_caches": {}, "normalizer": TextNormalizer({})}
+    return AIService(http_client=mock_http_client, **{**options, **kwargs})
+
+
+def _system_prompt(mock_http_client, call=-1) -> str:
+    return mock_http_client.post.call_args_list[call].kwargs["json"]["messages"][0]["content"]
+
+
+class TestPromptProjection:
+    def test_schema_lists_only_requested_fields_in_order(self):
+        prompt = build_prompts("system_prefix")[TaskType.SENTIMENT]
+
+        projected = prompt.project(["sentimentScore", "overallSentiment"])
+
+        assert projected.fields == ("overallSentiment", "sentimentScore")
+        assert projected.system_prompt.endswith('{"overallSentiment": "positive", "sentimentScore": 0.8}')
+        assert prompt.project(["overallSentiment", "sentimentScore"]) is projected
+
+    def test_all_fields_is_the_full_template(self):
+        prompt = build_prompts("system_prefix")[TaskType.CLASSIFY]
+
+        assert prompt.project(["confidence", "labels", "primaryCategory"]) is prompt
+
+    @pytest.mark.parametrize("fields", [["summary", "mood"], []])
+    def test_unknown_or_empty_fields_rejected(self, fields):
+        with pytest.raises(UnknownFields):
+            build_prompts("system_prefix")[TaskType.SUMMARIZE].project(fields)
+
+
+class TestServiceProjection:
+    def test_model_asked_only_for_requested_fields(self):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, {"overallSentiment": "negative"})
+        service = _service(mock_http_client)
+
+        result = service.analyze_sentiment(REVIEW, ["overallSentiment"])
+
+        assert _system_prompt(mock_http_client).endswith('{"overallSentiment": "positive"}')
+        assert result == SentimentResponse(overallSentiment="negative")
+
+    def test_extra_fields_in_answer_are_dropped(self):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, SENTIMENT)
+        service = _service(mock_http_client)
+
+        result = service.analyze_sentiment(REVIEW, ["sentimentScore"])
+
+        assert result.model_dump(exclude_none=True) == {"sentimentScore": -0.7}
+
+    def test_answer_missing_a_requested_field_fails(self):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, {"overallSentiment": "negative"})
+        service = _service(mock_http_client)
+
+        with pytest.raises(RuntimeError, match="missing fields"):
+            service.analyze_sentiment(REVIEW, ["overallSentiment", "emotions"])
+
+    def test_unknown_field_rejected_on_the_chunked_path(self):
+        mock_http_client = MagicMock()
+        service = _service(mock_http_client)
+
+        with patch.multiple("app.config.settings", CHUNKED_MODE_ENABLED=True, CHUNKED_CHUNK_CHARS=100):
+            with pytest.raises(UnknownFields):
+                service.analyze_sentiment(REVIEW * 5, ["bogus"])
+
+        mock_http_client.post.assert_not_called()
+
+    def test_cascade_keeps_confidence_in_the_schema(self):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, {"primaryCategory": "billing", "confidence": 0.95})
+        with patch.multiple("app.config.settings", CASCADE_ENABLED=True, CASCADE_MODEL="ministral-3:3b"):
+            service = _service(mock_http_client, router=ModelRouter())
+
+            result = service.classify_text(REVIEW, ["primaryCategory"])
+
+        assert '"confidence"' in _system_prompt(mock_http_client)
+        assert '"labels"' not in _system_prompt(mock_http_client)
+        assert result.model_dump(exclude_none=True) == {"primaryCategory": "billing", "modelTier": "small"}
+
+    def test_full_cached_answer_serves_projection_but_not_the_reverse(self):
+        mock_http_client = MagicMock()
+        _answers(mock_http_client, {"sentimentScore": -0.7}, SENTIMENT)
+        cache = NearDuplicateCache(min_similarity=0.9, max_entries=10, ttl_seconds=60, min_words=3)
+        service = _service(mock_http_client, result_caches={TaskType.SENTIMENT: cache})
+
+        service.analyze_sentiment(REVIEW, ["sentimentScore"])
+        full = service.analyze_sentiment(REVIEW)
+        projected = service.analyze_sentiment(REVIEW, ["overallSentiment"])
+
+        assert mock_http_client.post.call_count == 2
+        assert full.emotions == ["anger"]
+        assert projected.model_dump(exclude_none=True) == {"overallSentiment": "negative"}
+
+
+class TestProjectionEndpoint:
+    @pytest.fixture
+    def client(self):
+        return TestClient(app, raise_server_exceptions=False)
+
+    def test_omitted_fields_left_out_of_response(self, client):
+        with patch("app.controller.ai_controller.ai_service") as mock_service:
+            mock_service.analyze_sentiment.return_value = SentimentResponse(overallSentiment="negative")
+
+            response = client.post("/api/ai/sentiment", json={"text": REVIEW, "fields": ["overallSentiment"]})
+
+        assert response.status_code == 200
+        assert response.json() == {"overallSentiment": "negative"}
+        mock_service.analyze_sentiment.assert_called_once_with(REVIEW, ["overallSentiment"])
+
+    def test_unknown_field_returns_422(self, client):
+        with patch("app.controller.ai_controller.ai_service") as mock_service:
+            mock_service.analyze_sentiment.side_effect = UnknownFields("Unknown fields ['mood']")
+
+            response = client.post("/api/ai/sentiment", json={"text": REVIEW, "fields": ["mood"]})
+
+        assert response.status_code == 422
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.metrics import UpstreamTimings
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+from app.service.prompts import PromptTemplate, build_prompts
+
+
+class TestPromptTemplate:
+    def test_system_prefix_is_identical_across_texts(self):
+        prompts = build_prompts("system_prefix")
+
+        for task in TaskType:
+            first = prompts[task].messages("first text")
+            second = prompts[task].messages("a completely different text")
+            assert first[0] is second[0]
+            assert first[0]["role"] == "system"
+            assert first[-1] == {"role": "user", "content": "Text: first text"}
+
+    def test_inline_layout_keeps_single_user_message(self):
+        messages = build_prompts("inline")[TaskType.SUMMARIZE].messages("the text")
+
+        assert len(messages) == 1
+        content = messages[0]["content"]
+        assert content.startswith("Summarize the following text concisely.")
+        assert "Text: the text\n\n" in content
+        assert content.endswith('"wordCount": 25}')
+
+    def test_unknown_layout_rejected(self):
+        with pytest.raises(ValueError):
+            PromptTemplate("Do it.", {}, layout="suffix")
+
+    def test_service_sends_template_messages(self):
+        mock_http_client = MagicMock()
+        mock_http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"primaryIntent": "ask", "secondaryIntents": [], "intentCategory": "question", "confidence": 0.9}'}
+        }
+        service = AIService(http_client=mock_http_client, router=ModelRouter())
+        service.prompts = build_prompts("inline")
+
+        service.detect_intent("where is my order")
+
+        body = mock_http_client.post.call_args.kwargs["json"]
+        assert body["messages"] == service.prompts[TaskType.INTENT].messages("where is my order")
+
+
+class TestUpstreamTimings:
+    def test_records_prompt_eval_per_model(self):
+        timings = UpstreamTimings()
+
+        timings.record("gemma3:4b", {"prompt_eval_duration": 40_000_000, "prompt_eval_count": 12})
+        timings.record("gemma3:4b", {"prompt_eval_duration": 20_000_000, "prompt_eval_count": 4})
+        timings.record("gemma3:4b", {"message": {"content": "no timings"}})
+
+        stats = timings.snapshot()["gemma3:4b"]
+        assert stats["prompt_eval_ms"]["count"] == 2
+        assert stats["prompt_eval_tokens"]["count"] == 2
@@ -0,0 +1,167 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.cache.near_duplicate import NearDuplicateCache, normalize, similarity, simhash
+from app.dto.sentiment_response import SentimentResponse
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+
+REVIEW = (
+    "I ordered the blue backpack three weeks ago and it still has not arrived. The tracking page "
+    "has shown the same status since it left the warehouse and nobody answers my emails."
+)
+
+
+def _sentiment(label: str = "negative") -> SentimentResponse:
+    return SentimentResponse(overallSentiment=label, sentimentScore=-0.6, emotions=[], confidence=0.9)
+
+
+def _cache(**kwargs) -> NearDuplicateCache:
+    options = {"min_similarity": 0.95, "max_entries": 100, "ttl_seconds": 3600, "min_words": 8, **kwargs}
+    return NearDuplicateCache(**options)
+
+
+class TestSignatures:
+    def test_formatting_does_not_change_the_signature(self):
+        reformatted = "  " + REVIEW.upper().replace(" ", " \n ").replace(".", "!!") + " "
+
+        assert simhash(normalize(reformatted)) == simhash(normalize(REVIEW))
+
+    def test_small_edit_stays_similar(self):
+        edited = REVIEW.replace("blue backpack", "red backpack")
+
+        assert similarity(simhash(normalize(REVIEW)), simhash(normalize(edited))) >= 0.9
+
+    def test_unrelated_texts_are_dissimilar(self):
+        other = "The concert last night was wonderful and the band played every song we hoped to hear."
+
+        assert similarity(simhash(normalize(REVIEW)), simhash(normalize(other))) < 0.7
+
+
+class TestNearDuplicateCache:
+    def test_reuses_answer_for_near_duplicate(self):
+        cache = _cache(min_similarity=0.9)
+        compute = MagicMock(return_value=_sentiment())
+
+        cache.answer(REVIEW, compute)
+        result = cache.answer(REVIEW.replace("three weeks", "two weeks"), compute)
+
+        assert compute.call_count == 1
+        assert result.overallSentiment == "negative"
+        snapshot = cache.snapshot()
+        assert snapshot["near_hits"] == 1
+        assert snapshot["hit_rate"] == 0.5
+
+    def test_dissimilar_text_misses(self):
+        cache = _cache()
+        compute = MagicMock(side_effect=[_sentiment(), _sentiment("positive")])
+
+        cache.answer(REVIEW, compute)
+        result = cache.answer("Absolutely loved the hotel, the staff were friendly and the breakfast was great.", compute)
+
+        assert compute.call_count == 2
+        assert result.overallSentiment == "positive"
+
+    def test_short_texts_only_match_exactly(self):
+        cache = _cache(min_similarity=0.0)
+        compute = MagicMock(side_effect=[_sentiment(), _sentiment("positive"), _sentiment()])
+
+        cache.answer("not good at all", compute)
+        cache.answer("Not good, at all!", compute)
+        cache.answer("very good at all", compute)
+
+        assert compute.call_count == 2
+        assert cache.snapshot()["exact_hits"] == 1
+
+    def test_cached_results_are_copies(self):
+        cache = _cache()
+        cache.answer(REVIEW, lambda: _sentiment())
+
+        cache.answer(REVIEW, lambda: _sentiment()).modelTier = "mutated"
+
+        assert cache.answer(REVIEW, lambda: _sentiment()).modelTier is None
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = _cache(max_entries=2, min_words=100)
+        compute = MagicMock(return_value=_sentiment())
+
+        for text in ("one", "two", "one", "three", "one", "two"):
+            cache.answer(text, compute)
+
+        # "two" was evicted when "three" arrived; "one" stayed because it was used
+        assert compute.call_count == 4
+        assert cache.snapshot()["entries"] == 2
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = _cache(ttl_seconds=10, clock=lambda: now[0])
+        compute = MagicMock(return_value=_sentiment())
+
+        cache.answer(REVIEW, compute)
+        now[0] = 11.0
+        cache.answer(REVIEW, compute)
+
+        assert compute.call_count == 2
+
+    def test_failures_are_not_cached(self):
+        cache = _cache()
+
+        with pytest.raises(RuntimeError):
+            cache.answer(REVIEW, MagicMock(side_effect=RuntimeError("upstream down")))
+
+        assert cache.snapshot()["entries"] == 0
+
+    def test_similarity_distribution_recorded(self):
+        cache = _cache(min_similarity=0.99)
+        cache.answer(REVIEW, lambda: _sentiment())
+
+        cache.answer(REVIEW.replace("blue", "green"), lambda: _sentiment())
+
+        distribution = cache.snapshot()["best_similarity"]
+        assert distribution["none"] == 1
+        assert sum(distribution.values()) == 2
+
+
+class TestServiceResultCache:
+    def test_near_duplicate_skips_upstream(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "message": {
+                "content": '{"overallSentiment": "negative", "sentimentScore": -0.7, '
+                '"emotions": ["frustration"], "confidence": 0.9}'
+            }
+        }
+        mock_http_client.post.return_value = mock_response
+        service = AIService(
+            http_client=mock_http_client,
+            router=ModelRouter(),
+            fast_paths={},
+            result_caches={TaskType.SENTIMENT: _cache(min_similarity=0.9)},
+        )
+
+        first = service.analyze_sentiment(REVIEW)
+        second = service.analyze_sentiment(REVIEW.replace("  ", " ") + " ")
+
+        assert mock_http_client.post.call_count == 1
+        assert second == first
+
+    def test_routes_without_cache_always_ask(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "message": {"content": '{"summary": "Late order.", "keyPoints": [], "wordCount": 2}'}
+        }
+        mock_http_client.post.return_value = mock_response
+        service = AIService(
+            http_client=mock_http_client,
+            router=ModelRouter(),
+            fast_paths={},
+            result_caches={TaskType.SENTIMENT: _cache()},
+        )
+
+        service.summarize_text(REVIEW)
+        service.summarize_text(REVIEW)
+
+        assert mock_http_client.post.call_count == 2
@@ -0,0 +1,163 @@
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.concurrency.speculation import SpeculationBudget
+from app.context import SPECULATION_LOST, RequestCancelled, RequestContext, current_context, set_context
+from app.router.model_router import ModelRouter, TaskType
+from app.service.ai_service import AIService
+
+SMALL = "ministral-3:3b"
+CONFIDENT = '{"labels": ["t"], "primaryCategory": "small", "confidence": 0.95}'
+UNSURE = '{"labels": ["t"], "primaryCategory": "small", "confidence": 0.3}'
+LARGE = '{"labels": ["t"], "primaryCategory": "large", "confidence": 0.9}'
+
+
+@pytest.fixture
+def speculative_service():
+    with patch.multiple(
+        "app.config.settings", CASCADE_ENABLED=True, CASCADE_MODEL=SMALL, CASCADE_SPECULATIVE_ENABLED=True
+    ):
+        service = AIService(router=ModelRouter(), speculation=SpeculationBudget(ratio=0.5, burst=2, max_in_flight=2))
+        set_context(RequestContext(deadline=time.monotonic() + 5, speculative=True))
+        yield service
+    set_context(None)
+
+
+def _fake_chat(small_answer: str, large_answer: str, calls: list):
+    """The small model answers at once; the large one answers after 0.2 s unless cancelled first."""
+
+    def chat(messages, task_type, text, model=None):
+        context = current_context()
+        if model == SMALL:
+            calls.append(("small", context))
+            return small_answer
+        calls.append(("large", context))
+        for _ in range(20):
+            if context.cancelled:
+                raise RequestCancelled(context.cancel_reason)
+            time.sleep(0.01)
+        return large_answer
+
+    return chat
+
+
+def _wait_for(predicate):
+    for _ in range(100):
+        if predicate():
+            return
+        time.sleep(0.01)
+
+
+class TestSpeculationBudget:
+    def test_burst_then_ratio(self):
+        budget = SpeculationBudget(ratio=0.5, burst=1, max_in_flight=4)
+
+        assert budget.try_acquire()
+        budget.release(wasted=True)
+        assert not budget.try_acquire()
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_acquire()
+        assert budget.snapshot()["denied"] == 1
+
+    def test_needed_call_is_refunded(self):
+        budget = SpeculationBudget(ratio=0.0, burst=1, max_in_flight=4)
+
+        assert budget.try_acquire()
+        budget.release(wasted=False)
+
+        assert budget.try_acquire()
+        assert budget.snapshot()["wasted"] == 0
+
+    def test_max_in_flight(self):
+        budget = SpeculationBudget(ratio=0.0, burst=5, max_in_flight=1)
+
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+
+class TestSpeculativeCascade:
+    def test_confident_small_answer_cancels_large_call(self, speculative_service):
+        calls = []
+        speculative_service._chat = _fake_chat(CONFIDENT, LARGE, calls)
+
+        started = time.monotonic()
+        result = speculative_service.classify_text("text")
+
+        assert time.monotonic() - started < 0.15
+        assert result.primaryCategory == "small"
+        assert result.modelTier == "small"
+        large_context = dict(calls)["large"]
+        assert large_context.cancel_reason == SPECULATION_LOST
+        _wait_for(lambda: speculative_service.speculation.in_flight == 0)
+        assert speculative_service.speculation.snapshot()["wasted"] == 1
+
+    def test_unsure_small_answer_uses_large_call(self, speculative_service):
+        calls = []
+        speculative_service._chat = _fake_chat(UNSURE, LARGE, calls)
+
+        result = speculative_service.classify_text("text")
+
+        assert result.primaryCategory == "large"
+        assert result.modelTier == "large"
+        assert sorted(kind for kind, _ in calls) == ["large", "small"]
+        _wait_for(lambda: speculative_service.speculation.in_flight == 0)
+        assert speculative_service.speculation.snapshot()["wasted"] == 0
+
+    def test_failed_small_call_falls_back_to_large_call(self, speculative_service):
+        calls = []
+        chat = _fake_chat(CONFIDENT, LARGE, calls)
+
+        def small_fails(messages, task_type, text, model=None):
+            if model == SMALL:
+                raise httpx.ConnectError("small model down")
+            return chat(messages, task_type, text, model)
+
+        speculative_service._chat = small_fails
+
+        result = speculative_service.classify_text("text")
+
+        assert result.modelTier == "large"
+        assert calls[0][1].cancel_reason is None
+        _wait_for(lambda: speculative_service.speculation.in_flight == 0)
+        assert speculative_service.speculation.snapshot()["wasted"] == 0
+
+    def test_client_disconnect_cancels_large_call(self, speculative_service):
+        calls = []
+        context = current_context()
+        chat = _fake_chat(CONFIDENT, LARGE, calls)
+
+        def small_then_disconnect(messages, task_type, text, model=None):
+            if model == SMALL:
+                _wait_for(lambda: len(calls) == 1)
+                context.cancel("client_disconnected")
+                raise RequestCancelled("client_disconnected")
+            return chat(messages, task_type, text, model)
+
+        speculative_service._chat = small_then_disconnect
+
+        with pytest.raises(RequestCancelled):
+            speculative_service.classify_text("text")
+        assert calls[0][1].cancel_reason == "client_disconnected"
+
+    def test_over_budget_runs_sequentially(self, speculative_service):
+        speculative_service.speculation = SpeculationBudget(ratio=0.0, burst=0, max_in_flight=2)
+        calls = []
+        speculative_service._chat = _fake_chat(CONFIDENT, LARGE, calls)
+
+        result = speculative_service.classify_text("text")
+
+        assert result.modelTier == "small"
+        assert [kind for kind, _ in calls] == ["small"]
+
+    def test_requires_opt_in(self, speculative_service):
+        set_context(RequestContext(deadline=time.monotonic() + 5))
+        calls = []
+        speculative_service._chat = _fake_chat(CONFIDENT, LARGE, calls)
+
+        speculative_service.classify_text("text")
+
+        assert [kind for kind, _ in calls] == ["small"]
@@ -1,4 +1,25 @@
 import os
+from typing import Optional
+
+
+def _task_option(option: str, task: str, default: str = "") -> str:
+    """OLLAMA_<OPTION>_<TASK>, falling back to OLLAMA_<OPTION>, then `default`."""
+    return os.getenv(f"OLLAMA_{option}_{task}", os.getenv(f"OLLAMA_{option}", default)).strip()
+
+
+def _task_int(option: str, task: str, default: str = "") -> Optional[int]:
+    value = _task_option(option, task, default)
+    return int(value) if value else None
+
+
+def _task_float(option: str, task: str, default: str = "") -> Optional[float]:
+    value = _task_option(option, task, default)
+    return float(value) if value else None
+
+
+def _task_stop(task: str) -> list[str]:
+    # '|'-separated, with \n for newlines
+    return [s.replace("\\n", "\n") for s in _task_option("STOP", task).split("|") if s]
 
 
 class Settings:
@@ -8,6 +29,77 @@ class Settings:
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:4b")
     OLLAMA_TEMPERATURE: float = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
     OLLAMA_API_KEY: str = os.getenv("OLLAMA_API_KEY", "")
+    # system_prefix: static instructions in a system message, text last (prompt-cache friendly);
+    # inline: the original single user message, for A/B comparison
+    PROMPT_LAYOUT: str = os.getenv("PROMPT_LAYOUT", "system_prefix")
+
+    # Per-task generation options, sent to Ollama under "options". Each reads
+    # OLLAMA_<OPTION>_<TASK>, then OLLAMA_<OPTION>; empty leaves the model's default.
+    # NUM_PREDICT caps output tokens, sized to each task's JSON schema, so a runaway
+    # answer is cut off instead of generating until the context is full.
+    # STOP is '|'-separated
+    OLLAMA_NUM_PREDICT_CLASSIFY: Optional[int] = _task_int("NUM_PREDICT", "CLASSIFY", "128")
+    OLLAMA_NUM_PREDICT_SENTIMENT: Optional[int] = _task_int("NUM_PREDICT", "SENTIMENT", "128")
+    OLLAMA_NUM_PREDICT_SUMMARIZE: Optional[int] = _task_int("NUM_PREDICT", "SUMMARIZE", "512")
+    OLLAMA_NUM_PREDICT_INTENT: Optional[int] = _task_int("NUM_PREDICT", "INTENT", "128")
+
+    OLLAMA_TEMPERATURE_CLASSIFY: float = _task_float("TEMPERATURE", "CLASSIFY", "0.7")
+    OLLAMA_TEMPERATURE_SENTIMENT: float = _task_float("TEMPERATURE", "SENTIMENT", "0.7")
+    OLLAMA_TEMPERATURE_SUMMARIZE: float = _task_float("TEMPERATURE", "SUMMARIZE", "0.7")
+    OLLAMA_TEMPERATURE_INTENT: float = _task_float("TEMPERATURE", "INTENT", "0.7")
+
+    OLLAMA_NUM_CTX_CLASSIFY: Optional[int] = _task_int("NUM_CTX", "CLASSIFY")
+    OLLAMA_NUM_CTX_SENTIMENT: Optional[int] = _task_int("NUM_CTX", "SENTIMENT")
+    OLLAMA_NUM_CTX_SUMMARIZE: Optional[int] = _task_int("NUM_CTX", "SUMMARIZE")
+    OLLAMA_NUM_CTX_INTENT: Optional[int] = _task_int("NUM_CTX", "INTENT")
+
+    OLLAMA_TOP_K_CLASSIFY: Optional[int] = _task_int("TOP_K", "CLASSIFY")
+    OLLAMA_TOP_K_SENTIMENT: Optional[int] = _task_int("TOP_K", "SENTIMENT")
+    OLLAMA_TOP_K_SUMMARIZE: Optional[int] = _task_int("TOP_K", "SUMMARIZE")
+    OLLAMA_TOP_K_INTENT: Optional[int] = _task_int("TOP_K", "INTENT")
+
+    OLLAMA_TOP_P_CLASSIFY: Optional[float] = _task_float("TOP_P", "CLASSIFY")
+    OLLAMA_TOP_P_SENTIMENT: Optional[float] = _task_float("TOP_P", "SENTIMENT")
+    OLLAMA_TOP_P_SUMMARIZE: Optional[float] = _task_float("TOP_P", "SUMMARIZE")
+    OLLAMA_TOP_P_INTENT: Optional[float] = _task_float("TOP_P", "INTENT")
+
+    OLLAMA_SEED_CLASSIFY: Optional[int] = _task_int("SEED", "CLASSIFY")
+    OLLAMA_SEED_SENTIMENT: Optional[int] = _task_int("SEED", "SENTIMENT")
+    OLLAMA_SEED_SUMMARIZE: Optional[int] = _task_int("SEED", "SUMMARIZE")
+    OLLAMA_SEED_INTENT: Optional[int] = _task_int("SEED", "INTENT")
+
+    OLLAMA_STOP_CLASSIFY: list[str] = _task_stop("CLASSIFY")
+    OLLAMA_STOP_SENTIMENT: list[str] = _task_stop("SENTIMENT")
+    OLLAMA_STOP_SUMMARIZE: list[str] = _task_stop("SUMMARIZE")
+    OLLAMA_STOP_INTENT: list[str] = _task_stop("INTENT")
+
+    # Input normalization, run once per request before prompt construction.
+    # Comma-separated stages per task, applied in this order: html (tags, scripts,
+    # entities), quoted (email reply history), signature, urls (scheme, query and
+    # fragment dropped), whitespace. Empty turns normalization off. The defaults only
+    # drop markup and redundant whitespace; quoted, signature and urls change what the
+    # text says and are opt-in per task
+    NORMALIZE_STAGES_CLASSIFY: str = os.getenv("NORMALIZE_STAGES_CLASSIFY", "html,whitespace")
+    NORMALIZE_STAGES_SENTIMENT: str = os.getenv("NORMALIZE_STAGES_SENTIMENT", "html,whitespace")
+    NORMALIZE_STAGES_SUMMARIZE: str = os.getenv("NORMALIZE_STAGES_SUMMARIZE", "html,whitespace")
+    NORMALIZE_STAGES_INTENT: str = os.getenv("NORMALIZE_STAGES_INTENT", "html,whitespace")
+
+    # Longest a request may take end to end; callers can lower it with X-Request-Timeout-Ms
+    REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "120"))
+
+    # Upstream calls beyond this many wait in a priority queue; after the wait limit the API answers 429
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16"))
+    UPSTREAM_MAX_WAIT_SECONDS: float = float(os.getenv("UPSTREAM_MAX_WAIT_SECONDS", "60"))
+
+    # Priority classes (interactive, bulk, batch) from the X-Priority header or the API key
+    PRIORITY_DEFAULT: str = os.getenv("PRIORITY_DEFAULT", "interactive")
+    # Comma-separated key=class pairs, e.g. "nightly-key=batch,crm-key=bulk"
+    PRIORITY_API_KEYS: str = os.getenv("PRIORITY_API_KEYS", "")
+    PRIORITY_WEIGHT_INTERACTIVE: int = int(os.getenv("PRIORITY_WEIGHT_INTERACTIVE", "8"))
+    PRIORITY_WEIGHT_BULK: int = int(os.getenv("PRIORITY_WEIGHT_BULK", "3"))
+    PRIORITY_WEIGHT_BATCH: int = int(os.getenv("PRIORITY_WEIGHT_BATCH", "1"))
+    # A queued request older than this is served next regardless of class
+    PRIORITY_STARVATION_SECONDS: float = float(os.getenv("PRIORITY_STARVATION_SECONDS", "5"))
 
 
 settings = Settings()
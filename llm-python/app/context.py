@@ -0,0 +1,166 @@
+import threading
+import time
+from contextvars import ContextVar
+from enum import Enum
+from typing import Callable, Optional
+
+from app.config import settings
+from app.metrics import metrics
+
+# Remaining time budget of the caller in milliseconds, relative so clock skew does not matter
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+CLIENT_DISCONNECTED = "client_disconnected"
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+    BATCH = "batch"
+
+    @property
+    def rank(self) -> int:
+        return list(Priority).index(self)
+
+
+class RequestCancelled(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"Request cancelled ({reason.replace('_', ' ')})")
+        self.reason = reason
+
+
+class DeadlineExceeded(RequestCancelled):
+    def __init__(self):
+        super().__init__(DEADLINE_EXCEEDED)
+
+
+class CancellationStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {CLIENT_DISCONNECTED: 0, DEADLINE_EXCEEDED: 0, "upstream_aborted": 0}
+
+    def record(self, kind: str) -> None:
+        with self._lock:
+            self.counts[kind] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+
+cancellation_stats = CancellationStats()
+metrics.register("cancellation", cancellation_stats.snapshot)
+
+
+class RequestContext:
+    """Per-request scheduling information, visible to the service layer in the worker thread.
+
+    `deadline` is a time.monotonic() value; None means the caller set no budget (direct
+    service use). `cancel` may be called from the event loop while a worker thread is
+    blocked on the upstream; registered callbacks let that thread's I/O be cut short.
+    """
+
+    def __init__(self, priority: Priority = Priority.INTERACTIVE, deadline: Optional[float] = None):
+        self.priority = priority
+        self.deadline = deadline
+        self.cancel_reason: Optional[str] = None
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def cancel(self, reason: str) -> None:
+        with self._lock:
+            if self.cancel_reason is not None:
+                return
+            self.cancel_reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        cancellation_stats.record(reason)
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Runs `callback` on cancellation (at once if already cancelled); returns an unregister function."""
+        with self._lock:
+            if self.cancel_reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def check(self) -> None:
+        """Raises if the client went away or the deadline has passed."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self.cancel(DEADLINE_EXCEEDED)
+        if self.cancel_reason == DEADLINE_EXCEEDED:
+            raise DeadlineExceeded()
+        if self.cancel_reason is not None:
+            raise RequestCancelled(self.cancel_reason)
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_context() -> RequestContext:
+    return _current.get() or RequestContext(Priority(settings.PRIORITY_DEFAULT))
+
+
+def set_context(context: RequestContext) -> None:
+    _current.set(context)
+
+
+def _parse_api_key_map(raw: str) -> dict[str, Priority]:
+    mapping = {}
+    for entry in raw.split(","):
+        key, _, priority = entry.strip().partition("=")
+        if key and priority:
+            mapping[key] = Priority(priority.strip())
+    return mapping
+
+
+API_KEY_PRIORITIES = _parse_api_key_map(settings.PRIORITY_API_KEYS)
+
+
+def resolve_priority(header: Optional[str], api_key: Optional[str]) -> Priority:
+    """Priority from the X-Priority header, capped by the class assigned to the API key.
+
+    A key mapped to a class can ask for a lower priority but never a higher one, so
+    bulk clients cannot claim interactive capacity by sending the header.
+    """
+    requested = None
+    if header:
+        try:
+            requested = Priority(header.strip().lower())
+        except ValueError:
+            requested = None
+    assigned = API_KEY_PRIORITIES.get(api_key or "")
+    if assigned is None:
+        return requested or Priority(settings.PRIORITY_DEFAULT)
+    if requested is None or requested.rank < assigned.rank:
+        return assigned
+    return requested
+
+
+def deadline_from_header(value: Optional[str]) -> float:
+    """Absolute deadline from the caller's remaining budget, capped at REQUEST_TIMEOUT_SECONDS."""
+    budget = settings.REQUEST_TIMEOUT_SECONDS
+    if value:
+        try:
+            budget = min(budget, max(0.0, float(value) / 1000.0))
+        except ValueError:
+            pass
+    return time.monotonic() + budget
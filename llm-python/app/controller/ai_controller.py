@@ -1,15 +1,49 @@
-from fastapi import APIRouter
+import asyncio
+from typing import Optional
 
+from fastapi import APIRouter, Depends, Header, Request
+
+from app.context import CLIENT_DISCONNECTED, RequestContext, deadline_from_header, resolve_priority, set_context
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
 from app.dto.summary_response import SummaryResponse
 from app.dto.text_request import TextRequest
+from app.metrics import metrics
 from app.service.ai_service import AIService
 
-router = APIRouter(prefix="/api/ai", tags=["AI Text Analysis"])
+
+async def request_context(
+    request: Request,
+    x_priority: Optional[str] = Header(None, description="interactive, bulk or batch"),
+    x_api_key: Optional[str] = Header(None),
+    x_request_timeout_ms: Optional[str] = Header(None, description="Remaining time budget of the caller"),
+):
+    """Classifies the request; the context follows it into the worker thread.
+
+    While the request runs, a watcher cancels the context when the client disconnects
+    so the upstream call is aborted instead of generating an answer nobody reads.
+    """
+    context = RequestContext(resolve_priority(x_priority, x_api_key), deadline_from_header(x_request_timeout_ms))
+    set_context(context)
+    watcher = asyncio.create_task(_watch_disconnect(request, context))
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+async def _watch_disconnect(request: Request, context: RequestContext) -> None:
+    # The body has already been read, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+    context.cancel(CLIENT_DISCONNECTED)
+
+
+router = APIRouter(prefix="/api/ai", tags=["AI Text Analysis"], dependencies=[Depends(request_context)])
 
 ai_service = AIService()
+metrics.register("upstream", ai_service.scheduler.snapshot)
 
 
 @router.post(
@@ -50,3 +84,12 @@ def summarize_text(request: TextRequest) -> SummaryResponse:
 )
 def detect_intent(request: TextRequest) -> IntentResponse:
     return ai_service.detect_intent(request.text)
+
+
+@router.get(
+    "/metrics",
+    summary="Get Runtime Metrics",
+    description="Returns the upstream priority queue state and cancellation counters",
+)
+def get_metrics() -> dict:
+    return metrics.snapshot()
@@ -1,6 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
+from app.concurrency.priority import UpstreamBusy
 from app.config import settings
+from app.context import DeadlineExceeded, RequestCancelled
 from app.controller.ai_controller import router as ai_router
 
 app = FastAPI(
@@ -21,6 +24,27 @@ app = FastAPI(
     ],
 )
 
+
+@app.exception_handler(UpstreamBusy)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(RequestCancelled)
+async def request_cancelled_handler(request: Request, exc: RequestCancelled) -> JSONResponse:
+    # Nobody is listening any more; 499 is what the access log shows for client-closed requests
+    return JSONResponse(status_code=499, content={"detail": str(exc)})
+
+
 app.include_router(ai_router)
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+import math
+import threading
+from collections import deque
+from typing import Callable
+
+
+class LatencyStats:
+    """Running count/mean/max plus a bounded sample for percentiles, in milliseconds."""
+
+    def __init__(self, sample_size: int = 1024):
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=sample_size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += value_ms
+            self.max = max(self.max, value_ms)
+            self._samples.append(value_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._samples)
+            p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)] if ordered else 0.0
+            return {
+                "count": self.count,
+                "mean": round(self.total / self.count, 2) if self.count else 0.0,
+                "p95": round(p95, 2),
+                "max": round(self.max, 2),
+            }
+
+
+class MetricsRegistry:
+    """Collects snapshots from components that register a provider under a name."""
+
+    def __init__(self):
+        self._providers: dict[str, Callable[[], dict]] = {}
+
+    def register(self, name: str, provider: Callable[[], dict]) -> None:
+        self._providers[name] = provider
+
+    def snapshot(self) -> dict:
+        return {name: provider() for name, provider in self._providers.items()}
+
+
+class UpstreamTimings:
+    """Prompt evaluation timings that Ollama reports with each answer, per model.
+
+    A lower prompt_eval_tokens than the prompt length means Ollama reused a cached prefix.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: dict[str, dict[str, LatencyStats]] = {}
+
+    def record(self, model: str, body: dict) -> None:
+        if "prompt_eval_duration" not in body:
+            return
+        with self._lock:
+            stats = self._models.setdefault(
+                model, {"prompt_eval_ms": LatencyStats(), "prompt_eval_tokens": LatencyStats()}
+            )
+        stats["prompt_eval_ms"].record(body["prompt_eval_duration"] / 1_000_000)
+        stats["prompt_eval_tokens"].record(float(body.get("prompt_eval_count", 0)))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            models = dict(self._models)
+        return {model: {name: s.snapshot() for name, s in stats.items()} for model, stats in models.items()}
+
+
+metrics = MetricsRegistry()
+upstream_timings = UpstreamTimings()
+metrics.register("upstream_timings", upstream_timings.snapshot)
@@ -1,85 +1,128 @@
 import json
 import re
+import socket
 from typing import Optional
 
 import httpx
 
+from app.concurrency.priority import PriorityScheduler, configured_weights
 from app.config import settings
+from app.context import DEADLINE_EXCEEDED, RequestCancelled, RequestContext, cancellation_stats, current_context
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
 from app.dto.summary_response import SummaryResponse
+from app.metrics import upstream_timings
+from app.service.normalize import TextNormalizer, text_normalizer
+from app.service.options import build_options
+from app.service.prompts import prompts
 
 
 class AIService:
-    def __init__(self, http_client: Optional[httpx.Client] = None):
+    def __init__(
+        self,
+        http_client: Optional[httpx.Client] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        normalizer: Optional[TextNormalizer] = None,
+    ):
         self.http_client = http_client or httpx.Client(timeout=120.0)
+        self.scheduler = scheduler or PriorityScheduler(
+            lambda: settings.UPSTREAM_MAX_CONCURRENCY,
+            configured_weights(),
+            settings.PRIORITY_STARVATION_SECONDS,
+        )
         self.base_url = settings.OLLAMA_BASE_URL
         self.model = settings.OLLAMA_MODEL
-        self.temperature = settings.OLLAMA_TEMPERATURE
         self.api_key = settings.OLLAMA_API_KEY
+        self.normalizer = normalizer or text_normalizer
+        self.prompts = prompts
+        self.options = build_options()
+
+    def _chat(self, messages: list[dict], task: str) -> str:
+        context = current_context()
+        max_wait = settings.UPSTREAM_MAX_WAIT_SECONDS
+        if context.deadline is not None:
+            max_wait = max(0.0, min(max_wait, context.remaining()))
+        with self.scheduler.slot(context.priority, max_wait):
+            return self._post_chat(messages, self.options[task].to_payload())
 
-    def _chat(self, prompt: str) -> str:
+    def _post_chat(self, messages: list[dict], options: dict) -> str:
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-        response = self.http_client.post(
-            f"{self.base_url}/api/chat",
-            headers=headers,
-            json={
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "stream": False,
-                "options": {"temperature": self.temperature},
-            },
-        )
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": False,
+            "options": options,
+        }
+        context = current_context()
+        if context.deadline is not None:
+            return self._stream_chat(headers, payload, context)
+        response = self.http_client.post(f"{self.base_url}/api/chat", headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()["message"]["content"]
+        body = response.json()
+        upstream_timings.record(self.model, body)
+        return body["message"]["content"]
+
+    def _stream_chat(self, headers: dict, payload: dict, context: RequestContext) -> str:
+        """Streams the answer so a cancelled request can stop the upstream mid-generation.
+
+        Reads time out at the remaining budget; a client disconnect shuts the socket down
+        from the event loop, which also tells Ollama to stop generating.
+        """
+        context.check()
+        parts = []
+        try:
+            with self.http_client.stream(
+                "POST",
+                f"{self.base_url}/api/chat",
+                headers=headers,
+                json={**payload, "stream": True},
+                timeout=context.remaining(),
+            ) as response:
+                unregister = context.on_cancel(lambda: _abort(response))
+                try:
+                    if response.is_error:
+                        response.read()
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        context.check()
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if "error" in chunk:
+                            raise RuntimeError(f"Upstream error: {chunk['error']}")
+                        parts.append(chunk.get("message", {}).get("content", ""))
+                        if chunk.get("done"):
+                            upstream_timings.record(self.model, chunk)
+                finally:
+                    unregister()
+        except httpx.TimeoutException:
+            context.cancel(DEADLINE_EXCEEDED)
+            cancellation_stats.record("upstream_aborted")
+            context.check()
+        except (httpx.TransportError, RequestCancelled):
+            if not context.cancelled:
+                raise
+            cancellation_stats.record("upstream_aborted")
+            context.check()
+        return "".join(parts)
 
     def classify_text(self, text: str) -> ClassificationResponse:
-        prompt = (
-            "Analyze the following text and classify it with appropriate labels and tags. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"labels": ["label1", "label2"], "primaryCategory": "category", "confidence": 0.9}'
-        )
-        response = self._chat(prompt)
+        response = self._chat(self.prompts["classify"].messages(self.normalizer.apply("classify", text)), "classify")
         return self._parse_json(response, ClassificationResponse)
 
     def analyze_sentiment(self, text: str) -> SentimentResponse:
-        prompt = (
-            "Analyze the sentiment of the following text. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"overallSentiment": "positive", "sentimentScore": 0.8, '
-            '"emotions": ["joy", "excitement"], "confidence": 0.9}'
-        )
-        response = self._chat(prompt)
+        response = self._chat(self.prompts["sentiment"].messages(self.normalizer.apply("sentiment", text)), "sentiment")
         return self._parse_json(response, SentimentResponse)
 
     def summarize_text(self, text: str) -> SummaryResponse:
-        prompt = (
-            "Summarize the following text concisely. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"summary": "your summary here", "keyPoints": ["point1", "point2", "point3"], "wordCount": 25}'
-        )
-        response = self._chat(prompt)
+        response = self._chat(self.prompts["summarize"].messages(self.normalizer.apply("summarize", text)), "summarize")
         return self._parse_json(response, SummaryResponse)
 
     def detect_intent(self, text: str) -> IntentResponse:
-        prompt = (
-            "Detect the intent behind the following text. "
-            "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
-            f"Text: {text}\n\n"
-            "Return JSON in this exact format:\n"
-            '{"primaryIntent": "main_intent", "secondaryIntents": ["intent1", "intent2"], '
-            '"intentCategory": "question", "confidence": 0.9}'
-        )
-        response = self._chat(prompt)
+        response = self._chat(self.prompts["intent"].messages(self.normalizer.apply("intent", text)), "intent")
         return self._parse_json(response, IntentResponse)
 
     @staticmethod
@@ -95,3 +138,14 @@ class AIService:
             return model_class(**data)
         except Exception as e:
             raise RuntimeError(f"Failed to parse AI response as JSON: {raw}") from e
+
+
+def _abort(response: httpx.Response) -> None:
+    """Shuts the upstream socket down so the worker blocked reading it returns at once."""
+    stream = response.extensions.get("network_stream")
+    sock = stream.get_extra_info("socket") if stream is not None else None
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
@@ -0,0 +1,178 @@
+import html
+import math
+import re
+import threading
+from typing import Callable
+
+from app.config import settings
+from app.metrics import metrics
+
+# Only well-formed tags: a name, then name=value attributes, so "a<b and c>d" is left alone
+_HTML_TAG = re.compile(
+    r"</?[a-zA-Z][\w-]*(?:\s+[\w:.-]+\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'<>=`]+))*\s*/?>|<![a-zA-Z][^<>]*>"
+)
+_HTML_ENTITY = re.compile(r"&(?:[a-zA-Z]+|#[0-9]+|#x[0-9a-fA-F]+);")
+_HTML_DROP = re.compile(r"<(script|style|head)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_HTML_BREAK = re.compile(r"<\s*(br|/p|/div|/li|/tr|/h[1-6])\b[^<>]*>", re.IGNORECASE)
+
+_QUOTE_HEADER = re.compile(
+    r"^[ \t]*(?:On [^\n]{5,200}wrote:[ \t]*$"  # Gmail, Apple Mail
+    r"|-{2,}[ \t]*Original Message[ \t]*-{2,}"  # Outlook plain text
+    r"|From:[^\n]+\n(?:[A-Za-z-]+:[^\n]*\n){0,3}?(?:Sent|Date):)",  # Outlook header block
+    re.IGNORECASE | re.MULTILINE,
+)
+_QUOTED_LINE = re.compile(r"^[ \t]*>.*(?:\n|$)", re.MULTILINE)
+
+_SIGNATURE_DELIMITER = re.compile(r"^--[ \t]*$", re.MULTILINE)
+_SENT_FROM = re.compile(r"^[ \t]*Sent from my [\w ]+$", re.IGNORECASE | re.MULTILINE)
+_SIGN_OFF = re.compile(
+    r"^[ \t]*(best( regards)?|kind regards|regards|cheers|thanks( again)?|thank you|sincerely|br),?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# A sign-off only starts a signature when at most this many short lines follow it, none of them prose
+SIGNATURE_MAX_LINES = 6
+SIGNATURE_MAX_WORDS = 6
+
+_URL = re.compile(r"\bhttps?://([^\s<>\"')\]?#]+)(?:[?#][^\s<>\"')\]]*)?", re.IGNORECASE)
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+CHARS_PER_TOKEN = 4
+
+# The stages are kept identical to llm-multiroute/app/service/normalize.py: each service
+# is built and deployed from its own directory with no shared package, like context.py
+# and the priority scheduler. Only the normalizer's keying (by task name or TaskType) differs
+
+TASKS = ("classify", "sentiment", "summarize", "intent")
+
+
+def strip_html(text: str) -> str:
+    if not (_HTML_TAG.search(text) or _HTML_ENTITY.search(text)):
+        return text
+    text = _HTML_DROP.sub(" ", text)
+    text = html.unescape(_HTML_TAG.sub(" ", _HTML_BREAK.sub("\n", text)))
+    # Indentation in markup is layout, not content
+    return "\n".join(line.strip() for line in text.split("\n"))
+
+
+def strip_quoted(text: str) -> str:
+    """Drops the quoted history of an email reply: '>' lines and everything after a reply header."""
+    header = _QUOTE_HEADER.search(text)
+    if header is not None and header.start() > 0:
+        text = text[: header.start()]
+    return _QUOTED_LINE.sub("", text)
+
+
+def strip_signature(text: str) -> str:
+    for pattern in (_SIGNATURE_DELIMITER, _SENT_FROM):
+        match = pattern.search(text)
+        if match is not None and match.start() > 0:
+            text = text[: match.start()]
+    for match in _SIGN_OFF.finditer(text):
+        tail = [line.strip() for line in text[match.end() :].splitlines() if line.strip()]
+        if match.start() > 0 and len(tail) <= SIGNATURE_MAX_LINES and not any(map(_is_prose, tail)):
+            return text[: match.start()]
+    return text
+
+
+def _is_prose(line: str) -> bool:
+    """Whether a line reads as message content rather than a name, title or contact detail."""
+    words = line.split()
+    return len(line) > 80 or len(words) > SIGNATURE_MAX_WORDS or (len(words) >= 3 and line[-1] in ".!?:")
+
+
+def shorten_urls(text: str) -> str:
+    """Drops each URL's scheme, query string and fragment; the host and path carry the meaning."""
+    return _URL.sub(lambda m: m.group(1), text)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapses runs of spaces and blank lines, keeping each line's indentation."""
+    lines = []
+    for line in text.split("\n"):
+        body = line.lstrip(" \t")
+        lines.append((line[: len(line) - len(body)] + _SPACES.sub(" ", body)).rstrip())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip("\n")
+
+
+# Applied in this order, whatever order a task lists them in
+STAGES: dict[str, Callable[[str], str]] = {
+    "html": strip_html,
+    "quoted": strip_quoted,
+    "signature": strip_signature,
+    "urls": shorten_urls,
+    "whitespace": collapse_whitespace,
+}
+
+
+def parse_stages(raw: str) -> tuple[str, ...]:
+    names = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = names - STAGES.keys()
+    if unknown:
+        raise ValueError(f"Unknown normalization stages {sorted(unknown)}, expected some of {list(STAGES)}")
+    return tuple(name for name in STAGES if name in names)
+
+
+class NormalizationStats:
+    """Bytes and estimated prompt tokens before and after normalization, per task."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: dict[str, list[int]] = {}
+
+    def record(self, task: str, before: str, after: str) -> None:
+        with self._lock:
+            counts = self._tasks.setdefault(task, [0, 0, 0, 0, 0])
+            counts[0] += 1
+            counts[1] += len(before.encode())
+            counts[2] += len(after.encode())
+            counts[3] += math.ceil(len(before) / CHARS_PER_TOKEN)
+            counts[4] += math.ceil(len(after) / CHARS_PER_TOKEN)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                task: {
+                    "requests": n,
+                    "bytes_in": bytes_in,
+                    "bytes_out": bytes_out,
+                    "bytes_saved_ratio": round(1 - bytes_out / bytes_in, 4) if bytes_in else 0.0,
+                    "estimated_tokens_saved": tokens_in - tokens_out,
+                }
+                for task, (n, bytes_in, bytes_out, tokens_in, tokens_out) in self._tasks.items()
+            }
+
+
+class TextNormalizer:
+    """Cleans request text once, before prompt construction.
+
+    Each task runs its configured stages; the result is what the model sees. A text
+    that normalizes to nothing is passed unchanged.
+    """
+
+    def __init__(self, stages: dict[str, tuple[str, ...]]):
+        self.stages = stages
+        self.stats = NormalizationStats()
+
+    def apply(self, task: str, text: str) -> str:
+        stages = self.stages.get(task, ())
+        if not stages:
+            return text
+        normalized = text
+        for name in stages:
+            normalized = STAGES[name](normalized)
+        if not normalized.strip():
+            normalized = text
+        self.stats.record(task, text, normalized)
+        return normalized
+
+
+def build_normalizer() -> TextNormalizer:
+    return TextNormalizer(
+        {task: parse_stages(getattr(settings, f"NORMALIZE_STAGES_{task.upper()}")) for task in TASKS}
+    )
+
+
+text_normalizer = build_normalizer()
+metrics.register("normalization", text_normalizer.stats.snapshot)
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from app.config import settings
+
+
+class GenerationOptions:
+    """Ollama sampling options for one task; None leaves the model's default."""
+
+    def __init__(
+        self,
+        temperature: Optional[float] = None,
+        num_predict: Optional[int] = None,
+        num_ctx: Optional[int] = None,
+        stop: Optional[list[str]] = None,
+        top_k: Optional[int] = None,
+        top_p: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.temperature = temperature
+        self.num_predict = num_predict
+        self.num_ctx = num_ctx
+        self.stop = stop or []
+        self.top_k = top_k
+        self.top_p = top_p
+        self.seed = seed
+        self._payload = self._build_payload()
+
+    @classmethod
+    def for_task(cls, task: str) -> "GenerationOptions":
+        name = task.upper()
+        return cls(
+            temperature=getattr(settings, f"OLLAMA_TEMPERATURE_{name}"),
+            num_predict=getattr(settings, f"OLLAMA_NUM_PREDICT_{name}"),
+            num_ctx=getattr(settings, f"OLLAMA_NUM_CTX_{name}"),
+            stop=getattr(settings, f"OLLAMA_STOP_{name}"),
+            top_k=getattr(settings, f"OLLAMA_TOP_K_{name}"),
+            top_p=getattr(settings, f"OLLAMA_TOP_P_{name}"),
+            seed=getattr(settings, f"OLLAMA_SEED_{name}"),
+        )
+
+    def _build_payload(self) -> dict:
+        options = {
+            "temperature": self.temperature,
+            "num_predict": self.num_predict,
+            "num_ctx": self.num_ctx,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "seed": self.seed,
+        }
+        payload = {name: value for name, value in options.items() if value is not None}
+        if self.stop:
+            payload["stop"] = list(self.stop)
+        return payload
+
+    def to_payload(self) -> dict:
+        """The `options` object of an /api/chat request."""
+        return self._payload
+
+
+def build_options() -> dict[str, GenerationOptions]:
+    return {task: GenerationOptions.for_task(task) for task in ("classify", "sentiment", "summarize", "intent")}
@@ -0,0 +1,64 @@
+from app.config import settings
+
+JSON_ONLY = "Respond with ONLY valid JSON, no additional text or explanation."
+
+PROMPT_LAYOUTS = ("system_prefix", "inline")
+
+
+class PromptTemplate:
+    """Chat messages for one task.
+
+    With the `system_prefix` layout the instructions and JSON format live in a system
+    message that is identical on every request and the text comes last, so Ollama
+    reuses the cached prefix and only evaluates the new tokens. `inline` is the
+    original single user message with the text in the middle, kept for A/B runs.
+    """
+
+    def __init__(self, instruction: str, schema: str, layout: str = "system_prefix"):
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{layout}', expected one of {PROMPT_LAYOUTS}")
+        self.instruction = instruction
+        self.schema = schema
+        self.layout = layout
+        self.system_prompt = f"{instruction} {JSON_ONLY}\n\nReturn JSON in this exact format:\n{schema}"
+        self._system_message = {"role": "system", "content": self.system_prompt}
+
+    def messages(self, text: str) -> list[dict]:
+        if self.layout == "inline":
+            content = (
+                f"{self.instruction} {JSON_ONLY}\n\n"
+                f"Text: {text}\n\n"
+                f"Return JSON in this exact format:\n{self.schema}"
+            )
+            return [{"role": "user", "content": content}]
+        return [self._system_message, {"role": "user", "content": f"Text: {text}"}]
+
+
+def build_prompts(layout: str) -> dict[str, PromptTemplate]:
+    return {
+        "classify": PromptTemplate(
+            "Analyze the following text and classify it with appropriate labels and tags.",
+            '{"labels": ["label1", "label2"], "primaryCategory": "category", "confidence": 0.9}',
+            layout,
+        ),
+        "sentiment": PromptTemplate(
+            "Analyze the sentiment of the following text.",
+            '{"overallSentiment": "positive", "sentimentScore": 0.8, '
+            '"emotions": ["joy", "excitement"], "confidence": 0.9}',
+            layout,
+        ),
+        "summarize": PromptTemplate(
+            "Summarize the following text concisely.",
+            '{"summary": "your summary here", "keyPoints": ["point1", "point2", "point3"], "wordCount": 25}',
+            layout,
+        ),
+        "intent": PromptTemplate(
+            "Detect the intent behind the following text.",
+            '{"primaryIntent": "main_intent", "secondaryIntents": ["intent1", "intent2"], '
+            '"intentCategory": "question", "confidence": 0.9}',
+            layout,
+        ),
+    }
+
+
+prompts = build_prompts(settings.PROMPT_LAYOUT)
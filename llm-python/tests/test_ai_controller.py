@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.concurrency.priority import UpstreamBusy
+from app.context import Priority, current_context
 from app.dto.classification_response import ClassificationResponse
 from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
@@ -291,3 +293,27 @@ class TestRequestValidation:
         )
 
         assert response.status_code == 422
+
+
+class TestPriorityClassification:
+    def test_priority_header_reaches_service(self, client, mock_ai_service):
+        seen = []
+
+        def classify(text):
+            seen.append(current_context().priority)
+            return ClassificationResponse(labels=["t"], primaryCategory="t", confidence=0.9)
+
+        mock_ai_service.classify_text.side_effect = classify
+
+        response = client.post("/api/ai/classify", json={"text": "test"}, headers={"X-Priority": "batch"})
+
+        assert response.status_code == 200
+        assert seen == [Priority.BATCH]
+
+    def test_no_upstream_slot_returns_429(self, client, mock_ai_service):
+        mock_ai_service.classify_text.side_effect = UpstreamBusy(Priority.BATCH, 60, retry_after=7)
+
+        response = client.post("/api/ai/classify", json={"text": "test"})
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
@@ -8,6 +8,7 @@ from app.dto.intent_response import IntentResponse
 from app.dto.sentiment_response import SentimentResponse
 from app.dto.summary_response import SummaryResponse
 from app.service.ai_service import AIService
+from app.service.options import GenerationOptions
 
 
 @pytest.fixture
@@ -227,6 +228,27 @@ class TestAuthorizationHeader:
         assert "Authorization" not in headers
 
 
+class TestGenerationOptions:
+    def test_options_nested_and_capped_per_task(self, ai_service, mock_http_client):
+        _setup_chat_response(mock_http_client, '{"summary": "s", "keyPoints": ["p"], "wordCount": 1}')
+
+        ai_service.summarize_text("text")
+
+        body = mock_http_client.post.call_args.kwargs["json"]
+        assert body["options"] == {"temperature": 0.7, "num_predict": 512}
+
+    def test_options_from_settings(self):
+        with patch.multiple(
+            "app.config.settings",
+            OLLAMA_NUM_CTX_INTENT=4096,
+            OLLAMA_TOP_P_INTENT=0.9,
+            OLLAMA_STOP_INTENT=["\n\n"],
+        ):
+            options = GenerationOptions.for_task("intent").to_payload()
+
+        assert options == {"temperature": 0.7, "num_predict": 128, "num_ctx": 4096, "top_p": 0.9, "stop": ["\n\n"]}
+
+
 class TestJsonParsingEdgeCases:
     def test_extra_whitespace(self, ai_service, mock_http_client):
         json_response = '  \n\n  {"labels": ["test"], "primaryCategory": "test", "confidence": 0.9}  \n\n  '
@@ -261,9 +283,10 @@ class TestJsonParsingEdgeCases:
 
         call_args = mock_http_client.post.call_args
         body = call_args.kwargs.get("json") or call_args[1].get("json")
-        prompt = body["messages"][0]["content"]
-        assert "Test input text" in prompt
-        assert "Respond with ONLY valid JSON" in prompt
-        assert "labels" in prompt
-        assert "primaryCategory" in prompt
-        assert "confidence" in prompt
+        system, user = body["messages"]
+        assert system["role"] == "system"
+        assert "Respond with ONLY valid JSON" in system["content"]
+        assert "labels" in system["content"]
+        assert "primaryCategory" in system["content"]
+        assert "confidence" in system["content"]
+        assert user == {"role": "user", "content": "Text: Test input text"}
@@ -0,0 +1,71 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.service.ai_service import AIService
+from app.service.normalize import (
+    TextNormalizer,
+    collapse_whitespace,
+    parse_stages,
+    strip_html,
+    strip_quoted,
+    strip_signature,
+)
+
+ALL_STAGES = parse_stages("html,quoted,signature,urls,whitespace")
+
+EMAIL = (
+    "<p>The   export is <b>broken</b> again &amp; I need it fixed: "
+    "https://tracker.example.com/issues/4411?utm_source=mail</p>\n"
+    "<p>Best regards,</p><p>Jane Doe<br>ACME Corp</p>"
+)
+
+
+class TestTextNormalizer:
+    def test_email_pipeline(self):
+        normalizer = TextNormalizer({"sentiment": ALL_STAGES})
+
+        result = normalizer.apply("sentiment", EMAIL)
+
+        assert result == "The export is broken again & I need it fixed: tracker.example.com/issues/4411"
+        assert normalizer.stats.snapshot()["sentiment"]["bytes_saved_ratio"] > 0.5
+
+    def test_task_without_stages_is_untouched(self):
+        normalizer = TextNormalizer({"summarize": ()})
+
+        assert normalizer.apply("summarize", EMAIL) == EMAIL
+
+    def test_quoted_reply_and_signature_removed(self):
+        text = "Works for me.\n-- \nAnn\n\nOn Tue, Oct 13, 2026 at 10:00 AM Bob <bob@example.com> wrote:\n> Ok?"
+
+        assert strip_signature(strip_quoted(text)).strip() == "Works for me."
+
+    def test_plain_text_and_indentation_survive(self):
+        text = "if a<b and c>d:\n    return  x"
+
+        assert collapse_whitespace(strip_html(text)) == "if a<b and c>d:\n    return x"
+
+    def test_sign_off_followed_by_prose_is_kept(self):
+        text = "Thanks\nAlso, the invoice from March is wrong and I need it fixed."
+
+        assert strip_signature(text) == text
+
+    def test_unknown_stage_rejected(self):
+        with pytest.raises(ValueError):
+            parse_stages("emoji")
+
+
+class TestServiceNormalization:
+    def test_model_sees_normalized_text(self):
+        mock_http_client = MagicMock()
+        mock_response = MagicMock()
+        content = {"overallSentiment": "negative", "sentimentScore": -0.5, "emotions": [], "confidence": 0.9}
+        mock_response.json.return_value = {"message": {"content": json.dumps(content)}}
+        mock_http_client.post.return_value = mock_response
+        service = AIService(http_client=mock_http_client, normalizer=TextNormalizer({"sentiment": ALL_STAGES}))
+
+        service.analyze_sentiment(EMAIL)
+
+        sent = mock_http_client.post.call_args.kwargs["json"]["messages"][-1]["content"]
+        assert sent == "Text: The export is broken again & I need it fixed: tracker.example.com/issues/4411"
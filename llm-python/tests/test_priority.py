@@ -0,0 +1,118 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.concurrency.priority import PriorityScheduler, UpstreamBusy, WeightedPicker
+from app.context import Priority, RequestContext, resolve_priority, set_context
+from app.service.ai_service import AIService
+
+WEIGHTS = {Priority.INTERACTIVE: 8, Priority.BULK: 3, Priority.BATCH: 1}
+
+
+class TestResolvePriority:
+    def test_header_selects_class(self):
+        assert resolve_priority("bulk", None) == Priority.BULK
+        assert resolve_priority("urgent", None) == Priority.INTERACTIVE
+
+    def test_api_key_caps_header(self):
+        with patch.dict("app.context.API_KEY_PRIORITIES", {"nightly": Priority.BATCH}):
+            assert resolve_priority("interactive", "nightly") == Priority.BATCH
+            assert resolve_priority(None, "nightly") == Priority.BATCH
+
+
+class TestWeightedPicker:
+    def test_weighted_share_when_all_classes_backlogged(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=60)
+        for i in range(12):
+            for p in Priority:
+                picker.push(p, i)
+
+        picked = [picker.pop()[0] for _ in range(12)]
+
+        assert picked.count(Priority.INTERACTIVE) == 8
+        assert picked.count(Priority.BULK) == 3
+        assert picked.count(Priority.BATCH) == 1
+
+    def test_starved_request_is_promoted(self):
+        picker = WeightedPicker(WEIGHTS, starvation_seconds=0.01)
+        picker.push(Priority.BATCH, "old")
+        time.sleep(0.02)
+        picker.push(Priority.INTERACTIVE, "new")
+
+        assert picker.pop() == (Priority.BATCH, "old")
+        assert picker.promoted == 1
+
+
+class TestPriorityScheduler:
+    def test_interactive_waiter_served_before_batch(self):
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        assert scheduler.acquire(Priority.BATCH, 0)
+        order = []
+
+        def wait(priority):
+            with scheduler.slot(priority, 2):
+                order.append(priority)
+
+        batch = threading.Thread(target=wait, args=(Priority.BATCH,))
+        batch.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=wait, args=(Priority.INTERACTIVE,))
+        interactive.start()
+        time.sleep(0.02)
+        scheduler.release()
+        batch.join()
+        interactive.join()
+
+        assert order == [Priority.INTERACTIVE, Priority.BATCH]
+        assert scheduler.in_flight == 0
+
+    def test_slot_raises_after_wait(self):
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        scheduler.acquire(Priority.INTERACTIVE, 0)
+
+        with pytest.raises(UpstreamBusy):
+            with scheduler.slot(Priority.BULK, 0.01):
+                pass
+        assert scheduler.snapshot()["queued"]["bulk"] == 0
+
+    def test_retry_after_follows_slot_hold_time_and_queue(self):
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        assert scheduler.retry_after() == 1
+
+        for _ in range(20):
+            scheduler.acquire(Priority.INTERACTIVE, 0)
+            scheduler.release(held_seconds=4.0)
+        scheduler.acquire(Priority.INTERACTIVE, 0)
+
+        with pytest.raises(UpstreamBusy) as busy:
+            with scheduler.slot(Priority.BATCH, 0.01):
+                pass
+        assert busy.value.retry_after == 4
+
+
+class TestServiceScheduling:
+    def test_chat_uses_request_priority_and_releases_slot(self):
+        http_client = MagicMock()
+        http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'}
+        }
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        service = AIService(http_client=http_client, scheduler=scheduler)
+        set_context(RequestContext(Priority.BULK))
+
+        service.classify_text("test")
+
+        assert scheduler.granted[Priority.BULK] == 1
+        assert scheduler.in_flight == 0
+
+    def test_slot_released_when_upstream_fails(self):
+        http_client = MagicMock()
+        http_client.post.side_effect = RuntimeError("boom")
+        scheduler = PriorityScheduler(lambda: 1, WEIGHTS, starvation_seconds=60)
+        service = AIService(http_client=http_client, scheduler=scheduler)
+
+        with pytest.raises(RuntimeError):
+            service.classify_text("test")
+        assert scheduler.in_flight == 0
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.metrics import UpstreamTimings
+from app.service.ai_service import AIService
+from app.service.prompts import PromptTemplate, build_prompts
+
+
+class TestPromptTemplate:
+    def test_system_prefix_is_identical_across_texts(self):
+        prompts = build_prompts("system_prefix")
+
+        for task, template in prompts.items():
+            first = template.messages("first text")
+            second = template.messages("a completely different text")
+            assert first[0] is second[0], task
+            assert first[-1] == {"role": "user", "content": "Text: first text"}
+
+    def test_inline_layout_keeps_single_user_message(self):
+        messages = build_prompts("inline")["summarize"].messages("the text")
+
+        assert len(messages) == 1
+        content = messages[0]["content"]
+        assert content.startswith("Summarize the following text concisely.")
+        assert "Text: the text\n\n" in content
+
+    def test_unknown_layout_rejected(self):
+        with pytest.raises(ValueError):
+            PromptTemplate("Do it.", "{}", layout="suffix")
+
+    def test_response_timings_recorded(self):
+        mock_http_client = MagicMock()
+        mock_http_client.post.return_value.json.return_value = {
+            "message": {"content": '{"labels": ["t"], "primaryCategory": "t", "confidence": 0.9}'},
+            "prompt_eval_duration": 30_000_000,
+            "prompt_eval_count": 9,
+        }
+        timings = UpstreamTimings()
+        service = AIService(http_client=mock_http_client)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("app.service.ai_service.upstream_timings", timings)
+            service.classify_text("text")
+
+        stats = timings.snapshot()[service.model]
+        assert stats["prompt_eval_ms"]["mean"] == 30.0
+        assert stats["prompt_eval_tokens"]["mean"] == 9.0
@@ -0,0 +1,24 @@
+import os
+
+
+class Settings:
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "11434"))
+    APP_NAME: str = os.getenv("APP_NAME", "mock-ollama")
+
+    # Optional JSON profile describing per-model latency and fault behavior.
+    # When empty, the built-in defaults below apply to every model.
+    MOCK_PROFILE_PATH: str = os.getenv("MOCK_PROFILE_PATH", "")
+    MOCK_SEED: int = int(os.getenv("MOCK_SEED", "0"))
+    MOCK_EMBEDDING_DIM: int = int(os.getenv("MOCK_EMBEDDING_DIM", "384"))
+
+    # Defaults for models that the profile does not mention
+    MOCK_LATENCY_MEDIAN_MS: float = float(os.getenv("MOCK_LATENCY_MEDIAN_MS", "150"))
+    MOCK_LATENCY_SIGMA: float = float(os.getenv("MOCK_LATENCY_SIGMA", "0.3"))
+    MOCK_PROMPT_TOKENS_PER_SECOND: float = float(os.getenv("MOCK_PROMPT_TOKENS_PER_SECOND", "2000"))
+    MOCK_EVAL_TOKENS_PER_SECOND: float = float(os.getenv("MOCK_EVAL_TOKENS_PER_SECOND", "80"))
+    MOCK_ERROR_RATE: float = float(os.getenv("MOCK_ERROR_RATE", "0.0"))
+    MOCK_TIMEOUT_RATE: float = float(os.getenv("MOCK_TIMEOUT_RATE", "0.0"))
+    MOCK_MALFORMED_RATE: float = float(os.getenv("MOCK_MALFORMED_RATE", "0.0"))
+
+
+settings = Settings()
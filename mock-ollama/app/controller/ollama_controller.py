@@ -0,0 +1,115 @@
+import json
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.dto.mock_profile import MockProfile
+from app.dto.ollama_request import ChatRequest, EmbedRequest, ShowRequest
+from app.service.mock_engine import MockEngine, MockUpstreamError
+
+router = APIRouter(tags=["Ollama API (mock)"])
+admin_router = APIRouter(prefix="/mock", tags=["Mock Administration"])
+
+engine = MockEngine()
+
+
+def _error(exc: MockUpstreamError) -> JSONResponse:
+    return JSONResponse({"error": exc.message}, status_code=exc.status_code)
+
+
+@router.post("/api/chat", summary="Chat completion (streaming or not)")
+async def chat(request: ChatRequest):
+    if not request.stream:
+        try:
+            return await engine.chat(request.model, request.messages, request.options)
+        except MockUpstreamError as e:
+            return _error(e)
+
+    chunks = engine.chat_stream(request.model, request.messages, request.options)
+    try:
+        # Pull the first chunk eagerly so injected errors still become HTTP status codes
+        first = await chunks.__anext__()
+    except MockUpstreamError as e:
+        return _error(e)
+
+    async def body():
+        yield json.dumps(first) + "\n"
+        async for chunk in chunks:
+            yield json.dumps(chunk) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.post("/api/show", summary="Show model information")
+async def show(request: ShowRequest):
+    model = request.model or request.name or ""
+    try:
+        profile = engine.describe(model)
+    except MockUpstreamError as e:
+        return _error(e)
+    return {
+        "modelfile": f"# Modelfile generated by mock-ollama\nFROM {model}",
+        "parameters": "",
+        "template": "{{ .Prompt }}",
+        "details": {
+            "format": "gguf",
+            "family": model.split(":")[0],
+            "parameter_size": profile.parameter_size,
+            "quantization_level": "Q4_K_M",
+        },
+        "model_info": {"general.architecture": "mock"},
+        "capabilities": ["completion"],
+    }
+
+
+@router.get("/api/tags", summary="List local models")
+async def tags():
+    return {
+        "models": [
+            {
+                "name": name,
+                "model": name,
+                "modified_at": "2024-01-01T00:00:00Z",
+                "size": 0,
+                "digest": "mock",
+                "details": {
+                    "format": "gguf",
+                    "family": name.split(":")[0],
+                    "parameter_size": engine.profile.models[name].parameter_size,
+                    "quantization_level": "Q4_K_M",
+                },
+            }
+            for name in engine.list_models()
+        ]
+    }
+
+
+@router.post("/api/embed", summary="Generate embeddings")
+async def embed(request: EmbedRequest):
+    inputs = [request.input] if isinstance(request.input, str) else request.input
+    try:
+        return await engine.embed(request.model, inputs)
+    except MockUpstreamError as e:
+        return _error(e)
+
+
+@admin_router.get("/profile", response_model=MockProfile, summary="Current latency/fault profile")
+def get_profile() -> MockProfile:
+    return engine.profile
+
+
+@admin_router.put("/profile", response_model=MockProfile, summary="Replace the latency/fault profile")
+def put_profile(profile: MockProfile) -> MockProfile:
+    engine.set_profile(profile)
+    return engine.profile
+
+
+@admin_router.get("/stats", summary="Per-model request and fault counters")
+def get_stats() -> dict[str, dict[str, int]]:
+    return engine.get_stats()
+
+
+@admin_router.post("/stats/reset", summary="Reset the counters")
+def reset_stats() -> dict[str, dict[str, int]]:
+    engine.reset_stats()
+    return engine.get_stats()
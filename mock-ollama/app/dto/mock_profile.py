@@ -0,0 +1,85 @@
+import math
+import random
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+class LatencyDistribution(BaseModel):
+    """Distribution of the fixed per-request overhead (queueing, model load, time to first token)."""
+
+    kind: Literal["fixed", "uniform", "normal", "lognormal"] = Field(
+        "lognormal",
+        description="Shape of the distribution",
+    )
+    median_ms: float = Field(
+        settings.MOCK_LATENCY_MEDIAN_MS,
+        description="Value for 'fixed', mean for 'normal', median for 'lognormal'",
+    )
+    sigma: float = Field(
+        settings.MOCK_LATENCY_SIGMA,
+        description="Shape parameter of the 'lognormal' distribution",
+    )
+    stddev_ms: float = Field(50.0, description="Standard deviation for 'normal'")
+    low_ms: float = Field(0.0, description="Lower bound for 'uniform'")
+    high_ms: float = Field(300.0, description="Upper bound for 'uniform'")
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value = self.median_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.low_ms, self.high_ms)
+        elif self.kind == "normal":
+            value = rng.gauss(self.median_ms, self.stddev_ms)
+        else:
+            value = self.median_ms * math.exp(rng.gauss(0.0, self.sigma)) if self.median_ms > 0 else 0.0
+        return max(0.0, value)
+
+
+class ModelProfile(BaseModel):
+    """Latency, throughput and fault-injection settings for one model."""
+
+    latency: LatencyDistribution = Field(default_factory=LatencyDistribution)
+    prompt_tokens_per_second: float = Field(
+        settings.MOCK_PROMPT_TOKENS_PER_SECOND,
+        description="Prompt evaluation speed; 0 disables prompt-eval delay",
+    )
+    eval_tokens_per_second: float = Field(
+        settings.MOCK_EVAL_TOKENS_PER_SECOND,
+        description="Generation speed; 0 disables generation delay",
+    )
+    max_concurrency: int = Field(
+        0,
+        description="Requests served in parallel before further requests queue (0 = unlimited)",
+    )
+    error_rate: float = Field(settings.MOCK_ERROR_RATE, ge=0.0, le=1.0)
+    error_status_codes: list[int] = Field(default_factory=lambda: [500, 503])
+    timeout_rate: float = Field(settings.MOCK_TIMEOUT_RATE, ge=0.0, le=1.0)
+    hang_seconds: float = Field(300.0, description="How long an injected timeout stalls before answering")
+    malformed_rate: float = Field(settings.MOCK_MALFORMED_RATE, ge=0.0, le=1.0)
+    prefix_cache_slots: int = Field(
+        0,
+        description="Recent prompts kept per model; a prompt sharing a prefix with one of them "
+        "only pays prompt-eval time for the rest, like Ollama's KV cache (0 = no cache)",
+    )
+    parameter_size: str = Field("4B", description="Reported by /api/show and /api/tags")
+
+
+class MockProfile(BaseModel):
+    """Complete mock server configuration, loadable from JSON."""
+
+    seed: Optional[int] = Field(None, description="Seed for the random source; None uses MOCK_SEED")
+    strict_models: bool = Field(
+        False,
+        description="Reject models that are not listed in 'models' with 404, like a real Ollama",
+    )
+    default: ModelProfile = Field(default_factory=ModelProfile)
+    models: dict[str, ModelProfile] = Field(default_factory=dict)
+
+    def for_model(self, model: str) -> ModelProfile:
+        return self.models.get(model, self.default)
+
+    def knows_model(self, model: str) -> bool:
+        return not self.strict_models or model in self.models
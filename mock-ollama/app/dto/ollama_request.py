@@ -0,0 +1,26 @@
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class ChatRequest(BaseModel):
+    """Subset of the Ollama /api/chat request body that the mock understands."""
+
+    model: str = Field(..., json_schema_extra={"example": "gemma3:4b"})
+    messages: list[dict] = Field(default_factory=list)
+    stream: bool = Field(True, description="Ollama streams by default")
+    options: Optional[dict] = Field(None, description="Model options such as num_predict or temperature")
+
+
+class ShowRequest(BaseModel):
+    """Ollama /api/show request body; older clients send 'name' instead of 'model'."""
+
+    model: Optional[str] = None
+    name: Optional[str] = None
+
+
+class EmbedRequest(BaseModel):
+    """Ollama /api/embed request body."""
+
+    model: str = Field(..., json_schema_extra={"example": "nomic-embed-text"})
+    input: Union[str, list[str]] = Field(..., description="Text or list of texts to embed")
@@ -0,0 +1,32 @@
+import json
+
+from fastapi import FastAPI
+
+from app.config import settings
+from app.controller.ollama_controller import admin_router, engine
+from app.controller.ollama_controller import router as ollama_router
+from app.dto.mock_profile import MockProfile
+
+app = FastAPI(
+    title="Mock Ollama Server",
+    version="1.0.0",
+    description=(
+        "Offline stand-in for the Ollama API (/api/chat, /api/show, /api/tags, /api/embed) "
+        "that returns canned task JSON with configurable per-model latency, token rates "
+        "and error, timeout and malformed-output injection."
+    ),
+    docs_url="/swagger-ui.html",
+    openapi_url="/api-docs",
+)
+
+if settings.MOCK_PROFILE_PATH:
+    with open(settings.MOCK_PROFILE_PATH, encoding="utf-8") as f:
+        engine.set_profile(MockProfile(**json.load(f)))
+
+app.include_router(ollama_router)
+app.include_router(admin_router)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("app.main:app", host="0.0.0.0", port=settings.SERVER_PORT)
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import random
+import re
+from typing import Optional
+
+POSITIVE_WORDS = {"love", "great", "excellent", "amazing", "good", "happy", "outstanding", "wonderful", "best"}
+NEGATIVE_WORDS = {"hate", "terrible", "awful", "bad", "worst", "disappointed", "angry", "broken", "poor"}
+
+CATEGORIES = ["technology", "business", "health", "sports", "entertainment", "science", "politics"]
+INTENT_CATEGORIES = ["question", "request", "statement", "command"]
+
+_TEXT_PATTERN = re.compile(r"Text:\s*(.*?)(?:\n\nReturn JSON|\Z)", re.DOTALL)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z']+")
+
+
+def detect_task(messages: list[dict]) -> Optional[str]:
+    prompt = "\n".join(str(m.get("content", "")) for m in messages).lower()
+    if "sentiment" in prompt:
+        return "sentiment"
+    if "summarize" in prompt:
+        return "summarize"
+    if "intent" in prompt:
+        return "intent"
+    if "classify" in prompt:
+        return "classify"
+    return None
+
+
+def extract_text(messages: list[dict]) -> str:
+    user_messages = [m for m in messages if m.get("role", "user") == "user"]
+    content = str(user_messages[-1].get("content", "")) if user_messages else ""
+    match = _TEXT_PATTERN.search(content)
+    return match.group(1).strip() if match else content.strip()
+
+
+def _stable_index(text: str, size: int) -> int:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % size
+
+
+def _polarity(text: str) -> float:
+    words = _WORD.findall(text.lower())
+    positive = sum(1 for w in words if w in POSITIVE_WORDS)
+    negative = sum(1 for w in words if w in NEGATIVE_WORDS)
+    if positive == negative:
+        return 0.0
+    return round((positive - negative) / (positive + negative), 2)
+
+
+def build_content(task: Optional[str], text: str) -> str:
+    if task == "classify":
+        category = CATEGORIES[_stable_index(text, len(CATEGORIES))]
+        payload = {"labels": [category, "mock"], "primaryCategory": category, "confidence": 0.9}
+    elif task == "sentiment":
+        score = _polarity(text)
+        sentiment = "positive" if score > 0 else "negative" if score < 0 else "neutral"
+        emotions = {"positive": ["joy"], "negative": ["disappointment"], "neutral": []}[sentiment]
+        payload = {
+            "overallSentiment": sentiment,
+            "sentimentScore": score,
+            "emotions": emotions,
+            "confidence": 0.9,
+        }
+    elif task == "summarize":
+        sentences = [s for s in _SENTENCE_SPLIT.split(text.strip()) if s] or [text.strip()]
+        summary = sentences[0][:400]
+        payload = {
+            "summary": summary,
+            "keyPoints": [s[:120] for s in sentences[:3]],
+            "wordCount": len(summary.split()),
+        }
+    elif task == "intent":
+        category = "question" if text.rstrip().endswith("?") else INTENT_CATEGORIES[_stable_index(text, 4)]
+        payload = {
+            "primaryIntent": f"mock_{category}",
+            "secondaryIntents": [],
+            "intentCategory": category,
+            "confidence": 0.9,
+        }
+    else:
+        return "This is a mock response."
+    return json.dumps(payload)
+
+
+def malform(content: str, rng: random.Random) -> str:
+    """Turns a valid JSON answer into one of the failure shapes real models produce."""
+    variant = rng.randrange(3)
+    if variant == 0:
+        return f"Sure! Here is the analysis you asked for: {content}"
+    if variant == 1:
+        return content[: max(1, len(content) // 2)]
+    data = json.loads(content) if content.startswith("{") else {}
+    data.pop(next(iter(data), None), None)
+    return json.dumps(data)
@@ -0,0 +1,263 @@
+import asyncio
+import hashlib
+import math
+import os
+import random
+import re
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from app.config import settings
+from app.dto.mock_profile import MockProfile, ModelProfile
+from app.service.canned_responses import build_content, detect_task, extract_text, malform
+
+CHARS_PER_TOKEN = 4
+_EMBED_TOKEN = re.compile(r"\w+")
+
+
+class MockUpstreamError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class ChatPlan:
+    """Everything decided up front for one chat request: content, token counts and timings."""
+
+    def __init__(
+        self,
+        model: str,
+        content: str,
+        prompt_tokens: int,
+        overhead_s: float,
+        prompt_eval_s: float,
+        eval_s: float,
+        done_reason: str = "stop",
+        hang_s: float = 0.0,
+    ):
+        self.model = model
+        self.content = content
+        self.prompt_tokens = prompt_tokens
+        self.overhead_s = overhead_s
+        self.prompt_eval_s = prompt_eval_s
+        self.eval_s = eval_s
+        self.done_reason = done_reason
+        self.hang_s = hang_s
+
+    @property
+    def pieces(self) -> list[str]:
+        return [self.content[i : i + CHARS_PER_TOKEN] for i in range(0, len(self.content), CHARS_PER_TOKEN)]
+
+    @property
+    def eval_tokens(self) -> int:
+        return len(self.pieces)
+
+    def final_fields(self) -> dict:
+        return {
+            "done": True,
+            "done_reason": self.done_reason,
+            "total_duration": _ns(self.overhead_s + self.prompt_eval_s + self.eval_s),
+            "load_duration": _ns(self.overhead_s),
+            "prompt_eval_count": self.prompt_tokens,
+            "prompt_eval_duration": _ns(self.prompt_eval_s),
+            "eval_count": self.eval_tokens,
+            "eval_duration": _ns(self.eval_s),
+        }
+
+
+def count_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def _ns(seconds: float) -> int:
+    return int(seconds * 1_000_000_000)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class MockEngine:
+    def __init__(self, profile: Optional[MockProfile] = None, embedding_dim: Optional[int] = None):
+        self.embedding_dim = embedding_dim or settings.MOCK_EMBEDDING_DIM
+        self.stats: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.set_profile(profile or MockProfile())
+
+    def set_profile(self, profile: MockProfile) -> None:
+        self.profile = profile
+        self.rng = random.Random(profile.seed if profile.seed is not None else settings.MOCK_SEED)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._prefix_cache: dict[str, deque[str]] = {}
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        return {model: dict(counters) for model, counters in self.stats.items()}
+
+    def _slot(self, model: str, profile: ModelProfile) -> Optional[asyncio.Semaphore]:
+        if profile.max_concurrency <= 0:
+            return None
+        if model not in self._slots:
+            self._slots[model] = asyncio.Semaphore(profile.max_concurrency)
+        return self._slots[model]
+
+    def _check_model(self, model: str) -> None:
+        if not self.profile.knows_model(model):
+            raise MockUpstreamError(404, f"model '{model}' not found")
+
+    def _cached_prefix_tokens(self, model: str, profile: ModelProfile, messages: list[dict]) -> int:
+        """Tokens of the longest prefix this prompt shares with a recently seen one."""
+        if profile.prefix_cache_slots <= 0:
+            return 0
+        rendered = "".join(f"<{m.get('role', 'user')}>{m.get('content', '')}\n" for m in messages)
+        recent = self._prefix_cache.setdefault(model, deque(maxlen=profile.prefix_cache_slots))
+        shared = max((len(os.path.commonprefix([rendered, seen])) for seen in recent), default=0)
+        recent.append(rendered)
+        return shared // CHARS_PER_TOKEN
+
+    def _inject_faults(self, model: str, profile: ModelProfile) -> float:
+        """Raises an injected HTTP error, or returns how long to stall (0.0 for no stall)."""
+        counters = self.stats[model]
+        if self.rng.random() < profile.error_rate:
+            counters["errors_injected"] += 1
+            raise MockUpstreamError(self.rng.choice(profile.error_status_codes), "injected upstream error")
+        if self.rng.random() < profile.timeout_rate:
+            counters["timeouts_injected"] += 1
+            return profile.hang_seconds
+        return 0.0
+
+    def plan_chat(self, model: str, messages: list[dict], options: Optional[dict] = None) -> ChatPlan:
+        profile = self.profile.for_model(model)
+        hang_s = self._inject_faults(model, profile)
+        content = build_content(detect_task(messages), extract_text(messages))
+        if self.rng.random() < profile.malformed_rate:
+            self.stats[model]["malformed_injected"] += 1
+            content = malform(content, self.rng)
+
+        done_reason = "stop"
+        num_predict = (options or {}).get("num_predict")
+        if num_predict is not None and num_predict >= 0 and len(content) > num_predict * CHARS_PER_TOKEN:
+            content = content[: num_predict * CHARS_PER_TOKEN]
+            done_reason = "length"
+
+        prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+        cached_tokens = min(prompt_tokens - 1, self._cached_prefix_tokens(model, profile, messages))
+        self.stats[model]["prompt_tokens"] += prompt_tokens
+        self.stats[model]["prompt_tokens_cached"] += cached_tokens
+        # Like Ollama, prompt_eval_count only covers the tokens that were not cached
+        prompt_tokens -= cached_tokens
+        eval_tokens = math.ceil(len(content) / CHARS_PER_TOKEN)
+        return ChatPlan(
+            model=model,
+            content=content,
+            prompt_tokens=prompt_tokens,
+            overhead_s=profile.latency.sample_ms(self.rng) / 1000.0,
+            prompt_eval_s=prompt_tokens / profile.prompt_tokens_per_second if profile.prompt_tokens_per_second else 0.0,
+            eval_s=eval_tokens / profile.eval_tokens_per_second if profile.eval_tokens_per_second else 0.0,
+            done_reason=done_reason,
+            hang_s=hang_s,
+        )
+
+    async def _admit(self, model: str) -> Optional[asyncio.Semaphore]:
+        self._check_model(model)
+        counters = self.stats[model]
+        counters["requests"] += 1
+        slot = self._slot(model, self.profile.for_model(model))
+        if slot is not None:
+            await slot.acquire()
+        counters["in_flight"] += 1
+        return slot
+
+    def _release(self, model: str, slot: Optional[asyncio.Semaphore]) -> None:
+        self.stats[model]["in_flight"] -= 1
+        if slot is not None:
+            slot.release()
+
+    async def chat(self, model: str, messages: list[dict], options: Optional[dict] = None) -> dict:
+        slot = await self._admit(model)
+        try:
+            plan = self.plan_chat(model, messages, options)
+            await asyncio.sleep(plan.hang_s + plan.overhead_s + plan.prompt_eval_s + plan.eval_s)
+            return {
+                "model": model,
+                "created_at": _now(),
+                "message": {"role": "assistant", "content": plan.content},
+                **plan.final_fields(),
+            }
+        except asyncio.CancelledError:
+            self.stats[model]["cancelled"] += 1
+            raise
+        finally:
+            self._release(model, slot)
+
+    async def chat_stream(self, model: str, messages: list[dict], options: Optional[dict] = None) -> AsyncIterator[dict]:
+        slot = await self._admit(model)
+        completed = False
+        try:
+            try:
+                plan = self.plan_chat(model, messages, options)
+            except MockUpstreamError:
+                completed = True
+                raise
+            await asyncio.sleep(plan.hang_s + plan.overhead_s + plan.prompt_eval_s)
+            pieces = plan.pieces
+            per_piece = plan.eval_s / len(pieces) if pieces else 0.0
+            for piece in pieces:
+                await asyncio.sleep(per_piece)
+                yield {
+                    "model": model,
+                    "created_at": _now(),
+                    "message": {"role": "assistant", "content": piece},
+                    "done": False,
+                }
+            completed = True
+            yield {
+                "model": model,
+                "created_at": _now(),
+                "message": {"role": "assistant", "content": ""},
+                **plan.final_fields(),
+            }
+        finally:
+            if not completed:
+                self.stats[model]["cancelled"] += 1
+            self._release(model, slot)
+
+    def embed_vector(self, text: str) -> list[float]:
+        """Deterministic hashed bag-of-words embedding, so similar texts get similar vectors."""
+        vector = [0.0] * self.embedding_dim
+        tokens = _EMBED_TOKEN.findall(text.lower())
+        for token in tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "big") % self.embedding_dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    async def embed(self, model: str, inputs: list[str]) -> dict:
+        slot = await self._admit(model)
+        try:
+            profile = self.profile.for_model(model)
+            hang_s = self._inject_faults(model, profile)
+            prompt_tokens = sum(count_tokens(text) for text in inputs)
+            overhead_s = profile.latency.sample_ms(self.rng) / 1000.0
+            prompt_eval_s = prompt_tokens / profile.prompt_tokens_per_second if profile.prompt_tokens_per_second else 0.0
+            await asyncio.sleep(hang_s + overhead_s + prompt_eval_s)
+            return {
+                "model": model,
+                "embeddings": [self.embed_vector(text) for text in inputs],
+                "total_duration": _ns(overhead_s + prompt_eval_s),
+                "load_duration": _ns(overhead_s),
+                "prompt_eval_count": prompt_tokens,
+            }
+        finally:
+            self._release(model, slot)
+
+    def list_models(self) -> list[str]:
+        return sorted(self.profile.models)
+
+    def describe(self, model: str) -> ModelProfile:
+        self._check_model(model)
+        return self.profile.for_model(model)
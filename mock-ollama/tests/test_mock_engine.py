@@ -0,0 +1,231 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from app.dto.mock_profile import LatencyDistribution, MockProfile, ModelProfile
+from app.service.canned_responses import build_content, detect_task, extract_text
+from app.service.mock_engine import MockEngine, MockUpstreamError
+
+
+def _instant(**overrides) -> ModelProfile:
+    return ModelProfile(
+        latency=LatencyDistribution(kind="fixed", median_ms=0),
+        prompt_tokens_per_second=0,
+        eval_tokens_per_second=0,
+        **overrides,
+    )
+
+
+def _messages(prompt: str) -> list[dict]:
+    return [{"role": "user", "content": prompt}]
+
+
+CLASSIFY_PROMPT = (
+    "Analyze the following text and classify it with appropriate labels and tags. "
+    "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
+    "Text: AI is transforming healthcare\n\n"
+    "Return JSON in this exact format:\n"
+    '{"labels": ["label1", "label2"], "primaryCategory": "category", "confidence": 0.9}'
+)
+
+
+class TestLatencyDistribution:
+    def test_fixed(self):
+        assert LatencyDistribution(kind="fixed", median_ms=42).sample_ms(random.Random(0)) == 42
+
+    def test_uniform_within_bounds(self):
+        dist = LatencyDistribution(kind="uniform", low_ms=10, high_ms=20)
+        rng = random.Random(0)
+        assert all(10 <= dist.sample_ms(rng) <= 20 for _ in range(100))
+
+    def test_never_negative(self):
+        dist = LatencyDistribution(kind="normal", median_ms=0, stddev_ms=100)
+        rng = random.Random(0)
+        assert all(dist.sample_ms(rng) >= 0 for _ in range(100))
+
+    def test_lognormal_median(self):
+        dist = LatencyDistribution(kind="lognormal", median_ms=100, sigma=0.5)
+        rng = random.Random(1)
+        samples = sorted(dist.sample_ms(rng) for _ in range(2001))
+        assert 85 < samples[1000] < 115
+
+
+class TestCannedResponses:
+    def test_detect_task(self):
+        assert detect_task(_messages(CLASSIFY_PROMPT)) == "classify"
+        assert detect_task(_messages("Analyze the sentiment of the following text.")) == "sentiment"
+        assert detect_task(_messages("Summarize the following text concisely.")) == "summarize"
+        assert detect_task(_messages("Detect the intent behind the following text.")) == "intent"
+        assert detect_task(_messages("Hello")) is None
+
+    def test_extract_text(self):
+        assert extract_text(_messages(CLASSIFY_PROMPT)) == "AI is transforming healthcare"
+        system_prefix = [{"role": "system", "content": "Classify."}, {"role": "user", "content": "Text: AI is here"}]
+        assert extract_text(system_prefix) == "AI is here"
+
+    @pytest.mark.parametrize(
+        "task,keys",
+        [
+            ("classify", {"labels", "primaryCategory", "confidence"}),
+            ("sentiment", {"overallSentiment", "sentimentScore", "emotions", "confidence"}),
+            ("summarize", {"summary", "keyPoints", "wordCount"}),
+            ("intent", {"primaryIntent", "secondaryIntents", "intentCategory", "confidence"}),
+        ],
+    )
+    def test_valid_task_json(self, task, keys):
+        assert set(json.loads(build_content(task, "I love this product. It works."))) == keys
+
+    def test_sentiment_follows_polarity(self):
+        assert json.loads(build_content("sentiment", "This is terrible"))["overallSentiment"] == "negative"
+        assert json.loads(build_content("sentiment", "I love it"))["overallSentiment"] == "positive"
+
+
+class TestMockEngine:
+    def test_chat_returns_ollama_shape(self):
+        engine = MockEngine(MockProfile(default=_instant()))
+
+        result = asyncio.run(engine.chat("gemma3:4b", _messages(CLASSIFY_PROMPT)))
+
+        assert result["done"] is True
+        assert result["message"]["role"] == "assistant"
+        assert json.loads(result["message"]["content"])["confidence"] == 0.9
+        assert result["prompt_eval_count"] > 0
+        assert result["eval_count"] > 0
+        assert engine.get_stats()["gemma3:4b"]["requests"] == 1
+
+    def test_stream_concatenates_to_full_content(self):
+        engine = MockEngine(MockProfile(default=_instant()))
+
+        async def collect():
+            return [chunk async for chunk in engine.chat_stream("m", _messages(CLASSIFY_PROMPT))]
+
+        chunks = asyncio.run(collect())
+
+        assert chunks[-1]["done"] is True
+        content = "".join(c["message"]["content"] for c in chunks)
+        assert json.loads(content)["primaryCategory"]
+        assert engine.get_stats()["m"].get("cancelled", 0) == 0
+
+    def test_error_injection(self):
+        engine = MockEngine(MockProfile(default=_instant(error_rate=1.0, error_status_codes=[503])))
+
+        with pytest.raises(MockUpstreamError) as exc_info:
+            asyncio.run(engine.chat("m", _messages(CLASSIFY_PROMPT)))
+
+        assert exc_info.value.status_code == 503
+        assert engine.get_stats()["m"]["errors_injected"] == 1
+        assert engine.get_stats()["m"]["in_flight"] == 0
+
+    def test_malformed_injection_breaks_json(self):
+        engine = MockEngine(MockProfile(default=_instant(malformed_rate=1.0)))
+        required = {"labels", "primaryCategory", "confidence"}
+
+        for _ in range(10):
+            content = asyncio.run(engine.chat("m", _messages(CLASSIFY_PROMPT)))["message"]["content"]
+            try:
+                assert set(json.loads(content)) != required
+            except json.JSONDecodeError:
+                pass
+
+    def test_timeout_injection_stalls(self):
+        engine = MockEngine(MockProfile(default=_instant(timeout_rate=1.0, hang_seconds=5)))
+
+        async def call():
+            return await asyncio.wait_for(engine.chat("m", _messages(CLASSIFY_PROMPT)), timeout=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(call())
+        assert engine.get_stats()["m"]["timeouts_injected"] == 1
+        assert engine.get_stats()["m"]["cancelled"] == 1
+
+    def test_num_predict_truncates_output(self):
+        engine = MockEngine(MockProfile(default=_instant()))
+
+        result = asyncio.run(engine.chat("m", _messages(CLASSIFY_PROMPT), {"num_predict": 3}))
+
+        assert result["eval_count"] == 3
+        assert result["done_reason"] == "length"
+
+    def test_latency_follows_token_rates(self):
+        profile = ModelProfile(
+            latency=LatencyDistribution(kind="fixed", median_ms=10),
+            prompt_tokens_per_second=100,
+            eval_tokens_per_second=10,
+        )
+        engine = MockEngine(MockProfile(default=profile))
+
+        plan = engine.plan_chat("m", _messages("x" * 400))
+
+        assert plan.overhead_s == pytest.approx(0.01)
+        assert plan.prompt_eval_s == pytest.approx(1.0)
+        assert plan.eval_s == pytest.approx(plan.eval_tokens / 10)
+
+    def test_prefix_cache_discounts_shared_prompt_prefix(self):
+        profile = ModelProfile(
+            latency=LatencyDistribution(kind="fixed", median_ms=0),
+            prompt_tokens_per_second=100,
+            eval_tokens_per_second=0,
+            prefix_cache_slots=4,
+        )
+        engine = MockEngine(MockProfile(default=profile))
+        system = {"role": "system", "content": "Summarize the following text concisely. " * 10}
+
+        first = engine.plan_chat("m", [system, {"role": "user", "content": "Text: one"}])
+        second = engine.plan_chat("m", [system, {"role": "user", "content": "Text: two"}])
+
+        assert second.prompt_tokens < first.prompt_tokens
+        assert second.prompt_eval_s < first.prompt_eval_s
+        stats = engine.get_stats()["m"]
+        assert stats["prompt_tokens_cached"] == first.prompt_tokens - second.prompt_tokens
+        assert stats["prompt_tokens"] == 2 * first.prompt_tokens
+
+    def test_prefix_cache_disabled_by_default(self):
+        engine = MockEngine(MockProfile(default=_instant()))
+
+        first = engine.plan_chat("m", _messages(CLASSIFY_PROMPT))
+        second = engine.plan_chat("m", _messages(CLASSIFY_PROMPT))
+
+        assert first.prompt_tokens == second.prompt_tokens
+
+    def test_per_model_profiles(self):
+        engine = MockEngine(MockProfile(default=_instant(), models={"slow": _instant(error_rate=1.0)}))
+
+        asyncio.run(engine.chat("fast", _messages(CLASSIFY_PROMPT)))
+        with pytest.raises(MockUpstreamError):
+            asyncio.run(engine.chat("slow", _messages(CLASSIFY_PROMPT)))
+
+    def test_strict_models_rejects_unknown(self):
+        engine = MockEngine(MockProfile(strict_models=True, models={"known": _instant()}))
+
+        with pytest.raises(MockUpstreamError) as exc_info:
+            asyncio.run(engine.chat("unknown", _messages(CLASSIFY_PROMPT)))
+
+        assert exc_info.value.status_code == 404
+
+    def test_max_concurrency_queues_requests(self):
+        profile = ModelProfile(latency=LatencyDistribution(kind="fixed", median_ms=50), max_concurrency=1)
+        engine = MockEngine(MockProfile(default=profile))
+
+        async def run_two():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(
+                engine.chat("m", _messages("Hello")),
+                engine.chat("m", _messages("Hello")),
+            )
+            return loop.time() - start
+
+        assert asyncio.run(run_two()) >= 0.1
+
+    def test_embeddings_are_deterministic_and_normalized(self):
+        engine = MockEngine(MockProfile(default=_instant()), embedding_dim=64)
+
+        first = engine.embed_vector("the quick brown fox")
+        second = engine.embed_vector("the quick brown fox")
+        other = engine.embed_vector("completely unrelated words here")
+
+        assert first == second
+        assert sum(v * v for v in first) == pytest.approx(1.0)
+        assert sum(a * b for a, b in zip(first, second)) > sum(a * b for a, b in zip(first, other))
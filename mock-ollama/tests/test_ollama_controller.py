@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.controller.ollama_controller import engine
+from app.dto.mock_profile import LatencyDistribution, MockProfile, ModelProfile
+from app.main import app
+
+
+def _instant(**overrides) -> dict:
+    return ModelProfile(
+        latency=LatencyDistribution(kind="fixed", median_ms=0),
+        prompt_tokens_per_second=0,
+        eval_tokens_per_second=0,
+        **overrides,
+    ).model_dump()
+
+
+@pytest.fixture
+def client():
+    engine.set_profile(MockProfile(default=ModelProfile(**_instant()), models={"gemma3:4b": ModelProfile(**_instant())}))
+    engine.reset_stats()
+    return TestClient(app)
+
+
+SENTIMENT_PROMPT = (
+    "Analyze the sentiment of the following text. "
+    "Respond with ONLY valid JSON, no additional text or explanation.\n\n"
+    "Text: I love this product!\n\n"
+    "Return JSON in this exact format:\n"
+    '{"overallSentiment": "positive", "sentimentScore": 0.8, "emotions": ["joy", "excitement"], "confidence": 0.9}'
+)
+
+
+class TestChatEndpoint:
+    def test_non_streaming(self, client):
+        response = client.post(
+            "/api/chat",
+            json={"model": "gemma3:4b", "messages": [{"role": "user", "content": SENTIMENT_PROMPT}], "stream": False},
+        )
+
+        assert response.status_code == 200
+        content = json.loads(response.json()["message"]["content"])
+        assert content["overallSentiment"] == "positive"
+
+    def test_streaming_ndjson(self, client):
+        response = client.post(
+            "/api/chat",
+            json={"model": "gemma3:4b", "messages": [{"role": "user", "content": SENTIMENT_PROMPT}]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        chunks = [json.loads(line) for line in response.text.splitlines()]
+        assert chunks[-1]["done"] is True
+        assert json.loads("".join(c["message"]["content"] for c in chunks))["confidence"] == 0.9
+
+    def test_injected_error_status(self, client):
+        client.put("/mock/profile", json={"default": _instant(error_rate=1.0, error_status_codes=[502])})
+
+        response = client.post("/api/chat", json={"model": "x", "messages": [], "stream": False})
+        streamed = client.post("/api/chat", json={"model": "x", "messages": []})
+
+        assert response.status_code == 502
+        assert streamed.status_code == 502
+        assert "error" in response.json()
+
+
+class TestModelEndpoints:
+    def test_tags_lists_profile_models(self, client):
+        response = client.get("/api/tags")
+
+        assert response.status_code == 200
+        assert [m["name"] for m in response.json()["models"]] == ["gemma3:4b"]
+
+    def test_show(self, client):
+        response = client.post("/api/show", json={"model": "gemma3:4b"})
+
+        assert response.status_code == 200
+        assert response.json()["details"]["family"] == "gemma3"
+
+    def test_show_unknown_model_in_strict_mode(self, client):
+        client.put("/mock/profile", json={"strict_models": True, "models": {"gemma3:4b": _instant()}})
+
+        assert client.post("/api/show", json={"name": "missing"}).status_code == 404
+
+    def test_embed_single_and_batch(self, client):
+        single = client.post("/api/embed", json={"model": "nomic-embed-text", "input": "hello"})
+        batch = client.post("/api/embed", json={"model": "nomic-embed-text", "input": ["a", "b", "c"]})
+
+        assert len(single.json()["embeddings"]) == 1
+        assert len(batch.json()["embeddings"]) == 3
+
+
+class TestAdminEndpoints:
+    def test_stats_count_requests(self, client):
+        client.post("/api/chat", json={"model": "gemma3:4b", "messages": [], "stream": False})
+
+        stats = client.get("/mock/stats").json()
+
+        assert stats["gemma3:4b"]["requests"] == 1
+        assert client.post("/mock/stats/reset").json() == {}
+
+    def test_profile_round_trip(self, client):
+        client.put("/mock/profile", json={"seed": 3, "default": _instant(malformed_rate=0.5)})
+
+        assert client.get("/mock/profile").json()["default"]["malformed_rate"] == 0.5